@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Pool of pre-registered test accounts.
+
+Registering a user inline costs every membership test a full signup, and the
+old timestamp-based emails collided when tests started in the same second.
+The pool registers accounts ahead of time in a background worker, keeps each
+account's signed-in session snapshot in a local pool file, and leases a
+unique account to each test. Accounts move fresh -> leased -> consumed; the
+worker tops the pool back up whenever the fresh count drops below the low
+watermark.
+
+Leases are atomic across processes (pytest-xdist workers) through an
+exclusive lock on the pool file (core.file_lock). Opt in with
+USE_ACCOUNT_POOL=true.
+
+Usage:
+    python -m core.account_pool status
+    python -m core.account_pool fill [count]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from core.accounts import unique_test_email
+from core.constants import DEFAULT_PASSWORD
+from core.file_lock import locked
+from core.waits import page_ready
+
+USE_ACCOUNT_POOL = os.getenv("USE_ACCOUNT_POOL", "false").lower() == "true"
+ACCOUNT_POOL_PATH = os.getenv("ACCOUNT_POOL_FILE", ".cache/account_pool.json")
+LOW_WATERMARK = int(os.getenv("ACCOUNT_POOL_LOW_WATERMARK", "3"))
+TARGET_SIZE = int(os.getenv("ACCOUNT_POOL_TARGET", "8"))
+
+# Accounts unused for longer than this are retired; the site may expire sessions
+ACCOUNT_MAX_AGE_SECONDS = int(os.getenv("ACCOUNT_POOL_MAX_AGE", "1800"))
+# A lease older than this belongs to a test that died without releasing it
+LEASE_TIMEOUT_SECONDS = int(os.getenv("ACCOUNT_POOL_LEASE_TIMEOUT", "900"))
+
+FRESH = "fresh"
+LEASED = "leased"
+CONSUMED = "consumed"
+
+
+class AccountPool:
+    """File-backed pool of registered accounts with atomic leasing"""
+
+    def __init__(self, path=ACCOUNT_POOL_PATH, low_watermark=None, target_size=None):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+        self.low_watermark = low_watermark or LOW_WATERMARK
+        self.target_size = target_size or TARGET_SIZE
+        self._worker = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    # ----------------------
+    # Pool file
+    # ----------------------
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the pool; yields the account list and writes it back"""
+        with locked(self.lock_path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    accounts = json.load(f)
+            except (OSError, ValueError):
+                accounts = []
+            self._expire(accounts)
+            yield accounts
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(accounts, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def _expire(self, accounts):
+        now = time.time()
+        for account in accounts:
+            if (
+                account["state"] == FRESH
+                and now - account["created_at"] > ACCOUNT_MAX_AGE_SECONDS
+            ):
+                account.update(
+                    state=CONSUMED, consumed_at=now, consumed_reason="expired"
+                )
+            elif (
+                account["state"] == LEASED
+                and now - account["leased_at"] > LEASE_TIMEOUT_SECONDS
+            ):
+                account.update(
+                    state=CONSUMED, consumed_at=now, consumed_reason="lease timed out"
+                )
+            elif account["state"] == CONSUMED:
+                # Pool files written before consumed_at was always set
+                account.setdefault("consumed_at", now)
+        # Consumed accounts are kept for a day for debugging, then dropped
+        accounts[:] = [
+            a
+            for a in accounts
+            if a["state"] != CONSUMED or now - a["consumed_at"] < 86400
+        ]
+
+    # ----------------------
+    # Leasing
+    # ----------------------
+    def lease(self, holder=None):
+        """Atomically lease the oldest fresh account; None if the pool is empty"""
+        with self._locked() as accounts:
+            fresh = [a for a in accounts if a["state"] == FRESH]
+            account = min(fresh, key=lambda a: a["created_at"]) if fresh else None
+            if account:
+                account.update(
+                    state=LEASED,
+                    leased_at=time.time(),
+                    holder=holder or str(os.getpid()),
+                )
+            remaining = len(fresh) - (1 if account else 0)
+
+        if remaining < self.low_watermark:
+            self._wakeup.set()
+        if account:
+            print(
+                f"[👤] Leased pooled account {account['email']} ({remaining} fresh left)"
+            )
+        else:
+            print("[👤] Account pool is empty")
+        return account
+
+    def consume(self, email, reason="used"):
+        """Mark a leased account as used up"""
+        self._set_state(
+            email, CONSUMED, consumed_at=time.time(), consumed_reason=reason
+        )
+
+    def release(self, email):
+        """Return an untouched leased account to the pool"""
+        self._set_state(email, FRESH, holder=None)
+
+    def add(self, email, password, session):
+        """Add a freshly registered account with its signed-in session snapshot"""
+        with self._locked() as accounts:
+            accounts.append(
+                {
+                    "email": email,
+                    "password": password,
+                    "state": FRESH,
+                    "created_at": time.time(),
+                    "session": session,
+                }
+            )
+
+    def counts(self):
+        with self._locked() as accounts:
+            counts = {FRESH: 0, LEASED: 0, CONSUMED: 0}
+            for account in accounts:
+                counts[account["state"]] += 1
+        return counts
+
+    def _set_state(self, email, state, **fields):
+        with self._locked() as accounts:
+            for account in accounts:
+                if account["email"] == email:
+                    account.update(state=state, **fields)
+                    return
+
+    # ----------------------
+    # Replenishment
+    # ----------------------
+    def start_replenisher(self):
+        """Start the background worker that keeps the pool above its watermark"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._wakeup.set()
+        self._worker = threading.Thread(
+            target=self._replenish_loop, name="account-pool", daemon=True
+        )
+        self._worker.start()
+
+    def stop_replenisher(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker:
+            self._worker.join(timeout)
+
+    def _replenish_loop(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(timeout=30)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            if self.counts()[FRESH] < self.low_watermark:
+                self.fill(self.target_size)
+
+    def fill(self, target=None):
+        """Register accounts until the pool holds target fresh ones"""
+        target = target or self.target_size
+        missing = target - self.counts()[FRESH]
+        if missing <= 0:
+            return 0
+
+        # Imported here: the browser stack is only needed by the worker
+        from core.browser_pool import launch_browser
+        from core.session_checkpoint import take_snapshot
+        from pages.purchase_membership_question_by_monthly_plan_methods import (
+            SolutionInnPrimaryPage,
+        )
+
+        print(f"[👤] Registering {missing} pooled account(s)...")
+        driver = launch_browser("desktop")
+        added = 0
+        try:
+            for _ in range(missing):
+                if self._stop.is_set():
+                    break
+                try:
+                    driver.delete_all_cookies()
+                    page = SolutionInnPrimaryPage(driver)
+                    page.open()
+                    page.click_view_solution_button()
+                    email = unique_test_email()
+                    page.enter_email(email)
+                    page.enter_password()
+                    page.enter_university()
+                    page.click_signup_button()
+                    page_ready(driver, timeout=10)
+                    self.add(email, DEFAULT_PASSWORD, take_snapshot(driver))
+                    added += 1
+                except Exception as e:
+                    reason = f"{type(e).__name__} – {e}"
+                    print(f"[⚠️] Could not register pooled account: {reason}")
+        finally:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        print(f"[👤] Added {added} account(s) to the pool")
+        return added
+
+
+# Global pool instance
+account_pool = AccountPool()
+
+
+def main():
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "status"
+    if command == "fill":
+        target = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        account_pool.fill(target)
+    elif command != "status":
+        print(f"❌ Unknown command: {command}")
+        print("Usage: python -m core.account_pool [status | fill [count]]")
+        return
+    print(f"[📊] Account pool: {account_pool.counts()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Test account helpers shared by the page objects and the account pool.
+
+Kept apart from core.account_pool so importing them needs neither the pool's
+file lock nor the browser stack.
+"""
+
+import time
+import uuid
+
+from core.constants import EMAIL_DOMAIN
+
+
+def unique_test_email():
+    """Collision-free email for a new test user"""
+    return f"testuser_{int(time.time())}_{uuid.uuid4().hex[:8]}@{EMAIL_DOMAIN}"
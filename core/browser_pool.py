@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Session-scoped pool of warm Chrome instances for the test suite.
+
+Launching Chrome (and resolving chromedriver) for every device x stage x test
+combination dominates wall-clock on the nightly matrix. The pool keeps a
+configurable number of browsers alive, resets their state between tests and
+recycles them after a number of uses or when they crash. By default devices
+are switched through CDP emulation so one pool serves the whole device list;
+BROWSER_EMULATION=launch keeps a separate pool per device profile.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from core.constants import BOOK_URL, PRIMARY_URL, SECONDARY_URL
+from core.device_emulation import apply_device_emulation, get_mobile_emulation_option
+from core.waits import IMPLICIT_WAIT_SECONDS
+
+# By default: headless = True for CI environments
+HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+
+# Pool tuning
+POOL_SIZE_PER_DEVICE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+MAX_USES_PER_BROWSER = int(os.getenv("BROWSER_POOL_MAX_USES", "25"))
+
+# "cdp" switches devices on a running browser, "launch" starts one Chrome per device
+EMULATION_MODE = os.getenv("BROWSER_EMULATION", "cdp").lower()
+
+# Origins whose storage is wiped when a browser is handed back to the pool
+KNOWN_ORIGINS = sorted(
+    {
+        f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+        for url in (BOOK_URL, PRIMARY_URL, SECONDARY_URL)
+    }
+    | {"https://www.solutioninn.com", "https://staging.solutioninn.com"}
+)
+CLEARED_STORAGE_TYPES = ",".join(
+    (
+        "local_storage",
+        "indexeddb",
+        "service_workers",
+        "cache_storage",
+        "websql",
+        "file_systems",
+    )
+)
+
+_HIDE_WEBDRIVER_JS = (
+    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+)
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def get_chromedriver_path():
+    """Resolve chromedriver once per process instead of once per test"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def build_chrome_options(device):
+    """Build Chrome options for the given device profile"""
+    chrome_options = Options()
+
+    if HEADLESS:
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        print("[INFO] Running in headless mode")
+    else:
+        print("[INFO] Headless mode disabled")
+
+    mobile_emulation = get_mobile_emulation_option(device)
+    if mobile_emulation is None:
+        print("[INFO] Running on desktop")
+        chrome_options.add_argument("--start-maximized")
+    else:
+        chrome_options.add_experimental_option("mobileEmulation", mobile_emulation)
+        print(f"[INFO] Running on mobile: {device}")
+
+    # Stability settings
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--allow-running-insecure-content")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    chrome_options.add_argument("--no-first-run")
+    chrome_options.add_argument("--no-default-browser-check")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+
+    # Network and connectivity improvements
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-translate")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-component-update")
+    chrome_options.add_argument("--disable-client-side-phishing-detection")
+    chrome_options.add_argument("--disable-hang-monitor")
+    chrome_options.add_argument("--disable-prompt-on-repost")
+    chrome_options.add_argument("--disable-domain-reliability")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+
+    # Add timeout settings to prevent hanging
+    chrome_options.add_argument("--timeout=30000")
+    chrome_options.add_argument("--page-load-timeout=30000")
+
+    # DNS and network settings
+    chrome_options.add_argument("--dns-prefetch-disable")
+
+    # Fix for GitHub Actions: Use unique user data directory per browser
+    if os.getenv("GITHUB_ACTIONS") == "true":
+        temp_dir = tempfile.mkdtemp(prefix="chrome_user_data_")
+        chrome_options.add_argument(f"--user-data-dir={temp_dir}")
+        chrome_options.add_argument("--headless")  # Force headless in CI
+        print(f"[SETUP] Using unique user data directory: {temp_dir}")
+
+    return chrome_options
+
+
+def launch_browser(device):
+    """Launch a new Chrome instance configured for the device"""
+    driver = webdriver.Chrome(
+        service=Service(get_chromedriver_path()), options=build_chrome_options(device)
+    )
+
+    # Set page load timeout and other timeouts
+    driver.set_page_load_timeout(30)
+    driver.implicitly_wait(IMPLICIT_WAIT_SECONDS)
+    driver.set_script_timeout(30)
+
+    # Hide the webdriver flag on every document, not just the current one
+    try:
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": _HIDE_WEBDRIVER_JS}
+        )
+    except Exception:
+        driver.execute_script(_HIDE_WEBDRIVER_JS)
+
+    return driver
+
+
+class PooledBrowser:
+    """A Chrome instance owned by the pool"""
+
+    def __init__(self, key, driver):
+        self.key = key
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+        try:
+            self.native_user_agent = driver.execute_cdp_cmd("Browser.getVersion", {})[
+                "userAgent"
+            ]
+        except Exception:
+            self.native_user_agent = None
+
+
+class BrowserPool:
+    """Keeps warm Chrome instances per device profile for the whole session"""
+
+    def __init__(self, size_per_device=None, max_uses=None, emulation_mode=None):
+        self.size_per_device = size_per_device or POOL_SIZE_PER_DEVICE
+        self.max_uses = max_uses or MAX_USES_PER_BROWSER
+        self.emulation_mode = emulation_mode or EMULATION_MODE
+        self._idle = {}
+        self._leased = {}
+        self._lock = threading.Lock()
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "crashed": 0}
+
+    def acquire(self, device):
+        """Hand out a clean browser for the device, launching one if needed"""
+        key = self._pool_key(device)
+        while True:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                browser = idle.pop() if idle else None
+
+            if browser is None:
+                browser = PooledBrowser(key, launch_browser(key))
+                self._count("launched")
+                print(f"[🚀] Launched new browser for {key}")
+            elif not (self._is_alive(browser) and self._reset_state(browser)):
+                self._count("crashed")
+                self._quit(browser)
+                continue
+            else:
+                self._count("reused")
+                print(
+                    f"[♻️] Reusing warm browser for {device} (use {browser.uses + 1})"
+                )
+
+            if self.emulation_mode != "cdp":
+                break
+            try:
+                apply_device_emulation(
+                    browser.driver, device, browser.native_user_agent
+                )
+                break
+            except Exception as e:
+                print(f"[⚠️] Could not switch browser to {device}: {e}")
+                self._count("crashed")
+                self._quit(browser)
+
+        browser.uses += 1
+        # Lets the click engine key its stats by device profile
+        browser.driver.device_name = device
+        with self._lock:
+            self._leased[id(browser.driver)] = browser
+        return browser.driver
+
+    def release(self, driver, failed=False):
+        """Return a browser to the pool, or retire it if it is worn out or broken"""
+        with self._lock:
+            browser = self._leased.pop(id(driver), None)
+        if browser is None:
+            self._quit_driver(driver)
+            return
+
+        if failed and not self._is_alive(browser):
+            self._count("crashed")
+            self._quit(browser)
+            return
+
+        if browser.uses >= self.max_uses:
+            self._count("recycled")
+            print(f"[♻️] Recycling browser for {browser.key} after {browser.uses} uses")
+            self._quit(browser)
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(browser.key, [])
+            if len(idle) < self.size_per_device:
+                idle.append(browser)
+                return
+        self._quit(browser)
+
+    def close(self):
+        """Quit every browser owned by the pool"""
+        with self._lock:
+            browsers = [b for idle in self._idle.values() for b in idle]
+            browsers.extend(self._leased.values())
+            self._idle.clear()
+            self._leased.clear()
+            stats = dict(self.stats)
+        for browser in browsers:
+            self._quit(browser)
+        print(f"[📊] Browser pool stats: {stats}")
+
+    def _count(self, stat):
+        # Workers acquire and release browsers in parallel
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _pool_key(self, device):
+        """With CDP emulation every device shares one desktop-launched browser"""
+        return "desktop" if self.emulation_mode == "cdp" else device
+
+    def _is_alive(self, browser):
+        try:
+            return bool(browser.driver.window_handles)
+        except Exception:
+            return False
+
+    def _reset_state(self, browser):
+        """Wipe cookies, storage, service workers and extra tabs between tests"""
+        driver = browser.driver
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+
+            origins = set(KNOWN_ORIGINS)
+            current = urlparse(driver.current_url)
+            if current.scheme in ("http", "https"):
+                origins.add(f"{current.scheme}://{current.netloc}")
+            for origin in origins:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {
+                        "origin": origin,
+                        "storageTypes": CLEARED_STORAGE_TYPES,
+                    },
+                )
+
+            # sessionStorage lives with the tab, so start from a fresh one
+            driver.switch_to.new_window("tab")
+            fresh = driver.current_window_handle
+            driver.switch_to.window(handles[0])
+            driver.close()
+            driver.switch_to.window(fresh)
+            return True
+        except Exception as e:
+            print(f"[⚠️] Could not reset browser state for {browser.key}: {e}")
+            return False
+
+    def _quit(self, browser):
+        self._quit_driver(browser.driver)
+
+    def _quit_driver(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[⚠️] Error closing browser: {e}")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Adaptive click engine for the page objects.
+
+Buttons on the SolutionInn pages are often covered by accordions, overlays or
+sticky headers, so the page objects walk a ladder of click strategies. Each
+failed rung costs an exception round-trip. The engine remembers which strategy
+worked per (page, device profile, locator) and tries the historical winner
+first. Counts are kept in memory during the run and merged into an on-disk
+stats file once at session end (save()), under a file lock so parallel
+pytest-xdist workers add to each other's counts instead of overwriting them.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from core.file_lock import locked
+from core.waits import animation_finished, dom_quiet, scroll_into_view
+
+CLICK_STATS_PATH = os.getenv("CLICK_STATS_FILE", ".cache/click_stats.json")
+
+# Default ladder, cheapest and most realistic first
+DEFAULT_STRATEGIES = (
+    "native",
+    "javascript",
+    "close_accordion",
+    "force_dispatch",
+    "remove_blockers",
+)
+
+
+def get_device_profile(driver):
+    """Device name set by the browser pool, or a viewport-based fallback"""
+    device = getattr(driver, "device_name", None)
+    if device:
+        return device
+    try:
+        width = driver.execute_script("return window.innerWidth;")
+    except Exception:
+        return "unknown"
+    if width < 768:
+        return "mobile"
+    if width <= 1024:
+        return "tablet"
+    return "desktop"
+
+
+def merge_counts(target, counts):
+    """Add nested {key: {name: {counter: n}}} counts into target"""
+    for key, entries in counts.items():
+        for name, stats in entries.items():
+            merged = target.setdefault(key, {}).setdefault(name, {})
+            for counter, value in stats.items():
+                merged[counter] = merged.get(counter, 0) + value
+    return target
+
+
+def merge_stats_file(stats_path, counts):
+    """Add counts into the JSON stats file at stats_path; returns the merged stats
+
+    Holds an exclusive lock for the read-modify-write so concurrent workers
+    don't lose each other's counts.
+    """
+    stats_path = Path(stats_path)
+    with locked(stats_path.with_suffix(".lock")):
+        try:
+            with open(stats_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        merge_counts(stats, counts)
+        tmp_path = stats_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, stats_path)
+    return stats
+
+
+class ClickEngine:
+    """Clicks elements using the historically most successful strategy first"""
+
+    def __init__(self, stats_path=CLICK_STATS_PATH):
+        self.stats_path = Path(stats_path)
+        self._lock = threading.Lock()
+        self.counters = {"clicks": 0, "hits": 0, "misses": 0, "failed_attempts": 0}
+        self.history = self._load()
+        # Counts recorded since the last save()
+        self._unsaved = {}
+        self.strategies = {
+            "native": self._click_native,
+            "javascript": self._click_javascript,
+            "close_accordion": self._click_after_closing_accordion,
+            "force_dispatch": self._click_force_dispatch,
+            "remove_blockers": self._click_after_removing_blockers,
+        }
+
+    def click(
+        self,
+        driver,
+        locator,
+        page,
+        label=None,
+        strategies=None,
+        timeout=10,
+        element=None,
+    ):
+        """Click the element at locator (a (By, value) tuple); returns the strategy used
+
+        element is the already-resolved element (e.g. LocatorMatch.element);
+        the strategies use it directly and only fall back to finding locator
+        again once it has gone stale.
+        """
+        label = label or locator[1]
+        key = f"{page}|{get_device_profile(driver)}|{locator[0]}={locator[1]}"
+        ordered = self._order(key, strategies or DEFAULT_STRATEGIES)
+
+        # The first rung may wait for the element; later rungs only re-find it
+        if element is None:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located(locator)
+            )
+
+        last_error = None
+        for attempt, name in enumerate(ordered):
+            try:
+                try:
+                    self.strategies[name](driver, locator, element)
+                except StaleElementReferenceException:
+                    if element is None:
+                        raise
+                    # The page re-rendered since the element was resolved
+                    element = None
+                    self.strategies[name](driver, locator, None)
+            except Exception as e:
+                last_error = e
+                self._record(key, name, False)
+                print(f"[⚠️] {name} click failed for '{label}': {type(e).__name__}")
+                continue
+
+            self._record(key, name, True, first_try=attempt == 0)
+            print(f"[✅] Clicked '{label}' using {name} strategy")
+            return name
+
+        raise Exception(f"All click strategies failed for '{label}'") from last_error
+
+    def summary(self):
+        """Counters for the current process"""
+        with self._lock:
+            counters = dict(self.counters)
+        clicks = counters["clicks"] or 1
+        counters["hit_rate"] = round(counters["hits"] / clicks, 3)
+        return counters
+
+    # ----------------------
+    # Strategies
+    # ----------------------
+    def _find(self, driver, locator, element=None):
+        return element if element is not None else driver.find_element(*locator)
+
+    def _click_native(self, driver, locator, element=None):
+        mark = element if element is not None else locator
+        element = WebDriverWait(driver, 2).until(EC.element_to_be_clickable(mark))
+        scroll_into_view(driver, element)
+        element.click()
+
+    def _click_javascript(self, driver, locator, element=None):
+        driver.execute_script(
+            "arguments[0].click();", self._find(driver, locator, element)
+        )
+
+    def _click_after_closing_accordion(self, driver, locator, element=None):
+        closed = driver.execute_script(
+            """
+            let closed = 0;
+            const accordions = '.accordion.step-heading, [class*="accordion"]';
+            document.querySelectorAll(accordions).forEach(function(el) {
+                const expanded = /\\b(active|open)\\b/.test(el.className);
+                if (el.offsetParent !== null && expanded) {
+                    el.click();
+                    closed++;
+                }
+            });
+            return closed;
+            """
+        )
+        if closed:
+            animation_finished(driver)
+        element = self._find(driver, locator, element)
+        scroll_into_view(driver, element)
+        element.click()
+
+    def _click_force_dispatch(self, driver, locator, element=None):
+        driver.execute_script(
+            """
+            arguments[0].scrollIntoView({block: 'center', inline: 'center'});
+            arguments[0].focus();
+            arguments[0].dispatchEvent(new MouseEvent('click', {
+                bubbles: true,
+                cancelable: true,
+                view: window
+            }));
+            """,
+            self._find(driver, locator, element),
+        )
+
+    def _click_after_removing_blockers(self, driver, locator, element=None):
+        driver.execute_script(
+            """
+            const blockers = '.modal, .overlay, .popup, .tooltip, .dropdown-menu';
+            document.querySelectorAll(blockers).forEach(function(el) {
+                el.style.display = 'none';
+            });
+            arguments[0].style.zIndex = '9999';
+            arguments[0].style.position = 'relative';
+            arguments[0].click();
+            """,
+            self._find(driver, locator, element),
+        )
+        dom_quiet(driver, quiet_ms=150, timeout=1)
+
+    # ----------------------
+    # Stats
+    # ----------------------
+    def _order(self, key, strategies):
+        """Sort strategies by past success rate, keeping the default order on ties"""
+        with self._lock:
+            entry = self.history.get(key, {})
+
+        def score(item):
+            index, name = item
+            stats = entry.get(name)
+            if not stats:
+                return (0.0, 0, index)
+            total = stats["success"] + stats["failure"]
+            return (-stats["success"] / total, -stats["success"], index)
+
+        return [name for _, name in sorted(enumerate(strategies), key=score)]
+
+    def _record(self, key, strategy, success, first_try=False):
+        outcome = {"success": int(success), "failure": int(not success)}
+        with self._lock:
+            merge_counts(self.history, {key: {strategy: outcome}})
+            merge_counts(self._unsaved, {key: {strategy: outcome}})
+            if not success:
+                self.counters["failed_attempts"] += 1
+                return
+            self.counters["clicks"] += 1
+            self.counters["hits" if first_try else "misses"] += 1
+
+    def save(self):
+        """Merge this process's new counts into the stats file (once per session)"""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        if not unsaved:
+            return
+        try:
+            stats = merge_stats_file(self.stats_path, unsaved)
+        except OSError as e:
+            print(f"[WARNING] Could not save click stats: {e}")
+            with self._lock:
+                merge_counts(self._unsaved, unsaved)
+            return
+        with self._lock:
+            # Pick up other workers' counts plus anything recorded meanwhile
+            self.history = merge_counts(stats, self._unsaved)
+
+    def _load(self):
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+# Global click engine instance
+click_engine = ClickEngine()
@@ -54,9 +54,11 @@ PAYMENT_TOGGLE_SELECTORS = [
 
 # ---------- Join Now Button Selectors ----------
 JOIN_NOW_BUTTON_SELECTORS = [
+    "#submit_btn_checkout",
     "//button[contains(text(), 'Join Now')]",
     "//button[contains(text(), 'join now')]",
     "//input[@value='Join Now']",
+    "button[type='submit']",
 ]
 
 # ---------- Form Field IDs ----------
@@ -74,6 +76,20 @@ SUBMIT_BUTTON_ID = "submit_btn_checkout"
 EXPIRY_MONTH_IDS = ["cc_expiry_month", "cc-exp-month", "cc_exp_month"]
 EXPIRY_YEAR_IDS = ["cc_expiry_year", "cc-exp-year", "cc_exp_year"]
 
+# ---------- One Time Plan Card Selectors ----------
+ONE_TIME_PLAN_CARD_SELECTORS = [
+    "//div[contains(@class,'one-time')]//button[normalize-space()='Buy solution']",
+    "//div[contains(@class,'one-time')]//button[normalize-space()='View Solution']",
+    "//div[contains(@class,'one-time')]//button[@type='button']",
+    "//div[contains(@class,'one-time')]//button[contains(@class,'btn')]",
+    "//button[contains(@class,'one-time') and normalize-space()='Buy solution']",
+    "//button[contains(@class,'one-time') and normalize-space()='View Solution']",
+    # Fallback to more specific selectors
+    "//div[@class='plans-card-header' and contains(.,'one-time')]//button",
+    "//div[@class='plans-card-header' and contains(.,'One Time')]//button",
+    "//div[@class='plans-card-header' and contains(.,'one time')]//button",
+]
+
 # ---------- One Time Plan Fallback Selectors ----------
 ONE_TIME_PLAN_FALLBACK_SELECTORS = [
     "//button[contains(@class,'new-btn-blue-area activate_button')]",
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Device emulation through the Chrome DevTools Protocol.
+
+Applying metrics, user agent, touch and pixel ratio on a running browser lets
+one Chrome process serve every entry of get_device_list() back-to-back instead
+of relaunching with different mobileEmulation options.
+"""
+
+# Device profiles used by the test matrix. Desktop has no profile: it runs with
+# the browser's native metrics and user agent.
+DEVICE_PROFILES = {
+    "iPhone X": {
+        "width": 375,
+        "height": 812,
+        "pixelRatio": 3.0,
+        "mobile": True,
+        "touch": True,
+        "platform": "iPhone",
+        "userAgent": (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 11_0 like Mac OS X) "
+            "AppleWebKit/604.1.38 (KHTML, like Gecko) Version/11.0 Mobile/15A372 "
+            "Safari/604.1"
+        ),
+    },
+    "iPad Pro": {
+        "width": 1024,
+        "height": 1366,
+        "pixelRatio": 2.0,
+        "mobile": True,
+        "touch": True,
+        "platform": "iPad",
+        "userAgent": (
+            "Mozilla/5.0 (iPad; CPU OS 11_0 like Mac OS X) AppleWebKit/604.1.34 "
+            "(KHTML, like Gecko) Version/11.0 Mobile/15A5341f Safari/604.1"
+        ),
+    },
+    "Pixel 4": {
+        "width": 411,
+        "height": 823,
+        "pixelRatio": 2.75,
+        "mobile": True,
+        "touch": True,
+        "platform": "Linux armv8l",
+        "userAgent": (
+            "Mozilla/5.0 (Linux; Android 10; Pixel 4) AppleWebKit/537.36 (KHTML, like "
+            "Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+    },
+    "Samsung Galaxy S21": {
+        "width": 360,
+        "height": 800,
+        "pixelRatio": 3.0,
+        "mobile": True,
+        "touch": True,
+        "platform": "Linux armv8l",
+        "userAgent": (
+            "Mozilla/5.0 (Linux; Android 12; SM-G991B) AppleWebKit/537.36 (KHTML, like "
+            "Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+    },
+    "Samsung Galaxy S20": {
+        "width": 360,
+        "height": 800,
+        "pixelRatio": 3.0,
+        "mobile": True,
+        "touch": True,
+        "platform": "Linux armv8l",
+        "userAgent": (
+            "Mozilla/5.0 (Linux; Android 11; SM-G981B) AppleWebKit/537.36 (KHTML, like "
+            "Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+    },
+    "Samsung Galaxy S10": {
+        "width": 360,
+        "height": 640,
+        "pixelRatio": 3.0,
+        "mobile": True,
+        "touch": True,
+        "platform": "Linux armv8l",
+        "userAgent": (
+            "Mozilla/5.0 (Linux; Android 10; SM-G973F) AppleWebKit/537.36 (KHTML, like "
+            "Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+    },
+}
+
+GENERIC_SAMSUNG_PROFILE = {
+    "width": 360,
+    "height": 800,
+    "pixelRatio": 3.0,
+    "mobile": True,
+    "touch": True,
+    "platform": "Linux armv8l",
+    "userAgent": (
+        "Mozilla/5.0 (Linux; Android 12; Samsung Galaxy) AppleWebKit/537.36 (KHTML, "
+        "like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+    ),
+}
+
+GENERIC_MOBILE_PROFILE = {
+    "width": 375,
+    "height": 812,
+    "pixelRatio": 3.0,
+    "mobile": True,
+    "touch": True,
+    "platform": "iPhone",
+    "userAgent": (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 "
+        "(KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1"
+    ),
+}
+
+DESKTOP_RESOLUTION = (1920, 1080)
+
+
+def get_device_profile(device):
+    """Get the emulation profile for a device name (None for desktop)"""
+    if device == "desktop":
+        return None
+    if device in DEVICE_PROFILES:
+        return DEVICE_PROFILES[device]
+    if "Samsung Galaxy" in device:
+        return GENERIC_SAMSUNG_PROFILE
+    return GENERIC_MOBILE_PROFILE
+
+
+def get_default_resolution(device):
+    """Get the nominal resolution for a device name"""
+    profile = get_device_profile(device)
+    if profile is None:
+        return f"{DESKTOP_RESOLUTION[0]}x{DESKTOP_RESOLUTION[1]}"
+    return f"{profile['width']}x{profile['height']}"
+
+
+def get_mobile_emulation_option(device):
+    """Build the legacy mobileEmulation launch option for a device"""
+    profile = get_device_profile(device)
+    if profile is None:
+        return None
+    return {
+        "deviceMetrics": {
+            "width": profile["width"],
+            "height": profile["height"],
+            "pixelRatio": profile["pixelRatio"],
+            "touch": profile["touch"],
+        },
+        "userAgent": profile["userAgent"],
+    }
+
+
+def apply_device_emulation(driver, device, native_user_agent=None):
+    """Switch a live browser tab to the given device profile via CDP"""
+    profile = get_device_profile(device)
+
+    if profile is None:
+        # Desktop: drop every override and restore the browser's own user agent
+        driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+        driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+        driver.execute_cdp_cmd(
+            "Emulation.setEmitTouchEventsForMouse", {"enabled": False}
+        )
+        if native_user_agent:
+            driver.execute_cdp_cmd(
+                "Emulation.setUserAgentOverride", {"userAgent": native_user_agent}
+            )
+        try:
+            driver.set_window_size(*DESKTOP_RESOLUTION)
+        except Exception:
+            pass
+        print("[INFO] Emulating desktop")
+        return
+
+    driver.execute_cdp_cmd(
+        "Emulation.setDeviceMetricsOverride",
+        {
+            "width": profile["width"],
+            "height": profile["height"],
+            "deviceScaleFactor": profile["pixelRatio"],
+            "mobile": profile["mobile"],
+            "screenWidth": profile["width"],
+            "screenHeight": profile["height"],
+        },
+    )
+    driver.execute_cdp_cmd(
+        "Emulation.setUserAgentOverride",
+        {"userAgent": profile["userAgent"], "platform": profile["platform"]},
+    )
+    driver.execute_cdp_cmd(
+        "Emulation.setTouchEmulationEnabled",
+        {"enabled": profile["touch"], "maxTouchPoints": 5 if profile["touch"] else 0},
+    )
+    driver.execute_cdp_cmd(
+        "Emulation.setEmitTouchEventsForMouse",
+        {"enabled": profile["touch"], "configuration": "mobile"},
+    )
+    size = f"{profile['width']}x{profile['height']}"
+    print(f"[INFO] Emulating {device}: {size} @{profile['pixelRatio']}x")
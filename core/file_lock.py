@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Exclusive file locks shared by the pytest-xdist workers.
+
+The account pool and the click/selector stats files are read, changed and
+written back by several processes at once. Holding an exclusive lock on a
+sidecar ``.lock`` file around the read-modify-write keeps one worker from
+overwriting another's changes. Uses fcntl, or msvcrt on Windows.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def lock_file(lock_file):
+    """Block until this process holds the exclusive lock on an open file"""
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        lock_file.seek(0)
+        while True:
+            # LK_LOCK gives up with OSError after about 10 seconds
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+
+def unlock_file(lock_file):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked(lock_path):
+    """Hold the exclusive lock on lock_path (created if missing) for the block"""
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as f:
+        lock_file(f)
+        try:
+            yield
+        finally:
+            unlock_file(f)
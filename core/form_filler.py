@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Bulk form filling in a single browser round trip.
+
+Filling a checkout field by field costs a scroll script, clear(), send_keys,
+a commit wait and a get_attribute read per field. fill_form sends a whole
+{field_id: value} mapping to the page in one execute_async_script call, sets
+each value through the native value setter, dispatches input/change/blur and
+reads the values back once the page's handlers have run. Only fields the page
+rejects (missing, disabled, or rewritten by a mask) are typed again with key
+events.
+"""
+
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from core.key_input import type_text, typing_backend_for
+from core.waits import scroll_into_view, wait_tracker
+
+_FILL_FORM_JS = """
+const fields = arguments[0];
+const timeout = arguments[1];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const normalise = (v) => String(v == null ? '' : v).replace(/[\\s-]/g, '');
+
+function setNativeValue(el, value) {
+    const proto = el instanceof HTMLTextAreaElement
+        ? HTMLTextAreaElement.prototype
+        : HTMLInputElement.prototype;
+    const setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    setter.call(el, value);
+}
+
+function fill() {
+    const results = {};
+    Object.keys(fields).forEach(function(id) {
+        const el = document.getElementById(id);
+        if (!el) {
+            results[id] = {status: 'missing', value: null};
+            return;
+        }
+        if (el.disabled || el.readOnly) {
+            results[id] = {status: 'rejected', value: el.value};
+            return;
+        }
+        el.focus();
+        setNativeValue(el, '');
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        setNativeValue(el, fields[id]);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        el.dispatchEvent(new Event('blur', {bubbles: true}));
+        el.blur();
+        results[id] = {status: 'pending', value: null};
+    });
+    // Give masks and validators a couple of frames before reading back
+    setTimeout(function() {
+        Object.keys(results).forEach(function(id) {
+            if (results[id].status !== 'pending') return;
+            const value = document.getElementById(id).value;
+            const ok = normalise(value) === normalise(fields[id]);
+            results[id] = {status: ok ? 'ok' : 'rejected', value: value};
+        });
+        done(results);
+    }, 32);
+}
+
+function waitForFields() {
+    const missing = Object.keys(fields).some(id => !document.getElementById(id));
+    if (!missing || performance.now() - started > timeout) return fill();
+    setTimeout(waitForFields, 50);
+}
+waitForFields();
+"""
+
+
+def type_into_field(driver, field_id, value, delay_per_key=False, timeout=10):
+    """Fill one field through key events and wait for the value to commit"""
+    field = WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.ID, field_id))
+    )
+    scroll_into_view(driver, field)
+    field.clear()
+    return type_text(
+        driver,
+        field,
+        value,
+        backend=typing_backend_for(field_id, per_key=delay_per_key),
+    )
+
+
+def fill_form(driver, fields, per_key=(), timeout=10):
+    """Fill and verify a {field_id: value} form in one script call.
+
+    Fields the page rejects are retried with key-event typing; ids listed in
+    per_key use the per-key typing backend on that retry. Returns a dict mapping
+    each field id to "ok", "typed" or "failed".
+    """
+    start = time.time()
+    try:
+        results = driver.execute_async_script(
+            _FILL_FORM_JS, dict(fields), int(timeout * 1000)
+        )
+    except Exception as e:
+        print(f"[⚠️] Bulk form fill failed: {type(e).__name__} – {e}")
+        results = {}
+    wait_tracker.record_condition(
+        "fill_form",
+        time.time() - start,
+        all(r.get("status") == "ok" for r in results.values()) and bool(results),
+    )
+
+    outcome = {}
+    for field_id, value in fields.items():
+        result = results.get(field_id, {"status": "missing", "value": None})
+        if result["status"] == "ok":
+            outcome[field_id] = "ok"
+            continue
+
+        print(
+            f"[⚠️] Field {field_id} {result['status']} by bulk fill "
+            f"(got {result['value']!r}), typing it instead"
+        )
+        try:
+            typed = type_into_field(
+                driver, field_id, value, delay_per_key=field_id in per_key
+            )
+            outcome[field_id] = "typed" if typed else "failed"
+        except Exception as e:
+            print(f"[❌] Error typing {field_id}: {type(e).__name__} – {e}")
+            outcome[field_id] = "failed"
+
+    failed = [field_id for field_id, status in outcome.items() if status == "failed"]
+    if failed:
+        print(f"[⚠️] Fields not confirmed after fallback: {', '.join(failed)}")
+    else:
+        typed = sum(status == "typed" for status in outcome.values())
+        print(f"[✅] Filled {len(fields)} fields ({typed} typed)")
+    return outcome
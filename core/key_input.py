@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Typing backends for text fields.
+
+Masked inputs such as the card number field need to see real key events, so
+the page objects used to call send_keys once per character. The CDP backends
+send the same events through Input.dispatchKeyEvent / Input.insertText without
+the per-key WebDriver overhead. The backend is chosen per field:
+
+- webdriver:      one send_keys call with the whole value
+- webdriver_keys: one send_keys call per character (the old behaviour)
+- cdp_keys:       keyDown/keyUp pairs per character via Input.dispatchKeyEvent
+- cdp_insert:     a single Input.insertText (fires input/beforeinput, no keydown)
+
+cdp_keys still costs two CDP round-trips per character, so per-key fields
+default to cdp_insert. type_text verifies the committed value either way and
+retypes per key when a mask rejected the inserted text.
+
+TYPING_BACKENDS overrides individual fields, e.g. "cc_num=cdp_keys,zip=webdriver".
+"""
+
+import os
+
+from core.waits import value_committed
+
+BACKENDS = ("webdriver", "webdriver_keys", "cdp_keys", "cdp_insert")
+
+# Backend for fields that previously needed delay_per_key typing
+PER_KEY_BACKEND = os.getenv("PER_KEY_TYPING_BACKEND", "cdp_insert")
+
+
+def _parse_overrides(raw):
+    overrides = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        field_id, backend = (part.strip() for part in item.split("=", 1))
+        if backend in BACKENDS:
+            overrides[field_id] = backend
+        else:
+            print(f"[WARNING] Unknown typing backend '{backend}' for {field_id}")
+    return overrides
+
+
+FIELD_BACKENDS = _parse_overrides(os.getenv("TYPING_BACKENDS", ""))
+
+
+def typing_backend_for(field_id, per_key=False):
+    """Backend for a field: explicit override, else per-key or plain WebDriver"""
+    if field_id in FIELD_BACKENDS:
+        return FIELD_BACKENDS[field_id]
+    return PER_KEY_BACKEND if per_key else "webdriver"
+
+
+def _key_event_params(char):
+    """Key identifiers for a printable character so mask scripts see keyCode/key"""
+    if char.isdigit():
+        return {"key": char, "code": f"Digit{char}", "windowsVirtualKeyCode": ord(char)}
+    if char.isalpha() and char.isascii():
+        return {
+            "key": char,
+            "code": f"Key{char.upper()}",
+            "windowsVirtualKeyCode": ord(char.upper()),
+        }
+    if char == " ":
+        return {"key": " ", "code": "Space", "windowsVirtualKeyCode": 32}
+    return {"key": char}
+
+
+def _focus(driver, element):
+    """Focus the element and put the caret at the end of its (cleared) value"""
+    driver.execute_script(
+        """
+        const el = arguments[0];
+        el.focus();
+        if (typeof el.setSelectionRange === 'function') {
+            try { el.setSelectionRange(el.value.length, el.value.length); } catch (e) {}
+        }
+        """,
+        element,
+    )
+
+
+def _type_cdp_keys(driver, element, value):
+    _focus(driver, element)
+    for char in value:
+        params = _key_event_params(char)
+        driver.execute_cdp_cmd(
+            "Input.dispatchKeyEvent",
+            {"type": "keyDown", "text": char, "unmodifiedText": char, **params},
+        )
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyUp", **params})
+
+
+def _type_cdp_insert(driver, element, value):
+    _focus(driver, element)
+    driver.execute_cdp_cmd("Input.insertText", {"text": value})
+
+
+def type_text(driver, element, value, backend="webdriver", timeout=2):
+    """Type value into an already cleared element and verify the (masked) value.
+
+    CDP backends fall back to per-key send_keys when the committed value does
+    not match. Returns True when the field ends up holding the value.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown typing backend: {backend}")
+
+    if backend == "webdriver":
+        element.send_keys(value)
+    elif backend == "webdriver_keys":
+        for char in value:
+            element.send_keys(char)
+    else:
+        try:
+            if backend == "cdp_keys":
+                _type_cdp_keys(driver, element, value)
+            else:
+                _type_cdp_insert(driver, element, value)
+        except Exception as e:
+            print(f"[⚠️] {backend} typing failed: {type(e).__name__} – {e}")
+
+    # value_committed compares ignoring the spaces/dashes masks insert
+    if value_committed(driver, element, value, timeout=timeout):
+        return True
+    if backend.startswith("cdp"):
+        actual = element.get_attribute("value")
+        print(f"[⚠️] {backend} typing left {actual!r}, retyping with WebDriver")
+        element.clear()
+        for char in value:
+            element.send_keys(char)
+        return value_committed(driver, element, value, timeout=timeout)
+    return False
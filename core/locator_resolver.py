@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Batched resolution of fallback selector lists.
+
+The page objects carry long lists of candidate XPath/CSS selectors and used to
+try them one WebDriverWait at a time, so a button matched by the eighth
+candidate cost seven timeouts first. The resolver sends the whole list to the
+browser in a single execute_async_script call, evaluates every candidate there
+and returns the first visible, clickable match together with the index that
+matched. Per-selector match statistics put the historically winning candidates
+first; like the click engine's, they are kept in memory and merged into the
+stats file once at session end (save()).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from selenium.webdriver.common.by import By
+
+from core.click_engine import get_device_profile, merge_counts, merge_stats_file
+from core.waits import wait_tracker
+
+SELECTOR_STATS_PATH = os.getenv("SELECTOR_STATS_FILE", ".cache/selector_stats.json")
+
+# Result of a successful resolve: the element, its index in the caller's list
+# and the selector string itself
+LocatorMatch = namedtuple("LocatorMatch", ["element", "index", "selector"])
+
+
+def is_xpath(selector):
+    """Selectors starting with / or ( are XPath, everything else is CSS"""
+    return selector.startswith("/") or selector.startswith("(")
+
+
+def to_locator(selector):
+    """Build a (By, value) tuple for a selector string"""
+    return (By.XPATH, selector) if is_xpath(selector) else (By.CSS_SELECTOR, selector)
+
+
+_RESOLVE_JS = """
+const selectors = arguments[0];
+const timeout = arguments[1];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+
+function candidates(selector) {
+    if (selector.startsWith('/') || selector.startsWith('(')) {
+        const snapshot = document.evaluate(
+            selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes;
+    }
+    return Array.from(document.querySelectorAll(selector));
+}
+
+function clickable(el) {
+    if (!(el instanceof Element)) return false;
+    const rect = el.getBoundingClientRect();
+    if (rect.width === 0 && rect.height === 0) return false;
+    const style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden') return false;
+    if (style.pointerEvents === 'none') return false;
+    return !el.disabled;
+}
+
+function check() {
+    const matched = [];
+    const invalid = [];
+    let winner = null;
+    selectors.forEach(function(selector, index) {
+        let nodes;
+        try {
+            nodes = candidates(selector);
+        } catch (e) {
+            invalid.push(index);
+            return;
+        }
+        const usable = nodes.find(clickable);
+        if (usable) {
+            matched.push(index);
+            if (winner === null) winner = [usable, index];
+        }
+    });
+    if (winner !== null) {
+        return done({element: winner[0], index: winner[1], matched, invalid});
+    }
+    if (performance.now() - started > timeout) {
+        return done({element: null, index: -1, matched: [], invalid});
+    }
+    setTimeout(check, 50);
+}
+check();
+"""
+
+
+class LocatorResolver:
+    """Resolves a list of fallback selectors in one browser round trip"""
+
+    def __init__(self, stats_path=SELECTOR_STATS_PATH):
+        self.stats_path = Path(stats_path)
+        self._lock = threading.Lock()
+        self.history = self._load()
+        # Counts recorded since the last save()
+        self._unsaved = {}
+
+    def resolve(self, driver, selectors, name, timeout=5):
+        """Return a LocatorMatch for the first visible, clickable candidate, or None"""
+        key = f"{name}|{get_device_profile(driver)}"
+        ordered = self._order(key, selectors)
+
+        start = time.time()
+        try:
+            result = driver.execute_async_script(
+                _RESOLVE_JS, ordered, int(timeout * 1000)
+            )
+        except Exception as e:
+            print(
+                f"[⚠️] Selector resolution for {name} failed: {type(e).__name__} – {e}"
+            )
+            result = None
+        elapsed = time.time() - start
+
+        found = bool(result and result.get("element") is not None)
+        wait_tracker.record_condition("resolve_selectors", elapsed, found)
+
+        for index in (result or {}).get("invalid", []):
+            print(f"[⚠️] Invalid selector for {name}: {ordered[index]}")
+
+        self._record(
+            key,
+            ordered,
+            matched=(result or {}).get("matched", []),
+            chosen=result["index"] if found else None,
+        )
+
+        if not found:
+            print(
+                f"[⚠️] No candidate matched for {name} "
+                f"({len(selectors)} selectors, {elapsed:.2f}s)"
+            )
+            return None
+
+        selector = ordered[result["index"]]
+        index = selectors.index(selector)
+        position = f"{index + 1}/{len(selectors)}"
+        print(f"[✅] Resolved {name} with selector {position}: {selector}")
+        return LocatorMatch(result["element"], index, selector)
+
+    # ----------------------
+    # Stats
+    # ----------------------
+    def _order(self, key, selectors):
+        """Put the selectors that won most often first, keeping list order on ties"""
+        with self._lock:
+            entry = self.history.get(key, {})
+
+        def score(item):
+            index, selector = item
+            stats = entry.get(selector, {})
+            return (-stats.get("chosen", 0), -stats.get("matched", 0), index)
+
+        # Duplicates would make index lookups ambiguous
+        unique = list(dict.fromkeys(selectors))
+        return [selector for _, selector in sorted(enumerate(unique), key=score)]
+
+    def _record(self, key, ordered, matched, chosen):
+        counts = {
+            key: {
+                selector: {
+                    "evaluated": 1,
+                    "matched": int(index in matched),
+                    "chosen": int(index == chosen),
+                }
+                for index, selector in enumerate(ordered)
+            }
+        }
+        with self._lock:
+            merge_counts(self.history, counts)
+            merge_counts(self._unsaved, counts)
+
+    def save(self):
+        """Merge this process's new counts into the stats file (once per session)"""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        if not unsaved:
+            return
+        try:
+            stats = merge_stats_file(self.stats_path, unsaved)
+        except OSError as e:
+            print(f"[WARNING] Could not save selector stats: {e}")
+            with self._lock:
+                merge_counts(self._unsaved, unsaved)
+            return
+        with self._lock:
+            # Pick up other workers' counts plus anything recorded meanwhile
+            self.history = merge_counts(stats, self._unsaved)
+
+    def _load(self):
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+# Global resolver instance
+locator_resolver = LocatorResolver()
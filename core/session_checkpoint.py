@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Authenticated-session checkpoints for the membership flows.
+
+Every membership test registers a brand-new user before it reaches the plan
+it actually tests. A checkpoint snapshots cookies plus local and session
+storage after a named step (normally signup) so later flows can restore the
+signed-in session and go straight to plan selection. Snapshots expire after
+SESSION_CHECKPOINT_TTL seconds, and a snapshot the site rejects is discarded
+and the full flow runs instead. A checkpointed account can buy a plan only
+once, so the page objects call spend_checkpoint before submitting an order.
+
+Checkpoints are opt-in: set USE_SESSION_CHECKPOINTS=true. With USE_ACCOUNT_POOL=true
+a pre-registered account from core.account_pool is tried first.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+
+from core.account_pool import USE_ACCOUNT_POOL, account_pool
+from core.constants import EMAIL_FIELD_ID
+from core.waits import page_ready, wait_until
+
+USE_SESSION_CHECKPOINTS = (
+    os.getenv("USE_SESSION_CHECKPOINTS", "false").lower() == "true"
+)
+CHECKPOINT_DIR = os.getenv("SESSION_CHECKPOINT_DIR", ".cache/session_checkpoints")
+CHECKPOINT_TTL_SECONDS = int(os.getenv("SESSION_CHECKPOINT_TTL", "1800"))
+
+# Shown once the signed-in user opens the plan popup
+PLAN_CARD_CSS = ".plans-card-header"
+
+_SNAPSHOT_STORAGE_JS = """
+function dump(storage) {
+    const data = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        data[key] = storage.getItem(key);
+    }
+    return data;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_RESTORE_STORAGE_JS = """
+const snapshot = arguments[0];
+window.localStorage.clear();
+window.sessionStorage.clear();
+const load = (storage, values) => Object.keys(values)
+    .forEach(k => storage.setItem(k, values[k]));
+load(window.localStorage, snapshot.local);
+load(window.sessionStorage, snapshot.session);
+"""
+
+# Keys WebDriver's add_cookie accepts
+_COOKIE_KEYS = (
+    "name",
+    "value",
+    "path",
+    "domain",
+    "secure",
+    "httpOnly",
+    "expiry",
+    "sameSite",
+)
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _checkpoint_path(name, origin):
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{name}_{urlparse(origin).netloc}")
+    return Path(CHECKPOINT_DIR) / f"{slug}.json"
+
+
+def take_snapshot(driver):
+    """Cookies and web storage of the current origin as a JSON-serialisable dict"""
+    return {
+        "origin": _origin(driver.current_url),
+        "url": driver.current_url,
+        "created_at": time.time(),
+        "cookies": driver.get_cookies(),
+        "storage": driver.execute_script(_SNAPSHOT_STORAGE_JS),
+    }
+
+
+def apply_snapshot(driver, snapshot):
+    """Load a snapshot into the browser and reload; the browser must be on its origin"""
+    driver.delete_all_cookies()
+    for cookie in snapshot["cookies"]:
+        cookie = {k: v for k, v in cookie.items() if k in _COOKIE_KEYS}
+        if cookie.get("expiry") and cookie["expiry"] < time.time():
+            continue
+        driver.add_cookie(cookie)
+    driver.execute_script(_RESTORE_STORAGE_JS, snapshot["storage"])
+    driver.refresh()
+    page_ready(driver)
+
+
+def save_checkpoint(driver, name):
+    """Snapshot cookies and web storage for the current origin under name"""
+    snapshot = {"name": name, **take_snapshot(driver)}
+    path = _checkpoint_path(name, snapshot["origin"])
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+        cookies = len(snapshot["cookies"])
+        print(f"[💾] Saved session checkpoint '{name}' ({cookies} cookies)")
+    except OSError as e:
+        print(f"[WARNING] Could not save session checkpoint '{name}': {e}")
+    return path
+
+
+def discard_checkpoint(driver, name):
+    """Delete the checkpoint for name on the current origin"""
+    path = _checkpoint_path(name, _origin(driver.current_url))
+    try:
+        path.unlink()
+        print(f"[🗑️] Discarded session checkpoint '{name}'")
+    except OSError:
+        pass
+
+
+def restore_checkpoint(driver, name, ttl=CHECKPOINT_TTL_SECONDS):
+    """Load a fresh checkpoint into the browser; returns False if none is usable.
+
+    The browser must already be on a page of the checkpoint's origin.
+    """
+    origin = _origin(driver.current_url)
+    path = _checkpoint_path(name, origin)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    age = time.time() - snapshot.get("created_at", 0)
+    if age > ttl:
+        print(f"[⌛] Session checkpoint '{name}' is {int(age)}s old, ignoring it")
+        discard_checkpoint(driver, name)
+        return False
+
+    try:
+        apply_snapshot(driver, snapshot)
+    except Exception as e:
+        print(
+            f"[⚠️] Could not restore session checkpoint '{name}': "
+            f"{type(e).__name__} – {e}"
+        )
+        return False
+
+    print(f"[♻️] Restored session checkpoint '{name}' ({int(age)}s old)")
+    return True
+
+
+def spend_checkpoint(driver):
+    """Discard the checkpoint this session came from; call before buying a plan"""
+    name = getattr(driver, "session_checkpoint", None)
+    if name:
+        discard_checkpoint(driver, name)
+        driver.session_checkpoint = None
+
+
+def signup_form_shown(driver, timeout=10):
+    """After opening the plan popup: True if the site asks for registration"""
+    wait_until(
+        driver,
+        lambda d: d.find_elements(By.CSS_SELECTOR, PLAN_CARD_CSS)
+        or any(e.is_displayed() for e in d.find_elements(By.ID, EMAIL_FIELD_ID)),
+        timeout=timeout,
+        name="signup_or_plans",
+    )
+    return any(e.is_displayed() for e in driver.find_elements(By.ID, EMAIL_FIELD_ID))
+
+
+def _restore_pooled_account(driver, page):
+    """Sign in with a pre-registered account from the pool; True on success"""
+    account_pool.start_replenisher()
+    account = account_pool.lease()
+    if not account:
+        return False
+    try:
+        apply_snapshot(driver, account["session"])
+        page.click_view_solution_button()
+        accepted = not signup_form_shown(driver)
+    except Exception as e:
+        print(f"[⚠️] Could not use pooled account: {type(e).__name__} – {e}")
+        accepted = False
+
+    # Either way the account is spent: it is about to buy a plan, or the site
+    # rejected it
+    account_pool.consume(account["email"], reason="used" if accepted else "rejected")
+    if not accepted:
+        print(f"[⚠️] Pooled account {account['email']} was rejected")
+        page.open()
+    return accepted
+
+
+def sign_up_or_restore(driver, page, name="signup"):
+    """Reach the plan popup as a signed-in user.
+
+    With USE_ACCOUNT_POOL a pre-registered account is leased first. Otherwise
+    the named checkpoint is restored when enabled and still accepted by the
+    site. If neither works a new user registers through the page object and a
+    fresh checkpoint is saved. Either way the checkpoint stays valid until
+    spend_checkpoint is called. Returns True when the signup steps were skipped.
+    """
+    if USE_ACCOUNT_POOL and _restore_pooled_account(driver, page):
+        return True
+
+    restored = USE_SESSION_CHECKPOINTS and restore_checkpoint(driver, name)
+
+    page.click_view_solution_button()
+    if restored and not signup_form_shown(driver):
+        driver.session_checkpoint = name
+        return True
+    if restored:
+        print(f"[⚠️] Session checkpoint '{name}' was rejected, running full signup")
+        discard_checkpoint(driver, name)
+
+    page.enter_email()
+    page.enter_password()
+    page.enter_university()
+    page.click_signup_button()
+    if USE_SESSION_CHECKPOINTS:
+        page_ready(driver, timeout=10)
+        save_checkpoint(driver, name)
+        driver.session_checkpoint = name
+
+    page.click_view_solution_button()
+    return False
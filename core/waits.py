@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Condition-based waits shared by the page objects.
+
+Each helper blocks only until the browser reports that the condition holds
+(scroll settled, value committed, animations finished, network idle, DOM
+quiet) and gives up quietly after its timeout, so it can stand in for the
+fixed time.sleep calls the page objects used to make. Every wait is recorded
+by wait_tracker so a run can report how long each test idled versus waited on
+real conditions.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Implicit wait applied to pooled drivers. Page objects use explicit waits, and
+# a non-zero implicit wait stacks on top of every failing find_element.
+IMPLICIT_WAIT_SECONDS = float(os.getenv("IMPLICIT_WAIT_SECONDS", "0"))
+
+WAIT_REPORT_PATH = os.getenv("WAIT_REPORT_PATH", "test_reports/wait_report.json")
+
+
+class WaitTracker:
+    """Accumulates idle and condition wait time per test"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = None
+        self.tests = {}
+
+    def start_test(self, test_id):
+        with self._lock:
+            self._current = test_id
+            self.tests[test_id] = {
+                "idle_seconds": 0.0,
+                "condition_seconds": 0.0,
+                "conditions_met": 0,
+                "conditions_timed_out": 0,
+                "by_condition": {},
+            }
+
+    def end_test(self):
+        with self._lock:
+            test_id, self._current = self._current, None
+            return self.tests.get(test_id)
+
+    def record_idle(self, seconds):
+        with self._lock:
+            entry = self.tests.get(self._current)
+            if entry is not None:
+                entry["idle_seconds"] += seconds
+
+    def record_condition(self, name, seconds, met):
+        with self._lock:
+            entry = self.tests.get(self._current)
+            if entry is None:
+                return
+            entry["condition_seconds"] += seconds
+            entry["conditions_met" if met else "conditions_timed_out"] += 1
+            bucket = entry["by_condition"].setdefault(
+                name, {"count": 0, "seconds": 0.0, "timed_out": 0}
+            )
+            bucket["count"] += 1
+            bucket["seconds"] += seconds
+            if not met:
+                bucket["timed_out"] += 1
+
+    def summary(self):
+        """Totals across every tracked test"""
+        with self._lock:
+            idle = sum(t["idle_seconds"] for t in self.tests.values())
+            waited = sum(t["condition_seconds"] for t in self.tests.values())
+            timed_out = sum(t["conditions_timed_out"] for t in self.tests.values())
+            return {
+                "tests": len(self.tests),
+                "idle_seconds": round(idle, 3),
+                "condition_seconds": round(waited, 3),
+                "conditions_timed_out": timed_out,
+            }
+
+    def write_report(self, path=WAIT_REPORT_PATH):
+        """Write the per-test wait report as JSON"""
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            tests = {
+                test_id: {
+                    **entry,
+                    "idle_seconds": round(entry["idle_seconds"], 3),
+                    "condition_seconds": round(entry["condition_seconds"], 3),
+                }
+                for test_id, entry in self.tests.items()
+            }
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "tests": tests}, f, indent=2)
+        return report_path
+
+
+# Global tracker instance
+wait_tracker = WaitTracker()
+
+
+def pause(seconds):
+    """Unconditional sleep, recorded as idle time (retry back-off and similar)"""
+    time.sleep(seconds)
+    wait_tracker.record_idle(seconds)
+
+
+def _run_async_condition(driver, name, script, timeout, *args):
+    """Run a promise-style condition script in the page and record the wait"""
+    start = time.time()
+    met = False
+    try:
+        met = bool(driver.execute_async_script(script, int(timeout * 1000), *args))
+    except Exception:
+        met = False
+    wait_tracker.record_condition(name, time.time() - start, met)
+    return met
+
+
+def wait_until(driver, predicate, timeout=5, poll=0.05, name="custom"):
+    """Poll a Python predicate until it returns truthy; returns False on timeout"""
+    start = time.time()
+    met = False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(predicate)
+        met = True
+    except Exception:
+        met = False
+    wait_tracker.record_condition(name, time.time() - start, met)
+    return met
+
+
+_SCROLL_SETTLED_JS = """
+const timeout = arguments[0];
+const element = arguments[1];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const position = () => {
+    if (!element) return Math.round(window.scrollY) + ':' + Math.round(window.scrollX);
+    const rect = element.getBoundingClientRect();
+    return Math.round(rect.top) + ':' + Math.round(rect.left);
+};
+let last = position();
+let stableTicks = 0;
+function check() {
+    const now = position();
+    stableTicks = now === last ? stableTicks + 1 : 0;
+    last = now;
+    if (stableTicks >= 3) return done(true);
+    if (performance.now() - started > timeout) return done(false);
+    setTimeout(check, 16);
+}
+setTimeout(check, 16);
+"""
+
+
+def scroll_settled(driver, element=None, timeout=2):
+    """Wait until the window (or an element's position) stops moving"""
+    return _run_async_condition(
+        driver, "scroll_settled", _SCROLL_SETTLED_JS, timeout, element
+    )
+
+
+def scroll_into_view(driver, element, smooth=False, timeout=2):
+    """Scroll an element to the centre of the viewport and wait for it to settle"""
+    behavior = "smooth" if smooth else "auto"
+    driver.execute_script(
+        "arguments[0].scrollIntoView("
+        "{block: 'center', inline: 'center', behavior: arguments[1]});",
+        element,
+        behavior,
+    )
+    return scroll_settled(driver, element, timeout)
+
+
+_VALUE_COMMITTED_JS = """
+const timeout = arguments[0];
+const element = arguments[1];
+const expected = arguments[2];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const normalise = (v) => String(v == null ? '' : v).replace(/[\\s-]/g, '');
+let last = null;
+let stableTicks = 0;
+function check() {
+    const value = element.value;
+    const matches = expected === null
+        ? value !== ''
+        : normalise(value) === normalise(expected);
+    stableTicks = matches && value === last ? stableTicks + 1 : 0;
+    last = value;
+    if (stableTicks >= 2) return done(true);
+    if (performance.now() - started > timeout) return done(false);
+    setTimeout(check, 16);
+}
+setTimeout(check, 16);
+"""
+
+
+def value_committed(driver, element, expected=None, timeout=2):
+    """Wait until an input stably holds the expected value, ignoring mask spacing"""
+    return _run_async_condition(
+        driver, "value_committed", _VALUE_COMMITTED_JS, timeout, element, expected
+    )
+
+
+_ANIMATION_FINISHED_JS = """
+const timeout = arguments[0];
+const element = arguments[1];
+const done = arguments[arguments.length - 1];
+const source = element || document;
+const animations = source.getAnimations
+    ? source.getAnimations(element ? {subtree: true} : undefined)
+    : [];
+const running = animations.filter(a => a.playState === 'running'
+    && a.effect && a.effect.getTiming().iterations !== Infinity);
+if (!running.length) return done(true);
+const timer = setTimeout(() => done(false), timeout);
+Promise.all(running.map(a => a.finished.catch(() => null))).then(() => {
+    clearTimeout(timer);
+    done(true);
+});
+"""
+
+
+def animation_finished(driver, element=None, timeout=3):
+    """Wait for running CSS/Web animations (on an element or the page) to finish"""
+    return _run_async_condition(
+        driver, "animation_finished", _ANIMATION_FINISHED_JS, timeout, element
+    )
+
+
+_NETWORK_IDLE_JS = """
+const timeout = arguments[0];
+const idleMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+let lastCount = -1;
+let quietSince = performance.now();
+function busy() {
+    if (document.readyState !== 'complete') return true;
+    if (window.jQuery && window.jQuery.active > 0) return true;
+    return false;
+}
+function check() {
+    const count = performance.getEntriesByType('resource').length;
+    const now = performance.now();
+    if (count !== lastCount || busy()) {
+        lastCount = count;
+        quietSince = now;
+    }
+    if (now - quietSince >= idleMs) return done(true);
+    if (now - started > timeout) return done(false);
+    setTimeout(check, 50);
+}
+check();
+"""
+
+
+def network_idle(driver, timeout=10, idle_ms=500):
+    """Wait until the document is loaded and no new requests started for idle_ms"""
+    return _run_async_condition(
+        driver, "network_idle", _NETWORK_IDLE_JS, timeout, idle_ms
+    )
+
+
+_DOM_QUIET_JS = """
+const timeout = arguments[0];
+const quietMs = arguments[1];
+const done = arguments[arguments.length - 1];
+let timer = null;
+let finished = false;
+const observer = new MutationObserver(() => {
+    clearTimeout(timer);
+    timer = setTimeout(finish, quietMs, true);
+});
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(deadline);
+    done(result);
+}
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+timer = setTimeout(finish, quietMs, true);
+const deadline = setTimeout(finish, timeout, false);
+"""
+
+
+def dom_quiet(driver, quiet_ms=300, timeout=5):
+    """Wait until the DOM has had no mutations for quiet_ms"""
+    return _run_async_condition(driver, "dom_quiet", _DOM_QUIET_JS, timeout, quiet_ms)
+
+
+def page_ready(driver, timeout=15):
+    """Wait for a freshly loaded page: network idle, then DOM quiet
+
+    Both waits always run, so a page whose network never idles (analytics
+    beacons, long polling) still gets its DOM settled before the caller acts.
+    """
+    idle = network_idle(driver, timeout=timeout)
+    quiet = dom_quiet(driver, timeout=timeout)
+    return idle and quiet
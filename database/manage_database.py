@@ -33,34 +33,55 @@ class DatabaseManager:
             print(f"❌ Error showing tables: {e}")
             return []
 
-    def show_table_data(self, table_name, limit=10):
-        """Show data from a specific table"""
+    def _stream_rows(self, query, params=()):
+        """Yield query rows as the server sends them (unbuffered cursor)"""
+        cursor = self.db_helper.conn.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(100)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            try:
+                cursor.fetchall()
+            except Exception:
+                pass
+            cursor.close()
+
+    def show_table_data(self, table_name, limit=10, before_id=None):
+        """Show rows from a table, newest first, optionally from before an id"""
         try:
             # Get table structure
             self.db_helper.cursor.execute(f"DESCRIBE {table_name}")
             columns = self.db_helper.cursor.fetchall()
+            column_names = [col["Field"] for col in columns]
 
             print(f"\n📊 Table: {table_name}")
             print("=" * 60)
 
-            # Get data
-            self.db_helper.cursor.execute(
-                f"SELECT * FROM {table_name} ORDER BY id DESC LIMIT {limit}"
-            )
-            rows = self.db_helper.cursor.fetchall()
-
-            if not rows:
-                print("No data found in this table.")
-                return
+            # Keyset paging on id: an older page costs the same as the newest one
+            if "id" in column_names:
+                where = "WHERE id < %s" if before_id else ""
+                params = (before_id, limit) if before_id else (limit,)
+                query = f"SELECT * FROM {table_name} {where} ORDER BY id DESC LIMIT %s"
+            else:
+                query = f"SELECT * FROM {table_name} LIMIT %s"
+                params = (limit,)
 
             # Print column headers
-            column_names = [col["Field"] for col in columns]
             header = " | ".join(f"{name[:15]:<15}" for name in column_names)
-            print(header)
-            print("-" * len(header))
 
             # Print data rows
-            for row in rows:
+            shown = 0
+            last_id = None
+            for row in self._stream_rows(query, params):
+                if not shown:
+                    print(header)
+                    print("-" * len(header))
+                shown += 1
+                last_id = row.get("id")
                 row_data = []
                 for col in column_names:
                     value = row[col]
@@ -73,7 +94,16 @@ class DatabaseManager:
                     row_data.append(f"{value[:15]:<15}")
                 print(" | ".join(row_data))
 
-            print(f"\nTotal rows: {len(rows)}")
+            if not shown:
+                print("No data found in this table.")
+                return
+
+            print(f"\nTotal rows: {shown}")
+            if shown == limit and last_id is not None:
+                print(
+                    f"⏪ Older rows: python manage_database.py view {table_name} "
+                    f"{limit} --before {last_id}"
+                )
 
         except Exception as e:
             print(f"❌ Error showing table data: {e}")
@@ -107,11 +137,20 @@ class DatabaseManager:
         except Exception as e:
             print(f"❌ Error showing database summary: {e}")
 
-    def search_data(self, table_name, search_term, column=None):
-        """Search for data in a table"""
+    def search_data(
+        self, table_name, search_term, column=None, limit=50, before_id=None
+    ):
+        """Search for data in a table, newest matches first, one page at a time"""
+        if table_name == "test_results" and column in (
+            "error_message",
+            "error_summary",
+        ):
+            # Error text has a full-text index; don't LIKE-scan it
+            self.search_errors(search_term, limit)
+            return
         try:
             if column:
-                query = f"SELECT * FROM {table_name} WHERE {column} LIKE %s"
+                conditions = f"{column} LIKE %s"
                 params = (f"%{search_term}%",)
             else:
                 # Search in all text columns
@@ -128,29 +167,65 @@ class DatabaseManager:
                     return
 
                 conditions = " OR ".join([f"{col} LIKE %s" for col in text_columns])
-                query = f"SELECT * FROM {table_name} WHERE {conditions}"
                 params = tuple([f"%{search_term}%"] * len(text_columns))
 
-            self.db_helper.cursor.execute(query, params)
-            results = self.db_helper.cursor.fetchall()
+            # Walk the primary key newest first and stop after one page of
+            # matches instead of collecting every match of the scan
+            query = f"SELECT * FROM {table_name} WHERE ({conditions})"
+            if before_id:
+                query += " AND id < %s"
+                params += (before_id,)
+            query += " ORDER BY id DESC LIMIT %s"
+            params += (limit,)
 
             print(f"\n🔍 Search Results for '{search_term}' in {table_name}:")
             print("=" * 60)
 
+            shown = 0
+            last_id = None
+            for row in self._stream_rows(query, params):
+                shown += 1
+                last_id = row.get("id")
+                print(f"\nResult {shown}:")
+                for key, value in row.items():
+                    if value is not None:
+                        print(f"  {key}: {value}")
+
+            if not shown:
+                print("No results found.")
+                return
+
+            print(f"\nTotal results: {shown}")
+            if shown == limit:
+                print(f"⏪ More results: add --before {last_id}")
+
+        except Exception as e:
+            print(f"❌ Error searching data: {e}")
+
+    def search_errors(self, search_term, limit=20):
+        """Ranked full-text search over test_results error messages"""
+        try:
+            results = self.db_helper.search_errors(search_term, limit=limit)
+
+            print(f"\n🔍 Error Search Results for '{search_term}':")
+            print("=" * 60)
+
             if not results:
                 print("No results found.")
                 return
 
             for i, row in enumerate(results, 1):
-                print(f"\nResult {i}:")
-                for key, value in row.items():
-                    if value is not None:
-                        print(f"  {key}: {value}")
+                print(f"\nResult {i} (score {float(row['score']):.2f}):")
+                print(f"  id: {row['id']}")
+                print(f"  test_case_name: {row['test_case_name']}")
+                print(f"  module_name: {row['module_name']}")
+                print(f"  test_datetime: {row['test_datetime']}")
+                print(f"  snippet: {row['snippet']}")
 
             print(f"\nTotal results: {len(results)}")
 
         except Exception as e:
-            print(f"❌ Error searching data: {e}")
+            print(f"❌ Error searching error messages: {e}")
 
     def insert_sample_data(self):
         """Insert sample data into tables"""
@@ -263,8 +338,8 @@ Usage: python manage_database.py [command] [options]
 Commands:
   summary              - Show database summary
   tables               - List all tables
-  view <table> [limit] - View data from a specific table
-  search <table> <term> [column] - Search for data in a table
+  view <table> [limit] [--before ID] - View data from a specific table, newest first
+  search <table> <term> [column] [--before ID] - Search a table (50 per page)
   sample               - Insert sample data
   help                 - Show this help message
 
@@ -272,13 +347,24 @@ Examples:
   python manage_database.py summary
   python manage_database.py tables
   python manage_database.py view users 5
+  python manage_database.py view test_results 20 --before 1200
   python manage_database.py search books "computer"
   python manage_database.py search users "john" email
+  python manage_database.py search test_results "timeout checkout" error_message
   python manage_database.py sample
 """
     )
 
 
+def before_id():
+    """Id given with --before on the command line, or None"""
+    if "--before" in sys.argv:
+        index = sys.argv.index("--before")
+        if index + 1 < len(sys.argv):
+            return int(sys.argv[index + 1])
+    return None
+
+
 def main():
     """Main function"""
     try:
@@ -307,8 +393,10 @@ def main():
                 return
 
             table_name = sys.argv[2]
-            limit = int(sys.argv[3]) if len(sys.argv) > 3 else 10
-            manager.show_table_data(table_name, limit)
+            limit = (
+                int(sys.argv[3]) if len(sys.argv) > 3 and sys.argv[3].isdigit() else 10
+            )
+            manager.show_table_data(table_name, limit, before_id())
 
         elif command == "search":
             if len(sys.argv) < 4:
@@ -319,8 +407,10 @@ def main():
 
             table_name = sys.argv[2]
             search_term = sys.argv[3]
-            column = sys.argv[4] if len(sys.argv) > 4 else None
-            manager.search_data(table_name, search_term, column)
+            column = (
+                sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != "--before" else None
+            )
+            manager.search_data(table_name, search_term, column, before_id=before_id())
 
         elif command == "sample":
             manager.insert_sample_data()
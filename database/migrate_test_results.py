@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
 """
 Migration Script: Import test_results table from old database to new database
+
+The old table is split into primary-key ranges (chunks) that worker threads
+copy in parallel, each over its own pair of connections. A chunk is read with
+an unbuffered cursor and written with executemany batches, so memory use is
+bounded by the batch size however large the table is.
+
+Progress is kept in a migration_checkpoints table in the new database. A
+chunk is marked done only after its row count and checksum match on both
+sides; an interrupted or failed run picks up the chunks that are not done.
+
+Migrated rows carry result_key 'm' + the zero-padded old id, which keeps them
+apart from rows written by the test pipeline and lets a chunk be located (and
+re-copied) in the new table without relying on its ids.
+
+Usage:
+    python migrate_test_results.py [--workers N] [--chunk-size N] [--batch-size N]
+                                   [--restart]
 """
 
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import mysql.connector
-from datetime import datetime
 
 # Old database configuration
 OLD_DB_CONFIG = {
@@ -22,13 +43,67 @@ NEW_DB_CONFIG = {
     "database": "solutioninn_testing",
 }
 
+JOB_NAME = "test_results"
+CHUNK_SIZE = 50000  # ids per chunk
+BATCH_SIZE = 1000  # rows per executemany
+WORKERS = 4
+
+# Columns copied as they are; id is replaced by result_key on the new side
+MIGRATED_COLUMNS = [
+    "test_case_name",
+    "module_name",
+    "test_status",
+    "test_datetime",
+    "error_message",
+    "error_summary",
+    "total_time_duration",
+    "device_name",
+    "screen_resolution",
+    "error_link",
+    "created_at",
+]
+
+# Same expression on both sides, so equal chunks give equal checksums
+ROW_CHECKSUM = "CRC32(CONCAT_WS('|', {}))".format(
+    ", ".join(f"IFNULL({column}, '<null>')" for column in MIGRATED_COLUMNS)
+)
+
+CHECKPOINT_TABLE = """
+CREATE TABLE IF NOT EXISTS migration_checkpoints (
+    job_name VARCHAR(64) NOT NULL,
+    chunk_start INT NOT NULL,
+    chunk_end INT NOT NULL COMMENT 'Exclusive',
+    status ENUM('pending', 'done', 'mismatch', 'failed') NOT NULL DEFAULT 'pending',
+    source_rows INT NULL,
+    target_rows INT NULL,
+    source_checksum BIGINT UNSIGNED NULL,
+    target_checksum BIGINT UNSIGNED NULL,
+    seconds DECIMAL(10,3) NULL,
+    error VARCHAR(500) NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_name, chunk_start)
+)
+"""
+
+
+def migration_key(old_id):
+    """result_key of the migrated copy of old row old_id"""
+    return f"m{old_id:031d}"
+
 
 class TestResultsMigrator:
-    def __init__(self):
+    def __init__(self, workers=WORKERS, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
         self.old_conn = None
         self.new_conn = None
         self.old_cursor = None
         self.new_cursor = None
+        # Worker connections, one pair per thread
+        self._local = threading.local()
+        self._worker_conns = []
+        self._conns_lock = threading.Lock()
 
     def connect_to_databases(self):
         """Connect to both old and new databases"""
@@ -49,7 +124,7 @@ class TestResultsMigrator:
             return False
 
     def create_test_results_table_in_new_db(self):
-        """Create the test_results table in the new database"""
+        """Create test_results and migration_checkpoints in the new database"""
         create_table_query = """
         CREATE TABLE IF NOT EXISTS test_results (
             id INT AUTO_INCREMENT PRIMARY KEY,
@@ -59,16 +134,43 @@ class TestResultsMigrator:
             test_datetime DATETIME NOT NULL,
             error_message TEXT,
             error_summary VARCHAR(255),
-            total_time_duration DECIMAL(10,3) NULL COMMENT 'Test execution time in seconds',
+            total_time_duration DECIMAL(10,3) NULL
+                COMMENT 'Test execution time in seconds',
             device_name VARCHAR(50) NULL COMMENT 'Device type (mobile/desktop/tablet)',
-            screen_resolution VARCHAR(50) NULL COMMENT 'Screen resolution (e.g., 1920x1080, 375x812)',
-            error_link VARCHAR(500) NULL COMMENT 'URL link to screenshot showing affected screen',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            screen_resolution VARCHAR(50) NULL
+                COMMENT 'Screen resolution (e.g., 1920x1080, 375x812)',
+            error_link VARCHAR(500) NULL
+                COMMENT 'URL link to screenshot showing affected screen',
+            result_key CHAR(32) NULL
+                COMMENT 'Idempotency key from the local result spool',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_test_results_result_key (result_key)
         )
         """
         try:
             self.new_cursor.execute(create_table_query)
             self.new_conn.commit()
+            # Tables created before result_key existed get it here
+            self.new_cursor.execute(
+                """
+                SELECT COLUMN_NAME
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'test_results'
+                AND COLUMN_NAME = 'result_key'
+            """
+            )
+            if not self.new_cursor.fetchall():
+                self.new_cursor.execute(
+                    "ALTER TABLE test_results ADD COLUMN result_key CHAR(32) NULL "
+                    "COMMENT 'Idempotency key from the local result spool' "
+                    "AFTER error_link, "
+                    "ADD UNIQUE KEY uq_test_results_result_key (result_key)"
+                )
+                self.new_conn.commit()
+                print("✅ Added result_key column to test_results table")
+            self.new_cursor.execute(CHECKPOINT_TABLE)
+            self.new_conn.commit()
             print("✅ Test results table created in new database")
             return True
         except Exception as e:
@@ -96,72 +198,269 @@ class TestResultsMigrator:
         try:
             self.old_cursor.execute("SELECT COUNT(*) as count FROM test_results")
             result = self.old_cursor.fetchone()
-            return result['count'] if result else 0
+            return result["count"] if result else 0
         except Exception as e:
             print(f"❌ Error getting old table count: {e}")
             return 0
 
-    def migrate_data(self, batch_size=1000):
-        """Migrate data from old database to new database in batches"""
+    # ----------------------
+    # Checkpoints
+    # ----------------------
+    def plan_chunks(self, restart=False):
+        """Record the id ranges of the old table; returns the chunks still to copy"""
+        if restart:
+            self.new_cursor.execute(
+                "DELETE FROM migration_checkpoints WHERE job_name = %s", (JOB_NAME,)
+            )
+            self.new_conn.commit()
+            print("🔄 Checkpoints cleared, migrating every chunk again")
+
+        self.old_cursor.execute(
+            "SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM test_results"
+        )
+        bounds = self.old_cursor.fetchone()
+        if bounds["min_id"] is None:
+            return []
+
+        # Aligned to chunk_size, so a resumed run plans the same ranges
+        first = bounds["min_id"] - bounds["min_id"] % self.chunk_size
+        chunks = [
+            (JOB_NAME, start, start + self.chunk_size)
+            for start in range(first, bounds["max_id"] + 1, self.chunk_size)
+        ]
+        self.new_cursor.executemany(
+            "INSERT IGNORE INTO migration_checkpoints "
+            "(job_name, chunk_start, chunk_end) VALUES (%s, %s, %s)",
+            chunks,
+        )
+        self.new_conn.commit()
+
+        self.new_cursor.execute(
+            """
+            SELECT chunk_start, chunk_end
+            FROM migration_checkpoints
+            WHERE job_name = %s AND status <> 'done'
+            ORDER BY chunk_start
+        """,
+            (JOB_NAME,),
+        )
+        pending = [
+            (row["chunk_start"], row["chunk_end"]) for row in self.new_cursor.fetchall()
+        ]
+        print(
+            f"📋 {len(chunks)} chunk(s) of {self.chunk_size} ids, "
+            f"{len(chunks) - len(pending)} already done"
+        )
+        return pending
+
+    def _save_checkpoint(self, new_conn, chunk_start, status, stats, error=None):
+        cursor = new_conn.cursor()
         try:
-            # Get total count
-            total_records = self.get_old_table_count()
-            print(f"📊 Total records to migrate: {total_records}")
+            cursor.execute(
+                """
+                UPDATE migration_checkpoints
+                SET status = %s, source_rows = %s, target_rows = %s,
+                    source_checksum = %s, target_checksum = %s, seconds = %s, error = %s
+                WHERE job_name = %s AND chunk_start = %s
+            """,
+                (
+                    status,
+                    stats.get("source_rows"),
+                    stats.get("target_rows"),
+                    stats.get("source_checksum"),
+                    stats.get("target_checksum"),
+                    stats.get("seconds"),
+                    error[:500] if error else None,
+                    JOB_NAME,
+                    chunk_start,
+                ),
+            )
+            new_conn.commit()
+        finally:
+            cursor.close()
 
-            if total_records == 0:
-                print("ℹ️ No records to migrate")
-                return True
+    # ----------------------
+    # Workers
+    # ----------------------
+    def _worker_connections(self):
+        """This thread's (old, new) connections, opened on first use"""
+        if getattr(self._local, "conns", None) is None:
+            old_conn = mysql.connector.connect(**OLD_DB_CONFIG)
+            new_conn = mysql.connector.connect(**NEW_DB_CONFIG)
+            self._local.conns = (old_conn, new_conn)
+            with self._conns_lock:
+                self._worker_conns.extend(self._local.conns)
+        return self._local.conns
 
-            # Get all records from old database
-            self.old_cursor.execute("SELECT * FROM test_results ORDER BY id")
-            
-            migrated_count = 0
-            batch_count = 0
+    @staticmethod
+    def _chunk_summary(cursor, query, args):
+        cursor.execute(query, args)
+        count, checksum = cursor.fetchall()[0]
+        return int(count), int(checksum or 0)
 
+    def migrate_chunk(self, chunk_start, chunk_end):
+        """Copy old ids [chunk_start, chunk_end) and verify them; returns the stats"""
+        old_conn, new_conn = self._worker_connections()
+        start = time.time()
+        low_key, high_key = migration_key(chunk_start), migration_key(chunk_end)
+        columns = ", ".join(MIGRATED_COLUMNS)
+        insert_query = (
+            f"INSERT INTO test_results ({columns}, result_key) "
+            f"VALUES ({', '.join(['%s'] * (len(MIGRATED_COLUMNS) + 1))})"
+        )
+
+        new_cursor = new_conn.cursor()
+        # Unbuffered: rows come from the server as fetchmany asks for them
+        old_cursor = old_conn.cursor(buffered=False)
+        try:
+            # Rows left by an interrupted attempt are copied again from scratch
+            new_cursor.execute(
+                "DELETE FROM test_results WHERE result_key >= %s AND result_key < %s",
+                (low_key, high_key),
+            )
+            new_conn.commit()
+
+            old_cursor.execute(
+                f"SELECT id, {columns} FROM test_results "
+                "WHERE id >= %s AND id < %s ORDER BY id",
+                (chunk_start, chunk_end),
+            )
+            copied = 0
             while True:
-                batch = self.old_cursor.fetchmany(batch_size)
+                batch = old_cursor.fetchmany(self.batch_size)
                 if not batch:
                     break
+                new_cursor.executemany(
+                    insert_query, [(*row[1:], migration_key(row[0])) for row in batch]
+                )
+                new_conn.commit()
+                copied += len(batch)
+        except Exception:
+            new_conn.rollback()
+            raise
+        finally:
+            try:
+                old_cursor.fetchall()
+            except Exception:
+                pass
+            old_cursor.close()
+
+        # Verify the chunk on both sides
+        old_cursor = old_conn.cursor()
+        try:
+            source_rows, source_checksum = self._chunk_summary(
+                old_cursor,
+                f"SELECT COUNT(*), SUM({ROW_CHECKSUM}) FROM test_results "
+                "WHERE id >= %s AND id < %s",
+                (chunk_start, chunk_end),
+            )
+            target_rows, target_checksum = self._chunk_summary(
+                new_cursor,
+                f"SELECT COUNT(*), SUM({ROW_CHECKSUM}) FROM test_results "
+                "WHERE result_key >= %s AND result_key < %s",
+                (low_key, high_key),
+            )
+        finally:
+            old_cursor.close()
+            new_cursor.close()
+
+        stats = {
+            "copied": copied,
+            "source_rows": source_rows,
+            "target_rows": target_rows,
+            "source_checksum": source_checksum,
+            "target_checksum": target_checksum,
+            "seconds": round(time.time() - start, 3),
+        }
+        verified = (source_rows, source_checksum) == (target_rows, target_checksum)
+        self._save_checkpoint(
+            new_conn, chunk_start, "done" if verified else "mismatch", stats
+        )
+        stats["verified"] = verified
+        return stats
+
+    def _run_chunk(self, chunk_start, chunk_end):
+        try:
+            return self.migrate_chunk(chunk_start, chunk_end)
+        except Exception as e:
+            # Recorded so the next run retries the chunk; the pool carries on
+            try:
+                _, new_conn = self._worker_connections()
+                self._save_checkpoint(new_conn, chunk_start, "failed", {}, str(e))
+            except Exception:
+                pass
+            raise
+
+    def migrate_data(self, restart=False):
+        """Migrate the pending chunks with parallel workers"""
+        try:
+            total_records = self.get_old_table_count()
+            print(f"📊 Total records to migrate: {total_records}")
+
+            if total_records == 0:
+                print("ℹ️ No records to migrate")
+                return True
 
-                batch_count += 1
-                print(f"📦 Processing batch {batch_count} ({len(batch)} records)...")
+            pending = self.plan_chunks(restart)
+            if not pending:
+                print("ℹ️ Every chunk is already migrated and verified")
+                return True
 
-                # Insert batch into new database
-                for record in batch:
+            print(
+                f"🚀 Migrating {len(pending)} chunk(s) with {self.workers} worker(s), "
+                f"{self.batch_size} rows per batch"
+            )
+            start = time.time()
+            migrated_count = 0
+            failed = 0
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="migrate"
+            ) as executor:
+                futures = {
+                    executor.submit(self._run_chunk, chunk_start, chunk_end): (
+                        chunk_start,
+                        chunk_end,
+                    )
+                    for chunk_start, chunk_end in pending
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    chunk_start, chunk_end = futures[future]
+                    label = f"ids {chunk_start}-{chunk_end - 1}"
                     try:
-                        insert_query = """
-                        INSERT INTO test_results (
-                            test_case_name, module_name, test_status, test_datetime,
-                            error_message, error_summary, total_time_duration,
-                            device_name, screen_resolution, error_link, created_at
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """
-                        
-                        self.new_cursor.execute(insert_query, (
-                            record['test_case_name'],
-                            record['module_name'],
-                            record['test_status'],
-                            record['test_datetime'],
-                            record.get('error_message'),
-                            record.get('error_summary'),
-                            record.get('total_time_duration'),
-                            record.get('device_name'),
-                            record.get('screen_resolution'),
-                            record.get('error_link'),
-                            record.get('created_at', datetime.now())
-                        ))
-                        
-                        migrated_count += 1
+                        stats = future.result()
                     except Exception as e:
-                        print(f"❌ Error migrating record {record.get('id', 'unknown')}: {e}")
+                        failed += 1
+                        print(f"❌ [{done}/{len(pending)}] Chunk {label} failed: {e}")
                         continue
+                    migrated_count += stats["copied"]
+                    if stats["verified"]:
+                        print(
+                            f"✅ [{done}/{len(pending)}] Chunk {label}: "
+                            f"{stats['copied']} rows in {stats['seconds']:.1f}s"
+                        )
+                    else:
+                        failed += 1
+                        print(
+                            f"❌ [{done}/{len(pending)}] Chunk {label} does not match: "
+                            f"{stats['source_rows']} -> {stats['target_rows']} rows, "
+                            f"checksum {stats['source_checksum']} -> "
+                            f"{stats['target_checksum']}"
+                        )
 
-                # Commit batch
-                self.new_conn.commit()
-                print(f"✅ Batch {batch_count} completed. Total migrated: {migrated_count}")
-
-            print(f"🎉 Migration completed! {migrated_count}/{total_records} records migrated")
-            return migrated_count == total_records
+            elapsed = time.time() - start
+            rate = migrated_count / elapsed if elapsed else 0
+            print(
+                f"📊 Copied {migrated_count} records in {elapsed:.1f}s "
+                f"({rate:.0f} rows/s)"
+            )
+            if failed:
+                print(
+                    f"⚠️ {failed} chunk(s) not verified; "
+                    "run the migration again to retry them"
+                )
+                return False
+            print("🎉 Migration completed! Every chunk verified")
+            return True
 
         except Exception as e:
             print(f"❌ Error during migration: {e}")
@@ -171,30 +470,62 @@ class TestResultsMigrator:
     def verify_migration(self):
         """Verify that the migration was successful"""
         try:
-            # Check record count in new database
-            self.new_cursor.execute("SELECT COUNT(*) as count FROM test_results")
-            new_count = self.new_cursor.fetchone()['count']
-            
+            # Migrated rows are the ones with an 'm' result_key
+            self.new_cursor.execute(
+                "SELECT COUNT(*) as count FROM test_results "
+                "WHERE result_key >= %s AND result_key < %s",
+                (migration_key(0), "n"),
+            )
+            new_count = self.new_cursor.fetchone()["count"]
+
             # Check record count in old database
             old_count = self.get_old_table_count()
-            
-            print(f"\n📊 Migration Verification:")
+
+            self.new_cursor.execute(
+                """
+                SELECT status, COUNT(*) AS chunks
+                FROM migration_checkpoints
+                WHERE job_name = %s
+                GROUP BY status
+            """,
+                (JOB_NAME,),
+            )
+            chunks = {
+                row["status"]: row["chunks"] for row in self.new_cursor.fetchall()
+            }
+
+            print("\n📊 Migration Verification:")
             print(f"   Old database records: {old_count}")
-            print(f"   New database records: {new_count}")
-            
-            if new_count == old_count:
+            print(f"   Migrated records in new database: {new_count}")
+            print(
+                "   Chunks: "
+                + ", ".join(
+                    f"{count} {status}" for status, count in sorted(chunks.items())
+                )
+            )
+
+            if new_count == old_count and set(chunks) <= {"done"}:
                 print("✅ Migration verification successful!")
                 return True
             else:
-                print("❌ Migration verification failed - record counts don't match")
+                print(
+                    "❌ Migration verification failed - "
+                    "record counts or chunk checksums don't match"
+                )
                 return False
-                
+
         except Exception as e:
             print(f"❌ Error during verification: {e}")
             return False
 
     def close_connections(self):
         """Close all database connections"""
+        for conn in self._worker_conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._worker_conns = []
         if self.old_cursor:
             self.old_cursor.close()
         if self.new_cursor:
@@ -206,48 +537,69 @@ class TestResultsMigrator:
         print("🔌 Database connections closed")
 
 
+def option_value(name, default):
+    """Integer value following --name in the command line"""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return int(sys.argv[index + 1])
+    return default
+
+
 def main():
     """Main migration function"""
     print("🚀 Starting test_results table migration...")
     print("=" * 60)
-    
-    migrator = TestResultsMigrator()
-    
+
+    migrator = TestResultsMigrator(
+        workers=option_value("--workers", WORKERS),
+        chunk_size=option_value("--chunk-size", CHUNK_SIZE),
+        batch_size=option_value("--batch-size", BATCH_SIZE),
+    )
+
     try:
         # Step 1: Connect to databases
         if not migrator.connect_to_databases():
             return False
-        
+
         # Step 2: Check if old table exists
         if not migrator.check_old_table_exists():
             print("❌ Cannot proceed without old test_results table")
             return False
-        
-        # Step 3: Create table in new database
+
+        # Step 3: Create tables in new database
         if not migrator.create_test_results_table_in_new_db():
             print("❌ Cannot create table in new database")
             return False
-        
+
         # Step 4: Migrate data
-        if not migrator.migrate_data():
+        if not migrator.migrate_data(restart="--restart" in sys.argv):
             print("❌ Data migration failed")
             return False
-        
+
         # Step 5: Verify migration
         if not migrator.verify_migration():
             print("❌ Migration verification failed")
             return False
-        
+
         print("\n🎉 Migration completed successfully!")
         print("✅ Your new database is now ready to use")
-        
+        print(
+            "ℹ️ Run database_scripts/add_test_category_columns.py, "
+            "add_error_signatures.py"
+        )
+        print(
+            "   and rebuild_rollups.py to classify, fingerprint and aggregate "
+            "the migrated rows"
+        )
+
     except Exception as e:
         print(f"❌ Migration failed: {e}")
         return False
-    
+
     finally:
         migrator.close_connections()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
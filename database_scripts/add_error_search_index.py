@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Script to add the full-text index over test_results error_summary/error_message
+that `python scripts/view_test_results.py search` uses
+
+On MySQL the first FULLTEXT index rebuilds test_results, so run this outside
+of test runs. On SQLite the FTS5 index is created with the database.
+"""
+
+from db.result_store import get_result_store
+
+
+def add_error_search_index():
+    """Create the error search index if it is missing"""
+    db_helper = get_result_store()
+    try:
+        if db_helper.ensure_error_search_index():
+            print("✅ Error search index added")
+        else:
+            print("ℹ️ Error search index already exists")
+
+    except Exception as e:
+        print(f"❌ Error adding error search index: {e}")
+    finally:
+        db_helper.close()
+
+
+if __name__ == "__main__":
+    add_error_search_index()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Script to add the error_signatures table and test_results.error_signature_id,
+and fingerprint the failures stored before they existed
+
+Usage:
+    python database_scripts/add_error_signatures.py [batch_size] [--compact]
+
+--compact also drops the per-row error_message of fingerprinted failures;
+readers then take it from the signature, like for new results.
+"""
+
+import sys
+
+from db.result_store import get_result_store
+
+
+def add_error_signatures(batch_size=1000, compact=False):
+    """Create the signature table/column if missing, then backfill in batches"""
+    db_helper = get_result_store()
+    try:
+        # Creates error_signatures and adds error_signature_id when they are missing
+        db_helper.create_test_results_table()
+
+        updated = db_helper.backfill_error_signatures(batch_size, compact)
+        if updated:
+            print(f"✅ Fingerprinted {updated} failed test result(s)")
+        else:
+            print("ℹ️ All failed test results already have an error signature")
+
+    except Exception as e:
+        print(f"❌ Error fingerprinting test results: {e}")
+    finally:
+        db_helper.close()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--compact"]
+    add_error_signatures(int(args[0]) if args else 1000, "--compact" in sys.argv)
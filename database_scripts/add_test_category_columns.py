@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script to add test_category/plan_type columns to existing test_results table
+and classify the rows stored before they existed
+"""
+
+import sys
+
+from db.result_store import get_result_store
+
+
+def add_test_category_columns(batch_size=1000):
+    """Add the category columns if missing, then backfill them in batches"""
+    db_helper = get_result_store()
+    try:
+        # Adds the columns and idx_test_results_category when they are missing
+        db_helper.create_test_results_table()
+
+        updated = db_helper.backfill_test_categories(batch_size)
+        if updated:
+            print(f"✅ Classified {updated} existing test result(s)")
+        else:
+            print("ℹ️ All test results already have a test_category")
+
+    except Exception as e:
+        print(f"❌ Error backfilling test categories: {e}")
+    finally:
+        db_helper.close()
+
+
+if __name__ == "__main__":
+    add_test_category_columns(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
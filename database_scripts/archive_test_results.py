@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Script to archive test_results months older than the retention window and
+keep the next months' partitions ready
+
+Each archived month is moved out of test_results as a whole, either into its
+own compressed table (EXCHANGE PARTITION) or, with --export, into a gzip'ed
+JSONL file under TEST_RESULTS_ARCHIVE_DIR, and its partition is dropped.
+test_results must be partitioned (TEST_RESULTS_PARTITIONING=true and schema
+migration 006).
+
+Usage:
+    python database_scripts/archive_test_results.py [retention_months] [--export [dir]]
+"""
+
+import sys
+
+from db.db_helper import MySQLHelper
+from db.partitions import (
+    ARCHIVE_DIR,
+    RETENTION_MONTHS,
+    archive_partitions,
+    ensure_partitions,
+)
+
+
+def archive_test_results(
+    retention_months=RETENTION_MONTHS, export=False, archive_dir=ARCHIVE_DIR
+):
+    """Archive old months and add upcoming partitions; returns those archived"""
+    db_helper = MySQLHelper()
+    try:
+        if not db_helper.is_partitioned():
+            print(
+                "❌ test_results is not partitioned, run: "
+                "TEST_RESULTS_PARTITIONING=true python -m db.schema_migrations apply"
+            )
+            return []
+
+        ensure_partitions(db_helper)
+        archived = archive_partitions(db_helper, retention_months, export, archive_dir)
+        if archived:
+            rows = sum(count for _, count, _ in archived)
+            print(f"✅ Archived {len(archived)} month(s), {rows} test result(s)")
+        else:
+            print(f"ℹ️ Nothing older than {retention_months} months to archive")
+        return archived
+
+    except Exception as e:
+        print(f"❌ Error archiving test results: {e}")
+        return []
+    finally:
+        db_helper.close()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    export = "--export" in sys.argv
+    archive_test_results(
+        int(args[0]) if args else RETENTION_MONTHS,
+        export,
+        args[1] if export and len(args) > 1 else ARCHIVE_DIR,
+    )
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Script to time the viewer queries on a synthetic test_results table, before
+and after the indexes db.query_advisor proposes
+
+A scratch SQLite database is filled with synthetic results (40 modules, 3
+devices, 180 days, about 12% failures and skips), given the indexes
+test_results had before schema migration 007, and every workload query is
+timed. The advisor's proposals are then created, the indexes it reports as
+redundant dropped, and the queries timed again. The proposals are checked
+against QUERY_INDEXES, the indexes migration 007 adds.
+
+On MySQL, python -m db.query_advisor advise shows the plans of the real data.
+
+Usage:
+    python database_scripts/benchmark_query_indexes.py [rows] [--path FILE]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from db.query_advisor import advise, print_advice, time_query, workload
+from db.result_store import QUERY_INDEXES, REPLACED_INDEXES, classify_test
+from db.sqlite_helper import SQLiteHelper
+
+ROWS = 1_000_000
+SCRATCH_PATH = ".cache/index_benchmark.sqlite3"
+INSERT_BATCH_SIZE = 10_000
+DAYS = 180
+SEED = 25
+
+MODULES = [f"module_{number:02d}" for number in range(40)]
+DEVICES = ["desktop", "mobile", "tablet"]
+STATUSES = ["PASSED", "FAILED", "SKIPPED", "ERROR"]
+STATUS_WEIGHTS = [88, 6, 3, 3]
+ERRORS = [
+    "TimeoutException: element #checkout-button not clickable after 30s",
+    "AssertionError: expected order total 49.99, got 0.00",
+    "NoSuchElementException: element .plan-card[data-plan=monthly] not found",
+    "StaleElementReferenceException: element is not attached to the page document",
+    "WebDriverException: timeout waiting for page load",
+]
+SIGNATURES = 200
+
+
+def fill_test_results(helper, rows):
+    """Insert rows synthetic results, oldest first, and their error signatures"""
+    rng = random.Random(SEED)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=DAYS)
+    helper.cursor.executemany(
+        "INSERT INTO error_signatures "
+        "(signature, error_summary, error_message, first_seen) VALUES (%s, %s, %s, %s)",
+        [
+            (
+                f"{number:040x}",
+                ERRORS[number % len(ERRORS)][:60],
+                ERRORS[number % len(ERRORS)],
+                start,
+            )
+            for number in range(1, SIGNATURES + 1)
+        ],
+    )
+    # Few modules run most of the tests
+    module_weights = [1 / (rank + 1) for rank in range(len(MODULES))]
+    step = DAYS * 86400 / rows
+    for offset in range(0, rows, INSERT_BATCH_SIZE):
+        batch = []
+        for number in range(offset, min(offset + INSERT_BATCH_SIZE, rows)):
+            module = rng.choices(MODULES, module_weights)[0]
+            test_case_name = f"test_case_{rng.randrange(25):02d}"
+            status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+            failed = status in ("FAILED", "ERROR")
+            error = ERRORS[rng.randrange(len(ERRORS))] if failed else None
+            batch.append(
+                (
+                    test_case_name,
+                    module,
+                    status,
+                    start + timedelta(seconds=int(number * step)),
+                    error,
+                    error[:60] if error else None,
+                    round(rng.uniform(0.5, 120), 3),
+                    rng.choice(DEVICES),
+                    "1920x1080",
+                    None,
+                    f"{number:032x}",
+                    *classify_test(test_case_name, module),
+                    rng.randint(1, SIGNATURES) if failed else None,
+                )
+            )
+        helper.cursor.executemany(
+            """
+            INSERT INTO test_results (test_case_name, module_name, test_status,
+                                      test_datetime, error_message, error_summary,
+                                      total_time_duration, device_name,
+                                      screen_resolution, error_link, result_key,
+                                      test_category, plan_type, error_signature_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            batch,
+        )
+        helper.conn.commit()
+
+
+def _analyze(helper):
+    helper.cursor.execute("ANALYZE")
+    helper.conn.commit()
+    # Both rounds read the database file, not pages left in the WAL
+    helper.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    helper.cursor.fetchall()
+
+
+def benchmark_query_indexes(rows=ROWS, path=SCRATCH_PATH):
+    """Time the workload before and after the advisor's indexes.
+
+    Returns {query: (before ms, after ms)}.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        Path(path + suffix).unlink(missing_ok=True)
+    db_helper = SQLiteHelper(path)
+    try:
+        start = time.time()
+        fill_test_results(db_helper, rows)
+        print(f"[📦] {rows} synthetic result(s) in {time.time() - start:.0f}s ({path})")
+        db_helper.rebuild_rollups()
+
+        # test_results as it was before schema migration 007
+        for index, _ in QUERY_INDEXES:
+            db_helper.cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        for index, columns in REPLACED_INDEXES:
+            db_helper.cursor.execute(
+                f"CREATE INDEX {index} ON test_results ({', '.join(columns)})"
+            )
+        _analyze(db_helper)
+
+        queries = workload(db_helper)
+        print("\n🔍 Query plans before")
+        print("=" * 60)
+        findings, proposed, redundant = advise(db_helper, queries)
+        print_advice(findings, proposed, redundant)
+        before = {
+            name: time_query(db_helper, query, args) for name, query, args in queries
+        }
+
+        start = time.time()
+        for index, columns in proposed.items():
+            db_helper.cursor.execute(
+                f"CREATE INDEX {index} ON test_results ({', '.join(columns)})"
+            )
+        for index in redundant:
+            db_helper.cursor.execute(f"DROP INDEX {index}")
+        _analyze(db_helper)
+        print(f"\n[🔧] Applied the proposals in {time.time() - start:.1f}s")
+
+        print("\n🔍 Query plans after")
+        print("=" * 60)
+        print_advice(*advise(db_helper, queries))
+        after = {
+            name: time_query(db_helper, query, args) for name, query, args in queries
+        }
+
+        print(f"\n📊 Median latency over {rows} rows (ms)")
+        print("=" * 60)
+        print(f"{'Query':<22} {'Before':>10} {'After':>10} {'Speedup':>9}")
+        print("-" * 60)
+        for name, _, _ in queries:
+            speedup = before[name] / after[name] if after[name] else 0
+            timings = f"{before[name]:>10.2f} {after[name]:>10.2f}"
+            print(f"{name:<22} {timings} {speedup:>8.1f}x")
+
+        migration_indexes = {index: list(columns) for index, columns in QUERY_INDEXES}
+        replaced = [index for index, _ in REPLACED_INDEXES]
+        if proposed == migration_indexes and redundant == replaced:
+            print("\n✅ The advisor's proposals are the indexes of schema migration 007")
+        else:
+            print(
+                "\n[⚠️] The advisor's proposals differ from schema migration 007 "
+                "(result_store.QUERY_INDEXES)"
+            )
+        return {name: (before[name], after[name]) for name, _, _ in queries}
+
+    except Exception as e:
+        print(f"❌ Error benchmarking query indexes: {e}")
+        return {}
+    finally:
+        db_helper.close()
+
+
+if __name__ == "__main__":
+    path = SCRATCH_PATH
+    if "--path" in sys.argv and sys.argv.index("--path") + 1 < len(sys.argv):
+        path = sys.argv[sys.argv.index("--path") + 1]
+    args = [arg for arg in sys.argv[1:] if arg.isdigit()]
+    benchmark_query_indexes(int(args[0]) if args else ROWS, path)
@@ -1,155 +1,89 @@
 #!/usr/bin/env python3
 """
 Script to clean up test case names in the database by removing device information
-"""
-
-import re
-
-import mysql.connector
-
-from db.db_config import DB_CONFIG
-
-
-def clean_test_case_names():
-    """Clean up test case names by removing device information"""
-    try:
-        # Connect to database
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-
-        # Get all test results with device information in test case names
-        select_query = """
-        SELECT id, test_case_name 
-        FROM test_results 
-        WHERE test_case_name LIKE '%[%]%'
-        ORDER BY id
-        """
-
-        cursor.execute(select_query)
-        results = cursor.fetchall()
-
-        print(f"🔍 Found {len(results)} test results with device information in names")
-        print("=" * 60)
+and to strip package prefixes ('tests.test_', 'test.') from module names.
 
-        cleaned_count = 0
+Rows are rewritten in batches: the cleaned names of a batch of ids are loaded
+into a temporary table and applied with a single UPDATE ... JOIN (see
+ResultStore.normalise_test_names), instead of one UPDATE per row.
 
-        for result in results:
-            if isinstance(result, (list, tuple)) and len(result) >= 2:
-                test_id = int(result[0])
-                original_name = str(result[1])
-
-                # Remove device information from test case name
-                # Pattern: test_name[device] -> test_name
-                cleaned_name = re.sub(r"\[.*?\]", "", original_name)
-
-                # Remove any trailing spaces or underscores
-                cleaned_name = cleaned_name.strip(" _")
+Usage:
+    python clean_test_case_names.py [batch_size]
+"""
 
-                print(f"ID: {test_id}")
-                print(f"  Original: {original_name}")
-                print(f"  Cleaned:  {cleaned_name}")
+import sys
 
-                # Update the database
-                update_query = """
-                UPDATE test_results 
-                SET test_case_name = %s 
-                WHERE id = %s
-                """
+from db.result_store import MODULE_NAME_PREFIXES, get_result_store
 
-                cursor.execute(update_query, (cleaned_name, test_id))
-                cleaned_count += 1
 
-        # Commit the changes
-        conn.commit()
+def clean_test_case_names(batch_size=5000):
+    """Clean up test case and module names; returns the number of rows rewritten"""
+    db_helper = get_result_store()
+    try:
+        stats = db_helper.normalise_test_names(batch_size)
 
         print("=" * 60)
-        print(f"✅ Successfully cleaned {cleaned_count} test case names")
+        if stats["renamed"]:
+            rate = stats["scanned"] / stats["seconds"] if stats["seconds"] else 0
+            print(
+                f"✅ Successfully cleaned {stats['renamed']} test result(s), "
+                f"{stats['modules']} module name(s)"
+            )
+            print(
+                f"📊 Scanned {stats['scanned']} row(s) in {stats['seconds']:.1f}s "
+                f"({rate:.0f} rows/s)"
+            )
+        else:
+            print("ℹ️ All test case and module names are already clean")
 
         # Show some examples of cleaned results
-        cursor.execute(
-            """
-        SELECT test_case_name, test_status, device_name, screen_resolution 
-        FROM test_results 
-        ORDER BY id DESC 
-        LIMIT 10
-        """
-        )
-
-        recent_results = cursor.fetchall()
-
         print("\n📊 Recent test results after cleaning:")
         print("-" * 60)
-        for result in recent_results:
-            if isinstance(result, (list, tuple)) and len(result) >= 4:
-                test_name = str(result[0]) if result[0] else "unknown"
-                status = str(result[1]) if result[1] else "unknown"
-                device = str(result[2]) if result[2] else "unknown"
-                resolution = str(result[3]) if result[3] else "unknown"
-                print(
-                    f"  - {test_name}: {status} | Device: {device} | Resolution: {resolution}"
-                )
+        for result in db_helper.get_test_results(10):
+            test_name = result["test_case_name"] or "unknown"
+            status = result["test_status"] or "unknown"
+            device = result["device_name"] or "unknown"
+            resolution = result["screen_resolution"] or "unknown"
+            details = f"Device: {device} | Resolution: {resolution}"
+            print(f"  - {test_name}: {status} | {details}")
 
-        cursor.close()
-        conn.close()
-
-        return cleaned_count
+        return stats["renamed"]
 
     except Exception as e:
         print(f"❌ Error cleaning test case names: {e}")
-        if "conn" in locals():
-            conn.rollback()
-            conn.close()
         return 0
+    finally:
+        db_helper.close()
 
 
 def verify_cleanup():
-    """Verify that no test case names contain device information"""
+    """Verify that no test case or module names need cleaning"""
+    db_helper = get_result_store()
     try:
-        # Connect to database
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-
-        # Check for any remaining test case names with device information
-        check_query = """
-        SELECT COUNT(*) 
-        FROM test_results 
-        WHERE test_case_name LIKE '%[%]%'
-        """
-
-        cursor.execute(check_query)
-        count_result = cursor.fetchone()
-        count = int(count_result[0]) if count_result and count_result[0] else 0
-
-        if count == 0:
-            print(
-                "✅ Verification passed: No test case names contain device information"
-            )
-        else:
-            print(
-                f"⚠️ Warning: {count} test case names still contain device information"
-            )
-
-            # Show the problematic names
-            cursor.execute(
-                """
-            SELECT test_case_name 
-            FROM test_results 
-            WHERE test_case_name LIKE '%[%]%'
-            LIMIT 5
-            """
-            )
+        conditions = " OR ".join(
+            ["test_case_name LIKE %s"]
+            + ["module_name LIKE %s"] * len(MODULE_NAME_PREFIXES)
+        )
+        patterns = ("%[%]%", *(f"{prefix}%" for prefix in MODULE_NAME_PREFIXES))
+        db_helper.cursor.execute(
+            "SELECT test_case_name, module_name FROM test_results "
+            f"WHERE {conditions} LIMIT 5",
+            patterns,
+        )
+        problematic = db_helper.cursor.fetchall()
 
-            problematic = cursor.fetchall()
+        if not problematic:
+            print("✅ Verification passed: No test case or module names need cleaning")
+        else:
+            print("⚠️ Warning: some test case or module names still need cleaning")
             print("Problematic names:")
-            for name in problematic:
-                if isinstance(name, (list, tuple)) and len(name) > 0:
-                    print(f"  - {name[0]}")
-
-        cursor.close()
-        conn.close()
+            for row in problematic:
+                print(f"  - {row['module_name']}: {row['test_case_name']}")
 
     except Exception as e:
         print(f"❌ Error during verification: {e}")
+    finally:
+        db_helper.close()
 
 
 if __name__ == "__main__":
@@ -157,10 +91,12 @@ if __name__ == "__main__":
     print("=" * 50)
 
     # Clean the test case names
-    cleaned_count = clean_test_case_names()
+    cleaned_count = clean_test_case_names(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    )
 
     if cleaned_count > 0:
-        print(f"\n🔍 Verifying cleanup...")
+        print("\n🔍 Verifying cleanup...")
         verify_cleanup()
 
     print("\n🎉 Test case name cleanup completed!")
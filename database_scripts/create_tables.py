@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """
 Create Additional Tables Script
-Creates 4 additional tables in the test database.
+Creates 4 additional tables in the test database, and test_results
+(partitioned by month on test_datetime, see db/partitions.py) if it is missing.
 """
 
 from db.db_helper import MySQLHelper
+from db.partitions import list_partitions
+from db.schema_migrations import apply_migrations
 
 
 class TableCreator:
@@ -126,9 +129,30 @@ class TableCreator:
             self.db_helper.conn.rollback()
             return False
 
+    def create_test_results_table(self):
+        """Create the partitioned test_results table and its partitions ahead of time"""
+        try:
+            # Also adds the next months' partitions when they are missing
+            self.db_helper.create_test_results_table()
+            if not self.db_helper._table_exists("test_results"):
+                return False
+            partitions = list_partitions(self.db_helper)
+            if partitions:
+                print(f"✅ Test results table has {len(partitions)} partitions")
+            else:
+                print(
+                    "ℹ️ Test results table is not partitioned yet, "
+                    "run: python -m db.schema_migrations apply"
+                )
+            return True
+        except Exception as e:
+            print(f"❌ Error creating test results table: {e}")
+            self.db_helper.conn.rollback()
+            return False
+
     def create_all_tables(self):
-        """Create all 4 tables"""
-        print("🔧 Creating 4 additional tables in test database...")
+        """Create all 5 tables"""
+        print("🔧 Creating 5 tables in test database...")
         print("=" * 60)
 
         tables = [
@@ -136,6 +160,7 @@ class TableCreator:
             ("Books Table", self.create_books_table),
             ("Orders Table", self.create_orders_table),
             ("Subscriptions Table", self.create_subscriptions_table),
+            ("Test Results Table", self.create_test_results_table),
         ]
 
         success_count = 0
@@ -198,6 +223,9 @@ def main():
         success = creator.create_all_tables()
 
         if success:
+            # Bring tables created with older definitions up to date
+            apply_migrations(creator.db_helper)
+
             # Show table information
             creator.show_table_info()
 
@@ -2,6 +2,13 @@
 -- This file contains all table creation scripts
 
 -- Test Results Table (already created by the system)
+-- With TEST_RESULTS_PARTITIONING=true it is partitioned by month on
+-- test_datetime instead (db/partitions.py, schema migration 006): the primary
+-- and result_key keys then include test_datetime, and ft_test_results_errors
+-- is dropped as partitioned tables cannot have FULLTEXT indexes, so error
+-- search scans the months it covers for rows without an error signature.
+-- ensure_partitions then keeps the next months' partitions ready and
+-- archive_test_results.py archives and drops months past the retention window.
 CREATE TABLE IF NOT EXISTS test_results (
     id INT AUTO_INCREMENT PRIMARY KEY,
     test_case_name VARCHAR(255) NOT NULL,
@@ -14,7 +21,68 @@ CREATE TABLE IF NOT EXISTS test_results (
     device_name VARCHAR(50) NULL COMMENT 'Device type (mobile/desktop/tablet)',
     screen_resolution VARCHAR(50) NULL COMMENT 'Screen resolution (e.g., 1920x1080, 375x812)',
     error_link VARCHAR(500) NULL COMMENT 'URL link to screenshot showing affected screen',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    result_key CHAR(32) NULL COMMENT 'Idempotency key from the local result spool',
+    test_category VARCHAR(20) NULL COMMENT 'book/subscription/user/general, set by classify_test',
+    plan_type VARCHAR(20) NULL COMMENT 'Subscription plan for subscription tests',
+    error_signature_id INT NULL COMMENT 'error_signatures row of a failure',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_test_results_result_key (result_key),
+    INDEX idx_test_results_category (test_category, plan_type, test_status),
+    INDEX idx_test_results_signature (error_signature_id, test_datetime),
+    FULLTEXT INDEX ft_test_results_errors (error_summary, error_message)
+);
+
+-- Months archived out of test_results, as tables or export files
+CREATE TABLE IF NOT EXISTS test_results_archives (
+    partition_name VARCHAR(20) PRIMARY KEY,
+    range_start DATE NULL COMMENT 'NULL for p_start',
+    range_end DATE NOT NULL COMMENT 'Exclusive',
+    row_count INT NOT NULL,
+    method VARCHAR(10) NOT NULL COMMENT 'tables or export',
+    location VARCHAR(500) NOT NULL COMMENT 'Archive table or export file',
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Distinct failures; failed test_results rows reference one instead of
+-- storing their own traceback
+CREATE TABLE IF NOT EXISTS error_signatures (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    signature CHAR(40) NOT NULL COMMENT 'SHA-1 of the normalised traceback (db.error_signatures)',
+    error_summary VARCHAR(255),
+    error_message TEXT COMMENT 'First occurrence, as reported',
+    first_seen DATETIME NOT NULL,
+    UNIQUE KEY uq_error_signatures_signature (signature),
+    FULLTEXT INDEX ft_error_signatures_errors (error_summary, error_message)
+);
+
+-- Daily rollups of test_results, maintained as results are written
+-- (rebuild with database_scripts/rebuild_rollups.py)
+CREATE TABLE IF NOT EXISTS test_results_daily (
+    stat_date DATE NOT NULL,
+    module_name VARCHAR(255) NOT NULL,
+    device_name VARCHAR(50) NOT NULL DEFAULT '',
+    test_category VARCHAR(20) NOT NULL DEFAULT '',
+    plan_type VARCHAR(20) NOT NULL DEFAULT '',
+    test_status ENUM('PASSED', 'FAILED', 'SKIPPED', 'ERROR') NOT NULL,
+    result_count INT NOT NULL DEFAULT 0,
+    timed_count INT NOT NULL DEFAULT 0 COMMENT 'Results with a total_time_duration',
+    total_duration DECIMAL(14,3) NOT NULL DEFAULT 0,
+    min_duration DECIMAL(10,3) NULL,
+    max_duration DECIMAL(10,3) NULL,
+    PRIMARY KEY (stat_date, module_name, device_name, test_category, plan_type, test_status)
+);
+
+-- Duration histogram per rollup row, p95 is read from it
+CREATE TABLE IF NOT EXISTS test_results_daily_durations (
+    stat_date DATE NOT NULL,
+    module_name VARCHAR(255) NOT NULL,
+    device_name VARCHAR(50) NOT NULL DEFAULT '',
+    test_category VARCHAR(20) NOT NULL DEFAULT '',
+    plan_type VARCHAR(20) NOT NULL DEFAULT '',
+    test_status ENUM('PASSED', 'FAILED', 'SKIPPED', 'ERROR') NOT NULL,
+    bucket TINYINT UNSIGNED NOT NULL COMMENT 'Index into result_store.DURATION_BUCKETS',
+    result_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (stat_date, module_name, device_name, test_category, plan_type, test_status, bucket)
 );
 
 -- 1. Users Table
@@ -84,6 +152,16 @@ CREATE TABLE IF NOT EXISTS subscriptions (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+-- Versions applied by db/schema_migrations.py; a schema created from this
+-- file already contains every change, which the runner records as 'baseline'
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    method VARCHAR(20) NOT NULL COMMENT 'instant/inplace/copy, or baseline if already present',
+    seconds DECIMAL(10,3) NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Sample Data Insertion (Optional)
 
 -- Insert sample users
@@ -119,5 +197,7 @@ CREATE INDEX idx_orders_order_number ON orders(order_number);
 CREATE INDEX idx_orders_order_date ON orders(order_date);
 CREATE INDEX idx_subscriptions_user_id ON subscriptions(user_id);
 CREATE INDEX idx_subscriptions_status ON subscriptions(status);
-CREATE INDEX idx_test_results_datetime ON test_results(test_datetime);
-CREATE INDEX idx_test_results_status ON test_results(test_status); 
\ No newline at end of file
+CREATE INDEX idx_test_results_datetime ON test_results(test_datetime, id);
+-- Composite indexes for the viewer queries (db.query_advisor, schema migration 007)
+CREATE INDEX idx_test_results_module_device_datetime ON test_results(module_name, device_name, test_datetime);
+CREATE INDEX idx_test_results_status_datetime ON test_results(test_status, test_datetime);
\ No newline at end of file
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the daily rollup tables (test_results_daily and
+test_results_daily_durations) from test_results
+
+Usage:
+    python database_scripts/rebuild_rollups.py                  # all days
+    python database_scripts/rebuild_rollups.py 2025-07-01       # since a day
+    python database_scripts/rebuild_rollups.py 2025-07-01 2025-07-31
+"""
+
+import sys
+
+from db.result_store import get_result_store
+
+
+def rebuild_rollups(since=None, until=None):
+    """Recompute the rollups for the given days (inclusive), or for all of them"""
+    db_helper = get_result_store()
+    try:
+        # Creates the rollup tables when they are missing
+        db_helper.create_test_results_table()
+
+        rows = db_helper.rebuild_rollups(since, until)
+        period = f"{since or 'first day'} to {until or 'today'}"
+        print(f"✅ Daily rollups rebuilt for {period}: {rows} row(s)")
+
+    except Exception as e:
+        print(f"❌ Error rebuilding daily rollups: {e}")
+    finally:
+        db_helper.close()
+
+
+if __name__ == "__main__":
+    rebuild_rollups(
+        sys.argv[1] if len(sys.argv) > 1 else None,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+    )
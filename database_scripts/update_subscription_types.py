@@ -2,9 +2,11 @@
 """
 Update Subscription Types Script
 Updates the database schema to support all subscription types including three_month, popular, and onetime plans.
+The changes are schema migrations 004 and 005 (db/schema_migrations.py), applied online.
 """
 
 from db.db_helper import MySQLHelper
+from db.schema_migrations import apply_migrations
 
 
 class SubscriptionTypeUpdater:
@@ -17,12 +19,11 @@ class SubscriptionTypeUpdater:
         print("=" * 60)
 
         try:
-            # Update subscriptions table to support new types
-            self._update_subscriptions_table()
-            
-            # Update orders table to support new order types
-            self._update_orders_table()
-            
+            # Migrations 004 (subscriptions) and 005 (orders): ALTERed in place
+            # where the server can, otherwise copied in the background
+            applied = apply_migrations(self.db_helper, versions=["004", "005"])
+            if not applied:
+                print("✅ Subscription and order types were already up to date")
             print("✅ Subscription types updated successfully!")
             return True
 
@@ -31,131 +32,6 @@ class SubscriptionTypeUpdater:
             self.db_helper.conn.rollback()
             return False
 
-    def _update_subscriptions_table(self):
-        """Update subscriptions table to support new subscription types"""
-        print("📋 Updating subscriptions table...")
-        
-        try:
-            # First, let's check if we need to modify the ENUM
-            self.db_helper.cursor.execute("""
-                SELECT COLUMN_TYPE 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_SCHEMA = DATABASE() 
-                AND TABLE_NAME = 'subscriptions' 
-                AND COLUMN_NAME = 'subscription_type'
-            """)
-            
-            result = self.db_helper.cursor.fetchone()
-            if result:
-                current_enum = result['COLUMN_TYPE']
-                print(f"   Current subscription_type ENUM: {current_enum}")
-                
-                # Check if we need to update
-                if 'three_month' not in current_enum or 'popular' not in current_enum or 'onetime' not in current_enum:
-                    print("   Updating subscription_type ENUM...")
-                    
-                    # Create a temporary table with new structure
-                    self.db_helper.cursor.execute("""
-                        CREATE TABLE subscriptions_new (
-                            id INT AUTO_INCREMENT PRIMARY KEY,
-                            user_id INT NOT NULL,
-                            subscription_type ENUM('monthly', 'three_month', 'six_month', 'popular', 'onetime', 'annual') NOT NULL,
-                            status ENUM('active', 'cancelled', 'expired', 'pending') DEFAULT 'pending',
-                            start_date DATE NOT NULL,
-                            end_date DATE NOT NULL,
-                            amount DECIMAL(10,2) NOT NULL,
-                            auto_renew BOOLEAN DEFAULT FALSE,
-                            payment_method ENUM('credit_card', 'paypal') DEFAULT 'credit_card',
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                        )
-                    """)
-                    
-                    # Copy existing data
-                    self.db_helper.cursor.execute("""
-                        INSERT INTO subscriptions_new 
-                        SELECT * FROM subscriptions
-                    """)
-                    
-                    # Drop old table and rename new one
-                    self.db_helper.cursor.execute("DROP TABLE subscriptions")
-                    self.db_helper.cursor.execute("ALTER TABLE subscriptions_new RENAME TO subscriptions")
-                    
-                    print("   ✅ Subscriptions table updated with new types")
-                else:
-                    print("   ✅ Subscriptions table already supports new types")
-            else:
-                print("   ⚠️ Could not check current subscription_type structure")
-
-        except Exception as e:
-            print(f"   ❌ Error updating subscriptions table: {e}")
-            raise
-
-    def _update_orders_table(self):
-        """Update orders table to support new order types"""
-        print("📋 Updating orders table...")
-        
-        try:
-            # Check current order_type ENUM
-            self.db_helper.cursor.execute("""
-                SELECT COLUMN_TYPE 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_SCHEMA = DATABASE() 
-                AND TABLE_NAME = 'orders' 
-                AND COLUMN_NAME = 'order_type'
-            """)
-            
-            result = self.db_helper.cursor.fetchone()
-            if result:
-                current_enum = result['COLUMN_TYPE']
-                print(f"   Current order_type ENUM: {current_enum}")
-                
-                # Check if we need to update
-                if 'three_month_plan' not in current_enum or 'popular_plan' not in current_enum:
-                    print("   Updating order_type ENUM...")
-                    
-                    # Create a temporary table with new structure
-                    self.db_helper.cursor.execute("""
-                        CREATE TABLE orders_new (
-                            id INT AUTO_INCREMENT PRIMARY KEY,
-                            order_number VARCHAR(50) UNIQUE NOT NULL,
-                            user_id INT NOT NULL,
-                            book_id INT,
-                            order_type ENUM('book_purchase', 'monthly_plan', 'three_month_plan', 'six_month_plan', 'popular_plan', 'onetime_plan') NOT NULL,
-                            amount DECIMAL(10,2) NOT NULL,
-                            payment_method ENUM('credit_card', 'paypal', 'free') DEFAULT 'credit_card',
-                            payment_status ENUM('pending', 'completed', 'failed', 'refunded') DEFAULT 'pending',
-                            order_status ENUM('pending', 'processing', 'completed', 'cancelled') DEFAULT 'pending',
-                            billing_address TEXT,
-                            shipping_address TEXT,
-                            order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            completed_date TIMESTAMP NULL,
-                            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE SET NULL
-                        )
-                    """)
-                    
-                    # Copy existing data
-                    self.db_helper.cursor.execute("""
-                        INSERT INTO orders_new 
-                        SELECT * FROM orders
-                    """)
-                    
-                    # Drop old table and rename new one
-                    self.db_helper.cursor.execute("DROP TABLE orders")
-                    self.db_helper.cursor.execute("ALTER TABLE orders_new RENAME TO orders")
-                    
-                    print("   ✅ Orders table updated with new types")
-                else:
-                    print("   ✅ Orders table already supports new types")
-            else:
-                print("   ⚠️ Could not check current order_type structure")
-
-        except Exception as e:
-            print(f"   ❌ Error updating orders table: {e}")
-            raise
-
     def show_updated_schema(self):
         """Show the updated database schema"""
         print("\n📊 Updated Database Schema:")
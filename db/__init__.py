@@ -1,11 +1,25 @@
 # db package initialization
-from .db_config import get_database_config, DB_CONFIG, is_github_actions, is_local_environment
+from . import db_config
+from .db_config import get_database_config, is_github_actions, is_local_environment
 from .db_helper import MySQLHelper
+from .result_store import ResultStore, get_result_store
+from .result_writer import ResultWriter, result_writer
 
 __all__ = [
     'get_database_config',
     'DB_CONFIG', 
     'is_github_actions',
     'is_local_environment',
-    'MySQLHelper'
-] 
\ No newline at end of file
+    'MySQLHelper',
+    'ResultStore',
+    'get_result_store',
+    'ResultWriter',
+    'result_writer'
+]
+
+
+def __getattr__(name):
+    # DB_CONFIG probes the database endpoints, so resolve it only when asked for
+    if name == 'DB_CONFIG':
+        return db_config.DB_CONFIG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
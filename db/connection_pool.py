@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Process-wide MySQL connection pool.
+
+Every MySQLHelper used to open its own mysql.connector connection, and each
+handshake with the remote server costs hundreds of milliseconds. Helpers now
+check connections out of one mysql.connector.pooling pool per process and
+return them on close().
+
+The pool grows lazily up to DB_POOL_SIZE connections instead of opening all
+of them up front. A connection that sat idle for longer than
+DB_POOL_HEALTHCHECK_SECONDS is pinged on checkout and reconnected if the
+server dropped it. When every connection is busy, checkout waits up to
+DB_POOL_TIMEOUT seconds for one to be returned.
+"""
+
+import os
+import threading
+import time
+
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+from .db_config import get_database_config, invalidate_endpoint_cache
+
+POOL_NAME = "solutioninn_pool"
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+HEALTHCHECK_SECONDS = float(os.getenv("DB_POOL_HEALTHCHECK_SECONDS", "30"))
+
+_pool = None
+_lock = threading.Lock()
+_created = 0
+_last_used = {}
+_stats = {
+    "checkouts": 0,
+    "in_use": 0,
+    "max_in_use": 0,
+    "waits": 0,
+    "wait_seconds": 0.0,
+    "health_checks": 0,
+    "reconnects": 0,
+}
+
+
+def get_pool():
+    """Create the pool on first use; no connection is opened yet"""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME, pool_size=POOL_SIZE
+            )
+            _pool.set_config(**get_database_config())
+        return _pool
+
+
+def _checkout(pool):
+    """Take an idle connection, opening a new one while below the pool size"""
+    global _created
+    try:
+        return pool.get_connection()
+    except PoolError:
+        pass
+    with _lock:
+        if _created >= POOL_SIZE:
+            return None
+        _created += 1
+    try:
+        pool.add_connection()
+    except Exception:
+        with _lock:
+            _created -= 1
+        if _created == 0:
+            # The cached endpoint may be gone; probe again in the next process
+            invalidate_endpoint_cache()
+        raise
+    try:
+        return pool.get_connection()
+    except PoolError:
+        # Another thread took the new connection first
+        return None
+
+
+def ensure_alive(conn):
+    """Ping conn and reconnect if the server dropped it; True if it reconnected"""
+    with _lock:
+        _stats["health_checks"] += 1
+    if conn.is_connected():
+        return False
+    conn.reconnect(attempts=3, delay=1)
+    with _lock:
+        _stats["reconnects"] += 1
+    print("[🔌] Reconnected stale database connection")
+    return True
+
+
+def get_connection(timeout=POOL_TIMEOUT_SECONDS):
+    """Check a healthy connection out of the pool; close() returns it"""
+    pool = get_pool()
+    start = time.time()
+    conn = _checkout(pool)
+    if conn is None:
+        with _lock:
+            _stats["waits"] += 1
+        while conn is None:
+            if time.time() - start > timeout:
+                raise PoolError(
+                    f"No database connection free after {timeout:.0f}s "
+                    f"(pool size {POOL_SIZE})"
+                )
+            time.sleep(0.05)
+            conn = _checkout(pool)
+        with _lock:
+            _stats["wait_seconds"] += time.time() - start
+
+    # The pooled wrapper is new on every checkout; the underlying connection is not
+    key = id(getattr(conn, "_cnx", conn))
+    if time.time() - _last_used.get(key, time.time()) > HEALTHCHECK_SECONDS:
+        ensure_alive(conn)
+    _last_used[key] = time.time()
+
+    with _lock:
+        _stats["checkouts"] += 1
+        _stats["in_use"] += 1
+        _stats["max_in_use"] = max(_stats["max_in_use"], _stats["in_use"])
+    return conn
+
+
+def release_connection(conn):
+    """Return a connection to the pool"""
+    _last_used[id(getattr(conn, "_cnx", conn))] = time.time()
+    with _lock:
+        _stats["in_use"] = max(0, _stats["in_use"] - 1)
+    conn.close()
+
+
+def pool_stats():
+    """Pool size and utilisation counters"""
+    with _lock:
+        stats = dict(_stats)
+        stats["size"] = POOL_SIZE
+        stats["open"] = _created
+    stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+    stats["utilisation"] = (
+        round(stats["max_in_use"] / POOL_SIZE, 2) if POOL_SIZE else 0.0
+    )
+    return stats
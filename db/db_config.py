@@ -1,15 +1,33 @@
+import json
 import os
 import socket
-from typing import Dict, Any
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Endpoint discovery settings: probes run in parallel with a short timeout,
+# and the chosen endpoint is cached on disk so later processes skip probing
+PROBE_TIMEOUT_SECONDS = float(os.getenv("DB_PROBE_TIMEOUT", "2"))
+ENDPOINT_CACHE_PATH = os.getenv("DB_ENDPOINT_CACHE_FILE", ".cache/db_endpoint.json")
+ENDPOINT_CACHE_TTL_SECONDS = int(os.getenv("DB_ENDPOINT_CACHE_TTL", "600"))
+
+_resolved_config = None
+_resolve_lock = threading.Lock()
+
 
 def is_github_actions() -> bool:
     """Check if running in GitHub Actions environment"""
-    return os.getenv('GITHUB_ACTIONS') == 'true'
+    return os.getenv("GITHUB_ACTIONS") == "true"
+
 
 def is_local_environment() -> bool:
     """Check if running in local development environment"""
     return not is_github_actions()
 
+
 def can_connect_to_host(host: str, port: int, timeout: int = 10) -> bool:
     """Test if we can connect to a host:port with longer timeout"""
     try:
@@ -21,15 +39,23 @@ def can_connect_to_host(host: str, port: int, timeout: int = 10) -> bool:
     except Exception:
         return False
 
-def get_database_config() -> Dict[str, Any]:
-    """Get database configuration based on environment"""
-    
-    # Check if we're in GitHub Actions
+
+def probe_host(
+    host: str, port: int, timeout: float = PROBE_TIMEOUT_SECONDS
+) -> Optional[float]:
+    """TCP connect time to host:port in seconds, or None if it is unreachable"""
+    start = time.time()
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return time.time() - start
+    except OSError:
+        return None
+
+
+def get_database_candidates() -> List[Dict[str, Any]]:
+    """Database endpoints for this environment in priority order, plus the fallback"""
     if is_github_actions():
-        print("Detected GitHub Actions environment")
-        
-        # For GitHub Actions, try multiple database options
-        database_options = [
+        candidates = [
             # Option 1: Remote database (primary)
             {
                 "name": "Remote Database (18.235.51.183)",
@@ -40,8 +66,8 @@ def get_database_config() -> Dict[str, Any]:
                     "database": "solutioninn_testing",
                     "port": 3306,
                     "autocommit": True,
-                    "charset": "utf8mb4"
-                }
+                    "charset": "utf8mb4",
+                },
             },
             # Option 2: Alternative remote database
             {
@@ -53,8 +79,8 @@ def get_database_config() -> Dict[str, Any]:
                     "database": "test",
                     "port": 3306,
                     "autocommit": True,
-                    "charset": "utf8mb4"
-                }
+                    "charset": "utf8mb4",
+                },
             },
             # Option 3: Local test database (fallback)
             {
@@ -66,68 +92,198 @@ def get_database_config() -> Dict[str, Any]:
                     "database": os.getenv("TEST_DB_NAME", "test_results"),
                     "port": int(os.getenv("TEST_DB_PORT", "3306")),
                     "autocommit": True,
-                    "charset": "utf8mb4"
-                }
-            }
+                    "charset": "utf8mb4",
+                },
+            },
         ]
-        
-        # Try each database option
-        for option in database_options:
-            print(f"Testing connection to: {option['name']}")
-            host = option['config']['host']
-            port = option['config']['port']
-            
-            if can_connect_to_host(host, port):
-                print(f"SUCCESS: {option['name']} is accessible")
-                return option['config']
-            else:
-                print(f"FAILED: {option['name']} is not accessible")
-        
         # If none work, use the local test database as final fallback
-        print("WARNING: No remote databases accessible, using local test database")
-        return {
-            "host": "127.0.0.1",
-            "user": "root",
-            "password": "root",
-            "database": "test_results",
-            "port": 3306,
-            "autocommit": True,
-            "charset": "utf8mb4"
-        }
-    
-    # Local development environment
-    else:
-        print("Detected local development environment")
-        
-        # Try remote database first
-        if can_connect_to_host("18.235.51.183", 3306):
-            print("SUCCESS: Using remote database for local development")
-            return {
-                "host": "18.235.51.183",
-                "user": "sqa_user",
-                "password": "Hassan123!@#",
-                "database": "solutioninn_testing",
+        fallback = {
+            "name": "Local Test Database (fallback)",
+            "config": {
+                "host": "127.0.0.1",
+                "user": "root",
+                "password": "root",
+                "database": "test_results",
                 "port": 3306,
                 "autocommit": True,
-                "charset": "utf8mb4"
+                "charset": "utf8mb4",
+            },
+        }
+    else:
+        candidates = [
+            {
+                "name": "Remote Database (18.235.51.183)",
+                "config": {
+                    "host": "18.235.51.183",
+                    "user": "sqa_user",
+                    "password": "Hassan123!@#",
+                    "database": "solutioninn_testing",
+                    "port": 3306,
+                    "autocommit": True,
+                    "charset": "utf8mb4",
+                },
             }
-        else:
-            print("WARNING: Remote database not accessible locally")
-            print("Using local database configuration")
-            
-            # Fallback to local database
-            return {
+        ]
+        # Fallback to local database
+        fallback = {
+            "name": "Local Database",
+            "config": {
                 "host": "localhost",
                 "user": "root",
                 "password": "",
                 "database": "test_results",
                 "port": 3306,
                 "autocommit": True,
-                "charset": "utf8mb4"
-            }
+                "charset": "utf8mb4",
+            },
+        }
+    return candidates + [fallback]
+
+
+def _cache_key(candidates: List[Dict[str, Any]]) -> str:
+    """Identifies the candidate set so a cache from another environment is ignored"""
+    environment = "github" if is_github_actions() else "local"
+    endpoints = ",".join(
+        f"{c['config']['host']}:{c['config']['port']}" for c in candidates
+    )
+    return f"{environment}|{endpoints}"
+
+
+def _load_cached_choice(candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(ENDPOINT_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("key") != _cache_key(candidates):
+        return None
+    if time.time() - cached.get("resolved_at", 0) > ENDPOINT_CACHE_TTL_SECONDS:
+        return None
+    # Only the name is cached; credentials stay out of the cache file
+    for candidate in candidates:
+        if candidate["name"] == cached.get("name"):
+            return candidate
+    return None
+
+
+def _save_cached_choice(
+    candidates: List[Dict[str, Any]], choice: Dict[str, Any]
+) -> None:
+    path = Path(ENDPOINT_CACHE_PATH)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "key": _cache_key(candidates),
+                    "name": choice["name"],
+                    "resolved_at": time.time(),
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"WARNING: Could not cache database endpoint: {e}")
+
+
+def invalidate_endpoint_cache() -> None:
+    """Forget the chosen endpoint, e.g. after it refused connections"""
+    global _resolved_config
+    with _resolve_lock:
+        _resolved_config = None
+    try:
+        os.remove(ENDPOINT_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _discover(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Probe all candidates concurrently; take the first healthy one by priority.
+
+    Priority rather than raw latency decides, so a reachable local server never
+    silently replaces the shared remote database. Lower-priority probes do not
+    delay the choice once every higher-priority one has answered.
+    """
+    probed, fallback = candidates[:-1], candidates[-1]
+    latencies: Dict[int, Optional[float]] = {}
+    executor = ThreadPoolExecutor(max_workers=len(probed))
+    try:
+        futures = {
+            executor.submit(probe_host, c["config"]["host"], c["config"]["port"]): index
+            for index, c in enumerate(probed)
+        }
+        for future in as_completed(futures):
+            latencies[futures[future]] = future.result()
+            for index, candidate in enumerate(probed):
+                if index not in latencies:
+                    break  # A higher-priority probe is still running
+                if latencies[index] is not None:
+                    elapsed_ms = latencies[index] * 1000
+                    name = candidate["name"]
+                    print(f"SUCCESS: {name} is accessible ({elapsed_ms:.0f} ms)")
+                    return candidate
+    finally:
+        # Don't wait for slower, lower-priority probes once a choice is made
+        executor.shutdown(wait=False)
+
+    for index, candidate in enumerate(probed):
+        if latencies.get(index) is None:
+            print(f"FAILED: {candidate['name']} is not accessible")
+    print(f"WARNING: No database endpoint accessible, using {fallback['name']}")
+    return fallback
+
+
+def get_database_config(refresh: bool = False) -> Dict[str, Any]:
+    """Get database configuration based on environment.
+
+    Resolved once per process on first use and cached on disk for
+    DB_ENDPOINT_CACHE_TTL seconds; refresh=True probes again.
+    """
+    global _resolved_config
+    with _resolve_lock:
+        if _resolved_config is not None and not refresh:
+            return dict(_resolved_config)
+
+        print(
+            "Detected GitHub Actions environment"
+            if is_github_actions()
+            else "Detected local development environment"
+        )
+        candidates = get_database_candidates()
+        choice = None if refresh else _load_cached_choice(candidates)
+        if choice:
+            print(f"Using cached database endpoint: {choice['name']}")
+        else:
+            start = time.time()
+            choice = _discover(candidates)
+            print(f"Database endpoint resolved in {time.time() - start:.2f}s")
+            # An unprobed fallback is not cached, so the next process tries the
+            # real endpoints again
+            if choice is not candidates[-1]:
+                _save_cached_choice(candidates, choice)
+
+        _resolved_config = choice["config"]
+        return dict(_resolved_config)
+
+
+def __getattr__(name: str) -> Any:
+    # Legacy support - DB_CONFIG is resolved on first access, not at import time
+    if name == "DB_CONFIG":
+        return get_database_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-# Legacy support - keep the old DB_CONFIG for backward compatibility
-DB_CONFIG = get_database_config()
+# Export the function for use in other modules; DB_CONFIG is served lazily by
+# the module __getattr__ above, which pyflakes cannot see
+__all__ = [  # noqa: F822
+    "DB_CONFIG",
+    "get_database_config",
+    "is_github_actions",
+    "is_local_environment",
+]
 
-# Export the function for use in other modules
-__all__ = ['DB_CONFIG', 'get_database_config', 'is_github_actions', 'is_local_environment']
+if __name__ == "__main__":
+    config = get_database_config(refresh="--refresh" in sys.argv)
+    host = f"{config['host']}:{config['port']}"
+    print(f"Database: {config['user']}@{host}/{config['database']}")
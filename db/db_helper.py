@@ -1,23 +1,215 @@
 # db_helper.py
-import uuid
-from datetime import datetime
-
-import mysql.connector
-
+import os
+import time
+from datetime import date
+
+from mysql.connector import errors as mysql_errors
+
+from .connection_pool import (
+    HEALTHCHECK_SECONDS,
+    ensure_alive,
+    get_connection,
+    release_connection,
+)
 from .db_config import get_database_config
+from .partitions import (
+    PARTITION_MONTHS_AHEAD,
+    PARTITIONING,
+    add_months,
+    archived_until,
+    ensure_partitions,
+    month_start,
+    partition_clause,
+)
+from .result_store import ResultStore
+
+# ER_NO_REFERENCED_ROW_2: the referenced user/book row does not exist
+FK_VIOLATION = 1452
+
+# Online DDL: a schema change waits at most SCHEMA_LOCK_WAIT_SECONDS for the
+# table's metadata lock, so queued result inserts are never held up longer,
+# and is retried a few times before giving up
+DDL_LOCK_WAIT_SECONDS = int(os.getenv("SCHEMA_LOCK_WAIT_SECONDS", "3"))
+DDL_LOCK_RETRIES = 5
+# ER_LOCK_WAIT_TIMEOUT
+LOCK_WAIT_TIMEOUT = 1205
+# The server cannot run the change with the requested ALGORITHM/LOCK
+# (ER_ALTER_OPERATION_NOT_SUPPORTED[_REASON]); any other error, a syntax
+# error in the clause included, is raised instead of falling back
+DDL_NOT_SUPPORTED = (1845, 1846)
+# Older servers reject ALGORITHM=INSTANT as a syntax error, so it is not sent
+INSTANT_DDL_MIN_VERSION = (8, 0, 12)
+ONLINE_ALGORITHMS = (
+    ("instant", "ALGORITHM=INSTANT"),
+    ("inplace", "ALGORITHM=INPLACE, LOCK=NONE"),
+)
+
+# Columns added to test_results after it was first deployed: (column, ALTER clause)
+LATE_COLUMNS = [
+    (
+        "result_key",
+        """ADD COLUMN result_key CHAR(32) NULL
+               COMMENT 'Idempotency key from the local result spool',
+           ADD UNIQUE KEY uq_test_results_result_key (result_key)""",
+    ),
+    (
+        "test_category",
+        """ADD COLUMN test_category VARCHAR(20) NULL
+               COMMENT 'book/subscription/user/general, set by classify_test',
+           ADD COLUMN plan_type VARCHAR(20) NULL
+               COMMENT 'Subscription plan for subscription tests',
+           ADD INDEX idx_test_results_category
+               (test_category, plan_type, test_status)""",
+    ),
+    (
+        "error_signature_id",
+        """ADD COLUMN error_signature_id INT NULL
+               COMMENT 'error_signatures row of a failure',
+           ADD INDEX idx_test_results_signature (error_signature_id, test_datetime)""",
+    ),
+]
+
+# One row per distinct failure; test_results.error_signature_id points here
+ERROR_SIGNATURES_TABLE = """
+CREATE TABLE IF NOT EXISTS error_signatures (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    signature CHAR(40) NOT NULL
+        COMMENT 'SHA-1 of the normalised traceback (db.error_signatures)',
+    error_summary VARCHAR(255),
+    error_message TEXT COMMENT 'First occurrence, as reported',
+    first_seen DATETIME NOT NULL,
+    UNIQUE KEY uq_error_signatures_signature (signature),
+    FULLTEXT INDEX ft_error_signatures_errors (error_summary, error_message)
+)
+"""
+# Indexes added to test_results after it was first deployed: (index, ALTER clause)
+LATE_INDEXES = [
+    # Keyset paging on (test_datetime, id); InnoDB builds it online
+    (
+        "idx_test_results_datetime",
+        "ADD INDEX idx_test_results_datetime (test_datetime, id)",
+    ),
+]
+
+ROLLUP_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS test_results_daily (
+        stat_date DATE NOT NULL,
+        module_name VARCHAR(255) NOT NULL,
+        device_name VARCHAR(50) NOT NULL DEFAULT '',
+        test_category VARCHAR(20) NOT NULL DEFAULT '',
+        plan_type VARCHAR(20) NOT NULL DEFAULT '',
+        test_status ENUM('PASSED', 'FAILED', 'SKIPPED', 'ERROR') NOT NULL,
+        result_count INT NOT NULL DEFAULT 0,
+        timed_count INT NOT NULL DEFAULT 0
+            COMMENT 'Results with a total_time_duration',
+        total_duration DECIMAL(14,3) NOT NULL DEFAULT 0,
+        min_duration DECIMAL(10,3) NULL,
+        max_duration DECIMAL(10,3) NULL,
+        PRIMARY KEY (stat_date, module_name, device_name, test_category, plan_type,
+                     test_status)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS test_results_daily_durations (
+        stat_date DATE NOT NULL,
+        module_name VARCHAR(255) NOT NULL,
+        device_name VARCHAR(50) NOT NULL DEFAULT '',
+        test_category VARCHAR(20) NOT NULL DEFAULT '',
+        plan_type VARCHAR(20) NOT NULL DEFAULT '',
+        test_status ENUM('PASSED', 'FAILED', 'SKIPPED', 'ERROR') NOT NULL,
+        bucket TINYINT UNSIGNED NOT NULL
+            COMMENT 'Index into result_store.DURATION_BUCKETS',
+        result_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (stat_date, module_name, device_name, test_category, plan_type,
+                     test_status, bucket)
+    )
+    """,
+]
+
+# Concurrent writers add to the same rollup rows atomically
+ROLLUP_UPSERTS = {
+    "test_results_daily": """
+        INSERT INTO test_results_daily (stat_date, module_name, device_name,
+                                        test_category, plan_type, test_status,
+                                        result_count, timed_count, total_duration,
+                                        min_duration, max_duration)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            result_count = result_count + VALUES(result_count),
+            timed_count = timed_count + VALUES(timed_count),
+            total_duration = total_duration + VALUES(total_duration),
+            min_duration = LEAST(COALESCE(min_duration, VALUES(min_duration)),
+                                 COALESCE(VALUES(min_duration), min_duration)),
+            max_duration = GREATEST(COALESCE(max_duration, VALUES(max_duration)),
+                                    COALESCE(VALUES(max_duration), max_duration))
+    """,
+    "test_results_daily_durations": """
+        INSERT INTO test_results_daily_durations (stat_date, module_name, device_name,
+                                                  test_category, plan_type,
+                                                  test_status, bucket, result_count)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE result_count = result_count + VALUES(result_count)
+    """,
+}
+
+# Batches of name rewrites (normalise_test_names) are loaded here and applied
+# with one UPDATE ... JOIN
+NAME_REWRITE_TABLE = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS test_name_rewrites (
+        id INT PRIMARY KEY,
+        test_case_name VARCHAR(255) NOT NULL,
+        module_name VARCHAR(255) NOT NULL
+    )
+"""
+NAME_REWRITE_UPDATE = """
+    UPDATE test_results tr
+    JOIN test_name_rewrites r ON r.id = tr.id
+    SET tr.test_case_name = r.test_case_name, tr.module_name = r.module_name
+"""
+
+
+class MySQLHelper(ResultStore):
+    IntegrityError = mysql_errors.IntegrityError
+    ROLLUP_TABLES = ROLLUP_TABLES
+    ROLLUP_UPSERTS = ROLLUP_UPSERTS
+    NAME_REWRITE_TABLE = NAME_REWRITE_TABLE
+    NAME_REWRITE_UPDATE = NAME_REWRITE_UPDATE
 
-
-class MySQLHelper:
     def __init__(self):
-        config = get_database_config()
-        self.conn = mysql.connector.connect(**config)
+        # Checked out of the process-wide pool; close() returns it
+        self.conn = get_connection()
         self.cursor = self.conn.cursor(dictionary=True)
+        self._last_used = time.time()
+        config = get_database_config()
+        self.db_key = f"{config['host']}:{config['port']}/{config['database']}"
+        self._partitioned = None
+
+    def ensure_connection(self):
+        """Reconnect if the server dropped the connection while the helper sat idle"""
+        idle = time.time() - self._last_used
+        if idle > HEALTHCHECK_SECONDS and ensure_alive(self.conn):
+            self.cursor = self.conn.cursor(dictionary=True)
+        self._last_used = time.time()
 
     def create_test_results_table(self):
         """Create the test_results table if it doesn't exist"""
-        create_table_query = """
+        if PARTITIONING:
+            # Monthly partitions (db.partitions): every unique key has to include
+            # test_datetime, and MySQL has no FULLTEXT on partitioned tables
+            this_month = month_start(date.today())
+            keys = """PRIMARY KEY (id, test_datetime),
+            UNIQUE KEY uq_test_results_result_key (result_key, test_datetime),"""
+            last_month = add_months(this_month, PARTITION_MONTHS_AHEAD)
+            partitions = partition_clause(this_month, last_month)
+        else:
+            keys = """PRIMARY KEY (id),
+            UNIQUE KEY uq_test_results_result_key (result_key),
+            FULLTEXT INDEX ft_test_results_errors (error_summary, error_message),"""
+            partitions = ""
+        create_table_query = f"""
         CREATE TABLE IF NOT EXISTS test_results (
-            id INT AUTO_INCREMENT PRIMARY KEY,
+            id INT AUTO_INCREMENT,
             test_case_name VARCHAR(255) NOT NULL,
             module_name VARCHAR(255) NOT NULL,
             test_status ENUM('PASSED', 'FAILED', 'SKIPPED', 'ERROR') NOT NULL,
@@ -28,496 +220,279 @@ class MySQLHelper:
             device_name VARCHAR(50) NULL COMMENT 'Device type (mobile/desktop/tablet)',
             screen_resolution VARCHAR(50) NULL COMMENT 'Screen resolution (e.g., 1920x1080, 375x812)',
             error_link VARCHAR(500) NULL COMMENT 'URL link to screenshot showing affected screen',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            result_key CHAR(32) NULL
+                COMMENT 'Idempotency key from the local result spool',
+            test_category VARCHAR(20) NULL
+                COMMENT 'book/subscription/user/general, set by classify_test',
+            plan_type VARCHAR(20) NULL
+                COMMENT 'Subscription plan for subscription tests',
+            error_signature_id INT NULL COMMENT 'error_signatures row of a failure',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            {keys}
+            INDEX idx_test_results_datetime (test_datetime, id),
+            INDEX idx_test_results_category (test_category, plan_type, test_status),
+            INDEX idx_test_results_signature (error_signature_id, test_datetime),
+            INDEX idx_test_results_module_device_datetime
+                (module_name, device_name, test_datetime),
+            INDEX idx_test_results_status_datetime (test_status, test_datetime)
         )
+        {partitions}
         """
         try:
             self.cursor.execute(create_table_query)
             self.conn.commit()
             print("SUCCESS: Test results table created successfully")
-        except Exception as e:
-            print(f"ERROR: Error creating test results table: {e}")
-            self.conn.rollback()
-
-    def _create_error_summary(self, error_message):
-        """Create a short error summary from the full error message"""
-        if not error_message:
-            return None
-
-        import re
-
-        # Common error patterns to extract short messages
-        error_patterns = [
-            r"ElementClickInterceptedException: (.+?)(?:\n|$)",
-            r"NoSuchElementException: (.+?)(?:\n|$)",
-            r"TimeoutException: (.+?)(?:\n|$)",
-            r"AssertionError: (.+?)(?:\n|$)",
-            r"WebDriverException: (.+?)(?:\n|$)",
-            r"Exception: (.+?)(?:\n|$)",
-            r"Message: (.+?)(?:\n|$)",  # Selenium/WebDriver error
-        ]
-
-        for pattern in error_patterns:
-            match = re.search(pattern, str(error_message))
-            if match:
-                summary = match.group(1).strip()
-                return summary[:250] if len(summary) > 250 else summary
-
-        # If no pattern matches, take the first line and limit to 250 characters
-        first_line = str(error_message).split("\n")[0].strip()
-        return first_line[:250] if len(first_line) > 250 else first_line
-
-    def insert_test_result(
-        self,
-        test_case_name,
-        module_name,
-        test_status,
-        error_message=None,
-        total_time_duration=None,
-        device_name=None,
-        screen_resolution=None,
-        error_link=None,
-    ):
-        """Insert a test result into the database"""
-        # Clean module name - remove common test prefixes
-        for prefix in ("tests.test_", "tests.", "test."):
-            if module_name.startswith(prefix):
-                module_name = module_name[len(prefix) :]
-                break
-
-        # Create error summary
-        error_summary = self._create_error_summary(error_message)
-
-        insert_query = """
-        INSERT INTO test_results (test_case_name, module_name, test_status, test_datetime, error_message, error_summary, total_time_duration, device_name, screen_resolution, error_link)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        try:
-            self.cursor.execute(
-                insert_query,
-                (
-                    test_case_name,
-                    module_name,
-                    test_status,
-                    datetime.now(),
-                    error_message,
-                    error_summary,
-                    total_time_duration,
-                    device_name,
-                    screen_resolution,
-                    error_link,
-                ),
-            )
+            self.cursor.execute(ERROR_SIGNATURES_TABLE)
             self.conn.commit()
-            print(f"SUCCESS: Test result inserted: {test_case_name} - {test_status}")
-        except Exception as e:
-            print(f"ERROR: Error inserting test result: {e}")
-            self.conn.rollback()
-
-    def store_test_result_in_tables(
-        self,
-        test_case_name,
-        module_name,
-        test_status,
-        error_message=None,
-        test_data=None,
-        total_time_duration=None,
-        device_name=None,
-        screen_resolution=None,
-        error_link=None,
-    ):
-        """Store test results in appropriate tables based on test type"""
-        try:
-            # Always store in test_results table
-            self.insert_test_result(
-                test_case_name,
-                module_name,
-                test_status,
-                error_message,
-                total_time_duration,
-                device_name,
-                screen_resolution,
-                error_link,
-            )
-
-            # Store in specific tables based on test type
-            # BOOK PURCHASE TESTS - Only store in orders table with book_purchase type
-            if "book" in test_case_name.lower() or "book" in module_name.lower():
-                self._store_book_test_result(
-                    test_case_name, module_name, test_status, test_data
-                )
-
-            # SUBSCRIPTION TESTS - Store in both orders and subscriptions tables
-            elif (
-                "monthly" in test_case_name.lower() or "monthly" in module_name.lower()
-            ):
-                self._store_subscription_test_result(
-                    test_case_name, module_name, test_status, "monthly", test_data
-                )
-
-            elif (
-                "six_month" in test_case_name.lower()
-                or "six_month" in module_name.lower()
-            ):
-                self._store_subscription_test_result(
-                    test_case_name, module_name, test_status, "six_month", test_data
-                )
-
-            elif (
-                "three_month" in test_case_name.lower()
-                or "three_month" in module_name.lower()
-            ):
-                self._store_subscription_test_result(
-                    test_case_name, module_name, test_status, "three_month", test_data
-                )
-
-            elif (
-                "popular" in test_case_name.lower()
-                or "popular" in module_name.lower()
-            ):
-                self._store_subscription_test_result(
-                    test_case_name, module_name, test_status, "popular", test_data
-                )
-
-            elif (
-                "onetime" in test_case_name.lower() or "onetime" in module_name.lower()
-            ):
-                # Onetime plans are also subscriptions, not just orders
-                self._store_subscription_test_result(
-                    test_case_name, module_name, test_status, "onetime", test_data
-                )
-
-            elif "user" in test_case_name.lower() or "user" in module_name.lower():
-                self._store_user_test_result(
-                    test_case_name, module_name, test_status, test_data
-                )
-
-            else:
-                # Default: store as general order (only for non-subscription, non-book tests)
-                self._store_general_order_test_result(
-                    test_case_name, module_name, test_status, test_data
-                )
-
+            self._ensure_late_columns()
+            self.ensure_rollup_tables()
+            if self.is_partitioned():
+                ensure_partitions(self)
         except Exception as e:
-            print(f"❌ Error storing test result in tables: {e}")
-
-    def _store_book_test_result(
-        self, test_case_name, module_name, test_status, test_data=None
-    ):
-        """Store book-related test results"""
-        try:
-            # Create or get test user
-            user_id = self._get_or_create_test_user()
-
-            # Create or get test book
-            book_id = self._get_or_create_test_book()
-
-            # Create order record
-            order_number = f"TEST-{uuid.uuid4().hex[:8].upper()}"
-            order_type = "book_purchase"
-            amount = 49.99 if test_status == "PASSED" else 0.00
-            payment_status = "completed" if test_status == "PASSED" else "failed"
-            order_status = "completed" if test_status == "PASSED" else "cancelled"
-
-            self.cursor.execute(
-                """
-                INSERT INTO orders (order_number, user_id, book_id, order_type, amount, 
-                                  payment_method, payment_status, order_status, order_date, completed_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    order_number,
-                    user_id,
-                    book_id,
-                    order_type,
-                    amount,
-                    "credit_card",
-                    payment_status,
-                    order_status,
-                    datetime.now(),
-                    datetime.now() if test_status == "PASSED" else None,
-                ),
-            )
-
-            self.conn.commit()
-            print(f"✅ Book test result stored in orders table: {order_number}")
-
-        except Exception as e:
-            print(f"❌ Error storing book test result: {e}")
-            self.conn.rollback()
-
-    def _store_subscription_test_result(
-        self,
-        test_case_name,
-        module_name,
-        test_status,
-        subscription_type,
-        test_data=None,
-    ):
-        """Store subscription-related test results"""
-        try:
-            # Create or get test user
-            user_id = self._get_or_create_test_user()
-
-            # Create subscription record with proper pricing and duration
-            start_date = datetime.now().date()
-            
-            # Calculate subscription details based on type
-            if subscription_type == "monthly":
-                # Add 1 month
-                current_date = datetime.now()
-                if current_date.month == 12:
-                    end_date = current_date.replace(year=current_date.year + 1, month=1).date()
-                else:
-                    end_date = current_date.replace(month=current_date.month + 1).date()
-                amount = 29.99
-            elif subscription_type == "three_month":
-                # Add 3 months
-                current_date = datetime.now()
-                new_month = current_date.month + 3
-                new_year = current_date.year + (new_month - 1) // 12
-                new_month = ((new_month - 1) % 12) + 1
-                end_date = current_date.replace(year=new_year, month=new_month).date()
-                amount = 79.99
-            elif subscription_type == "six_month":
-                # Add 6 months
-                current_date = datetime.now()
-                new_month = current_date.month + 6
-                new_year = current_date.year + (new_month - 1) // 12
-                new_month = ((new_month - 1) % 12) + 1
-                end_date = current_date.replace(year=new_year, month=new_month).date()
-                amount = 149.99
-            elif subscription_type == "popular":
-                # Popular plan is typically 3-month plan
-                current_date = datetime.now()
-                new_month = current_date.month + 3
-                new_year = current_date.year + (new_month - 1) // 12
-                new_month = ((new_month - 1) % 12) + 1
-                end_date = current_date.replace(year=new_year, month=new_month).date()
-                amount = 79.99
-            elif subscription_type == "onetime":
-                # Onetime plan is a one-time payment, no recurring
-                end_date = datetime.now().replace(year=datetime.now().year + 1).date()
-                amount = 99.99
-            else:
-                # Default annual plan
-                end_date = datetime.now().replace(year=datetime.now().year + 1).date()
-                amount = 299.99
-
-            status = "active" if test_status == "PASSED" else "cancelled"
-            
-            # Auto-renewal settings
-            auto_renew = True if subscription_type in ["monthly", "three_month", "six_month"] else False
-
-            self.cursor.execute(
-                """
-                INSERT INTO subscriptions (user_id, subscription_type, status, start_date, end_date, 
-                                         amount, auto_renew, payment_method)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    user_id,
-                    subscription_type,
-                    status,
-                    start_date,
-                    end_date,
-                    amount,
-                    auto_renew,
-                    "credit_card",
-                ),
-            )
-
-            self.conn.commit()
-            print(f"✅ Subscription test result stored in subscriptions table ONLY: {subscription_type} - {status} - ${amount}")
-
-        except Exception as e:
-            print(f"❌ Error storing subscription test result: {e}")
+            print(f"ERROR: Error creating test results table: {e}")
             self.conn.rollback()
 
-
-
-    def _store_user_test_result(
-        self, test_case_name, module_name, test_status, test_data=None
-    ):
-        """Store user-related test results"""
-        try:
-            # Create test user record
-            username = f"test_user_{uuid.uuid4().hex[:8]}"
-            email = f"{username}@test.com"
-            password_hash = "test_password_hash"
-
+    def is_partitioned(self):
+        """True once test_results is partitioned (schema migration 006)"""
+        if self._partitioned is None:
             self.cursor.execute(
                 """
-                INSERT INTO users (username, email, password_hash, first_name, last_name, 
-                                 university, user_type, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    username,
-                    email,
-                    password_hash,
-                    "Test",
-                    "User",
-                    "Test University",
-                    "student",
-                    test_status == "PASSED",
-                ),
+                SELECT PARTITION_NAME
+                FROM INFORMATION_SCHEMA.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'test_results'
+                AND PARTITION_NAME IS NOT NULL
+                LIMIT 1
+            """
             )
+            self._partitioned = bool(self.cursor.fetchall())
+        return self._partitioned
 
-            self.conn.commit()
-            print(f"✅ User test result stored: {username}")
-
-        except Exception as e:
-            print(f"❌ Error storing user test result: {e}")
-            self.conn.rollback()
-
-    def _store_general_order_test_result(
-        self, test_case_name, module_name, test_status, test_data=None
-    ):
-        """Store general test results as orders"""
-        try:
-            # Create or get test user
-            user_id = self._get_or_create_test_user()
-
-            # Create general order record
-            order_number = f"TEST-{uuid.uuid4().hex[:8].upper()}"
-            order_type = "book_purchase"  # Default type
-            amount = 49.99 if test_status == "PASSED" else 0.00
-
+    def _ensure_late_columns(self):
+        """Add columns and indexes introduced after test_results was first created"""
+        for column, alter_clause in LATE_COLUMNS:
             self.cursor.execute(
                 """
-                INSERT INTO orders (order_number, user_id, order_type, amount, 
-                                  payment_method, payment_status, order_status, order_date, completed_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                SELECT COLUMN_NAME
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'test_results'
+                AND COLUMN_NAME = %s
             """,
-                (
-                    order_number,
-                    user_id,
-                    order_type,
-                    amount,
-                    "credit_card",
-                    "completed" if test_status == "PASSED" else "failed",
-                    "completed" if test_status == "PASSED" else "cancelled",
-                    datetime.now(),
-                    datetime.now() if test_status == "PASSED" else None,
-                ),
+                (column,),
             )
+            if self.cursor.fetchone():
+                continue
+            self._alter_test_results(alter_clause)
+            print(f"SUCCESS: Added {column} column to test_results table")
 
-            self.conn.commit()
-            print(f"✅ General test result stored as order: {order_number}")
-
-        except Exception as e:
-            print(f"❌ Error storing general test result: {e}")
-            self.conn.rollback()
-
-    def _get_or_create_test_user(self):
-        """Get or create a test user for test results"""
-        try:
-            # Try to get existing test user
-            self.cursor.execute(
-                "SELECT id FROM users WHERE username = 'test_user' LIMIT 1"
-            )
-            result = self.cursor.fetchone()
-
-            if result:
-                return result["id"]
-
-            # Create new test user
+        for index, alter_clause in LATE_INDEXES:
             self.cursor.execute(
                 """
-                INSERT INTO users (username, email, password_hash, first_name, last_name, 
-                                 university, user_type, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                SELECT INDEX_NAME
+                FROM INFORMATION_SCHEMA.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'test_results'
+                AND INDEX_NAME = %s
             """,
-                (
-                    "test_user",
-                    "test@example.com",
-                    "test_hash",
-                    "Test",
-                    "User",
-                    "Test University",
-                    "student",
-                    True,
-                ),
+                (index,),
             )
-
+            if self.cursor.fetchall():
+                continue
+            self._alter_test_results(alter_clause)
+            print(f"SUCCESS: Added {index} index to test_results table")
+
+    def _alter_test_results(self, alter_clause):
+        # Online where the server allows it; ADD COLUMN/INDEX otherwise only
+        # needs a plain ALTER on very old servers
+        if not self.alter_table_online("test_results", alter_clause):
+            self.cursor.execute(f"ALTER TABLE test_results {alter_clause}")
             self.conn.commit()
-            return self.cursor.lastrowid
 
-        except Exception as e:
-            print(f"❌ Error getting/creating test user: {e}")
-            return 1  # Fallback to first user
-
-    def _get_or_create_test_book(self):
-        """Get or create a test book for test results"""
+    def run_ddl(self, statement):
+        """Run a DDL statement, waiting at most DDL_LOCK_WAIT_SECONDS per attempt
+        for the table's metadata lock; while DDL waits, every later query on
+        the table queues behind it"""
+        self.cursor.execute("SELECT @@SESSION.lock_wait_timeout AS lock_wait_timeout")
+        previous_wait = self.cursor.fetchone()["lock_wait_timeout"]
+        self.cursor.execute(f"SET SESSION lock_wait_timeout = {DDL_LOCK_WAIT_SECONDS}")
         try:
-            # Try to get existing test book
-            self.cursor.execute(
-                "SELECT id FROM books WHERE title LIKE '%Test Book%' LIMIT 1"
-            )
-            result = self.cursor.fetchone()
-
-            if result:
-                return result["id"]
-
-            # Create new test book
-            self.cursor.execute(
-                """
-                INSERT INTO books (title, author, isbn, publisher, publication_year, 
-                                 price, description, category, is_available)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    "Test Book for Automation",
-                    "Test Author",
-                    "978-TEST-1234",
-                    "Test Publisher",
-                    2024,
-                    49.99,
-                    "Test book for automation testing",
-                    "Test Category",
-                    True,
-                ),
+            for attempt in range(1, DDL_LOCK_RETRIES + 1):
+                try:
+                    self.cursor.execute(statement)
+                    self.conn.commit()
+                    return
+                except mysql_errors.Error as e:
+                    if e.errno != LOCK_WAIT_TIMEOUT or attempt == DDL_LOCK_RETRIES:
+                        raise
+                    retry = f"{attempt}/{DDL_LOCK_RETRIES}"
+                    print(f"[⏳] Table is busy, retrying DDL ({retry})")
+                    time.sleep(attempt)
+        finally:
+            self.cursor.execute(f"SET SESSION lock_wait_timeout = {int(previous_wait)}")
+
+    def alter_table_online(self, table, alter_clause):
+        """Run ALTER TABLE without blocking writes: ALGORITHM=INSTANT, else
+        INPLACE with LOCK=NONE. Returns the algorithm used, or None when the
+        server can only do this change by copying the table."""
+        for algorithm, options in ONLINE_ALGORITHMS:
+            if algorithm == "instant" and not self._supports_instant_ddl():
+                continue
+            try:
+                self.run_ddl(f"ALTER TABLE {table} {options}, {alter_clause}")
+                return algorithm
+            except mysql_errors.Error as e:
+                if e.errno not in DDL_NOT_SUPPORTED:
+                    raise
+        return None
+
+    def _supports_instant_ddl(self):
+        version = self.conn.get_server_version() or ()
+        return tuple(version) >= INSTANT_DDL_MIN_VERSION
+
+    def _is_fk_violation(self, error):
+        return error.errno == FK_VIOLATION
+
+    def _table_exists(self, table):
+        self.cursor.execute(
+            """
+            SELECT TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+            (table,),
+        )
+        return self.cursor.fetchone() is not None
+
+    def ensure_error_search_index(self):
+        """Add the FULLTEXT index search_errors uses; rebuilds the table once"""
+        if self.is_partitioned():
+            # Not available on partitioned tables; failures are still searched
+            # through ft_error_signatures_errors
+            print(
+                "ℹ️ test_results is partitioned, "
+                "error search matches its rows without FULLTEXT"
             )
-
-            self.conn.commit()
-            return self.cursor.lastrowid
-
-        except Exception as e:
-            print(f"❌ Error getting/creating test book: {e}")
-            return 1  # Fallback to first book
-
-    def get_test_results(self, limit=100):
-        """Get recent test results"""
-        select_query = """
-        SELECT * FROM test_results 
-        ORDER BY test_datetime DESC 
-        LIMIT %s
+            return False
+        self.cursor.execute(
+            """
+            SELECT INDEX_NAME
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = 'test_results'
+            AND INDEX_NAME = 'ft_test_results_errors'
         """
-        try:
-            self.cursor.execute(select_query, (limit,))
-            return self.cursor.fetchall()
-        except Exception as e:
-            print(f"❌ Error fetching test results: {e}")
-            return []
-
-    def get_test_statistics(self):
-        """Get test statistics"""
-        stats_query = """
-        SELECT 
-            COUNT(*) as total_tests,
-            SUM(CASE WHEN test_status = 'PASSED' THEN 1 ELSE 0 END) as passed_tests,
-            SUM(CASE WHEN test_status = 'FAILED' THEN 1 ELSE 0 END) as failed_tests,
-            SUM(CASE WHEN test_status = 'SKIPPED' THEN 1 ELSE 0 END) as skipped_tests,
-            SUM(CASE WHEN test_status = 'ERROR' THEN 1 ELSE 0 END) as error_tests
-        FROM test_results
+        )
+        if self.cursor.fetchall():
+            return False
+        self.cursor.execute(
+            "ALTER TABLE test_results ADD FULLTEXT INDEX ft_test_results_errors "
+            "(error_summary, error_message)"
+        )
+        self.conn.commit()
+        print("SUCCESS: Added ft_test_results_errors index to test_results table")
+        return True
+
+    def _error_search_query(self, terms, conditions, args, limit):
+        signature_match = (
+            "MATCH(es.error_summary, es.error_message) "
+            "AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        )
+        columns = (
+            "tr.id, tr.test_case_name, tr.module_name, tr.test_status, "
+            "tr.device_name, tr.test_datetime, tr.error_summary"
+        )
+        unsigned = ["tr.error_signature_id IS NULL"]
+        text = " ".join(terms)
+        if self.is_partitioned():
+            # No FULLTEXT on test_results: score its own rows by the number of
+            # terms they contain; since/until still prune the partitions read.
+            # Fingerprinted rows are found through their signature only.
+            error_text = "CONCAT_WS(' ', tr.error_summary, tr.error_message)"
+            row_match = "(" + " + ".join([f"({error_text} LIKE %s)"] * len(terms)) + ")"
+            patterns = tuple(f"%{term}%" for term in terms)
+            query = f"""
+                SELECT {columns}, tr.error_message, {row_match} AS score
+                FROM test_results tr
+                WHERE {" AND ".join(
+                    [f"{row_match} > 0", "tr.error_message IS NOT NULL"]
+                    + unsigned
+                    + conditions
+                )}
+                UNION ALL
+                SELECT {columns}, es.error_message, {signature_match} AS score
+                FROM error_signatures es
+                JOIN test_results tr ON tr.error_signature_id = es.id
+                WHERE {" AND ".join([signature_match] + conditions)}
+                ORDER BY score DESC, id DESC
+                LIMIT %s
+            """
+            return query, (*patterns, *patterns, *args, text, text, *args, limit)
+
+        row_match = (
+            "MATCH(tr.error_summary, tr.error_message) "
+            "AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        )
+        query = f"""
+            SELECT {columns}, tr.error_message, {row_match} AS score
+            FROM test_results tr
+            WHERE {" AND ".join([row_match] + unsigned + conditions)}
+            UNION ALL
+            SELECT {columns}, es.error_message, {signature_match} AS score
+            FROM error_signatures es
+            JOIN test_results tr ON tr.error_signature_id = es.id
+            WHERE {" AND ".join([signature_match] + conditions)}
+            ORDER BY score DESC, id DESC
+            LIMIT %s
         """
-        try:
-            self.cursor.execute(stats_query)
-            return self.cursor.fetchone()
-        except Exception as e:
-            print(f"❌ Error fetching test statistics: {e}")
-            return None
+        return query, (text, text, *args, text, text, *args, limit)
+
+    def _streaming_cursor(self):
+        return self.conn.cursor(dictionary=True, buffered=False)
+
+    def _explain(self, query, args=()):
+        self.cursor.execute(f"EXPLAIN {query}", args)
+        plan = []
+        for row in self.cursor.fetchall():
+            table, access, extra = row["table"] or "-", row["type"], row["Extra"] or ""
+            problems = []
+            # <derived2>, <union1,2>: reads of a subquery's result
+            if not table.startswith("<"):
+                if access == "ALL":
+                    problems.append("full scan")
+                elif access == "index":
+                    problems.append("index scan")
+            if "Using filesort" in extra:
+                problems.append("sort")
+            if "Using temporary" in extra:
+                problems.append("temporary")
+            key = row["key"] or "-"
+            step = f"{table}: {access} key={key} rows={row['rows']} {extra}"
+            plan.append((step.strip(), problems))
+        return plan
+
+    def _table_indexes(self, table):
+        self.cursor.execute(
+            """
+            SELECT INDEX_NAME, COLUMN_NAME
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+            ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """,
+            (table,),
+        )
+        indexes = {}
+        for row in self.cursor.fetchall():
+            indexes.setdefault(row["INDEX_NAME"], []).append(row["COLUMN_NAME"])
+        return indexes
+
+    def _begin(self):
+        # Pooled connections autocommit; group the rollup statements explicitly
+        self.conn.start_transaction()
+
+    def _archived_until(self):
+        return archived_until(self)
 
     def close(self):
         try:
@@ -528,6 +503,6 @@ class MySQLHelper:
                 except:
                     pass
             self.cursor.close()
-            self.conn.close()
+            release_connection(self.conn)
         except Exception as e:
             print(f"Warning: Error closing database connection: {e}")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Error fingerprinting for failed test results.
+
+The same Selenium failure produces a slightly different longrepr on every
+run: element ids, session ids, memory addresses, timestamps, runner paths
+and line numbers change while the failure itself does not. fingerprint_error
+strips that noise and hashes what is left, so every occurrence of one failure
+maps to one row in error_signatures. test_results rows reference the
+signature by id instead of storing the whole traceback again.
+"""
+
+import hashlib
+import re
+
+# Only these statuses carry tracebacks; other rows (log captures, reports)
+# keep their error_message text as it is
+FINGERPRINTED_STATUSES = ("FAILED", "ERROR")
+
+# Applied in order; each pattern's matches are replaced by a placeholder
+NORMALISATION_RULES = [
+    # Timestamps and dates
+    (
+        re.compile(
+            r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+        ),
+        "<time>",
+    ),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:\.\d+)?\b"), "<time>"),
+    # UUIDs and WebDriver session / element ids
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I
+        ),
+        "<id>",
+    ),
+    (re.compile(r"\b[0-9a-f]{16,}\b", re.I), "<id>"),
+    (re.compile(r"\b[0-9A-F]{16,}_element_\d+\b", re.I), "<id>"),
+    # Memory addresses and chromedriver stack frames
+    (re.compile(r"\b0x[0-9a-f]+\b", re.I), "<addr>"),
+    (re.compile(r"^(?:E)?\s*#\d+\s+.*$", re.M), "<frame>"),
+    # Runner-specific paths (not URLs): keep the file name only
+    (re.compile(r"(?<![:/\w])(?:[A-Za-z]:)?(?:[\\/][\w.@~-]+)+[\\/]([\w.-]+)"), r"\1"),
+    # Line numbers in tracebacks ("line 42", "test_x.py:42:")
+    (re.compile(r"\bline \d+\b"), "line <n>"),
+    (re.compile(r"(\.py):\d+"), r"\1:<n>"),
+    # Remaining numbers (ports, durations, counters)
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "<n>"),
+]
+
+
+def normalise_error(error_message):
+    """error_message with run-specific noise replaced by placeholders"""
+    text = str(error_message)
+    for pattern, replacement in NORMALISATION_RULES:
+        text = pattern.sub(replacement, text)
+    # Collapse repeated frames and whitespace
+    text = re.sub(r"(?:<frame>\s*)+", "<frame>\n", text)
+    return "\n".join(
+        " ".join(line.split()) for line in text.splitlines() if line.strip()
+    )
+
+
+def fingerprint_error(error_message):
+    """SHA-1 hex digest identifying the failure behind error_message"""
+    return hashlib.sha1(normalise_error(error_message).encode("utf-8")).hexdigest()
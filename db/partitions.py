@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Monthly partitions of test_results (MySQL).
+
+test_results is partitioned BY RANGE COLUMNS(test_datetime), one partition
+per month: p202610 holds October 2026, p_start everything before the first
+month and p_future everything from the last month on. Queries filtering on
+test_datetime only read the partitions of the months they cover.
+
+ensure_partitions keeps PARTITION_MONTHS_AHEAD empty months ready by
+splitting p_future. archive_partitions moves months older than the retention
+window out of test_results, without deleting rows one by one:
+
+- tables: EXCHANGE PARTITION swaps the month into its own table
+  (test_results_archive_p202601), which is then compressed
+- export: the month is streamed to a gzip'ed JSONL file first
+
+Either way the emptied partition is dropped, which costs the same for any
+number of rows. Archived months are listed in test_results_archives. The
+daily rollups keep their history; rebuild_rollups does not recompute days
+before the last archived month.
+
+Partitioning is opt-in (TEST_RESULTS_PARTITIONING=true): MySQL allows no
+FULLTEXT index on a partitioned table, so search_errors then matches the rows
+of test_results without a fingerprint by a LIKE scan of the months it covers
+instead of ft_test_results_errors. Fingerprinted failures are still found
+through the FULLTEXT index of error_signatures.
+"""
+
+import gzip
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+PARTITIONING = os.getenv("TEST_RESULTS_PARTITIONING", "false").lower() == "true"
+PARTITION_MONTHS_AHEAD = int(os.getenv("TEST_RESULTS_PARTITION_MONTHS_AHEAD", "3"))
+RETENTION_MONTHS = int(os.getenv("TEST_RESULTS_RETENTION_MONTHS", "12"))
+ARCHIVE_DIR = os.getenv("TEST_RESULTS_ARCHIVE_DIR", "archive/test_results")
+EXPORT_FETCH_SIZE = 1000
+
+ARCHIVES_TABLE = """
+CREATE TABLE IF NOT EXISTS test_results_archives (
+    partition_name VARCHAR(20) PRIMARY KEY,
+    range_start DATE NULL COMMENT 'NULL for p_start',
+    range_end DATE NOT NULL COMMENT 'Exclusive',
+    row_count INT NOT NULL,
+    method VARCHAR(10) NOT NULL COMMENT 'tables or export',
+    location VARCHAR(500) NOT NULL COMMENT 'Archive table or export file',
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def month_partitions(first_month, last_month):
+    """PARTITION definitions for each month from first_month to last_month"""
+    definitions = []
+    month = first_month
+    while month <= last_month:
+        next_month = add_months(month, 1)
+        definitions.append(
+            f"PARTITION {partition_name(month)} VALUES LESS THAN ('{next_month}')"
+        )
+        month = next_month
+    return definitions
+
+
+def partition_clause(first_month, last_month):
+    """PARTITION BY clause for first_month..last_month, with p_start and p_future"""
+    definitions = (
+        [f"PARTITION p_start VALUES LESS THAN ('{first_month}')"]
+        + month_partitions(first_month, last_month)
+        + ["PARTITION p_future VALUES LESS THAN (MAXVALUE)"]
+    )
+    return (
+        "PARTITION BY RANGE COLUMNS(test_datetime) (\n    "
+        + ",\n    ".join(definitions)
+        + "\n)"
+    )
+
+
+def list_partitions(helper):
+    """[(name, upper bound date or None for MAXVALUE, approximate rows)] in order"""
+    helper.cursor.execute(
+        """
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = 'test_results'
+        AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """
+    )
+    partitions = []
+    for row in helper.cursor.fetchall():
+        bound = row["PARTITION_DESCRIPTION"].strip("'")
+        upper = None if bound == "MAXVALUE" else date.fromisoformat(bound[:10])
+        partitions.append((row["PARTITION_NAME"], upper, row["TABLE_ROWS"]))
+    return partitions
+
+
+def ensure_partitions(helper, months_ahead=PARTITION_MONTHS_AHEAD, today=None):
+    """Split p_future so every month up to months_ahead has its own partition;
+    returns the partitions added"""
+    partitions = list_partitions(helper)
+    if not partitions:
+        return []
+    last_bound = max(upper for _, upper, _ in partitions if upper)
+    target = add_months(month_start(today or date.today()), months_ahead)
+    if last_bound > target:
+        return []
+    definitions = month_partitions(last_bound, target)
+    # p_future is empty while it is kept ahead of time, so this moves no rows
+    helper.run_ddl(
+        "ALTER TABLE test_results REORGANIZE PARTITION p_future INTO (\n    "
+        + ",\n    ".join(
+            definitions + ["PARTITION p_future VALUES LESS THAN (MAXVALUE)"]
+        )
+        + "\n)"
+    )
+    added = [definition.split()[1] for definition in definitions]
+    print(f"[🗂️] Added test_results partition(s): {', '.join(added)}")
+    return added
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return (
+            value.isoformat(sep=" ")
+            if isinstance(value, datetime)
+            else value.isoformat()
+        )
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _export_partition(helper, name, archive_dir):
+    """Stream partition name to <archive_dir>/test_results-<name>.jsonl.gz.
+
+    Returns (path, rows).
+    """
+    path = Path(archive_dir) / f"test_results-{name}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    rows = 0
+    # Failures keep their traceback in error_signatures; the export carries it
+    # so the file stands on its own
+    cursor = helper._streaming_cursor()
+    try:
+        cursor.execute(
+            f"""
+            SELECT tr.*, COALESCE(tr.error_message, es.error_message) AS error_message
+            FROM test_results PARTITION ({name}) tr
+            LEFT JOIN error_signatures es ON es.id = tr.error_signature_id
+            ORDER BY tr.id
+            """
+        )
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            while True:
+                batch = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                if not batch:
+                    break
+                for row in batch:
+                    f.write(
+                        json.dumps({k: _json_value(v) for k, v in row.items()}) + "\n"
+                    )
+                rows += len(batch)
+    finally:
+        try:
+            cursor.fetchall()
+        except Exception:
+            pass
+        cursor.close()
+    with open(tmp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path, rows
+
+
+def _exchange_partition(helper, name):
+    """Swap partition name into its own compressed table; returns (table, rows)"""
+    table = f"test_results_archive_{name}"
+    cursor = helper.cursor
+    cursor.execute(f"CREATE TABLE {table} LIKE test_results")
+    try:
+        cursor.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        # Metadata only: the partition's rows become the (empty) table's and back
+        helper.run_ddl(
+            f"ALTER TABLE test_results EXCHANGE PARTITION {name} WITH TABLE {table}"
+        )
+    except Exception:
+        # Still empty; left behind it would make the next run's CREATE fail
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        raise
+    # Rebuilds the archive table only; test_results is not touched. The rows
+    # are archived either way, so a failure only leaves the table uncompressed
+    try:
+        cursor.execute(f"ALTER TABLE {table} ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8")
+    except Exception as e:
+        print(f"[⚠️] {table} left uncompressed: {e}")
+    cursor.execute(f"SELECT COUNT(*) AS count FROM {table}")
+    return table, cursor.fetchone()["count"]
+
+
+def archive_partitions(
+    helper,
+    retention_months=RETENTION_MONTHS,
+    export=False,
+    archive_dir=ARCHIVE_DIR,
+    today=None,
+):
+    """Archive and drop the partitions of months older than retention_months;
+    returns [(partition, rows, location)]"""
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    helper.cursor.execute(ARCHIVES_TABLE)
+    helper.cursor.execute("SELECT partition_name FROM test_results_archives")
+    done = {row["partition_name"] for row in helper.cursor.fetchall()}
+    archived = []
+    for name, upper, _ in list_partitions(helper):
+        # p_start stays as the (empty) lower bound once it has been archived
+        if upper is None or upper > cutoff or name in done:
+            continue
+        if export:
+            location, rows = _export_partition(helper, name, archive_dir)
+        else:
+            location, rows = _exchange_partition(helper, name)
+        range_start = None if name == "p_start" else add_months(upper, -1)
+        helper.cursor.execute(
+            """
+            INSERT INTO test_results_archives
+                (partition_name, range_start, range_end, row_count, method, location)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+            (
+                name,
+                range_start,
+                upper,
+                rows,
+                "export" if export else "tables",
+                str(location),
+            ),
+        )
+        helper.conn.commit()
+        # Exchanged partitions are empty already; months are dropped, p_start
+        # is kept as the lower bound
+        if name != "p_start":
+            helper.run_ddl(f"ALTER TABLE test_results DROP PARTITION {name}")
+        elif export:
+            helper.run_ddl("ALTER TABLE test_results TRUNCATE PARTITION p_start")
+        archived.append((name, rows, location))
+        print(f"[📦] Archived {name}: {rows} row(s) -> {location}")
+    return archived
+
+
+def archived_until(helper):
+    """End (exclusive) of the last archived month, or None"""
+    if not helper._table_exists("test_results_archives"):
+        return None
+    helper.cursor.execute(
+        "SELECT MAX(range_end) AS archived_until FROM test_results_archives"
+    )
+    row = helper.cursor.fetchone()
+    return row["archived_until"] if row else None
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Query inventory and index advisor for test_results.
+
+inventory() lists every SQL statement in the db/, scripts/ and database/
+sources: string literals and f-strings (module-level string constants are
+filled in), with the tables each one touches.
+
+workload() builds the queries the viewers and the result writer run against
+test_results, from the same functions that run them. advise() EXPLAINs each
+one on the current backend, reports full scans and sorts, and derives the
+index that would serve it: columns compared for equality first, then the
+ORDER BY/GROUP BY columns (or the first range column), then the remaining
+columns the query reads when at most COVERING_EXTRA_COLUMNS are left, so
+the index covers the query. The primary key is part of every index and is
+left off. Existing indexes that are a left prefix of another are reported as
+redundant.
+
+Usage:
+    python -m db.query_advisor [inventory | advise]
+"""
+
+import ast
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .result_store import (
+    ERROR_SEARCH_LIMIT,
+    RESULT_PAGE_SIZE,
+    RESULT_SELECT,
+    STATISTICS_QUERY,
+    TOP_SIGNATURES_QUERY,
+    error_search_filters,
+    get_result_store,
+    results_page_query,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SQL_PACKAGES = ("db", "scripts", "database")
+SQL_STATEMENT = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|CREATE|ALTER|DROP|TRUNCATE|RENAME"
+    r"|SHOW|DESCRIBE|EXPLAIN|SET|WITH)\b"
+)
+# Keywords are upper case and table names lower case throughout
+SQL_TABLE = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE(?: IF (?:NOT )?EXISTS)?)\s+`?([a-z_]\w*)"
+)
+
+# Workload: results of the last WORKLOAD_DAYS; module filters use the least
+# run module and device
+WORKLOAD_DAYS = 7
+FAILED_STATUSES = ("FAILED", "ERROR")
+SAMPLE_SEARCH_TEXT = "timeout element"
+
+# An index holding at most this many columns beyond the ones the query
+# filters and sorts on is worth making covering
+COVERING_EXTRA_COLUMNS = 2
+TEST_RESULT_COLUMNS = set(re.findall(r"\btr\.(\w+)", RESULT_SELECT))
+PRIMARY_KEY = "id"
+# TEXT: only indexable with a prefix length
+UNINDEXED_COLUMNS = {"error_message"}
+
+# A test_results column (bare or tr.) and the comparison it is used in
+PREDICATE = re.compile(
+    r"(?<![\w.])(?:tr\.)?(\w+)\s*(<=|>=|=|<|>|IN\s*\(|LIKE\b|IS NOT NULL\b)",
+    re.IGNORECASE,
+)
+COLUMN = re.compile(r"(?<![\w.])(?:tr\.)?(\w+)")
+CLAUSE_END = r"(?=\bWHERE\b|\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bHAVING\b|$)"
+
+
+# ----------------------
+# Inventory
+# ----------------------
+def _string_constants(tree):
+    """{name: text} of the module-level string constants"""
+    constants = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+        ):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+    return constants
+
+
+def _literal_text(node, constants):
+    """Text of a string literal or f-string; unknown placeholders become {...}"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            elif isinstance(value.value, ast.Name) and value.value.id in constants:
+                parts.append(constants[value.value.id])
+            else:
+                parts.append("{...}")
+        return "".join(parts)
+    return None
+
+
+def inventory(root=REPO_ROOT, packages=SQL_PACKAGES):
+    """[(location, statement kind, [tables], sql)] of the SQL in the sources"""
+    statements = []
+    for package in packages:
+        for path in sorted((Path(root) / package).rglob("*.py")):
+            tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+            constants = _string_constants(tree)
+            # The literal parts of an f-string are reported with the f-string
+            parts = {
+                id(value)
+                for node in ast.walk(tree)
+                if isinstance(node, ast.JoinedStr)
+                for value in node.values
+            }
+            for node in sorted(
+                (
+                    node
+                    for node in ast.walk(tree)
+                    if isinstance(node, (ast.Constant, ast.JoinedStr))
+                ),
+                key=lambda node: node.lineno,
+            ):
+                if id(node) in parts:
+                    continue
+                text = _literal_text(node, constants)
+                if not text:
+                    continue
+                sql = " ".join(text.split())
+                match = SQL_STATEMENT.match(sql)
+                if not match:
+                    continue
+                tables = sorted(set(SQL_TABLE.findall(sql)))
+                location = f"{path.relative_to(root)}:{node.lineno}"
+                statements.append((location, match.group(1), tables, sql))
+    return statements
+
+
+# ----------------------
+# Advisor
+# ----------------------
+def workload(helper):
+    """[(name, query, args)] the viewers and the result writer run on test_results"""
+    helper.cursor.execute(
+        "SELECT id, module_name, device_name, test_datetime, result_key "
+        "FROM test_results ORDER BY test_datetime DESC, id DESC LIMIT 1"
+    )
+    newest = helper.cursor.fetchone()
+    if not newest:
+        return []
+    newest_datetime = newest["test_datetime"]
+    if isinstance(newest_datetime, str):
+        newest_datetime = datetime.fromisoformat(newest_datetime)
+    since = (newest_datetime - timedelta(days=WORKLOAD_DAYS)).date()
+    # The rarest module on a device: the viewer reads the most rows to fill a page
+    helper.cursor.execute(
+        "SELECT module_name, device_name FROM test_results_daily "
+        "WHERE device_name <> '' GROUP BY module_name, device_name "
+        "ORDER BY SUM(result_count) LIMIT 1"
+    )
+    rarest = helper.cursor.fetchone() or newest
+    module, device = rarest["module_name"], rarest["device_name"]
+
+    conditions, args = error_search_filters(module, device, since)
+    search_terms = SAMPLE_SEARCH_TEXT.split()
+    return [
+        ("recent results", *results_page_query()),
+        (
+            "older page",
+            *results_page_query(
+                before=(newest_datetime - timedelta(days=WORKLOAD_DAYS), newest["id"])
+            ),
+        ),
+        ("failures", *results_page_query(FAILED_STATUSES)),
+        ("module on device", *results_page_query(module=module, device=device)),
+        (
+            "error search",
+            *helper._error_search_query(
+                search_terms, conditions, args, ERROR_SEARCH_LIMIT
+            ),
+        ),
+        (
+            "top signatures",
+            TOP_SIGNATURES_QUERY.format(
+                where="WHERE error_signature_id IS NOT NULL AND test_datetime >= %s"
+            ),
+            (since, 10),
+        ),
+        ("status counts", STATISTICS_QUERY.format(count="1", table="test_results"), ()),
+        (
+            "new results",
+            f"{RESULT_SELECT} WHERE tr.id > %s ORDER BY tr.id LIMIT %s",
+            (newest["id"], RESULT_PAGE_SIZE),
+        ),
+        (
+            "result key lookup",
+            "SELECT result_key FROM test_results WHERE result_key IN (%s)",
+            (newest["result_key"],),
+        ),
+    ]
+
+
+def _clause_columns(sql, keyword):
+    """test_results columns named in the keyword (e.g. ORDER BY) clauses, in order"""
+    columns = []
+    for clause in re.findall(rf"\b{keyword}\b(.*?){CLAUSE_END}", sql, re.DOTALL):
+        for column in COLUMN.findall(clause):
+            if column in TEST_RESULT_COLUMNS and column not in columns:
+                columns.append(column)
+    return columns
+
+
+def index_for(query):
+    """Columns of the index serving query, [] if the primary key does, or None
+    for full-text queries"""
+    key = []
+    for part in re.split(r"\bUNION ALL\b", query):
+        if "MATCH" in part or not re.search(r"\btest_results\b", part):
+            # Full-text matches come from their own index
+            continue
+        equal, ranges = [], []
+        for clause in re.findall(rf"\bWHERE\b(.*?){CLAUSE_END}", part, re.DOTALL):
+            for column, operator in PREDICATE.findall(clause):
+                if column not in TEST_RESULT_COLUMNS or column in UNINDEXED_COLUMNS:
+                    continue
+                operator = operator.upper()
+                # A prefix LIKE narrows the rows like an equality when the
+                # whole name is given
+                kind = equal if operator[:2] in ("=", "IN", "LI") else ranges
+                if column not in kind:
+                    kind.append(column)
+        equal = [column for column in equal if column not in ranges]
+        grouped = _clause_columns(part, "GROUP BY")
+        ordered = _clause_columns(part, "ORDER BY")
+
+        columns = list(equal)
+        if grouped:
+            columns += [column for column in grouped if column not in columns]
+        elif ordered and set(ranges) <= set(ordered):
+            columns += [column for column in ordered if column not in columns]
+        elif ranges:
+            columns.append(ranges[0])
+        while columns and columns[-1] == PRIMARY_KEY:
+            columns.pop()
+
+        read = [
+            column
+            for column in COLUMN.findall(part)
+            if column in TEST_RESULT_COLUMNS and column != PRIMARY_KEY
+        ]
+        extra = [column for column in dict.fromkeys(read) if column not in columns]
+        if (
+            extra
+            and len(extra) <= COVERING_EXTRA_COLUMNS
+            and not UNINDEXED_COLUMNS.intersection(extra)
+        ):
+            columns += extra
+        if len(columns) > len(key):
+            key = columns
+    if not key and "MATCH" in query:
+        return None
+    return key
+
+
+def index_name(columns):
+    """idx_test_results_<columns>, e.g. idx_test_results_module_device_datetime"""
+    short = [column.removeprefix("test_").removesuffix("_name") for column in columns]
+    return "idx_test_results_" + "_".join(short)
+
+
+def _served_by(indexes, columns):
+    """First index whose leading columns are columns"""
+    for index, index_columns in indexes.items():
+        if index_columns[: len(columns)] == list(columns):
+            return index
+    return None
+
+
+def time_query(helper, query, args=(), repeat=5):
+    """Median milliseconds of running query and reading all its rows"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        helper.cursor.execute(query, args)
+        helper.cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def advise(helper, queries=None):
+    """EXPLAIN the workload; returns (findings, proposed, redundant).
+
+    findings: [(name, plan, problems, index columns, serving index)]
+    proposed: {index: columns} to add; redundant: existing indexes to drop
+    """
+    queries = workload(helper) if queries is None else queries
+    indexes = helper._table_indexes("test_results")
+    findings, proposed = [], {}
+    for name, query, args in queries:
+        plan = helper._explain(query, args)
+        problems = sorted(
+            {problem for _, step_problems in plan for problem in step_problems}
+        )
+        columns = index_for(query)
+        if not columns:
+            serving = "full-text index" if columns is None else "primary key"
+        else:
+            serving = _served_by(indexes, columns) or _served_by(proposed, columns)
+            if not serving:
+                # A proposal that extends another replaces it
+                for index, index_columns in list(proposed.items()):
+                    if columns[: len(index_columns)] == index_columns:
+                        del proposed[index]
+                serving = index_name(columns)
+                proposed[serving] = columns
+        findings.append((name, plan, problems, columns, serving))
+
+    every_index = {**indexes, **proposed}
+    redundant = [
+        index
+        for index, columns in indexes.items()
+        if index.startswith("idx_")
+        and any(
+            other != index
+            and len(other_columns) > len(columns)
+            and other_columns[: len(columns)] == columns
+            for other, other_columns in every_index.items()
+        )
+    ]
+    return findings, proposed, redundant
+
+
+def print_advice(findings, proposed, redundant):
+    for name, plan, problems, columns, serving in findings:
+        flag = "[⚠️]" if problems and serving in proposed else "✅"
+        print(f"\n{flag} {name}: {', '.join(problems) or 'index access'}")
+        for step, _ in plan:
+            print(f"     {step}")
+        if columns:
+            note = " (proposed)" if serving in proposed else ""
+            print(f"     index ({', '.join(columns)}) -> {serving}{note}")
+        else:
+            print(f"     served by the {serving}")
+    print()
+    if proposed:
+        print("[🔧] Proposed indexes:")
+        for index, columns in proposed.items():
+            print(f"     ADD INDEX {index} ({', '.join(columns)})")
+    for index in redundant:
+        print(f"[🗑️] Redundant: DROP INDEX {index}")
+    if not proposed and not redundant:
+        print("✅ Every workload query is served by an index")
+
+
+def main():
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "advise"
+    if command == "inventory":
+        statements = inventory()
+        for location, kind, tables, sql in statements:
+            print(f"{location:<50} {kind:<8} {','.join(tables):<40} {sql[:80]}")
+        on_results = sum(
+            1 for _, _, tables, _ in statements if "test_results" in tables
+        )
+        print(f"\n[📊] {len(statements)} SQL statement(s), {on_results} on test_results")
+    elif command == "advise":
+        helper = get_result_store()
+        try:
+            print_advice(*advise(helper))
+        finally:
+            helper.close()
+    else:
+        print(f"❌ Unknown command: {command}")
+        print("Usage: python -m db.query_advisor [inventory | advise]")
+
+
+if __name__ == "__main__":
+    main()
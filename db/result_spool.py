@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Durable local spool for test results.
+
+Every result is appended to a per-process JSONL file before it is handed to
+the database writer, so a result is never lost when MySQL is unreachable or
+the run dies mid-flush. Appends are flushed immediately and fsync'ed in
+batches (every RESULT_SPOOL_FSYNC_EVERY records or RESULT_SPOOL_FSYNC_SECONDS).
+Each record carries a result_key that is stored in test_results.result_key
+(UNIQUE), which makes replays idempotent.
+
+Once the writer confirms a result was stored, the record is acknowledged.
+When the process closes its spool, acknowledged records are dropped and the
+file is deleted when nothing is left. Anything else stays on disk for replay:
+
+Usage:
+    python -m db.result_spool status
+    python -m db.result_spool replay [batch_size]
+"""
+
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+SPOOL_DIR = os.getenv("RESULT_SPOOL_DIR", ".cache/result_spool")
+FSYNC_EVERY = int(os.getenv("RESULT_SPOOL_FSYNC_EVERY", "20"))
+FSYNC_SECONDS = float(os.getenv("RESULT_SPOOL_FSYNC_SECONDS", "1"))
+REPLAY_BATCH_SIZE = 500
+
+# Windows process probing (see _pid_alive)
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+
+def new_result_key():
+    return uuid.uuid4().hex
+
+
+def _encode(result):
+    return {
+        k: v.isoformat(sep=" ") if isinstance(v, datetime) else v
+        for k, v in result.items()
+    }
+
+
+def _decode(result):
+    result = dict(result)
+    if isinstance(result.get("test_datetime"), str):
+        result["test_datetime"] = datetime.fromisoformat(result["test_datetime"])
+    return result
+
+
+class ResultSpool:
+    """Append-only JSONL spool owned by one process"""
+
+    def __init__(self, spool_dir=SPOOL_DIR):
+        self.spool_dir = Path(spool_dir)
+        self.path = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.time()
+        self._pending = set()
+
+    def _open(self):
+        if self._file is None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            name = (
+                f"results-{socket.gethostname()}-{os.getpid()}-{int(time.time())}.jsonl"
+            )
+            self.path = self.spool_dir / name
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def append(self, result_key, result):
+        """Persist one result before it is sent to the database"""
+        line = json.dumps({"result_key": result_key, "result": _encode(result)})
+        with self._lock:
+            f = self._open()
+            f.write(line + "\n")
+            f.flush()
+            self._pending.add(result_key)
+            self._unsynced += 1
+            if (
+                self._unsynced >= FSYNC_EVERY
+                or time.time() - self._last_sync > FSYNC_SECONDS
+            ):
+                self._sync()
+
+    def ack(self, result_keys):
+        """Mark results as stored in the database"""
+        with self._lock:
+            self._pending.difference_update(result_keys)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        """Drop acknowledged records; keep the file only if some are left for replay"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync()
+            self._file.close()
+            self._file = None
+
+            if not self._pending:
+                self.path.unlink()
+                return
+            records = [
+                line
+                for line in self.path.read_text(encoding="utf-8").splitlines()
+                if line.strip() and json.loads(line)["result_key"] in self._pending
+            ]
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(records) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            print(
+                f"[💾] {len(records)} unsaved result(s) kept in {self.path} for replay"
+            )
+
+
+def _owner_alive(path):
+    """True if the spool file belongs to a still-running process on this host"""
+    match = re.fullmatch(r"results-(.+)-(\d+)-(\d+)", path.stem)
+    if not match or match.group(1) != socket.gethostname():
+        return False
+    return _pid_alive(int(match.group(2)))
+
+
+def _pid_alive(pid):
+    """True if a process with this id is running"""
+    if os.name == "nt":
+        # os.kill(pid, 0) sends CTRL_C_EVENT on Windows instead of probing
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        # Running, but owned by another user
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def spooled_files(spool_dir=SPOOL_DIR):
+    """Spool files no running process is writing to"""
+    return [
+        p
+        for p in sorted(Path(spool_dir).glob("results-*.jsonl"))
+        if not _owner_alive(p)
+    ]
+
+
+def _read_records(path):
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # A torn final line from a crash; everything before it is intact
+            print(f"[⚠️] Skipping unreadable spool line in {path.name}")
+    return records
+
+
+def replay(helper=None, batch_size=REPLAY_BATCH_SIZE, spool_dir=SPOOL_DIR):
+    """Drain spooled results into the database; returns (stored, skipped)"""
+    from .result_store import get_result_store
+
+    own_helper = helper is None
+    helper = helper or get_result_store()
+    stored = skipped = 0
+    try:
+        for path in spooled_files(spool_dir):
+            # Claim the file so a concurrent replay does not pick it up too
+            claimed = path.with_suffix(f".replaying-{os.getpid()}")
+            try:
+                os.replace(path, claimed)
+            except OSError:
+                continue
+
+            records = _read_records(claimed)
+            try:
+                for i in range(0, len(records), batch_size):
+                    batch = records[i : i + batch_size]
+                    keys = [r["result_key"] for r in batch]
+                    existing = helper.existing_result_keys(keys)
+                    fresh = [r for r in batch if r["result_key"] not in existing]
+                    rows = []
+                    for record in fresh:
+                        rows.extend(
+                            helper.build_result_rows(
+                                **_decode(record["result"]),
+                                result_key=record["result_key"],
+                            )
+                        )
+                    written = helper.write_rows(rows, ignore_duplicates=True)
+                    if rows and written.get("test_results", 0) == 0:
+                        raise RuntimeError("test_results insert failed")
+                    stored += len(fresh)
+                    skipped += len(batch) - len(fresh)
+            except Exception as e:
+                os.replace(claimed, path)
+                print(
+                    f"[❌] Replay of {path.name} failed, file kept: "
+                    f"{type(e).__name__} – {e}"
+                )
+                continue
+            claimed.unlink()
+            print(f"[✅] Replayed {path.name}: {len(records)} record(s)")
+    finally:
+        if own_helper:
+            helper.close()
+    print(f"[📊] Replay done: {stored} stored, {skipped} already in the database")
+    return stored, skipped
+
+
+def main():
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "status"
+    if command == "replay":
+        batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else REPLAY_BATCH_SIZE
+        replay(batch_size=batch_size)
+    elif command == "status":
+        files = spooled_files()
+        total = sum(len(_read_records(p)) for p in files)
+        print(
+            f"[📊] {total} spooled result(s) in {len(files)} file(s) under {SPOOL_DIR}"
+        )
+    else:
+        print(f"❌ Unknown command: {command}")
+        print("Usage: python -m db.result_spool [status | replay [batch_size]]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1524 @@
+#!/usr/bin/env python3
+"""
+Backend-independent part of the result storage API.
+
+ResultStore holds everything MySQLHelper and SQLiteHelper share: turning a
+test result into rows for test_results/orders/subscriptions/users, batched
+writes, reference id caching, error fingerprinting and the read queries.
+Statements use MySQL's %s placeholders; the SQLite backend translates them.
+A backend supplies the connection, its schema DDL, its IntegrityError class
+and how to recognise a foreign key failure.
+
+Every write also updates the daily rollups (test_results_daily and its
+duration histogram), which get_test_statistics and the viewers read instead
+of scanning test_results.
+
+get_result_store() returns the backend chosen by TEST_RESULTS_BACKEND
+(mysql, the default, or sqlite).
+"""
+
+import calendar
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from .error_signatures import FINGERPRINTED_STATUSES, fingerprint_error
+
+TEST_RESULTS_BACKEND = os.getenv("TEST_RESULTS_BACKEND", "mysql").lower()
+
+TEST_USERNAME = "test_user"
+TEST_BOOK_ISBN = "978-TEST-1234"
+
+# Reference ids are resolved once per process and persisted so later runs skip
+# the lookups too; a foreign key failure invalidates them
+REFERENCE_ID_CACHE_PATH = os.getenv(
+    "REFERENCE_ID_CACHE_FILE", ".cache/reference_ids.json"
+)
+_reference_ids = {}
+_reference_lock = threading.Lock()
+
+
+def _load_reference_ids():
+    try:
+        with open(REFERENCE_ID_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_reference_ids():
+    path = Path(REFERENCE_ID_CACHE_PATH)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with _reference_lock:
+            data = json.dumps(_reference_ids, indent=2, sort_keys=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[WARNING] Could not save reference id cache: {e}")
+
+
+# error_signatures ids by (db_key, signature) with their error_summary; a
+# signature row never changes once written
+_error_signature_ids = {}
+_error_signature_lock = threading.Lock()
+
+
+# Statements shared by the single-row and the batched (executemany) write paths
+INSERT_STATEMENTS = {
+    "test_results": """
+        INSERT INTO test_results (test_case_name, module_name, test_status,
+                                  test_datetime, error_message, error_summary,
+                                  total_time_duration, device_name, screen_resolution,
+                                  error_link, result_key, test_category, plan_type,
+                                  error_signature_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    "orders": """
+        INSERT INTO orders (order_number, user_id, book_id, order_type, amount,
+                            payment_method, payment_status, order_status,
+                            order_date, completed_date)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    "subscriptions": """
+        INSERT INTO subscriptions (user_id, subscription_type, status, start_date,
+                                   end_date, amount, auto_renew, payment_method)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    "users": """
+        INSERT INTO users (username, email, password_hash, first_name, last_name,
+                           university, user_type, is_active)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+}
+
+# Value positions of the cached reference ids in each table's rows
+REFERENCE_COLUMNS = {
+    "orders": {1: "user", 2: "book"},
+    "subscriptions": {0: "user"},
+}
+
+
+# Test type keywords, checked in order against the test and module name; the
+# first match decides the category and, for subscriptions, the plan type
+TEST_CATEGORIES = [
+    ("book", "book", None),
+    ("monthly", "subscription", "monthly"),
+    ("six_month", "subscription", "six_month"),
+    ("three_month", "subscription", "three_month"),
+    ("popular", "subscription", "popular"),
+    ("onetime", "subscription", "onetime"),
+    ("user", "user", None),
+]
+
+
+def classify_test(test_case_name, module_name):
+    """(test_category, plan_type) stored with each result"""
+    # The space keeps keywords from matching across the two names
+    name = f"{test_case_name} {module_name}".lower()
+    for keyword, category, plan_type in TEST_CATEGORIES:
+        if keyword in name:
+            return category, plan_type
+    return "general", None
+
+
+# Package prefixes dropped from module names, longest first
+MODULE_NAME_PREFIXES = ("tests.test_", "tests.", "test.")
+
+
+def clean_test_case_name(test_case_name):
+    """test_case_name without the parametrize id: test_login[mobile] -> test_login"""
+    return re.sub(r"\[.*?\]", "", test_case_name).strip(" _")
+
+
+# Daily rollups: one row per day x module x device x category x status.
+# Missing device/category/plan values are stored as '' so they can be part of
+# the primary key
+ROLLUP_KEY = (
+    "stat_date",
+    "module_name",
+    "device_name",
+    "test_category",
+    "plan_type",
+    "test_status",
+)
+
+# Upper bounds (seconds) of the duration histogram buckets p95 is read from;
+# the last bucket holds everything slower
+DURATION_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, 600, 1200)
+DURATION_BUCKET_SQL = (
+    "CASE "
+    + " ".join(
+        f"WHEN total_time_duration <= {bound} THEN {index}"
+        for index, bound in enumerate(DURATION_BUCKETS)
+    )
+    + f" ELSE {len(DURATION_BUCKETS)} END"
+)
+
+# {count} is 1 on test_results and result_count on test_results_daily
+STATISTICS_QUERY = """
+SELECT
+    COALESCE(SUM({count}), 0) as total_tests,
+    COALESCE(SUM(CASE WHEN test_status = 'PASSED' THEN {count} ELSE 0 END), 0)
+        as passed_tests,
+    COALESCE(SUM(CASE WHEN test_status = 'FAILED' THEN {count} ELSE 0 END), 0)
+        as failed_tests,
+    COALESCE(SUM(CASE WHEN test_status = 'SKIPPED' THEN {count} ELSE 0 END), 0)
+        as skipped_tests,
+    COALESCE(SUM(CASE WHEN test_status = 'ERROR' THEN {count} ELSE 0 END), 0)
+        as error_tests
+FROM {table}
+"""
+
+# {where} selects the test_results rows counted
+TOP_SIGNATURES_QUERY = """
+SELECT es.id, es.signature, es.error_summary, es.first_seen,
+       counts.occurrences, counts.last_seen
+FROM (
+    SELECT error_signature_id, COUNT(*) as occurrences, MAX(test_datetime) as last_seen
+    FROM test_results
+    {where}
+    GROUP BY error_signature_id
+) counts
+JOIN error_signatures es ON es.id = counts.error_signature_id
+ORDER BY counts.occurrences DESC, counts.last_seen DESC
+LIMIT %s
+"""
+
+
+# test_results columns for readers; failed rows keep their traceback in
+# error_signatures
+RESULT_SELECT = """
+    SELECT tr.id, tr.test_case_name, tr.module_name, tr.test_status, tr.test_datetime,
+           COALESCE(tr.error_message, es.error_message) AS error_message,
+           tr.error_summary, tr.total_time_duration, tr.device_name,
+           tr.screen_resolution, tr.error_link, tr.result_key, tr.test_category,
+           tr.plan_type, tr.error_signature_id, tr.created_at
+    FROM test_results tr
+    LEFT JOIN error_signatures es ON es.id = tr.error_signature_id
+"""
+
+# Result paging: pages are read with keyset conditions and streamed from the
+# server STREAM_FETCH_SIZE rows at a time
+RESULT_PAGE_SIZE = 200
+STREAM_FETCH_SIZE = 100
+FOLLOW_POLL_SECONDS = float(os.getenv("RESULT_FOLLOW_POLL_SECONDS", "2"))
+
+# Composite indexes for the viewer queries, as proposed by db.query_advisor:
+# (index, columns). The primary key follows in every index, so pages ordered
+# by (test_datetime, id) read them in order. Schema migration 007 adds them to
+# existing MySQL tables and drops REPLACED_INDEXES, which they make redundant
+QUERY_INDEXES = (
+    # results of one module on one device, newest first; error search filters
+    (
+        "idx_test_results_module_device_datetime",
+        ("module_name", "device_name", "test_datetime"),
+    ),
+    # failures newest first; covers the status counts
+    ("idx_test_results_status_datetime", ("test_status", "test_datetime")),
+)
+REPLACED_INDEXES = (("idx_test_results_status", ("test_status",)),)
+
+
+def results_page_query(
+    statuses=None,
+    module=None,
+    device=None,
+    since=None,
+    before=None,
+    size=RESULT_PAGE_SIZE,
+):
+    """(query, args) of one iter_test_results page, newest first"""
+    conditions, args = [], []
+    if module:
+        conditions.append("tr.module_name = %s")
+        args.append(module)
+    if device:
+        conditions.append("tr.device_name = %s")
+        args.append(device)
+    if statuses:
+        conditions.append(f"tr.test_status IN ({', '.join(['%s'] * len(statuses))})")
+        args.extend(statuses)
+    if since:
+        conditions.append("tr.test_datetime >= %s")
+        args.append(since)
+    if before:
+        conditions.append(
+            "(tr.test_datetime < %s OR (tr.test_datetime = %s AND tr.id < %s))"
+        )
+        args.extend([before[0], before[0], before[1]])
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return (
+        f"{RESULT_SELECT} {where} ORDER BY tr.test_datetime DESC, tr.id DESC LIMIT %s",
+        (*args, size),
+    )
+
+
+def error_search_filters(module=None, device=None, since=None, until=None):
+    """(conditions, args) narrowing search_errors; since/until are inclusive dates"""
+    if isinstance(since, str):
+        since = date.fromisoformat(since)
+    if isinstance(until, str):
+        until = date.fromisoformat(until)
+    conditions, args = [], []
+    if module:
+        conditions.append("tr.module_name LIKE %s")
+        args.append(f"{module}%")
+    if device:
+        conditions.append("tr.device_name = %s")
+        args.append(device)
+    if since:
+        conditions.append("tr.test_datetime >= %s")
+        args.append(since)
+    if until:
+        conditions.append("tr.test_datetime < %s")
+        args.append(until + timedelta(days=1))
+    return conditions, args
+
+
+def page_position(row):
+    """Printable (test_datetime, id) position of a row, see parse_page_position"""
+    test_datetime = row["test_datetime"]
+    if isinstance(test_datetime, datetime):
+        test_datetime = test_datetime.isoformat()
+    return f"{str(test_datetime).replace(' ', 'T')}/{row['id']}"
+
+
+def parse_page_position(text):
+    """(test_datetime, id) from a page_position string"""
+    test_datetime, _, row_id = text.rpartition("/")
+    return datetime.fromisoformat(test_datetime), int(row_id)
+
+
+# Error search: matches are ranked by the backend's full-text index and shown
+# with a snippet of the error text around the first hit
+ERROR_SEARCH_LIMIT = 20
+SNIPPET_WIDTH = 160
+
+
+def search_terms(text):
+    """Words of a search query, as the full-text indexes tokenise them"""
+    return re.findall(r"\w+", text.lower())
+
+
+def highlight_snippet(text, terms, width=SNIPPET_WIDTH):
+    """About width characters of text around the first term, with matches in **"""
+    if not text:
+        return ""
+    text = " ".join(str(text).split())
+    pattern = (
+        re.compile(
+            r"\b(?:%s)\b" % "|".join(re.escape(term) for term in terms), re.IGNORECASE
+        )
+        if terms
+        else None
+    )
+    match = pattern.search(text) if pattern else None
+    start = max(0, match.start() - width // 3) if match else 0
+    snippet = text[start : start + width]
+    if pattern:
+        snippet = pattern.sub(lambda m: f"**{m.group(0)}**", snippet)
+    return (
+        ("..." if start else "")
+        + snippet
+        + ("..." if start + width < len(text) else "")
+    )
+
+
+def duration_percentile(buckets, fraction, max_duration=None):
+    """Approximate percentile from {bucket: count}: the upper bound of its bucket"""
+    total = sum(buckets.values())
+    if not total:
+        return None
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        if seen >= fraction * total:
+            bound = (
+                DURATION_BUCKETS[bucket]
+                if bucket < len(DURATION_BUCKETS)
+                else max_duration
+            )
+            if max_duration is None:
+                return bound
+            return min(bound, max_duration)
+
+
+def get_result_store():
+    """New helper for the configured TEST_RESULTS_BACKEND"""
+    if TEST_RESULTS_BACKEND == "sqlite":
+        from .sqlite_helper import SQLiteHelper
+
+        return SQLiteHelper()
+    if TEST_RESULTS_BACKEND != "mysql":
+        raise ValueError(f"Unknown TEST_RESULTS_BACKEND: {TEST_RESULTS_BACKEND}")
+    from .db_helper import MySQLHelper
+
+    return MySQLHelper()
+
+
+class ResultStore:
+    """Result storage shared by the MySQL and SQLite backends"""
+
+    # Set by each backend
+    IntegrityError = Exception
+    db_key = None
+    ROLLUP_TABLES = ()
+    ROLLUP_UPSERTS = {}
+    NAME_REWRITE_TABLE = None
+    NAME_REWRITE_UPDATE = None
+
+    def ensure_connection(self):
+        """Hook for backends whose connections can go stale"""
+
+    def _is_fk_violation(self, error):
+        return False
+
+    def _create_error_summary(self, error_message):
+        """Create a short error summary from the full error message"""
+        if not error_message:
+            return None
+
+        import re
+
+        # Common error patterns to extract short messages
+        error_patterns = [
+            r"ElementClickInterceptedException: (.+?)(?:\n|$)",
+            r"NoSuchElementException: (.+?)(?:\n|$)",
+            r"TimeoutException: (.+?)(?:\n|$)",
+            r"AssertionError: (.+?)(?:\n|$)",
+            r"WebDriverException: (.+?)(?:\n|$)",
+            r"Exception: (.+?)(?:\n|$)",
+            r"Message: (.+?)(?:\n|$)",  # Selenium/WebDriver error
+        ]
+
+        for pattern in error_patterns:
+            match = re.search(pattern, str(error_message))
+            if match:
+                summary = match.group(1).strip()
+                return summary[:250] if len(summary) > 250 else summary
+
+        # If no pattern matches, take the first line and limit to 250 characters
+        first_line = str(error_message).split("\n")[0].strip()
+        return first_line[:250] if len(first_line) > 250 else first_line
+
+    @staticmethod
+    def _clean_module_name(module_name):
+        """Remove common test prefixes from a module name"""
+        for prefix in MODULE_NAME_PREFIXES:
+            if module_name.startswith(prefix):
+                return module_name[len(prefix) :]
+        return module_name
+
+    def _test_result_row(
+        self,
+        test_case_name,
+        module_name,
+        test_status,
+        error_message=None,
+        total_time_duration=None,
+        device_name=None,
+        screen_resolution=None,
+        error_link=None,
+        result_key=None,
+        test_datetime=None,
+        classification=None,
+    ):
+        """Values for INSERT_STATEMENTS["test_results"].
+
+        Failures get their error_summary and error_signature_id when they are
+        written (see _attach_error_signatures).
+        """
+        test_category, plan_type = classification or classify_test(
+            test_case_name, module_name
+        )
+        fingerprinted = error_message and test_status in FINGERPRINTED_STATUSES
+        return (
+            test_case_name,
+            self._clean_module_name(module_name),
+            test_status,
+            test_datetime or datetime.now(),
+            error_message,
+            None if fingerprinted else self._create_error_summary(error_message),
+            total_time_duration,
+            device_name,
+            screen_resolution,
+            error_link,
+            result_key,
+            test_category,
+            plan_type,
+            None,
+        )
+
+    def insert_test_result(
+        self,
+        test_case_name,
+        module_name,
+        test_status,
+        error_message=None,
+        total_time_duration=None,
+        device_name=None,
+        screen_resolution=None,
+        error_link=None,
+    ):
+        """Insert a test result into the database"""
+        row = self._test_result_row(
+            test_case_name,
+            module_name,
+            test_status,
+            error_message,
+            total_time_duration,
+            device_name,
+            screen_resolution,
+            error_link,
+        )
+        self.ensure_connection()
+        row = self._attach_error_signatures([row])[0]
+        try:
+            self.cursor.execute(INSERT_STATEMENTS["test_results"], row)
+            self.conn.commit()
+            print(f"SUCCESS: Test result inserted: {test_case_name} - {test_status}")
+        except Exception as e:
+            print(f"ERROR: Error inserting test result: {e}")
+            self.conn.rollback()
+            return
+        self.update_rollups([row])
+
+    def store_test_result_in_tables(
+        self,
+        test_case_name,
+        module_name,
+        test_status,
+        error_message=None,
+        test_data=None,
+        total_time_duration=None,
+        device_name=None,
+        screen_resolution=None,
+        error_link=None,
+        result_key=None,
+        test_datetime=None,
+    ):
+        """Store test results in appropriate tables based on test type"""
+        try:
+            rows = self.build_result_rows(
+                test_case_name,
+                module_name,
+                test_status,
+                error_message,
+                test_data,
+                total_time_duration,
+                device_name,
+                screen_resolution,
+                error_link,
+                result_key,
+                test_datetime,
+            )
+            self.write_rows(rows)
+        except Exception as e:
+            print(f"❌ Error storing test result in tables: {e}")
+
+    def build_result_rows(
+        self,
+        test_case_name,
+        module_name,
+        test_status,
+        error_message=None,
+        test_data=None,
+        total_time_duration=None,
+        device_name=None,
+        screen_resolution=None,
+        error_link=None,
+        result_key=None,
+        test_datetime=None,
+    ):
+        """Rows to write for one test result as a list of (table, values) pairs.
+
+        Nothing is inserted here, so a batch of results can be written with one
+        executemany per table (see write_rows and db.result_writer).
+        """
+        self.ensure_connection()
+        category, plan_type = classify_test(test_case_name, module_name)
+
+        # Always store in test_results table
+        rows = [
+            (
+                "test_results",
+                self._test_result_row(
+                    test_case_name,
+                    module_name,
+                    test_status,
+                    error_message,
+                    total_time_duration,
+                    device_name,
+                    screen_resolution,
+                    error_link,
+                    result_key,
+                    test_datetime,
+                    (category, plan_type),
+                ),
+            )
+        ]
+
+        # Store in specific tables based on test type
+        if category == "book":
+            # BOOK PURCHASE TESTS - Only store in orders table with book_purchase type
+            rows.append(("orders", self._book_order_row(test_status)))
+        elif category == "subscription":
+            # SUBSCRIPTION TESTS (onetime plans included) - Store in subscriptions table
+            rows.append(
+                ("subscriptions", self._subscription_row(test_status, plan_type))
+            )
+        elif category == "user":
+            rows.append(("users", self._user_row(test_status)))
+        else:
+            # Default: store as general order (non-subscription, non-book tests only)
+            rows.append(("orders", self._general_order_row(test_status)))
+
+        return rows
+
+    def write_rows(self, rows, ignore_duplicates=False):
+        """Insert (table, values) pairs with one executemany and commit per table.
+
+        Tables are written independently so a failing orders insert does not
+        roll back the test_results rows. ignore_duplicates uses INSERT IGNORE,
+        for replays keyed on test_results.result_key. Stored test_results rows
+        are added to the daily rollups. Returns {table: rows written}.
+        """
+        by_table = {}
+        for table, values in rows:
+            by_table.setdefault(table, []).append(values)
+
+        self.ensure_connection()
+        written = {}
+        for table, values in by_table.items():
+            try:
+                statement = INSERT_STATEMENTS[table]
+                if ignore_duplicates:
+                    statement = statement.replace(
+                        "INSERT INTO", "INSERT IGNORE INTO", 1
+                    )
+                if table == "test_results":
+                    values = self._attach_error_signatures(values)
+                try:
+                    self.cursor.executemany(statement, values)
+                except self.IntegrityError as e:
+                    # A cached user/book id points at a deleted row
+                    if not self._is_fk_violation(e) or table not in REFERENCE_COLUMNS:
+                        raise
+                    self.conn.rollback()
+                    values = self._refresh_reference_ids(table, values)
+                    self.cursor.executemany(statement, values)
+                inserted = self.cursor.rowcount
+                self.conn.commit()
+                written[table] = len(values)
+                print(f"✅ Stored {len(values)} row(s) in {table}")
+            except Exception as e:
+                print(f"❌ Error storing rows in {table}: {e}")
+                self.conn.rollback()
+                written[table] = 0
+                continue
+            if table == "test_results":
+                # INSERT IGNORE may have skipped some rows; only then is rowcount short
+                self.update_rollups(
+                    values, complete=not ignore_duplicates or inserted == len(values)
+                )
+        return written
+
+    def existing_result_keys(self, result_keys):
+        """The subset of result_keys already stored in test_results"""
+        if not result_keys:
+            return set()
+        placeholders = ", ".join(["%s"] * len(result_keys))
+        self.ensure_connection()
+        self.cursor.execute(
+            f"SELECT result_key FROM test_results WHERE result_key IN ({placeholders})",
+            tuple(result_keys),
+        )
+        return {row["result_key"] for row in self.cursor.fetchall()}
+
+    def _book_order_row(self, test_status):
+        """Values for a book purchase order"""
+        # Create or get test user and book
+        user_id = self._get_or_create_test_user()
+        book_id = self._get_or_create_test_book()
+
+        passed = test_status == "PASSED"
+        return (
+            f"TEST-{uuid.uuid4().hex[:8].upper()}",
+            user_id,
+            book_id,
+            "book_purchase",
+            49.99 if passed else 0.00,
+            "credit_card",
+            "completed" if passed else "failed",
+            "completed" if passed else "cancelled",
+            datetime.now(),
+            datetime.now() if passed else None,
+        )
+
+    def _general_order_row(self, test_status):
+        """Values for a general order (no book attached)"""
+        user_id = self._get_or_create_test_user()
+
+        passed = test_status == "PASSED"
+        return (
+            f"TEST-{uuid.uuid4().hex[:8].upper()}",
+            user_id,
+            None,
+            "book_purchase",  # Default type
+            49.99 if passed else 0.00,
+            "credit_card",
+            "completed" if passed else "failed",
+            "completed" if passed else "cancelled",
+            datetime.now(),
+            datetime.now() if passed else None,
+        )
+
+    def _subscription_row(self, test_status, subscription_type):
+        """Values for a subscription with the plan's pricing and duration"""
+        user_id = self._get_or_create_test_user()
+
+        start_date = datetime.now().date()
+        end_date, amount = self._subscription_terms(subscription_type)
+        status = "active" if test_status == "PASSED" else "cancelled"
+
+        # Auto-renewal settings
+        auto_renew = subscription_type in ["monthly", "three_month", "six_month"]
+
+        return (
+            user_id,
+            subscription_type,
+            status,
+            start_date,
+            end_date,
+            amount,
+            auto_renew,
+            "credit_card",
+        )
+
+    @staticmethod
+    def _subscription_terms(subscription_type):
+        """End date and price for a subscription type starting today"""
+
+        def add_months(months):
+            current_date = datetime.now().date()
+            new_month = current_date.month + months
+            new_year = current_date.year + (new_month - 1) // 12
+            new_month = ((new_month - 1) % 12) + 1
+            # Jan 31 + 1 month ends on the last day of February
+            day = min(current_date.day, calendar.monthrange(new_year, new_month)[1])
+            return date(new_year, new_month, day)
+
+        if subscription_type == "monthly":
+            return add_months(1), 29.99
+        if subscription_type == "three_month":
+            return add_months(3), 79.99
+        if subscription_type == "six_month":
+            return add_months(6), 149.99
+        if subscription_type == "popular":
+            # Popular plan is typically 3-month plan
+            return add_months(3), 79.99
+
+        next_year = add_months(12)
+        if subscription_type == "onetime":
+            # Onetime plan is a one-time payment, no recurring
+            return next_year, 99.99
+        # Default annual plan
+        return next_year, 299.99
+
+    def _user_row(self, test_status):
+        """Values for a throwaway user created by a user test"""
+        username = f"test_user_{uuid.uuid4().hex[:8]}"
+        return (
+            username,
+            f"{username}@test.com",
+            "test_password_hash",
+            "Test",
+            "User",
+            "Test University",
+            "student",
+            test_status == "PASSED",
+        )
+
+    # ----------------------
+    # Reference ids (test user / test book)
+    # ----------------------
+    def _reference_id(self, kind, resolve):
+        """Id of the test user/book, resolved once per process and database"""
+        key = f"{self.db_key}|{kind}"
+        with _reference_lock:
+            if not _reference_ids:
+                _reference_ids.update(_load_reference_ids())
+            if key in _reference_ids:
+                return _reference_ids[key]
+
+        ref_id = resolve()
+        if ref_id is not None:
+            with _reference_lock:
+                _reference_ids[key] = ref_id
+            _save_reference_ids()
+        return ref_id
+
+    def invalidate_reference_ids(self):
+        """Forget cached ids, e.g. after the referenced row was deleted"""
+        prefix = f"{self.db_key}|"
+        with _reference_lock:
+            for key in [k for k in _reference_ids if k.startswith(prefix)]:
+                del _reference_ids[key]
+        _save_reference_ids()
+        print("[🔄] Reference id cache invalidated")
+
+    def _select_or_insert_id(
+        self, select_query, select_args, insert_query, insert_args
+    ):
+        """Id of the row found by select_query, inserting it if it does not exist"""
+        self.cursor.execute(select_query, select_args)
+        result = self.cursor.fetchone()
+        if result:
+            return result["id"]
+        try:
+            self.cursor.execute(insert_query, insert_args)
+            self.conn.commit()
+            return self.cursor.lastrowid
+        except self.IntegrityError:
+            # Another process created it first
+            self.conn.rollback()
+            self.cursor.execute(select_query, select_args)
+            return self.cursor.fetchone()["id"]
+
+    def _get_or_create_test_user(self):
+        """Get or create a test user for test results"""
+        try:
+            return self._reference_id(
+                "user",
+                lambda: self._select_or_insert_id(
+                    "SELECT id FROM users WHERE username = %s LIMIT 1",
+                    (TEST_USERNAME,),
+                    INSERT_STATEMENTS["users"],
+                    (
+                        TEST_USERNAME,
+                        "test@example.com",
+                        "test_hash",
+                        "Test",
+                        "User",
+                        "Test University",
+                        "student",
+                        True,
+                    ),
+                ),
+            )
+        except Exception as e:
+            print(f"❌ Error getting/creating test user: {e}")
+            return 1  # Fallback to first user
+
+    def _get_or_create_test_book(self):
+        """Get or create a test book for test results"""
+        try:
+            # isbn is UNIQUE, so this is an index lookup rather than a LIKE scan
+            return self._reference_id(
+                "book",
+                lambda: self._select_or_insert_id(
+                    "SELECT id FROM books WHERE isbn = %s LIMIT 1",
+                    (TEST_BOOK_ISBN,),
+                    """
+                    INSERT INTO books (title, author, isbn, publisher, publication_year,
+                                     price, description, category, is_available)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        "Test Book for Automation",
+                        "Test Author",
+                        TEST_BOOK_ISBN,
+                        "Test Publisher",
+                        2024,
+                        49.99,
+                        "Test book for automation testing",
+                        "Test Category",
+                        True,
+                    ),
+                ),
+            )
+        except Exception as e:
+            print(f"❌ Error getting/creating test book: {e}")
+            return 1  # Fallback to first book
+
+    def _refresh_reference_ids(self, table, values):
+        """Rebuild rows with freshly resolved ids after a foreign key failure"""
+        self.invalidate_reference_ids()
+        fresh = {"user": self._get_or_create_test_user}
+        if table == "orders":
+            fresh["book"] = self._get_or_create_test_book
+        refreshed = []
+        for row in values:
+            row = list(row)
+            for position, kind in REFERENCE_COLUMNS[table].items():
+                if kind in fresh and row[position] is not None:
+                    row[position] = fresh[kind]()
+            refreshed.append(tuple(row))
+        return refreshed
+
+    # ----------------------
+    # Error signatures
+    # ----------------------
+    def _attach_error_signatures(self, rows):
+        """test_results rows with failures pointing at their error_signatures row.
+
+        The traceback is stored once per signature; the row keeps only its
+        summary and error_signature_id. If the signatures can't be written the
+        rows keep their full error_message.
+        """
+        signatures = []
+        unknown = {}
+        for row in rows:
+            signature = None
+            if row[4] and row[2] in FINGERPRINTED_STATUSES:
+                signature = fingerprint_error(row[4])
+                if (self.db_key, signature) not in _error_signature_ids:
+                    unknown.setdefault(signature, row[4])
+            signatures.append(signature)
+        if not any(signatures):
+            return rows
+
+        try:
+            if unknown:
+                self._store_error_signatures(unknown)
+        except Exception as e:
+            print(
+                "[⚠️] Could not store error signatures, "
+                f"keeping full error messages: {e}"
+            )
+            self.conn.rollback()
+            return [
+                row[:5] + (self._create_error_summary(row[4]),) + row[6:]
+                if signature
+                else row
+                for row, signature in zip(rows, signatures)
+            ]
+
+        attached = []
+        for row, signature in zip(rows, signatures):
+            if signature:
+                signature_id, summary = _error_signature_ids[(self.db_key, signature)]
+                row = row[:4] + (None, summary) + row[6:13] + (signature_id,)
+            attached.append(row)
+        return attached
+
+    def _store_error_signatures(self, messages):
+        """Insert new signatures ({signature: first error_message}), cache their ids"""
+        self.cursor.executemany(
+            """
+            INSERT IGNORE INTO error_signatures
+                (signature, error_summary, error_message, first_seen)
+            VALUES (%s, %s, %s, %s)
+            """,
+            [
+                (
+                    signature,
+                    self._create_error_summary(message),
+                    message,
+                    datetime.now(),
+                )
+                for signature, message in messages.items()
+            ],
+        )
+        placeholders = ", ".join(["%s"] * len(messages))
+        self.cursor.execute(
+            "SELECT id, signature, error_summary FROM error_signatures "
+            f"WHERE signature IN ({placeholders})",
+            tuple(messages),
+        )
+        found = self.cursor.fetchall()
+        self.conn.commit()
+        with _error_signature_lock:
+            for row in found:
+                _error_signature_ids[(self.db_key, row["signature"])] = (
+                    row["id"],
+                    row["error_summary"],
+                )
+
+    def get_top_error_signatures(self, limit=10, since=None):
+        """Most frequent failure signatures, optionally counting only results since"""
+        if isinstance(since, str):
+            since = date.fromisoformat(since)
+        where = "WHERE error_signature_id IS NOT NULL"
+        args = ()
+        if since:
+            where += " AND test_datetime >= %s"
+            args = (since,)
+        try:
+            self.ensure_connection()
+            self.cursor.execute(
+                TOP_SIGNATURES_QUERY.format(where=where), (*args, limit)
+            )
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"❌ Error fetching error signatures: {e}")
+            return []
+
+    def backfill_error_signatures(self, batch_size=1000, compact=False):
+        """Fingerprint failures stored before error_signatures existed.
+
+        Returns the number of rows updated.
+
+        compact=True also drops their error_message, which is then read from
+        the signature like for new rows.
+        """
+        updated = 0
+        last_id = 0
+        statuses = ", ".join(f"'{status}'" for status in FINGERPRINTED_STATUSES)
+        while True:
+            self.cursor.execute(
+                f"""
+                SELECT id, error_message FROM test_results
+                WHERE id > %s AND error_signature_id IS NULL
+                AND test_status IN ({statuses}) AND error_message IS NOT NULL
+                ORDER BY id LIMIT %s
+                """,
+                (last_id, batch_size),
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            groups = {}
+            for row in rows:
+                groups.setdefault(fingerprint_error(row["error_message"]), []).append(
+                    row
+                )
+            unknown = {
+                signature: group[0]["error_message"]
+                for signature, group in groups.items()
+                if (self.db_key, signature) not in _error_signature_ids
+            }
+            if unknown:
+                self._store_error_signatures(unknown)
+
+            # One UPDATE per signature in the batch instead of one per row
+            clear = ", error_message = NULL" if compact else ""
+            for signature, group in groups.items():
+                signature_id = _error_signature_ids[(self.db_key, signature)][0]
+                placeholders = ", ".join(["%s"] * len(group))
+                self.cursor.execute(
+                    f"UPDATE test_results SET error_signature_id = %s{clear} "
+                    f"WHERE id IN ({placeholders})",
+                    (signature_id, *[row["id"] for row in group]),
+                )
+            self.conn.commit()
+            updated += len(rows)
+            print(f"[🧬] Fingerprinted {updated} failed test result(s)...")
+        return updated
+
+    # ----------------------
+    # Daily rollups
+    # ----------------------
+    def _begin(self):
+        """Hook for backends that need an explicit transaction (autocommit)"""
+
+    def _archived_until(self):
+        """Hook for backends that archive results: first day not archived, or None"""
+        return None
+
+    def ensure_rollup_tables(self):
+        """Create the rollup tables; new ones are filled from existing results"""
+        existed = self._table_exists("test_results_daily")
+        for statement in self.ROLLUP_TABLES:
+            self.cursor.execute(statement)
+        self.conn.commit()
+        if not existed:
+            print("SUCCESS: Daily rollup tables created")
+            self.rebuild_rollups()
+
+    @staticmethod
+    def _rollup_deltas(rows):
+        """Aggregate test_results rows into rollup and duration histogram increments"""
+        daily = {}
+        durations = {}
+        for row in rows:
+            key = (
+                row[3].date(),
+                row[1],
+                row[7] or "",
+                row[11] or "",
+                row[12] or "",
+                row[2],
+            )
+            count, timed, total, low, high = daily.get(key, (0, 0, 0.0, None, None))
+            duration = row[6]
+            if duration is not None:
+                duration = float(duration)
+                timed += 1
+                total += duration
+                low = duration if low is None else min(low, duration)
+                high = duration if high is None else max(high, duration)
+                bucket_key = key + (bisect_left(DURATION_BUCKETS, duration),)
+                durations[bucket_key] = durations.get(bucket_key, 0) + 1
+            daily[key] = (count + 1, timed, total, low, high)
+        return daily, durations
+
+    def update_rollups(self, rows, complete=True):
+        """Add stored test_results rows (INSERT_STATEMENTS order) to the daily rollups.
+
+        complete=False means some rows may not have been inserted, so the days
+        they fall on are recomputed from test_results instead. A failure here
+        never fails the write; rebuild_rollups repairs the rollups later.
+        """
+        if not rows:
+            return
+        try:
+            if not complete:
+                days = [row[3].date() for row in rows]
+                self.rebuild_rollups(min(days), max(days))
+                return
+            daily, durations = self._rollup_deltas(rows)
+            self._begin()
+            self.cursor.executemany(
+                self.ROLLUP_UPSERTS["test_results_daily"],
+                [key + values for key, values in daily.items()],
+            )
+            self.cursor.executemany(
+                self.ROLLUP_UPSERTS["test_results_daily_durations"],
+                [key + (count,) for key, count in durations.items()],
+            )
+            self.conn.commit()
+        except Exception as e:
+            print(
+                "[⚠️] Daily rollups not updated, "
+                f"run database_scripts/rebuild_rollups.py: {e}"
+            )
+            self.conn.rollback()
+
+    def rebuild_rollups(self, since=None, until=None):
+        """Recompute the daily rollups from test_results for the days since..until
+        (inclusive dates, both optional); returns the number of rollup rows"""
+        if isinstance(since, str):
+            since = date.fromisoformat(since)
+        if isinstance(until, str):
+            until = date.fromisoformat(until)
+        # Archived months are gone from test_results; their rollups are all
+        # that is left of them
+        archived = self._archived_until()
+        if archived and (since is None or since < archived):
+            print(
+                f"ℹ️ Keeping the rollups before {archived}, their results are archived"
+            )
+            since = archived
+        source_filter, rollup_filter, args = [], [], []
+        if since:
+            source_filter.append("test_datetime >= %s")
+            rollup_filter.append("stat_date >= %s")
+            args.append(since)
+        if until:
+            source_filter.append("test_datetime < %s")
+            rollup_filter.append("stat_date < %s")
+            args.append(until + timedelta(days=1))
+        source_where = f"WHERE {' AND '.join(source_filter)}" if source_filter else ""
+        timed_where = (
+            f"WHERE {' AND '.join(source_filter + ['total_time_duration IS NOT NULL'])}"
+        )
+        rollup_where = f"WHERE {' AND '.join(rollup_filter)}" if rollup_filter else ""
+        args = tuple(args)
+        dimensions = """DATE(test_datetime), module_name, COALESCE(device_name, ''),
+                   COALESCE(test_category, ''), COALESCE(plan_type, ''), test_status"""
+
+        self._begin()
+        try:
+            self.cursor.execute(f"DELETE FROM test_results_daily {rollup_where}", args)
+            self.cursor.execute(
+                f"DELETE FROM test_results_daily_durations {rollup_where}", args
+            )
+            self.cursor.execute(
+                f"""
+                INSERT INTO test_results_daily ({", ".join(ROLLUP_KEY)}, result_count,
+                    timed_count, total_duration, min_duration, max_duration)
+                SELECT {dimensions}, COUNT(*), COUNT(total_time_duration),
+                       COALESCE(SUM(total_time_duration), 0), MIN(total_time_duration),
+                       MAX(total_time_duration)
+                FROM test_results {source_where}
+                GROUP BY 1, 2, 3, 4, 5, 6
+                """,
+                args,
+            )
+            rebuilt = self.cursor.rowcount
+            self.cursor.execute(
+                f"""
+                INSERT INTO test_results_daily_durations
+                    ({", ".join(ROLLUP_KEY)}, bucket, result_count)
+                SELECT {dimensions}, {DURATION_BUCKET_SQL}, COUNT(*)
+                FROM test_results {timed_where}
+                GROUP BY 1, 2, 3, 4, 5, 6, 7
+                """,
+                args,
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        print(f"[📊] Rebuilt {rebuilt} daily rollup row(s)")
+        return rebuilt
+
+    def get_daily_statistics(self, days=14):
+        """Per day x module x device x status counts and durations for the last days"""
+        since = date.today() - timedelta(days=days - 1)
+        grouping = "stat_date, module_name, device_name, test_status"
+        try:
+            self.cursor.execute(
+                f"""
+                SELECT {grouping},
+                       SUM(result_count) as total_tests,
+                       SUM(timed_count) as timed_tests,
+                       SUM(total_duration) as total_duration,
+                       MIN(min_duration) as min_duration,
+                       MAX(max_duration) as max_duration
+                FROM test_results_daily
+                WHERE stat_date >= %s
+                GROUP BY {grouping}
+                ORDER BY stat_date DESC, module_name, device_name, test_status
+                """,
+                (since,),
+            )
+            rows = self.cursor.fetchall()
+            self.cursor.execute(
+                f"""
+                SELECT {grouping}, bucket, SUM(result_count) as result_count
+                FROM test_results_daily_durations
+                WHERE stat_date >= %s
+                GROUP BY {grouping}, bucket
+                """,
+                (since,),
+            )
+            histograms = {}
+            for row in self.cursor.fetchall():
+                key = (
+                    str(row["stat_date"]),
+                    row["module_name"],
+                    row["device_name"],
+                    row["test_status"],
+                )
+                histograms.setdefault(key, {})[row["bucket"]] = row["result_count"]
+        except Exception as e:
+            print(f"❌ Error fetching daily statistics: {e}")
+            return []
+
+        for row in rows:
+            key = (
+                str(row["stat_date"]),
+                row["module_name"],
+                row["device_name"],
+                row["test_status"],
+            )
+            timed = row["timed_tests"]
+            row["avg_duration"] = row["total_duration"] / timed if timed else None
+            row["p95_duration"] = duration_percentile(
+                histograms.get(key, {}), 0.95, row["max_duration"]
+            )
+            row["device_name"] = row["device_name"] or None
+        return rows
+
+    # ----------------------
+    # Reading results
+    # ----------------------
+    def _streaming_cursor(self):
+        """New cursor that reads rows from the server as they are fetched"""
+        raise NotImplementedError
+
+    def _explain(self, query, args=()):
+        """Plan of query as [(step, problems)]; problems are 'full scan',
+        'index scan', 'sort' or 'temporary' (db.query_advisor)"""
+        raise NotImplementedError
+
+    def _table_indexes(self, table):
+        """{index: [columns]} of table, in key order"""
+        raise NotImplementedError
+
+    def _stream(self, query, args=()):
+        """Yield the rows of query without buffering the whole result set"""
+        self.ensure_connection()
+        cursor = self._streaming_cursor()
+        try:
+            cursor.execute(query, args)
+            while True:
+                rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            try:
+                # An unbuffered result must be read to the end before the
+                # connection runs another query; at most one page is left
+                cursor.fetchall()
+            except Exception:
+                pass
+            cursor.close()
+
+    def iter_test_results(
+        self,
+        before=None,
+        limit=None,
+        statuses=None,
+        page_size=RESULT_PAGE_SIZE,
+        module=None,
+        device=None,
+        since=None,
+    ):
+        """Yield test results newest first, page by page.
+
+        Pages are keyed on (test_datetime, id) instead of OFFSET, so a page far
+        back in history costs the same as the first one, and each page is
+        streamed. before is an exclusive (test_datetime, id) position, e.g.
+        parse_page_position(page_position(row)); statuses, module, device and
+        since (a date) narrow the results. Don't run other queries on this
+        helper while a page is being read.
+        """
+        if isinstance(since, str):
+            since = date.fromisoformat(since)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            query, args = results_page_query(
+                statuses, module, device, since, before, size
+            )
+
+            count = 0
+            for row in self._stream(query, args):
+                count += 1
+                before = (row["test_datetime"], row["id"])
+                yield row
+            if remaining is not None:
+                remaining -= count
+            if count < size:
+                return
+
+    def follow_test_results(
+        self,
+        after_id=None,
+        poll_seconds=FOLLOW_POLL_SECONDS,
+        page_size=RESULT_PAGE_SIZE,
+    ):
+        """Yield results as they are stored, oldest first, until interrupted.
+
+        Follows the id (insertion order) rather than test_datetime: the writer
+        stamps results when they finish but stores them in batches, so a new
+        row can carry an older test_datetime than one already shown.
+        """
+        if after_id is None:
+            self.ensure_connection()
+            self.cursor.execute(
+                "SELECT COALESCE(MAX(id), 0) as last_id FROM test_results"
+            )
+            after_id = self.cursor.fetchone()["last_id"]
+        while True:
+            count = 0
+            for row in self._stream(
+                f"{RESULT_SELECT} WHERE tr.id > %s ORDER BY tr.id LIMIT %s",
+                (after_id, page_size),
+            ):
+                count += 1
+                after_id = row["id"]
+                yield row
+            if count < page_size:
+                time.sleep(poll_seconds)
+
+    def search_errors(
+        self,
+        text,
+        module=None,
+        device=None,
+        since=None,
+        until=None,
+        limit=ERROR_SEARCH_LIMIT,
+    ):
+        """Test results whose error_summary/error_message match text, best first.
+
+        Failures are matched through their error signature, other rows through
+        their own error text. Uses the backend's full-text indexes; module
+        (prefix), device and
+        since/until (inclusive dates) narrow the matches. Each row gets a
+        relevance score and a highlighted snippet.
+        """
+        terms = search_terms(text)
+        if not terms:
+            return []
+        conditions, args = error_search_filters(module, device, since, until)
+
+        query, query_args = self._error_search_query(terms, conditions, args, limit)
+        self.ensure_connection()
+        self.cursor.execute(query, query_args)
+        results = self.cursor.fetchall()
+        for row in results:
+            row["snippet"] = highlight_snippet(
+                row.pop("error_message") or row["error_summary"], terms
+            )
+        return results
+
+    def get_test_results(
+        self, limit=100, before=None, module=None, device=None, since=None
+    ):
+        """Recent test results, optionally older than a (test_datetime, id) position"""
+        try:
+            return list(
+                self.iter_test_results(
+                    before=before,
+                    limit=limit,
+                    module=module,
+                    device=device,
+                    since=since,
+                )
+            )
+        except Exception as e:
+            print(f"❌ Error fetching test results: {e}")
+            return []
+
+    def get_test_statistics(self):
+        """Get test statistics from the daily rollups"""
+        try:
+            self.cursor.execute(
+                STATISTICS_QUERY.format(
+                    count="result_count", table="test_results_daily"
+                )
+            )
+            return self.cursor.fetchone()
+        except Exception as e:
+            print(f"[⚠️] Daily rollups unavailable, counting test_results instead: {e}")
+            self.conn.rollback()
+        try:
+            self.cursor.execute(
+                STATISTICS_QUERY.format(count="1", table="test_results")
+            )
+            return self.cursor.fetchone()
+        except Exception as e:
+            print(f"❌ Error fetching test statistics: {e}")
+            return None
+
+    def backfill_test_categories(self, batch_size=1000):
+        """Classify rows stored before test_category existed; returns rows updated"""
+        updated = 0
+        last_id = 0
+        while True:
+            self.cursor.execute(
+                """
+                SELECT id, test_case_name, module_name FROM test_results
+                WHERE id > %s AND test_category IS NULL
+                ORDER BY id LIMIT %s
+                """,
+                (last_id, batch_size),
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            # One UPDATE per (category, plan type) in the batch instead of one per row
+            groups = {}
+            for row in rows:
+                groups.setdefault(
+                    classify_test(row["test_case_name"], row["module_name"]), []
+                ).append(row["id"])
+            for (category, plan_type), ids in groups.items():
+                placeholders = ", ".join(["%s"] * len(ids))
+                self.cursor.execute(
+                    "UPDATE test_results SET test_category = %s, plan_type = %s "
+                    f"WHERE id IN ({placeholders})",
+                    (category, plan_type, *ids),
+                )
+            self.conn.commit()
+            updated += len(rows)
+            print(f"[🏷️] Classified {updated} test result(s)...")
+        return updated
+
+    def normalise_test_names(self, batch_size=5000):
+        """Clean test case names and module name prefixes of rows stored before
+        results were cleaned on write; returns stats.
+
+        Rewrites are computed a batch of ids at a time, loaded into a temporary
+        table and applied with one UPDATE ... JOIN per batch. Rollups of the
+        days whose module names changed are rebuilt afterwards.
+        """
+        conditions = " OR ".join(
+            ["test_case_name LIKE %s"]
+            + ["module_name LIKE %s"] * len(MODULE_NAME_PREFIXES)
+        )
+        patterns = ("%[%", *(f"{prefix}%" for prefix in MODULE_NAME_PREFIXES))
+        stats = {"scanned": 0, "renamed": 0, "modules": 0, "seconds": 0.0}
+        first_day = last_day = None
+        last_id = 0
+        start = time.time()
+
+        self.cursor.execute(self.NAME_REWRITE_TABLE)
+        try:
+            while True:
+                batch_start = time.time()
+                self.cursor.execute(
+                    f"""
+                    SELECT id, test_case_name, module_name, test_datetime
+                    FROM test_results
+                    WHERE id > %s AND ({conditions})
+                    ORDER BY id LIMIT %s
+                    """,
+                    (last_id, *patterns, batch_size),
+                )
+                rows = self.cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                stats["scanned"] += len(rows)
+
+                rewrites = []
+                for row in rows:
+                    name = clean_test_case_name(row["test_case_name"])
+                    module = self._clean_module_name(row["module_name"])
+                    if (name, module) == (row["test_case_name"], row["module_name"]):
+                        continue
+                    rewrites.append((row["id"], name, module))
+                    if module != row["module_name"]:
+                        stats["modules"] += 1
+                        day = date.fromisoformat(str(row["test_datetime"])[:10])
+                        first_day = min(first_day or day, day)
+                        last_day = max(last_day or day, day)
+                if not rewrites:
+                    continue
+
+                self._begin()
+                try:
+                    self.cursor.execute("DELETE FROM test_name_rewrites")
+                    self.cursor.executemany(
+                        "INSERT INTO test_name_rewrites "
+                        "(id, test_case_name, module_name) VALUES (%s, %s, %s)",
+                        rewrites,
+                    )
+                    self.cursor.execute(self.NAME_REWRITE_UPDATE)
+                    self.conn.commit()
+                except Exception:
+                    self.conn.rollback()
+                    raise
+                stats["renamed"] += len(rewrites)
+                elapsed = time.time() - batch_start
+                print(
+                    f"[🧹] Rewrote {len(rewrites)} of {len(rows)} name(s) "
+                    f"up to id {last_id} ({len(rows) / elapsed:.0f} rows/s), "
+                    f"{stats['renamed']} so far"
+                )
+        finally:
+            self.cursor.execute("DROP TABLE IF EXISTS test_name_rewrites")
+            self.conn.commit()
+
+        # Rollups are keyed by module name
+        if first_day:
+            self.rebuild_rollups(first_day, last_day)
+        stats["seconds"] = round(time.time() - start, 3)
+        return stats
+
+    def close(self):
+        try:
+            self.cursor.close()
+            self.conn.close()
+        except Exception as e:
+            print(f"Warning: Error closing database connection: {e}")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Buffered, asynchronous writer for test results.
+
+store_test_result_in_tables does several SELECT/INSERT/commit round trips to
+the remote MySQL server, and the autouse capture_test_results fixture used to
+run it on every test's critical path. ResultWriter queues results instead and
+a background thread writes them in batches: the rows of all queued results are
+built first and then inserted with one executemany per table (test_results,
+orders, subscriptions, users).
+
+A batch is flushed every RESULT_WRITER_BATCH_SIZE results or every
+RESULT_WRITER_FLUSH_SECONDS, whichever comes first, and on close(). The queue
+is bounded by RESULT_WRITER_QUEUE_SIZE; a full queue blocks the caller rather
+than dropping results. Set ASYNC_RESULT_WRITER=false to write synchronously.
+
+Every result goes to the local spool (db.result_spool) before it is queued
+and is acknowledged there once stored, so results that could not be written
+survive the run and can be replayed later.
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from .result_spool import ResultSpool, new_result_key
+from .result_store import get_result_store
+
+ASYNC_RESULT_WRITER = os.getenv("ASYNC_RESULT_WRITER", "true").lower() == "true"
+BATCH_SIZE = int(os.getenv("RESULT_WRITER_BATCH_SIZE", "50"))
+FLUSH_SECONDS = float(os.getenv("RESULT_WRITER_FLUSH_SECONDS", "2"))
+QUEUE_SIZE = int(os.getenv("RESULT_WRITER_QUEUE_SIZE", "1000"))
+
+
+class ResultWriter:
+    """Background thread that batches results into executemany inserts"""
+
+    def __init__(
+        self,
+        helper_factory=get_result_store,
+        batch_size=BATCH_SIZE,
+        flush_seconds=FLUSH_SECONDS,
+        queue_size=QUEUE_SIZE,
+        asynchronous=ASYNC_RESULT_WRITER,
+        spool=None,
+    ):
+        self.helper_factory = helper_factory
+        self.asynchronous = asynchronous
+        self.spool = spool or ResultSpool()
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._helper = None
+        self._worker = None
+        self._lock = threading.Lock()
+        self.metrics = {
+            "submitted": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+            "last_flush_seconds": 0.0,
+            "max_flush_seconds": 0.0,
+            "total_flush_seconds": 0.0,
+        }
+
+    # ----------------------
+    # Producer side
+    # ----------------------
+    def submit(self, **result):
+        """Queue one result; takes the store_test_result_in_tables keyword arguments"""
+        # Stamped now so a later replay keeps the original time
+        result = dict(
+            result, test_datetime=result.get("test_datetime") or datetime.now()
+        )
+        result_key = new_result_key()
+        self.spool.append(result_key, result)
+        with self._lock:
+            self.metrics["submitted"] += 1
+
+        if not self.asynchronous:
+            self._write_batch([(result_key, result)])
+            return
+        self._ensure_worker()
+        self._queue.put(("result", (result_key, result)))
+        with self._lock:
+            self.metrics["max_queue_depth"] = max(
+                self.metrics["max_queue_depth"], self._queue.qsize()
+            )
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written"""
+        if not (self._worker and self._worker.is_alive()):
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, timeout=60):
+        """Flush the queue, stop the worker and close its connection and spool"""
+        if self._worker and self._worker.is_alive():
+            self._queue.put(("stop", None))
+            self._worker.join(timeout)
+        self._worker = None
+        if self._helper:
+            self._helper.close()
+            self._helper = None
+        self.spool.close()
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.metrics)
+        batches = stats.pop("batches")
+        total = stats.pop("total_flush_seconds")
+        stats["queue_depth"] = self._queue.qsize()
+        stats["spooled_unsaved"] = self.spool.pending_count()
+        stats["batches"] = batches
+        stats["avg_flush_seconds"] = round(total / batches, 3) if batches else 0.0
+        stats["last_flush_seconds"] = round(stats["last_flush_seconds"], 3)
+        stats["max_flush_seconds"] = round(stats["max_flush_seconds"], 3)
+        return stats
+
+    # ----------------------
+    # Worker side
+    # ----------------------
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="result-writer", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        batch = []
+        waiters = []
+        stopping = False
+        deadline = None
+
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, payload = "timer", None
+
+            if kind == "result":
+                batch.append(payload)
+                if deadline is None:
+                    deadline = time.time() + self.flush_seconds
+            elif kind == "flush":
+                waiters.append(payload)
+            elif kind == "stop":
+                stopping = True
+
+            if batch and (
+                len(batch) >= self.batch_size
+                or kind != "result"
+                or time.time() >= deadline
+            ):
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+    def _write_batch(self, batch):
+        start = time.time()
+        stored = 0
+        try:
+            if self._helper is None:
+                self._helper = self.helper_factory()
+            rows = []
+            built = []
+            for result_key, result in batch:
+                # A result whose rows cannot be built stays in the spool on its own
+                try:
+                    rows.extend(
+                        self._helper.build_result_rows(**result, result_key=result_key)
+                    )
+                except Exception as e:
+                    name = result.get("test_case_name")
+                    print(
+                        f"[⚠️] Result writer could not build rows for {name}, "
+                        f"kept in spool: {type(e).__name__} – {e}"
+                    )
+                    continue
+                built.append(result_key)
+            if built:
+                written = self._helper.write_rows(rows)
+                if written.get("test_results", 0) == len(built):
+                    self.spool.ack(built)
+                    stored = len(built)
+        except Exception as e:
+            print(
+                f"[⚠️] Result writer could not store {len(batch)} result(s), "
+                f"kept in spool: {type(e).__name__} – {e}"
+            )
+            # A broken connection is rebuilt on the next batch
+            if self._helper:
+                self._helper.close()
+            self._helper = None
+
+        elapsed = time.time() - start
+        with self._lock:
+            self.metrics["batches"] += 1
+            self.metrics["written"] += stored
+            self.metrics["failed"] += len(batch) - stored
+            self.metrics["last_flush_seconds"] = elapsed
+            self.metrics["max_flush_seconds"] = max(
+                self.metrics["max_flush_seconds"], elapsed
+            )
+            self.metrics["total_flush_seconds"] += elapsed
+        print(f"[🗄️] Result writer flushed {len(batch)} result(s) in {elapsed:.2f}s")
+
+
+# Global writer instance
+result_writer = ResultWriter()
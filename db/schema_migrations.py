@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Versioned, online schema migrations for the MySQL database.
+
+Each entry of MIGRATIONS is applied once, in order, and recorded in the
+schema_migrations table. A change runs as ALGORITHM=INSTANT where the server
+supports it, else ALGORITHM=INPLACE with LOCK=NONE (MySQLHelper.
+alter_table_online). Changes that can only be made by rebuilding the table,
+such as inserting members in the middle of an ENUM, use a shadow copy
+instead: the altered copy is filled in batches by primary key while triggers
+carry concurrent writes over, and the two tables are swapped with one atomic
+RENAME. Every DDL statement waits at most SCHEMA_LOCK_WAIT_SECONDS for its
+metadata lock, so result ingestion is never blocked for longer.
+
+A migration whose change is already present (a database created from
+database_schema.sql, or updated by the old table-copy scripts) is recorded as
+'baseline' without running. An opt-in migration whose clause function returns
+None, such as 006 without TEST_RESULTS_PARTITIONING=true, stays pending.
+
+The SQLite backend always creates its schema at the current version.
+
+Usage:
+    python -m db.schema_migrations [status | apply [version ...]]
+"""
+
+import os
+import re
+import sys
+import time
+from datetime import date
+
+from .db_helper import MySQLHelper
+from .partitions import (
+    PARTITION_MONTHS_AHEAD,
+    PARTITIONING,
+    add_months,
+    month_start,
+    partition_clause,
+)
+from .result_store import QUERY_INDEXES, REPLACED_INDEXES
+
+SHADOW_BATCH_SIZE = int(os.getenv("SCHEMA_COPY_BATCH_SIZE", "1000"))
+# Pause between shadow copy batches, so replicas and writers keep up
+SHADOW_BATCH_PAUSE_SECONDS = float(os.getenv("SCHEMA_COPY_PAUSE_SECONDS", "0.05"))
+
+MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    method VARCHAR(20) NOT NULL
+        COMMENT 'instant/inplace/copy, or baseline if already present',
+    seconds DECIMAL(10,3) NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _has_column(column):
+    """Check: the table already has column"""
+
+    def check(cursor, table):
+        cursor.execute(
+            """
+            SELECT COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+            AND COLUMN_NAME = %s
+        """,
+            (table, column),
+        )
+        return bool(cursor.fetchall())
+
+    return check
+
+
+def _has_enum_values(column, *values):
+    """Check: the ENUM column already accepts every one of values"""
+
+    def check(cursor, table):
+        cursor.execute(
+            """
+            SELECT COLUMN_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+            AND COLUMN_NAME = %s
+        """,
+            (table, column),
+        )
+        rows = cursor.fetchall()
+        column_type = rows[0]["COLUMN_TYPE"] if rows else ""
+        return bool(rows) and all(f"'{value}'" in column_type for value in values)
+
+    return check
+
+
+def _has_indexes(*indexes):
+    """Check: the table already has every one of indexes"""
+
+    def check(cursor, table):
+        cursor.execute(
+            f"""
+            SELECT DISTINCT INDEX_NAME
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+            AND INDEX_NAME IN ({', '.join(['%s'] * len(indexes))})
+        """,
+            (table, *indexes),
+        )
+        return len(cursor.fetchall()) == len(indexes)
+
+    return check
+
+
+def _is_partitioned(cursor, table):
+    """Check: the table is partitioned already"""
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME
+        FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = %s
+        AND PARTITION_NAME IS NOT NULL
+        LIMIT 1
+    """,
+        (table,),
+    )
+    return bool(cursor.fetchall())
+
+
+def _monthly_partitioning(helper):
+    """ALTER clause partitioning test_results by month, from its oldest result on;
+    None unless TEST_RESULTS_PARTITIONING is set (see db.partitions)"""
+    if not PARTITIONING:
+        return None
+    # The keys below need every late column in place
+    helper._ensure_late_columns()
+    cursor = helper.cursor
+    cursor.execute("SELECT MIN(test_datetime) AS oldest FROM test_results")
+    oldest = cursor.fetchone()["oldest"]
+    this_month = month_start(date.today())
+    first_month = month_start(oldest) if oldest else this_month
+    cursor.execute(
+        """
+        SELECT INDEX_NAME
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_NAME = 'test_results'
+        AND INDEX_NAME = 'ft_test_results_errors'
+    """
+    )
+    # Partitioned tables cannot have FULLTEXT indexes, and every unique key
+    # must include the partitioning column. search_errors falls back to LIKE
+    # for the rows of test_results
+    drop_fulltext = "DROP INDEX ft_test_results_errors, " if cursor.fetchall() else ""
+    return (
+        f"{drop_fulltext}DROP PRIMARY KEY, ADD PRIMARY KEY (id, test_datetime), "
+        "DROP INDEX uq_test_results_result_key, "
+        "ADD UNIQUE KEY uq_test_results_result_key (result_key, test_datetime) "
+        + partition_clause(first_month, add_months(this_month, PARTITION_MONTHS_AHEAD))
+    )
+
+
+def _query_indexes(helper):
+    """ALTER clause adding the missing QUERY_INDEXES, dropping those they replace"""
+    existing = helper._table_indexes("test_results")
+    return ", ".join(
+        [
+            f"ADD INDEX {index} ({', '.join(columns)})"
+            for index, columns in QUERY_INDEXES
+            if index not in existing
+        ]
+        + [f"DROP INDEX {index}" for index, _ in REPLACED_INDEXES if index in existing]
+    )
+
+
+# (version, description, table, ALTER clause, check that the change is
+# already present). The clause may be a function of the helper, for changes
+# that depend on the data or are opt-in (None leaves them pending). Append
+# only: a version is never renumbered or edited once it has been applied
+# somewhere
+MIGRATIONS = [
+    (
+        "001",
+        "test_results: total_time_duration and device_name columns",
+        "test_results",
+        """ADD COLUMN total_time_duration DECIMAL(10,3) NULL
+               COMMENT 'Test execution time in seconds',
+           ADD COLUMN device_name VARCHAR(50) NULL
+               COMMENT 'Device type (mobile/desktop/tablet)'""",
+        _has_column("device_name"),
+    ),
+    (
+        "002",
+        "test_results: screen_resolution column",
+        "test_results",
+        "ADD COLUMN screen_resolution VARCHAR(50) NULL "
+        "COMMENT 'Screen resolution (e.g., 1920x1080, 375x812)'",
+        _has_column("screen_resolution"),
+    ),
+    (
+        "003",
+        "test_results: error_link column",
+        "test_results",
+        "ADD COLUMN error_link VARCHAR(500) NULL "
+        "COMMENT 'URL link to screenshot showing affected screen'",
+        _has_column("error_link"),
+    ),
+    (
+        "004",
+        "subscriptions: three_month, popular and onetime subscription types",
+        "subscriptions",
+        "MODIFY COLUMN subscription_type ENUM('monthly', 'three_month', 'six_month', "
+        "'popular', 'onetime', 'annual') NOT NULL",
+        _has_enum_values("subscription_type", "three_month", "popular", "onetime"),
+    ),
+    (
+        "005",
+        "orders: three_month_plan and popular_plan order types",
+        "orders",
+        "MODIFY COLUMN order_type ENUM('book_purchase', 'monthly_plan', "
+        "'three_month_plan', 'six_month_plan', 'popular_plan', 'onetime_plan') "
+        "NOT NULL",
+        _has_enum_values("order_type", "three_month_plan", "popular_plan"),
+    ),
+    (
+        "006",
+        "test_results: monthly RANGE partitions on test_datetime",
+        "test_results",
+        _monthly_partitioning,
+        _is_partitioned,
+    ),
+    (
+        "007",
+        "test_results: composite indexes for the viewer queries (db.query_advisor)",
+        "test_results",
+        _query_indexes,
+        _has_indexes(*(index for index, _ in QUERY_INDEXES)),
+    ),
+]
+
+
+def _flip_underscore(name):
+    """name with its leading underscore removed, or one added"""
+    return name[1:] if name.startswith("_") else "_" + name
+
+
+def _drop_shadow(cursor, shadow, triggers):
+    for trigger in triggers:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+
+
+def _table_columns(cursor, table):
+    cursor.execute(f"SHOW COLUMNS FROM {table}")
+    return [row["Field"] for row in cursor.fetchall()]
+
+
+def shadow_copy(helper, table, alter_clause, batch_size=SHADOW_BATCH_SIZE):
+    """Apply alter_clause by copying table into an altered shadow table.
+
+    Needs an integer id primary key and a change every existing value fits
+    (the triggers copy each write as it happens). Tables other tables
+    reference by foreign key are refused: their children would follow the
+    renamed original.
+    """
+    cursor = helper.cursor
+    shadow, retired = f"_{table}_new", f"_{table}_old"
+    triggers = [f"_{table}_{event}" for event in ("ins", "upd", "del")]
+
+    cursor.execute(
+        """
+        SELECT TABLE_NAME
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+        WHERE REFERENCED_TABLE_SCHEMA = DATABASE()
+        AND REFERENCED_TABLE_NAME = %s
+    """,
+        (table,),
+    )
+    children = [row["TABLE_NAME"] for row in cursor.fetchall()]
+    if children:
+        raise RuntimeError(
+            f"{table} is referenced by {', '.join(children)}; shadow copy not possible"
+        )
+
+    # Leftovers of an interrupted copy
+    _drop_shadow(cursor, shadow, triggers)
+
+    # SHOW CREATE keeps the foreign keys LIKE would drop; constraint names are
+    # unique per schema, so the copy's get (or lose) a leading underscore
+    cursor.execute(f"SHOW CREATE TABLE {table}")
+    ddl = cursor.fetchone()["Create Table"]
+    ddl = ddl.replace(f"CREATE TABLE `{table}`", f"CREATE TABLE `{shadow}`", 1)
+    ddl = re.sub(
+        r"CONSTRAINT `(\w+)`",
+        lambda m: f"CONSTRAINT `{_flip_underscore(m.group(1))}`",
+        ddl,
+    )
+    try:
+        cursor.execute(ddl)
+        cursor.execute(f"ALTER TABLE {shadow} {alter_clause}")
+
+        shadow_columns = set(_table_columns(cursor, shadow))
+        columns = [
+            column
+            for column in _table_columns(cursor, table)
+            if column in shadow_columns
+        ]
+        column_list = ", ".join(f"`{column}`" for column in columns)
+        new_values = ", ".join(f"NEW.`{column}`" for column in columns)
+        # Creating the triggers and the swap need the table's metadata lock,
+        # so they go through run_ddl like the online ALTERs
+        helper.run_ddl(
+            f"CREATE TRIGGER {triggers[0]} AFTER INSERT ON {table} FOR EACH ROW "
+            f"REPLACE INTO {shadow} ({column_list}) VALUES ({new_values})"
+        )
+        # The shadow's primary key may include a column the update changed
+        # (test_results is keyed on id and test_datetime once partitioned), so
+        # REPLACE alone could leave the old row next to the new one
+        helper.run_ddl(
+            f"CREATE TRIGGER {triggers[1]} AFTER UPDATE ON {table} FOR EACH ROW BEGIN "
+            f"DELETE IGNORE FROM {shadow} WHERE id = OLD.id; "
+            f"REPLACE INTO {shadow} ({column_list}) VALUES ({new_values}); END"
+        )
+        helper.run_ddl(
+            f"CREATE TRIGGER {triggers[2]} AFTER DELETE ON {table} FOR EACH ROW "
+            f"DELETE IGNORE FROM {shadow} WHERE id = OLD.id"
+        )
+
+        cursor.execute(f"SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM {table}")
+        bounds = cursor.fetchone()
+        copied = 0
+        if bounds["min_id"] is not None:
+            for start in range(bounds["min_id"], bounds["max_id"] + 1, batch_size):
+                # IGNORE: a row the triggers already copied is newer than this read
+                cursor.execute(
+                    f"INSERT IGNORE INTO {shadow} ({column_list}) "
+                    f"SELECT {column_list} FROM {table} "
+                    "WHERE id >= %s AND id < %s LOCK IN SHARE MODE",
+                    (start, start + batch_size),
+                )
+                helper.conn.commit()
+                copied += cursor.rowcount
+                time.sleep(SHADOW_BATCH_PAUSE_SECONDS)
+        print(f"[📦] Copied {copied} row(s) of {table} into {shadow}")
+
+        # One atomic swap
+        helper.run_ddl(f"RENAME TABLE {table} TO {retired}, {shadow} TO {table}")
+    finally:
+        # After a failure this removes the half-built copy; after the swap the
+        # triggers moved with the original table and the shadow name is free
+        _drop_shadow(cursor, shadow, triggers)
+    cursor.execute(f"DROP TABLE {retired}")
+    return "copy"
+
+
+def applied_migrations(helper):
+    """{version: row} of schema_migrations"""
+    helper.cursor.execute(MIGRATIONS_TABLE)
+    helper.cursor.execute(
+        "SELECT version, description, method, seconds, applied_at "
+        "FROM schema_migrations"
+    )
+    return {row["version"]: row for row in helper.cursor.fetchall()}
+
+
+def apply_migrations(helper=None, versions=None):
+    """Apply the pending migrations (or just versions); returns the versions
+    that changed the schema (already present ones are only recorded)"""
+    own_helper = helper is None
+    helper = helper or MySQLHelper()
+    applied = []
+    try:
+        # One runner at a time; a second one leaves the work to the first
+        helper.cursor.execute("SELECT GET_LOCK('schema_migrations', 0) AS acquired")
+        if not helper.cursor.fetchone()["acquired"]:
+            print("[⚠️] Another schema migration is running, nothing done")
+            return applied
+        try:
+            done = applied_migrations(helper)
+            for version, description, table, alter_clause, is_present in MIGRATIONS:
+                if version in done or (versions and version not in versions):
+                    continue
+                start = time.time()
+                if is_present(helper.cursor, table):
+                    method = "baseline"
+                else:
+                    if callable(alter_clause):
+                        alter_clause = alter_clause(helper)
+                    if alter_clause is None:
+                        print(
+                            f"ℹ️ {version} is not enabled, left pending: {description}"
+                        )
+                        continue
+                    print(f"[🔧] {version}: {description}")
+                    method = helper.alter_table_online(
+                        table, alter_clause
+                    ) or shadow_copy(helper, table, alter_clause)
+                    helper._partitioned = None
+                seconds = round(time.time() - start, 3)
+                helper.cursor.execute(
+                    "INSERT INTO schema_migrations "
+                    "(version, description, method, seconds) VALUES (%s, %s, %s, %s)",
+                    (version, description, method, seconds),
+                )
+                helper.conn.commit()
+                if method != "baseline":
+                    applied.append(version)
+                print(f"[✅] {version} recorded ({method}, {seconds:.2f}s)")
+        finally:
+            helper.cursor.execute("SELECT RELEASE_LOCK('schema_migrations')")
+            helper.cursor.fetchall()
+    finally:
+        if own_helper:
+            helper.close()
+    return applied
+
+
+def main():
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "status"
+    if command == "apply":
+        applied = apply_migrations(versions=sys.argv[2:] or None)
+        print(
+            f"[📊] {len(applied)} migration(s) applied"
+            if applied
+            else "ℹ️ Schema is up to date"
+        )
+    elif command == "status":
+        helper = MySQLHelper()
+        try:
+            done = applied_migrations(helper)
+        finally:
+            helper.close()
+        for version, description, *_ in MIGRATIONS:
+            row = done.get(version)
+            state = f"{row['method']} {row['applied_at']}" if row else "pending"
+            print(f"  {version}  {state:<30} {description}")
+    else:
+        print(f"❌ Unknown command: {command}")
+        print("Usage: python -m db.schema_migrations [status | apply [version ...]]")
+
+
+if __name__ == "__main__":
+    main()
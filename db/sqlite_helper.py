@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Embedded SQLite backend for test result storage.
+
+Exposes the MySQLHelper API (insert_test_result, store_test_result_in_tables,
+get_test_results, get_test_statistics, ...) on a local database file, so
+local and offline runs and benchmarks need no MySQL server. The database runs
+in WAL mode with synchronous=NORMAL, and write_rows commits one transaction
+per table per batch.
+
+Select it with TEST_RESULTS_BACKEND=sqlite; the file defaults to
+.cache/test_results.sqlite3 (TEST_RESULTS_SQLITE_PATH).
+"""
+
+import os
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+from .result_store import ResultStore
+
+SQLITE_PATH = os.getenv("TEST_RESULTS_SQLITE_PATH", ".cache/test_results.sqlite3")
+
+# Same tables as database_schema.sql; ENUMs become CHECK constraints
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_case_name TEXT NOT NULL,
+    module_name TEXT NOT NULL,
+    test_status TEXT NOT NULL
+        CHECK (test_status IN ('PASSED', 'FAILED', 'SKIPPED', 'ERROR')),
+    test_datetime TEXT NOT NULL,
+    error_message TEXT,
+    error_summary TEXT,
+    total_time_duration REAL,
+    device_name TEXT,
+    screen_resolution TEXT,
+    error_link TEXT,
+    result_key TEXT UNIQUE,
+    test_category TEXT,
+    plan_type TEXT,
+    error_signature_id INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_test_results_datetime ON test_results (test_datetime);
+
+CREATE TABLE IF NOT EXISTS error_signatures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    signature TEXT NOT NULL UNIQUE,
+    error_summary TEXT,
+    error_message TEXT,
+    first_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    university TEXT,
+    user_type TEXT DEFAULT 'student'
+        CHECK (user_type IN ('student', 'instructor', 'admin')),
+    is_active INTEGER DEFAULT 1,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    author TEXT,
+    isbn TEXT UNIQUE,
+    publisher TEXT,
+    publication_year INTEGER,
+    price REAL,
+    description TEXT,
+    cover_image_url TEXT,
+    category TEXT,
+    is_available INTEGER DEFAULT 1,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_number TEXT UNIQUE NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    book_id INTEGER REFERENCES books(id) ON DELETE SET NULL,
+    order_type TEXT NOT NULL,
+    amount REAL NOT NULL,
+    payment_method TEXT DEFAULT 'credit_card',
+    payment_status TEXT DEFAULT 'pending',
+    order_status TEXT DEFAULT 'pending',
+    billing_address TEXT,
+    shipping_address TEXT,
+    order_date TEXT DEFAULT CURRENT_TIMESTAMP,
+    completed_date TEXT
+);
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    subscription_type TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    auto_renew INTEGER DEFAULT 0,
+    payment_method TEXT DEFAULT 'credit_card',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Columns added after the first SQLite schema, with the indexes that use them
+LATE_COLUMNS = [
+    (
+        "test_category",
+        [
+            "ALTER TABLE test_results ADD COLUMN test_category TEXT",
+            "ALTER TABLE test_results ADD COLUMN plan_type TEXT",
+        ],
+    ),
+    (
+        "error_signature_id",
+        ["ALTER TABLE test_results ADD COLUMN error_signature_id INTEGER"],
+    ),
+]
+LATE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_test_results_category
+    ON test_results (test_category, plan_type, test_status);
+CREATE INDEX IF NOT EXISTS idx_test_results_signature
+    ON test_results (error_signature_id, test_datetime);
+-- result_store.QUERY_INDEXES, which replace idx_test_results_status
+CREATE INDEX IF NOT EXISTS idx_test_results_module_device_datetime
+    ON test_results (module_name, device_name, test_datetime);
+CREATE INDEX IF NOT EXISTS idx_test_results_status_datetime
+    ON test_results (test_status, test_datetime);
+DROP INDEX IF EXISTS idx_test_results_status;
+"""
+
+ROLLUP_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS test_results_daily (
+        stat_date TEXT NOT NULL,
+        module_name TEXT NOT NULL,
+        device_name TEXT NOT NULL DEFAULT '',
+        test_category TEXT NOT NULL DEFAULT '',
+        plan_type TEXT NOT NULL DEFAULT '',
+        test_status TEXT NOT NULL,
+        result_count INTEGER NOT NULL DEFAULT 0,
+        timed_count INTEGER NOT NULL DEFAULT 0,
+        total_duration REAL NOT NULL DEFAULT 0,
+        min_duration REAL,
+        max_duration REAL,
+        PRIMARY KEY (stat_date, module_name, device_name, test_category, plan_type,
+                     test_status)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS test_results_daily_durations (
+        stat_date TEXT NOT NULL,
+        module_name TEXT NOT NULL,
+        device_name TEXT NOT NULL DEFAULT '',
+        test_category TEXT NOT NULL DEFAULT '',
+        plan_type TEXT NOT NULL DEFAULT '',
+        test_status TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        result_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (stat_date, module_name, device_name, test_category, plan_type,
+                     test_status, bucket)
+    )
+    """,
+]
+
+ROLLUP_UPSERTS = {
+    "test_results_daily": """
+        INSERT INTO test_results_daily (stat_date, module_name, device_name,
+                                        test_category, plan_type, test_status,
+                                        result_count, timed_count, total_duration,
+                                        min_duration, max_duration)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (stat_date, module_name, device_name, test_category, plan_type,
+                     test_status) DO UPDATE SET
+            result_count = result_count + excluded.result_count,
+            timed_count = timed_count + excluded.timed_count,
+            total_duration = total_duration + excluded.total_duration,
+            min_duration = MIN(COALESCE(min_duration, excluded.min_duration),
+                               COALESCE(excluded.min_duration, min_duration)),
+            max_duration = MAX(COALESCE(max_duration, excluded.max_duration),
+                               COALESCE(excluded.max_duration, max_duration))
+    """,
+    "test_results_daily_durations": """
+        INSERT INTO test_results_daily_durations (stat_date, module_name, device_name,
+                                                  test_category, plan_type,
+                                                  test_status, bucket, result_count)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (stat_date, module_name, device_name, test_category, plan_type,
+                     test_status, bucket)
+        DO UPDATE SET result_count = result_count + excluded.result_count
+    """,
+}
+
+# FTS5 index over the error text, kept in sync with test_results by triggers
+ERROR_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS test_results_fts USING fts5(
+    error_summary, error_message, content='test_results', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS test_results_fts_insert
+AFTER INSERT ON test_results BEGIN
+    INSERT INTO test_results_fts (rowid, error_summary, error_message)
+    VALUES (new.id, new.error_summary, new.error_message);
+END;
+CREATE TRIGGER IF NOT EXISTS test_results_fts_delete
+AFTER DELETE ON test_results BEGIN
+    INSERT INTO test_results_fts (test_results_fts, rowid, error_summary, error_message)
+    VALUES ('delete', old.id, old.error_summary, old.error_message);
+END;
+CREATE TRIGGER IF NOT EXISTS test_results_fts_update
+AFTER UPDATE OF error_summary, error_message ON test_results BEGIN
+    INSERT INTO test_results_fts (test_results_fts, rowid, error_summary, error_message)
+    VALUES ('delete', old.id, old.error_summary, old.error_message);
+    INSERT INTO test_results_fts (rowid, error_summary, error_message)
+    VALUES (new.id, new.error_summary, new.error_message);
+END;
+"""
+
+SIGNATURE_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS error_signatures_fts USING fts5(
+    error_summary, error_message, content='error_signatures', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS error_signatures_fts_insert
+AFTER INSERT ON error_signatures BEGIN
+    INSERT INTO error_signatures_fts (rowid, error_summary, error_message)
+    VALUES (new.id, new.error_summary, new.error_message);
+END;
+CREATE TRIGGER IF NOT EXISTS error_signatures_fts_delete
+AFTER DELETE ON error_signatures BEGIN
+    INSERT INTO error_signatures_fts
+        (error_signatures_fts, rowid, error_summary, error_message)
+    VALUES ('delete', old.id, old.error_summary, old.error_message);
+END;
+"""
+
+# Batches of name rewrites (normalise_test_names) are loaded here and applied
+# with one UPDATE ... FROM
+NAME_REWRITE_TABLE = """
+    CREATE TEMP TABLE IF NOT EXISTS test_name_rewrites (
+        id INTEGER PRIMARY KEY,
+        test_case_name TEXT NOT NULL,
+        module_name TEXT NOT NULL
+    )
+"""
+NAME_REWRITE_UPDATE = """
+    UPDATE test_results
+    SET test_case_name = r.test_case_name, module_name = r.module_name
+    FROM test_name_rewrites r
+    WHERE r.id = test_results.id
+"""
+
+# Store dates the way MySQL prints them so both backends read back alike
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+
+def _translate(sql):
+    """Rewrite the shared MySQL-style statements for SQLite"""
+    return sql.replace("%s", "?").replace("INSERT IGNORE INTO", "INSERT OR IGNORE INTO")
+
+
+class _TranslatingCursor(sqlite3.Cursor):
+    """Cursor that accepts the %s placeholders used by ResultStore"""
+
+    def execute(self, sql, parameters=()):
+        return super().execute(_translate(sql), parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return super().executemany(_translate(sql), seq_of_parameters)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteHelper(ResultStore):
+    IntegrityError = sqlite3.IntegrityError
+    ROLLUP_TABLES = ROLLUP_TABLES
+    ROLLUP_UPSERTS = ROLLUP_UPSERTS
+    NAME_REWRITE_TABLE = NAME_REWRITE_TABLE
+    NAME_REWRITE_UPDATE = NAME_REWRITE_UPDATE
+
+    def __init__(self, path=SQLITE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # The result writer uses the helper from its own thread
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = _dict_row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.cursor = self.conn.cursor(factory=_TranslatingCursor)
+        self.db_key = f"sqlite:{Path(path).resolve()}"
+        self.create_test_results_table()
+
+    def _is_fk_violation(self, error):
+        return "FOREIGN KEY constraint failed" in str(error)
+
+    def ensure_error_search_index(self):
+        """Create the FTS5 error indexes; new ones are filled from existing rows"""
+        created = False
+        for table, schema in (
+            ("test_results_fts", ERROR_SEARCH_SCHEMA),
+            ("error_signatures_fts", SIGNATURE_SEARCH_SCHEMA),
+        ):
+            if self._table_exists(table):
+                continue
+            self.conn.executescript(schema)
+            self.conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+            created = True
+        if created:
+            self.conn.commit()
+            print("SUCCESS: Error search index created")
+        return created
+
+    def _error_search_query(self, terms, conditions, args, limit):
+        # Any term matches, like MySQL's natural language mode; bm25 ranks
+        # rows matching more (and rarer) terms first
+        match = " OR ".join(f'"{term}"' for term in terms)
+        columns = (
+            "tr.id, tr.test_case_name, tr.module_name, tr.test_status, "
+            "tr.device_name, tr.test_datetime, tr.error_summary"
+        )
+        unsigned = ["test_results_fts MATCH %s", "tr.error_signature_id IS NULL"]
+        query = f"""
+            SELECT {columns}, tr.error_message, -bm25(test_results_fts) AS score
+            FROM test_results_fts
+            JOIN test_results tr ON tr.id = test_results_fts.rowid
+            WHERE {" AND ".join(unsigned + conditions)}
+            UNION ALL
+            SELECT {columns}, es.error_message, -bm25(error_signatures_fts) AS score
+            FROM error_signatures_fts
+            JOIN error_signatures es ON es.id = error_signatures_fts.rowid
+            JOIN test_results tr ON tr.error_signature_id = es.id
+            WHERE {" AND ".join(["error_signatures_fts MATCH %s"] + conditions)}
+            ORDER BY score DESC, id DESC
+            LIMIT %s
+        """
+        return query, (match, *args, match, *args, limit)
+
+    def _streaming_cursor(self):
+        # SQLite cursors step through the result as rows are fetched
+        return self.conn.cursor(factory=_TranslatingCursor)
+
+    def _explain(self, query, args=()):
+        self.cursor.execute(f"EXPLAIN QUERY PLAN {query}", args)
+        plan, subqueries = [], set()
+        for row in self.cursor.fetchall():
+            detail = row["detail"]
+            words = detail.split()
+            problems = []
+            if words[0] in ("MATERIALIZE", "CO-ROUTINE"):
+                subqueries.add(words[-1])
+            elif words[0] == "SCAN" and "VIRTUAL TABLE" not in detail:
+                # "SCAN tr" reads the table, "SCAN tr USING [COVERING] INDEX"
+                # one index from end to end; subquery results don't count
+                scanned = words[2] if words[1] == "TABLE" else words[1]
+                if scanned not in subqueries:
+                    problems.append("index scan" if "INDEX" in detail else "full scan")
+            elif detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+                problems.append("sort")
+            elif detail.startswith("USE TEMP B-TREE"):
+                problems.append("temporary")
+            plan.append((detail, problems))
+        return plan
+
+    def _table_indexes(self, table):
+        return {
+            index["name"]: [
+                column["name"]
+                for column in self.conn.execute(f"PRAGMA index_info({index['name']})")
+            ]
+            for index in self.conn.execute(f"PRAGMA index_list({table})").fetchall()
+        }
+
+    def _table_exists(self, table):
+        self.cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s",
+            (table,),
+        )
+        return self.cursor.fetchone() is not None
+
+    def create_test_results_table(self):
+        """Create test_results and the tables store_test_result_in_tables writes to"""
+        try:
+            self.conn.executescript(SCHEMA)
+            existing = {
+                row["name"]
+                for row in self.conn.execute("PRAGMA table_info(test_results)")
+            }
+            for column, statements in LATE_COLUMNS:
+                if column not in existing:
+                    for statement in statements:
+                        self.conn.execute(statement)
+            self.conn.executescript(LATE_INDEXES)
+            self.conn.commit()
+            self.ensure_rollup_tables()
+            self.ensure_error_search_index()
+        except Exception as e:
+            print(f"ERROR: Error creating SQLite tables: {e}")
+            self.conn.rollback()
@@ -6,6 +6,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
 # Constants for configuration
+from core.accounts import unique_test_email
+from core.click_engine import click_engine
 from core.constants import (
     ADDRESS,
     BOOK_URL,
@@ -26,6 +28,18 @@ from core.constants import (
     POSTAL_CODE,
     STATE,
 )
+from core.form_filler import fill_form
+from core.key_input import type_text, typing_backend_for
+from core.locator_resolver import locator_resolver, to_locator
+from core.waits import (
+    animation_finished,
+    dom_quiet,
+    page_ready,
+    pause,
+    scroll_settled,
+    value_committed,
+    wait_until,
+)
 
 
 class OneTimeBookPurchasePage:
@@ -63,7 +77,7 @@ class OneTimeBookPurchasePage:
                     )
                     
                     # Additional wait for page to be fully rendered
-                    time.sleep(2)
+                    page_ready(self.driver)
                     
                     # Check if page loaded successfully
                     current_url_after_load = self.driver.current_url
@@ -118,12 +132,12 @@ class OneTimeBookPurchasePage:
                     
                     if attempt < max_retries - 1:
                         print(f"[🔄] Retrying in 5 seconds...")
-                        time.sleep(5)
+                        pause(5)
                         
                         # Try to refresh the page
                         try:
                             self.driver.refresh()
-                            time.sleep(3)
+                            page_ready(self.driver)
                         except:
                             pass
                     else:
@@ -141,7 +155,7 @@ class OneTimeBookPurchasePage:
                                 # First try the base domain
                                 base_url = current_url.split('/textbooks/')[0] if '/textbooks/' in current_url else "https://www.solutioninn.com"
                                 self.driver.get(base_url)
-                                time.sleep(3)
+                                page_ready(self.driver)
                                 
                                 # Check if base domain loads
                                 if "solutioninn" not in self.driver.current_url.lower():
@@ -172,7 +186,7 @@ class OneTimeBookPurchasePage:
                                         "Object.defineProperty(navigator, 'userAgent', {get: function () {return 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36';}});"
                                     )
                                     self.driver.get(current_url)
-                                    time.sleep(5)
+                                    page_ready(self.driver)
                                     
                                     if "solutioninn" in self.driver.current_url.lower():
                                         print(f"[✅] Page loaded with custom user agent: {self.driver.current_url}")
@@ -184,6 +198,18 @@ class OneTimeBookPurchasePage:
                                     print(f"[❌] All approaches failed: {final_error}")
                                     raise e
 
+    def _wait_for_state_options(self, timeout=5):
+        """Wait until the state dropdown has been populated for the chosen country"""
+        return wait_until(
+            self.driver,
+            lambda d: any(
+                STATE in opt.text
+                for opt in Select(d.find_element(By.ID, "state")).options
+            ),
+            timeout=timeout,
+            name="state_options_loaded",
+        )
+
     def click_get_free_textbook(self):
         self._click_and_log(
             By.ID, "submit_btn_checkout", "Get Your Free Textbook", "📱🖥️"
@@ -203,7 +229,7 @@ class OneTimeBookPurchasePage:
         self.driver.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", button
         )
-        time.sleep(0.5)
+        scroll_settled(self.driver, button)
         button.click()
         print(f"[{emoji}] Clicked '{name}' on {'Mobile' if is_mobile else 'Desktop'}.")
 
@@ -211,7 +237,7 @@ class OneTimeBookPurchasePage:
     # Registration
     # ----------------------
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@example.com"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -239,10 +265,6 @@ class OneTimeBookPurchasePage:
 
         print(f"[📱] Filling billing details on {'Mobile' if is_mobile else 'Desktop'}")
 
-        # Fill basic text fields first
-        self._fill_input("fname", DEFAULT_FIRST_NAME)
-        self._fill_input("lname", DEFAULT_LAST_NAME)
-
         # Handle Country selection
         try:
             if is_mobile:
@@ -253,7 +275,7 @@ class OneTimeBookPurchasePage:
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", country_select
                 )
-                time.sleep(0.5)
+                scroll_settled(self.driver, country_select)
 
                 # Try to find Pakistan by value first, then by text
                 try:
@@ -277,7 +299,7 @@ class OneTimeBookPurchasePage:
                         print("[🌍] Country selected via JavaScript (Mobile).")
 
                 # Wait for state dropdown to populate
-                time.sleep(2)
+                self._wait_for_state_options()
             else:
                 country = wait.until(
                     EC.element_to_be_clickable((By.ID, "country_name_p"))
@@ -306,7 +328,7 @@ class OneTimeBookPurchasePage:
             """
             )
             print("[🌍] Country selected via JavaScript fallback.")
-            time.sleep(2)
+            self._wait_for_state_options()
 
         # Handle State selection
         try:
@@ -317,7 +339,7 @@ class OneTimeBookPurchasePage:
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", state_select
                 )
-                time.sleep(0.5)
+                scroll_settled(self.driver, state_select)
 
                 # Try to find Punjab by text first
                 try:
@@ -341,7 +363,7 @@ class OneTimeBookPurchasePage:
                     )
                     print("[🏙️] State selected via JavaScript (Mobile).")
 
-                time.sleep(1)
+                dom_quiet(self.driver)
             else:
                 state = wait.until(EC.element_to_be_clickable((By.ID, "state")))
                 Select(state).select_by_visible_text(STATE)
@@ -366,46 +388,18 @@ class OneTimeBookPurchasePage:
             )
             print("[🏙️] State selected via JavaScript fallback.")
 
-        # Fill remaining fields
-        self._fill_input("city", CITY)
-        self._fill_input("post_code", POSTAL_CODE)
-        self._fill_input("address", ADDRESS)
-        self._fill_input("phone_number", PHONE_NUMBER)
-
-        # Additional mobile-specific handling
-        if is_mobile:
-            # Ensure all fields are properly filled by scrolling and checking
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
-
-            # Verify all fields have values
-            fields_to_check = [
-                "fname",
-                "lname",
-                "city",
-                "post_code",
-                "address",
-                "phone_number",
-            ]
-            for field_id in fields_to_check:
-                try:
-                    field = self.driver.find_element(By.ID, field_id)
-                    if not field.get_attribute("value"):
-                        print(f"[⚠️] Field {field_id} is empty, refilling...")
-                        if field_id == "fname":
-                            field.send_keys(DEFAULT_FIRST_NAME)
-                        elif field_id == "lname":
-                            field.send_keys(DEFAULT_LAST_NAME)
-                        elif field_id == "city":
-                            field.send_keys(CITY)
-                        elif field_id == "post_code":
-                            field.send_keys(POSTAL_CODE)
-                        elif field_id == "address":
-                            field.send_keys(ADDRESS)
-                        elif field_id == "phone_number":
-                            field.send_keys(PHONE_NUMBER)
-                except Exception as e:
-                    print(f"[⚠️] Could not verify/fill field {field_id}: {e}")
+        # Text fields go in one round trip once the country/state selects settled
+        fill_form(
+            self.driver,
+            {
+                "fname": DEFAULT_FIRST_NAME,
+                "lname": DEFAULT_LAST_NAME,
+                "city": CITY,
+                "post_code": POSTAL_CODE,
+                "address": ADDRESS,
+                "phone_number": PHONE_NUMBER,
+            },
+        )
 
         print("[✅] Billing details filled successfully.")
 
@@ -418,45 +412,35 @@ class OneTimeBookPurchasePage:
             
             # Most common selectors first (faster approach)
             toggle_selectors = [
-                # Most likely selectors first
-                (By.CSS_SELECTOR, "label[for='radio7']"),  # This worked in debug
-                (By.ID, "radio7"),
-                (By.CSS_SELECTOR, "input[type='radio'][value='card']"),
-                (By.CSS_SELECTOR, "input[type='radio'][name*='payment']"),
-                (By.CSS_SELECTOR, "input[type='radio'][id*='card']"),
+                "label[for='radio7']",  # This worked in debug
+                "#radio7",
+                "input[type='radio'][value='card']",
+                "input[type='radio'][name*='payment']",
+                "input[type='radio'][id*='card']",
             ]
-            
+
             toggle_clicked = False
-            for selector_type, selector_value in toggle_selectors:
+            match = locator_resolver.resolve(
+                self.driver,
+                toggle_selectors,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=2,
+            )
+            if match:
                 try:
-                    print(f"[🔍] Trying payment toggle selector: {selector_type} = {selector_value}")
-                    
-                    # Reduced wait time for faster execution
-                    toggle = WebDriverWait(self.driver, 1).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
+                    click_engine.click(
+                        self.driver,
+                        to_locator(match.selector),
+                        page=self.__class__.__name__,
+                        element=match.element,
+                        label="Payment Toggle",
+                        strategies=("native", "javascript"),
                     )
-                    
-                    # Quick scroll and click
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", toggle)
-                    time.sleep(0.1)  # Reduced wait time
-                    
-                    # Try regular click first
-                    try:
-                        toggle.click()
-                        print(f"[💳] Payment toggle clicked using {selector_type}: {selector_value}")
-                        toggle_clicked = True
-                        break
-                    except Exception as click_error:
-                        print(f"[⚠️] Regular click failed, trying JavaScript: {click_error}")
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(f"[💳] Payment toggle clicked via JavaScript using {selector_type}: {selector_value}")
-                        toggle_clicked = True
-                        break
-                        
+                    print(f"[💳] Payment toggle clicked using {match.selector}")
+                    toggle_clicked = True
                 except Exception as e:
-                    print(f"[⚠️] Selector failed: {selector_type} = {selector_value}")
-                    continue
-            
+                    print(f"[⚠️] Payment toggle click failed: {type(e).__name__}")
+
             if not toggle_clicked:
                 print("[🔄] Trying JavaScript-based payment toggle selection...")
                 # JavaScript fallback to find and click any payment-related element
@@ -518,164 +502,28 @@ class OneTimeBookPurchasePage:
     # Card Details
     # ----------------------
     def enter_card_details(self):
-        wait = WebDriverWait(self.driver, 10)
         is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
 
         print(f"[💳] Entering card details on {'Mobile' if is_mobile else 'Desktop'}")
 
-        try:
-            # Fill card number
-            (
-                self._fill_card_number_mobile()
-                if is_mobile
-                else self._fill_input("cc_num", CARD_NUMBER)
-            )
-
-            # Fill card holder name
-            self._fill_input("cc_card_holder", CARD_HOLDER_NAME)
-
-            # Fill CVC
-            self._fill_input("cc-cvc", CVC)
-
-            # Fill postal code
-            self._fill_input("zipcode", POSTAL_CODE)
-
+        outcome = fill_form(
+            self.driver,
+            {
+                "cc_num": CARD_NUMBER,
+                "cc_card_holder": CARD_HOLDER_NAME,
+                "cc-cvc": CVC,
+                "zipcode": POSTAL_CODE,
+            },
+            per_key=("cc_num",),
+        )
+        if "failed" in outcome.values():
+            print(f"[❌] Error entering card details: {outcome}")
+        else:
             print("[✅] Card details filled successfully.")
 
-        except Exception as e:
-            print(f"[❌] Error entering card details: {type(e).__name__} – {e}")
-
-            # Enhanced JavaScript fallback for mobile
-            if is_mobile:
-                try:
-                    print("[🔄] Trying enhanced JavaScript fallback for mobile...")
-                    self.driver.execute_script(
-                        f"""
-                        // Fill card number
-                        let cc_num = document.getElementById('cc_num');
-                        if (cc_num) {{
-                            cc_num.value = '{CARD_NUMBER}';
-                            cc_num.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            cc_num.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-                        
-                        // Fill card holder
-                        let cc_card_holder = document.getElementById('cc_card_holder');
-                        if (cc_card_holder) {{
-                            cc_card_holder.value = '{CARD_HOLDER_NAME}';
-                            cc_card_holder.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            cc_card_holder.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-                        
-                        // Fill CVC
-                        let cvc = document.getElementById('cc-cvc');
-                        if (cvc) {{
-                            cvc.value = '{CVC}';
-                            cvc.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            cvc.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-                        
-                        // Fill postal code
-                        let zipcode = document.getElementById('zipcode');
-                        if (zipcode) {{
-                            zipcode.value = '{POSTAL_CODE}';
-                            zipcode.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            zipcode.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-                    """
-                    )
-                    print("[✅] Card details filled via enhanced JavaScript fallback.")
-
-                    # Verify the values were set correctly
-                    if is_mobile:
-                        time.sleep(1)
-                        fields_to_verify = [
-                            ("cc_num", CARD_NUMBER),
-                            ("cc_card_holder", CARD_HOLDER_NAME),
-                            ("cc-cvc", CVC),
-                            ("zipcode", POSTAL_CODE),
-                        ]
-
-                        for field_id, expected_value in fields_to_verify:
-                            try:
-                                field = self.driver.find_element(By.ID, field_id)
-                                actual_value = field.get_attribute("value")
-                                if actual_value != expected_value:
-                                    print(
-                                        f"[⚠️] Card field {field_id} verification failed. Expected: {expected_value}, Got: {actual_value}"
-                                    )
-                            except Exception as verify_error:
-                                print(
-                                    f"[❌] Could not verify field {field_id}: {verify_error}"
-                                )
-
-                except Exception as js_error:
-                    print(f"[❌] Enhanced JavaScript fallback also failed: {js_error}")
-                    raise e
-
         # Take screenshot for debugging
         self.driver.save_screenshot("card_details_filled.png")
 
-    def _fill_card_number_mobile(self):
-        """Enhanced card number filling for mobile devices"""
-        try:
-            # Wait for the field to be present
-            card_field = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "cc_num"))
-            )
-
-            # Scroll to the field with smooth behavior
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
-                card_field,
-            )
-            time.sleep(1)  # Wait for scroll to complete
-
-            # Clear the field first
-            card_field.clear()
-            time.sleep(0.3)
-
-            # Fill the field
-            card_field.send_keys(CARD_NUMBER)
-            time.sleep(0.3)
-
-            # Verify the value was entered correctly
-            actual_value = card_field.get_attribute("value")
-            if actual_value != CARD_NUMBER:
-                print(
-                    f"[⚠️] Card number verification failed. Expected: {CARD_NUMBER}, Got: {actual_value}"
-                )
-
-                # Try JavaScript fallback
-                self.driver.execute_script(
-                    f"""
-                    let field = document.getElementById('cc_num');
-                    if (field) {{
-                        field.value = '{CARD_NUMBER}';
-                        field.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        field.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                    }}
-                """
-                )
-                print("[✅] Card number filled via JavaScript fallback.")
-            else:
-                print("[✅] Card number filled successfully.")
-
-        except Exception as e:
-            print(f"[❌] Error filling card number: {type(e).__name__} – {e}")
-            # Try JavaScript fallback
-            self.driver.execute_script(
-                f"""
-                let field = document.getElementById('cc_num');
-                if (field) {{
-                    field.value = '{CARD_NUMBER}';
-                    field.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                    field.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                }}
-            """
-            )
-            print("[✅] Card number filled via JavaScript fallback.")
-
     # ----------------------
     # Expiry Selection
     # ----------------------
@@ -730,7 +578,9 @@ class OneTimeBookPurchasePage:
                             try:
                                 # Try to set value directly
                                 self.driver.execute_script("arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", element, month_value)
-                                time.sleep(0.5)
+                                value_committed(
+                                    self.driver, element, month_value, timeout=1
+                                )
                                 
                                 # Verify the selection
                                 actual_value = element.get_attribute("value")
@@ -808,7 +658,9 @@ class OneTimeBookPurchasePage:
                             try:
                                 # Try to set value directly
                                 self.driver.execute_script("arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", element, year_value)
-                                time.sleep(0.5)
+                                value_committed(
+                                    self.driver, element, year_value, timeout=1
+                                )
                                 
                                 # Verify the selection
                                 actual_value = element.get_attribute("value")
@@ -902,29 +754,27 @@ class OneTimeBookPurchasePage:
                     "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                     field,
                 )
-                time.sleep(1)  # Wait for scroll to complete
+                scroll_settled(self.driver, field)
             else:
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", field
                 )
-                time.sleep(0.5)
+                scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.1)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(field_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(
                     f"[⚠️] Field {field_id} verification failed. Expected: {value}, Got: {actual_value}"
                 )
@@ -944,7 +794,13 @@ class OneTimeBookPurchasePage:
                 print(f"[✅] Filled {field_id} via JavaScript fallback")
 
                 # Verify JavaScript fallback worked
-                time.sleep(0.3)
+                wait_until(
+                    self.driver,
+                    lambda d: d.find_element(By.ID, field_id).get_attribute("value")
+                    == value,
+                    timeout=1,
+                    name="value_committed",
+                )
                 actual_value = self.driver.find_element(By.ID, field_id).get_attribute(
                     "value"
                 )
@@ -974,7 +830,13 @@ class OneTimeBookPurchasePage:
                 print(f"[✅] Filled {field_id} via JavaScript fallback")
 
                 # Verify JavaScript fallback worked
-                time.sleep(0.3)
+                wait_until(
+                    self.driver,
+                    lambda d: d.find_element(By.ID, field_id).get_attribute("value")
+                    == value,
+                    timeout=1,
+                    name="value_committed",
+                )
                 actual_value = self.driver.find_element(By.ID, field_id).get_attribute(
                     "value"
                 )
@@ -1009,18 +871,18 @@ class OneTimeBookPurchasePage:
             # Quick scrolling strategy
             for _ in range(1):  # Reduced to 1 iteration
                 self.driver.execute_script("window.scrollBy(0, 100);")  # Reduced scroll distance
-                time.sleep(0.1)  # Reduced wait time
+                scroll_settled(self.driver)
 
             # Clear any overlays or modals
             self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-            time.sleep(0.2)  # Reduced wait time
+            animation_finished(self.driver)
 
             # Scroll button into view with better positioning
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center', inline: 'center'});", 
                 place_order_btn
             )
-            time.sleep(0.2)  # Reduced wait time
+            scroll_settled(self.driver, place_order_btn)
 
             # Try multiple click strategies
             try:
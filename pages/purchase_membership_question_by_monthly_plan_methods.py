@@ -4,6 +4,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from core.accounts import unique_test_email
+from core.click_engine import click_engine
 from core.constants import (
     ADDRESS,
     CARD_HOLDER_NAME,
@@ -13,12 +15,24 @@ from core.constants import (
     CVC,
     DEFAULT_PASSWORD,
     DEFAULT_UNIVERSITY,
-    EMAIL_DOMAIN,
     EXPIRY_MONTH,
     EXPIRY_YEAR,
+    JOIN_NOW_BUTTON_SELECTORS,
+    ONE_TIME_PLAN_FALLBACK_SELECTORS,
+    PAYMENT_TOGGLE_FALLBACK_SELECTORS,
     POSTAL_CODE,
     PRIMARY_URL,
 )
+from core.key_input import type_text, typing_backend_for
+from core.locator_resolver import locator_resolver, to_locator
+from core.session_checkpoint import spend_checkpoint
+from core.waits import (
+    animation_finished,
+    dom_quiet,
+    scroll_settled,
+    value_committed,
+    wait_until,
+)
 
 
 class SolutionInnPrimaryPage:
@@ -58,9 +72,6 @@ class SolutionInnPrimaryPage:
 
     def click_view_solution_button(self):
         try:
-            # Try multiple selectors to find the View Solution button
-            working_selector = None
-            
             # Selectors for the View Solution button
             selectors = [
                 ".view_solution_btn.step1PopupButton",
@@ -78,167 +89,28 @@ class SolutionInnPrimaryPage:
                 "//*[contains(text(), 'view solution')]",
             ]
             
-            # Find working selector first
-            for selector in selectors:
-                try:
-                    print(f"[SEARCH] Trying View Solution button selector: {selector}")
-                    
-                    if selector.startswith("//"):
-                        # XPath selector
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                        button = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        # CSS selector
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if button and button.is_displayed():
-                        working_selector = selector
-                        print(f"[SUCCESS] Found View Solution button with selector: {selector}")
-                        break
-                        
-                except Exception as e:
-                    print(f"[FAIL] Selector {selector} failed: {type(e).__name__}")
-                    continue
-            
-            if not working_selector:
+            match = locator_resolver.resolve(
+                self.driver, selectors, name=f"{self.__class__.__name__}.view_solution"
+            )
+            if not match:
                 raise Exception("Could not find View Solution button with any selector")
+            working_selector = match.selector
             
-            # Enhanced accordion and overlay handling
-            try:
-                # Close any open accordions that might be blocking the button
-                accordion_elements = self.driver.find_elements(By.CSS_SELECTOR, ".accordion.step-heading")
-                for accordion in accordion_elements:
-                    if "active" in accordion.get_attribute("class") or "open" in accordion.get_attribute("class"):
-                        self.driver.execute_script("arguments[0].click();", accordion)
-                        time.sleep(0.5)
-                        print("[FIX] Closed overlapping accordion element")
-                
-                # Remove any other overlapping elements
-                self.driver.execute_script("""
-                    // Remove any overlays, modals, or popups
-                    var overlays = document.querySelectorAll('.modal, .overlay, .popup, .tooltip, .dropdown-menu');
-                    overlays.forEach(function(overlay) {
-                        overlay.style.display = 'none';
-                        overlay.style.visibility = 'hidden';
-                    });
-                    
-                    // Hide any elements that might be covering the button
-                    var coveringElements = document.querySelectorAll('[style*="z-index"]');
-                    coveringElements.forEach(function(element) {
-                        if (parseInt(element.style.zIndex) > 1000) {
-                            element.style.display = 'none';
-                        }
-                    });
-                """)
-                time.sleep(0.5)
-                print("[FIX] Removed potential overlapping elements")
-                
-            except Exception as cleanup_error:
-                print(f"[WARNING] Could not clean up overlapping elements: {cleanup_error}")
-            
-            # Try multiple click strategies with fresh element finding
-            click_success = False
-            
-            # Strategy 1: Regular click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element right before clicking to avoid stale element
-                    if working_selector.startswith("//"):
-                        button = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, working_selector))
-                        )
-                    else:
-                        button = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, working_selector))
-                        )
-                    
-                    # Scroll to button with better positioning
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", button)
-                    time.sleep(1)
-                    
-                    button.click()
-                    print("[SUCCESS] Clicked 'View Solution' button successfully")
-                    click_success = True
-                except Exception as click_error:
-                    print(f"[WARNING] Regular click failed: {click_error}")
-            
-            # Strategy 2: JavaScript click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element
-                    if working_selector.startswith("//"):
-                        button = self.driver.find_element(By.XPATH, working_selector)
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, working_selector)
-                    
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print("[SUCCESS] Clicked 'View Solution' button using JavaScript")
-                    click_success = True
-                except Exception as js_error:
-                    print(f"[WARNING] JavaScript click failed: {js_error}")
-            
-            # Strategy 3: Force click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element
-                    if working_selector.startswith("//"):
-                        button = self.driver.find_element(By.XPATH, working_selector)
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, working_selector)
-                    
-                    # Scroll to button and force click
-                    self.driver.execute_script("""
-                        arguments[0].scrollIntoView({block: 'center', inline: 'center'});
-                        arguments[0].focus();
-                        arguments[0].dispatchEvent(new MouseEvent('click', {
-                            bubbles: true,
-                            cancelable: true,
-                            view: window
-                        }));
-                    """, button)
-                    print("[SUCCESS] Clicked 'View Solution' button using force click")
-                    click_success = True
-                except Exception as force_error:
-                    print(f"[WARNING] Force click failed: {force_error}")
-            
-            # Strategy 4: Final attempt with element removal and fresh element
-            if not click_success:
-                try:
-                    # Remove all potential blockers and try again
-                    self.driver.execute_script("""
-                        // Remove all potential blocking elements
-                        var blockers = document.querySelectorAll('.modal, .overlay, .popup, .tooltip, .dropdown-menu, .accordion.step-heading');
-                        blockers.forEach(function(blocker) {
-                            blocker.remove();
-                        });
-                    """)
-                    time.sleep(1)
-                    
-                    # Re-find the element one more time
-                    if working_selector.startswith("//"):
-                        button = self.driver.find_element(By.XPATH, working_selector)
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, working_selector)
-                    
-                    # Try clicking again
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print("[SUCCESS] Clicked 'View Solution' button after removing all blockers")
-                    click_success = True
-                except Exception as final_error:
-                    print(f"[ERROR] All click strategies failed: {final_error}")
-                    raise final_error
-                        
+            # The click engine's fallback strategies handle accordions and overlays
+            click_engine.click(
+                self.driver,
+                to_locator(working_selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="View Solution",
+            )
+
         except Exception as e:
             print(f"[ERROR] Failed to click View Solution button: {type(e).__name__} - {e}")
             raise e
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -277,26 +149,12 @@ class SolutionInnPrimaryPage:
             # Use the specific selector for Popular Plan button
             selector = "//button[contains(@class,'new-btn-blue-area activate_button')]"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Popular Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[SUCCESS] Popular Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[WARNING] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[SUCCESS] Popular Plan button clicked with JavaScript: '{button.text.strip()}'")
 
         except Exception as e:
             print(f"[ERROR] Failed to click Popular Plan button: {type(e).__name__} - {e}")
@@ -336,125 +194,24 @@ class SolutionInnPrimaryPage:
                 "//a[contains(text(),'monthly')]",
             ]
             
-            button = None
-            working_selector = None
-            
-            # Find working selector first
-            for selector in selectors:
-                try:
-                    print(f"[SEARCH] Trying Monthly Access button selector: {selector}")
-                    
-                    if selector.startswith("//"):
-                        # XPath selector
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                        button = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        # CSS selector
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if button and button.is_displayed():
-                        working_selector = selector
-                        print(f"[SUCCESS] Found Monthly Access button with selector: {selector}")
-                        break
-                        
-                except Exception as e:
-                    print(f"[FAIL] Selector {selector} failed: {type(e).__name__}")
-                    continue
-            
-            if not working_selector:
+            match = locator_resolver.resolve(
+                self.driver, selectors, name=f"{self.__class__.__name__}.monthly_access"
+            )
+            if not match:
                 raise Exception("Could not find Monthly Access button with any selector")
+            working_selector = match.selector
             
             # Wait for page to stabilize after finding the button
-            time.sleep(2)
-            
-            # Try multiple click strategies with immediate execution
-            click_success = False
-            
-            # Strategy 1: Immediate click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element and click immediately
-                    if working_selector.startswith("//"):
-                        button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, working_selector))
-                        )
-                    else:
-                        button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, working_selector))
-                        )
-                    
-                    # Click immediately without scrolling first
-                    button.click()
-                    print(f"[SUCCESS] Monthly Access button clicked successfully: '{button.text.strip()}'")
-                    click_success = True
-                except Exception as click_error:
-                    print(f"[WARNING] Immediate click failed: {click_error}")
-            
-            # Strategy 2: JavaScript click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element
-                    if working_selector.startswith("//"):
-                        button = self.driver.find_element(By.XPATH, working_selector)
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, working_selector)
-                    
-                    # Click with JavaScript immediately
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print(f"[SUCCESS] Monthly Access button clicked with JavaScript: '{button.text.strip()}'")
-                    click_success = True
-                except Exception as js_error:
-                    print(f"[WARNING] JavaScript click failed: {js_error}")
-            
-            # Strategy 3: Direct XPath click without finding element first
-            if not click_success:
-                try:
-                    # Click directly using XPath without finding the element first
-                    if working_selector.startswith("//"):
-                        self.driver.execute_script(f"""
-                            let element = document.evaluate('{working_selector}', document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                            if (element) {{
-                                element.click();
-                            }}
-                        """)
-                    else:
-                        self.driver.execute_script(f"""
-                            let element = document.querySelector('{working_selector}');
-                            if (element) {{
-                                element.click();
-                            }}
-                        """)
-                    print(f"[SUCCESS] Monthly Access button clicked using direct XPath/CSS: {working_selector}")
-                    click_success = True
-                except Exception as direct_error:
-                    print(f"[WARNING] Direct XPath/CSS click failed: {direct_error}")
-            
-            # Strategy 4: Try clicking by text content
-            if not click_success:
-                try:
-                    # Try to find and click any button with "View Solution" text
-                    self.driver.execute_script("""
-                        let buttons = document.querySelectorAll('button, a, input[type="button"]');
-                        for (let button of buttons) {
-                            if (button.textContent && button.textContent.toLowerCase().includes('view solution')) {
-                                button.click();
-                                return true;
-                            }
-                        }
-                        return false;
-                    """)
-                    print(f"[SUCCESS] Monthly Access button clicked using text search")
-                    click_success = True
-                except Exception as text_error:
-                    print(f"[WARNING] Text-based click failed: {text_error}")
+            dom_quiet(self.driver)
             
-            if not click_success:
-                raise Exception("All click strategies failed for Monthly Access button")
+            click_engine.click(
+                self.driver,
+                to_locator(working_selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Monthly Access",
+                timeout=5,
+            )
 
         except Exception as e:
             print(f"[ERROR] Failed to click Monthly Access button: {type(e).__name__} - {e}")
@@ -474,26 +231,12 @@ class SolutionInnPrimaryPage:
             # Use the specific selector for Six Month Plan button
             selector = "//div[@class='new-month-day-trail-6 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Six Month Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[SUCCESS] Six Month Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[WARNING] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[SUCCESS] Six Month Plan button clicked with JavaScript: '{button.text.strip()}'")
 
         except Exception as e:
             print(f"[ERROR] Failed to click Six Month Plan button: {type(e).__name__} - {e}")
@@ -512,59 +255,21 @@ class SolutionInnPrimaryPage:
                 f"[MOBILE] Clicking One Time Plan button on {'Mobile' if is_mobile else 'Desktop'}"
             )
 
-            # Try multiple selectors for the one-time plan button
-            selectors = [
-                "//button[contains(@class,'new-btn-blue-area activate_button')]",
-                "//button[contains(text(), 'One Time')]",
-                "//button[contains(text(), 'one time')]",
-                "//button[contains(text(), 'One-Time')]",
-                "//button[contains(text(), 'one-time')]",
-                "//a[contains(text(), 'One Time')]",
-                "//a[contains(text(), 'one time')]",
-                "//a[contains(text(), 'One-Time')]",
-                "//a[contains(text(), 'one-time')]",
-            ]
-
             button_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[SEARCH] Trying selector {i+1}/{len(selectors)}: {selector}")
-                    button = WebDriverWait(
-                        self.driver, 3
-                    ).until(  # Reduced from 10 seconds
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Scroll to element with better positioning
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        button,
-                    )
-                    time.sleep(0.2)  # Reduced from 1 second
-
-                    # Try regular click first
-                    try:
-                        button.click()
-                        print(
-                            f"[✓] Clicked One Time Plan button using selector: {selector}"
-                        )
-                        button_found = True
-                        break
-                    except Exception as click_error:
-                        print(
-                            f"[WARNING] Regular click failed, trying JavaScript click: {type(click_error).__name__}"
-                        )
-                        # Try JavaScript click as fallback
-                        self.driver.execute_script("arguments[0].click();", button)
-                        print(
-                            f"[✓] Clicked One Time Plan button using JavaScript: {selector}"
-                        )
-                        button_found = True
-                        break
-
-                except Exception as e:
-                    print(f"[WARNING] Selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                ONE_TIME_PLAN_FALLBACK_SELECTORS,
+                name=f"{self.__class__.__name__}.one_time_plan",
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="One Time Plan",
+                )
+                button_found = True
 
             if not button_found:
                 # Fallback: try to find any button that might be the one-time plan
@@ -610,7 +315,7 @@ class SolutionInnPrimaryPage:
                                     "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
                                     element,
                                 )
-                                time.sleep(0.2)  # Reduced from 1 second
+                                scroll_settled(self.driver, element)
 
                                 try:
                                     element.click()
@@ -674,29 +379,13 @@ class SolutionInnPrimaryPage:
     def _click_plan_button(self, xpath, label):
         """Generic method to click plan buttons"""
         try:
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, xpath))
+            click_engine.click(
+                self.driver,
+                (By.XPATH, xpath),
+                page=self.__class__.__name__,
+                label=label,
             )
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.2)  # Reduced from 1 second
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✓] Clicked {label} button")
-            except Exception as click_error:
-                print(
-                    f"[WARNING] Regular click failed, trying JavaScript click: {type(click_error).__name__}"
-                )
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✓] Clicked {label} button using JavaScript")
-
         except Exception as e:
             print(f"[ERROR] Failed to click {label} button: {type(e).__name__} - {e}")
             raise e
@@ -708,62 +397,23 @@ class SolutionInnPrimaryPage:
                 f"[📱] Looking for Payment Toggle on {'Mobile' if is_mobile else 'Desktop'}"
             )
 
-            # Try multiple selectors for payment toggle (same as secondary page)
-            toggle_selectors = [
-                "//label[@for='radio7']",
-                "//input[@id='radio7']",
-                "//label[contains(text(), 'Credit Card')]",
-                "//label[contains(text(), 'Card')]",
-                "//input[@type='radio'][@name='payment_method']",
-                "//input[@type='radio']",
-                "//label[contains(@class, 'payment')]",
-                "//div[contains(@class, 'payment')]//input[@type='radio']",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(toggle_selectors):
-                try:
-                    print(
-                        f"[🔍] Trying payment toggle selector {i+1}/{len(toggle_selectors)}: {selector}"
-                    )
-                    toggle = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Enhanced scrolling for mobile
-                    if is_mobile:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
-                            toggle,
-                        )
-                        time.sleep(1)
-                    else:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center'});", toggle
-                        )
-                        time.sleep(0.5)
-
-                    try:
-                        toggle.click()
-                        print(f"[✅] Clicked Payment Toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(
-                            f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}"
-                        )
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(
-                            f"[✅] Clicked Payment Toggle with JavaScript: {selector}"
-                        )
-                        toggle_found = True
-                        break
-
-                except Exception as e:
-                    print(
-                        f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}"
-                    )
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_FALLBACK_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -787,15 +437,15 @@ class SolutionInnPrimaryPage:
                     wait, "cc_num", CARD_NUMBER, delay_per_key=True
                 )
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
+                scroll_settled(self.driver)
 
                 self._fill_card_field_mobile(wait, "cc_card_holder", CARD_HOLDER_NAME)
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
+                scroll_settled(self.driver)
 
                 self._fill_card_field_mobile(wait, "cc-cvc", CVC)
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
+                scroll_settled(self.driver)
 
                 self._fill_card_field_mobile(wait, "zipcode", POSTAL_CODE)
             else:
@@ -821,25 +471,23 @@ class SolutionInnPrimaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(1)  # Wait for scroll to complete
+            scroll_settled(self.driver, field)
 
             # Clear the field first
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(
                     f"[WARNING] Card field {element_id} verification failed. Expected: {value}, Got: {actual_value}"
                 )
@@ -858,7 +506,7 @@ class SolutionInnPrimaryPage:
                 print(f"[SUCCESS] Card field {element_id} filled via JavaScript fallback.")
 
                 # Final verification
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
                 final_value = field.get_attribute("value")
                 if final_value != value:
                     print(
@@ -886,20 +534,18 @@ class SolutionInnPrimaryPage:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", field
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.2)
-
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
+            value_committed(self.driver, field, "")
 
-            time.sleep(0.2)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
         except Exception as e:
             print(f"[ERROR] Error filling field {element_id}: {type(e).__name__} - {e}")
@@ -966,7 +612,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == month_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == month_value:
                         print(
@@ -986,7 +640,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{month_value}']")
@@ -1021,7 +675,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == year_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == year_value:
                         print(
@@ -1041,7 +703,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{year_value}']")
@@ -1054,61 +716,28 @@ class SolutionInnPrimaryPage:
             print(f"[ERROR] Failed selecting year: {type(e).__name__} - {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(
                 f"[MOBILE] Clicking Join Now button on {'Mobile' if is_mobile else 'Desktop'}"
             )
 
-            # Try multiple possible selectors for the Join Now button
-            possible_selectors = [
-                (
-                    By.ID,
-                    "submit_btn_checkout",
-                ),  # Primary selector (like secondary page)
-                (By.XPATH, "//button[contains(text(), 'Join Now')]"),  # Fallback XPath
-                (
-                    By.XPATH,
-                    "//button[contains(text(), 'join now')]",
-                ),  # Case insensitive
-                (By.XPATH, "//input[@value='Join Now']"),  # Input button
-                (By.CSS_SELECTOR, "button[type='submit']"),  # Generic submit button
-            ]
-
-            button = None
-            for selector_type, selector_value in possible_selectors:
-                try:
-                    button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    print(
-                        f"[SEARCH] Found Join Now button using: {selector_type} = '{selector_value}'"
-                    )
-                    break
-                except Exception:
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                JOIN_NOW_BUTTON_SELECTORS,
+                name=f"{self.__class__.__name__}.join_now",
+            )
+            if not match:
                 raise Exception("Could not find Join Now button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Join Now",
             )
-            time.sleep(0.5)  # Give time for scroll to complete
-
-            # Try regular click first
-            try:
-                button.click()
-                print("[✓] Clicked Join Now button")
-            except Exception as click_error:
-                print(
-                    f"[WARNING] Regular click failed, trying JavaScript click: {type(click_error).__name__}"
-                )
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print("[✓] Clicked Join Now button using JavaScript")
 
         except Exception as e:
             print(f"[ERROR] Failed to click Join Now button: {type(e).__name__} - {e}")
@@ -4,6 +4,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from core.accounts import unique_test_email
+from core.click_engine import click_engine
 from core.constants import (
     ADDRESS,
     CARD_HOLDER_NAME,
@@ -13,14 +15,28 @@ from core.constants import (
     CVC,
     DEFAULT_PASSWORD,
     DEFAULT_UNIVERSITY,
-    EMAIL_DOMAIN,
     EXPIRY_MONTH,
     EXPIRY_YEAR,
+    JOIN_NOW_BUTTON_SELECTORS,
+    ONE_TIME_PLAN_CARD_SELECTORS,
+    PAYMENT_TOGGLE_FALLBACK_SELECTORS,
+    PAYMENT_TOGGLE_SELECTORS,
+    POPULAR_PLAN_FALLBACK_SELECTORS,
     POSTAL_CODE,
     PRIMARY_URL,
     SECONDARY_URL,
     VIEW_SOLUTION_BTN_CSS,
 )
+from core.key_input import type_text, typing_backend_for
+from core.locator_resolver import locator_resolver, to_locator
+from core.session_checkpoint import spend_checkpoint
+from core.waits import (
+    animation_finished,
+    dom_quiet,
+    scroll_settled,
+    value_committed,
+    wait_until,
+)
 
 
 class SolutionInnPrimaryPage:
@@ -40,98 +56,14 @@ class SolutionInnPrimaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking View Solution button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Wait for the button to be present
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, self.view_solution_btn_css)
-                )
-            )
-            
-            # Find the button
-            button = self.driver.find_element(By.CSS_SELECTOR, self.view_solution_btn_css)
-            
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.CSS_SELECTOR, self.view_solution_btn_css),
+                page=self.__class__.__name__,
+                label="View Solution",
+                timeout=15,
             )
-            time.sleep(0.5)
-            
-            # Wait for element to be clickable
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, self.view_solution_btn_css))
-            )
-            
-            # Try multiple click strategies to handle element interception
-            click_success = False
-            
-            # Strategy 1: Regular click
-            if not click_success:
-                try:
-                    button.click()
-                    print(f"[✅] View Solution button clicked successfully")
-                    click_success = True
-                except Exception as click_error:
-                    print(f"[⚠️] Regular click failed: {type(click_error).__name__}")
-            
-            # Strategy 2: JavaScript click
-            if not click_success:
-                try:
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print(f"[✅] View Solution button clicked with JavaScript")
-                    click_success = True
-                except Exception as js_error:
-                    print(f"[⚠️] JavaScript click failed: {type(js_error).__name__}")
-            
-            # Strategy 3: Try to close any overlapping accordion first
-            if not click_success:
-                try:
-                    # Look for accordion elements that might be overlapping
-                    accordion_selectors = [
-                        "//strong[contains(@class,'accordion')]",
-                        "//div[contains(@class,'accordion')]",
-                        "//*[contains(@class,'step-heading')]",
-                        "//*[contains(@class,'accordion')]"
-                    ]
-                    
-                    for accordion_selector in accordion_selectors:
-                        try:
-                            accordion = self.driver.find_element(By.XPATH, accordion_selector)
-                            if accordion.is_displayed():
-                                print(f"[🔍] Found overlapping accordion, trying to close it")
-                                self.driver.execute_script("arguments[0].click();", accordion)
-                                time.sleep(0.5)
-                                break
-                        except:
-                            continue
-                    
-                    # Try clicking the button again after closing accordion
-                    button = self.driver.find_element(By.CSS_SELECTOR, self.view_solution_btn_css)
-                    button.click()
-                    print(f"[✅] View Solution button clicked after closing accordion")
-                    click_success = True
-                except Exception as accordion_error:
-                    print(f"[⚠️] Accordion handling failed: {type(accordion_error).__name__}")
-            
-            # Strategy 4: Force click with JavaScript
-            if not click_success:
-                try:
-                    self.driver.execute_script("""
-                        let button = document.querySelector(arguments[0]);
-                        if (button) {
-                            button.style.zIndex = '9999';
-                            button.style.position = 'relative';
-                            button.click();
-                        }
-                    """, self.view_solution_btn_css)
-                    print(f"[✅] View Solution button clicked with forced JavaScript")
-                    click_success = True
-                except Exception as force_error:
-                    print(f"[⚠️] Force click failed: {type(force_error).__name__}")
-            
-            if not click_success:
-                raise Exception("All click strategies failed for View Solution button")
-                
+
         except Exception as e:
             print(f"[❌] Failed to click View Solution button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -143,7 +75,7 @@ class SolutionInnPrimaryPage:
             raise e
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -182,26 +114,12 @@ class SolutionInnPrimaryPage:
             # Use the specific selector for Popular Plan button
             selector = "//button[contains(@class,'new-btn-blue-area activate_button')]"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Popular Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Popular Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Popular Plan button clicked with JavaScript: '{button.text.strip()}'")
 
         except Exception as e:
             print(f"[❌] Failed to click Popular Plan button: {type(e).__name__} – {e}")
@@ -221,26 +139,12 @@ class SolutionInnPrimaryPage:
             # Use the specific selector for Monthly Access button
             selector = "//div[@class='new-month-day-trail-1 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Monthly Access",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Monthly Access button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Monthly Access button clicked with JavaScript: '{button.text.strip()}'")
 
         except Exception as e:
             print(f"[❌] Failed to click Monthly Access button: {type(e).__name__} – {e}")
@@ -260,27 +164,13 @@ class SolutionInnPrimaryPage:
             # Use the specific selector for Six Month Plan button
             selector = "//div[@class='new-month-day-trail-6 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Six Month Plan",
             )
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Six Month Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Six Month Plan button clicked with JavaScript: '{button.text.strip()}'")
-
         except Exception as e:
             print(f"[❌] Failed to click Six Month Plan button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -296,67 +186,22 @@ class SolutionInnPrimaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking One Time Plan button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Use multiple specific selectors for One Time Plan button to ensure we get the right one
-            selectors = [
-                "//div[contains(@class,'one-time')]//button[normalize-space()='Buy solution']",
-                "//div[contains(@class,'one-time')]//button[normalize-space()='View Solution']",
-                "//div[contains(@class,'one-time')]//button[@type='button']",
-                "//div[contains(@class,'one-time')]//button[contains(@class,'btn')]",
-                "//button[contains(@class,'one-time') and normalize-space()='Buy solution']",
-                "//button[contains(@class,'one-time') and normalize-space()='View Solution']",
-                # Fallback to more specific selectors
-                "//div[@class='plans-card-header' and contains(.,'one-time')]//button",
-                "//div[@class='plans-card-header' and contains(.,'One Time')]//button",
-                "//div[@class='plans-card-header' and contains(.,'one time')]//button",
-            ]
-
-            button = None
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying One Time Plan selector {i+1}/{len(selectors)}: {selector}")
-                    button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    print(f"[✅] Found One Time Plan button with selector: {selector}")
-                    break
-                except Exception as e:
-                    print(f"[⚠️] Selector {i+1} failed: {type(e).__name__}")
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                ONE_TIME_PLAN_CARD_SELECTORS,
+                name=f"{self.__class__.__name__}.one_time_plan",
+                timeout=5,
+            )
+            if not match:
                 raise Exception("Could not find One Time Plan button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="One Time Plan",
             )
-            time.sleep(0.5)
-
-            # Re-find the element to avoid stale element issues
-            try:
-                button = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                button.click()
-                print(f"[✅] One Time Plan button clicked successfully")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                try:
-                    button = self.driver.find_element(By.XPATH, selector)
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print(f"[✅] One Time Plan button clicked with JavaScript")
-                except Exception as js_error:
-                    print(f"[⚠️] JavaScript click also failed: {type(js_error).__name__}")
-                    # Final fallback: direct XPath click
-                    self.driver.execute_script("""
-                        let element = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                        if (element) {
-                            element.click();
-                        }
-                    """, selector)
-                    print(f"[✅] One Time Plan button clicked using direct XPath: {selector}")
 
         except Exception as e:
             print(f"[❌] Failed to click One Time Plan button: {type(e).__name__} – {e}")
@@ -373,47 +218,23 @@ class SolutionInnPrimaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking payment toggle on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple selectors for the payment toggle
-            selectors = [
-                "//input[@id='radio7']",
-                "//label[@for='radio7']",
-                "//input[@name='payment_method' and @value='card']",
-                "//input[@type='radio' and contains(@class, 'payment')]",
-                "//input[@type='radio' and contains(@class, 'card')]",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying payment toggle selector {i+1}/{len(selectors)}: {selector}")
-                    toggle = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Scroll to element with better positioning
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        toggle,
-                    )
-                    time.sleep(0.2)
-
-                    # Try regular click first
-                    try:
-                        toggle.click()
-                        print(f"[✓] Clicked payment toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                        # Try JavaScript click as fallback
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(f"[✓] Clicked payment toggle using JavaScript: {selector}")
-                        toggle_found = True
-                        break
-
-                except Exception as e:
-                    print(f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -451,14 +272,14 @@ class SolutionInnPrimaryPage:
                 if is_mobile:
                     # Scroll to top first
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1)
+                    scroll_settled(self.driver)
 
                 self._js_fallback_card_fields()
                 print("[✅] Card details filled via enhanced JavaScript fallback.")
 
                 # Verify the values were set correctly
                 if is_mobile:
-                    time.sleep(1)
+                    dom_quiet(self.driver, quiet_ms=150, timeout=1)
                     fields_to_verify = [
                         ("cc_num", CARD_NUMBER),
                         ("cc_card_holder", CARD_HOLDER_NAME),
@@ -490,25 +311,23 @@ class SolutionInnPrimaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(1)  # Wait for scroll to complete
+            scroll_settled(self.driver, field)
 
             # Clear the field first
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(f"[⚠️] Card field {element_id} verification failed. Expected: {value}, Got: {actual_value}")
 
                 # Try JavaScript fallback
@@ -525,7 +344,7 @@ class SolutionInnPrimaryPage:
                 print(f"[✅] Card field {element_id} filled via JavaScript fallback.")
 
                 # Final verification
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
                 final_value = field.get_attribute("value")
                 if final_value != value:
                     print(f"[❌] Card field {element_id} still not correct after JavaScript fallback. Expected: {value}, Got: {final_value}")
@@ -547,20 +366,18 @@ class SolutionInnPrimaryPage:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", field
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.2)
+            value_committed(self.driver, field, "")
 
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.2)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
         except Exception as e:
             print(f"[❌] Error filling field {element_id}: {type(e).__name__} – {e}")
@@ -627,7 +444,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == month_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == month_value:
                         print(f"[🌐] JS: Set expiry month to '{month_value}' using ID '{element_id}'")
@@ -645,7 +470,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{month_value}']")
@@ -680,7 +505,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == year_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == year_value:
                         print(f"[🌐] JS: Set expiry year to '{year_value}' using ID '{element_id}'")
@@ -698,7 +531,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{year_value}']")
@@ -711,49 +544,26 @@ class SolutionInnPrimaryPage:
             print(f"[❌] Failed selecting year: {type(e).__name__} – {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking Join Now button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple possible selectors for the Join Now button
-            possible_selectors = [
-                (By.ID, "submit_btn_checkout"),  # Primary selector (like secondary page)
-                (By.XPATH, "//button[contains(text(), 'Join Now')]"),  # Fallback XPath
-                (By.XPATH, "//button[contains(text(), 'join now')]"),  # Case insensitive
-                (By.XPATH, "//input[@value='Join Now']"),  # Input button
-                (By.CSS_SELECTOR, "button[type='submit']"),  # Generic submit button
-            ]
-
-            button = None
-            for selector_type, selector_value in possible_selectors:
-                try:
-                    button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    print(f"[🔍] Found Join Now button using: {selector_type} = '{selector_value}'")
-                    break
-                except Exception:
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                JOIN_NOW_BUTTON_SELECTORS,
+                name=f"{self.__class__.__name__}.join_now",
+            )
+            if not match:
                 raise Exception("Could not find Join Now button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Join Now",
             )
-            time.sleep(0.5)  # Give time for scroll to complete
-
-            # Try regular click first
-            try:
-                button.click()
-                print("[✓] Clicked Join Now button")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print("[✓] Clicked Join Now button using JavaScript")
 
         except Exception as e:
             print(f"[❌] Failed to click Join Now button: {type(e).__name__} – {e}")
@@ -777,98 +587,14 @@ class SolutionInnSecondaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking View Solution button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Wait for the button to be present
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, self.view_solution_btn_css)
-                )
-            )
-            
-            # Find the button
-            button = self.driver.find_element(By.CSS_SELECTOR, self.view_solution_btn_css)
-            
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.5)
-            
-            # Wait for element to be clickable
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, self.view_solution_btn_css))
+            click_engine.click(
+                self.driver,
+                (By.CSS_SELECTOR, self.view_solution_btn_css),
+                page=self.__class__.__name__,
+                label="View Solution",
+                timeout=15,
             )
-            
-            # Try multiple click strategies to handle element interception
-            click_success = False
-            
-            # Strategy 1: Regular click
-            if not click_success:
-                try:
-                    button.click()
-                    print(f"[✅] View Solution button clicked successfully")
-                    click_success = True
-                except Exception as click_error:
-                    print(f"[⚠️] Regular click failed: {type(click_error).__name__}")
-            
-            # Strategy 2: JavaScript click
-            if not click_success:
-                try:
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print(f"[✅] View Solution button clicked with JavaScript")
-                    click_success = True
-                except Exception as js_error:
-                    print(f"[⚠️] JavaScript click failed: {type(js_error).__name__}")
-            
-            # Strategy 3: Try to close any overlapping accordion first
-            if not click_success:
-                try:
-                    # Look for accordion elements that might be overlapping
-                    accordion_selectors = [
-                        "//strong[contains(@class,'accordion')]",
-                        "//div[contains(@class,'accordion')]",
-                        "//*[contains(@class,'step-heading')]",
-                        "//*[contains(@class,'accordion')]"
-                    ]
-                    
-                    for accordion_selector in accordion_selectors:
-                        try:
-                            accordion = self.driver.find_element(By.XPATH, accordion_selector)
-                            if accordion.is_displayed():
-                                print(f"[🔍] Found overlapping accordion, trying to close it")
-                                self.driver.execute_script("arguments[0].click();", accordion)
-                                time.sleep(0.5)
-                                break
-                        except:
-                            continue
-                    
-                    # Try clicking the button again after closing accordion
-                    button = self.driver.find_element(By.CSS_SELECTOR, self.view_solution_btn_css)
-                    button.click()
-                    print(f"[✅] View Solution button clicked after closing accordion")
-                    click_success = True
-                except Exception as accordion_error:
-                    print(f"[⚠️] Accordion handling failed: {type(accordion_error).__name__}")
-            
-            # Strategy 4: Force click with JavaScript
-            if not click_success:
-                try:
-                    self.driver.execute_script("""
-                        let button = document.querySelector(arguments[0]);
-                        if (button) {
-                            button.style.zIndex = '9999';
-                            button.style.position = 'relative';
-                            button.click();
-                        }
-                    """, self.view_solution_btn_css)
-                    print(f"[✅] View Solution button clicked with forced JavaScript")
-                    click_success = True
-                except Exception as force_error:
-                    print(f"[⚠️] Force click failed: {type(force_error).__name__}")
-            
-            if not click_success:
-                raise Exception("All click strategies failed for View Solution button")
-                
+
         except Exception as e:
             print(f"[❌] Failed to click View Solution button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -880,7 +606,7 @@ class SolutionInnSecondaryPage:
             raise e
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -915,54 +641,21 @@ class SolutionInnSecondaryPage:
         try:
             print("[🔍] Attempting to locate Popular Plan button...")
 
-            # Try multiple selectors for the popular plan button
-            selectors = [
-                "//button[contains(@class,'new-btn-blue-area activate_button')]",
-                "//button[contains(text(), 'Popular')]",
-                "//button[contains(text(), 'popular')]",
-                "//button[contains(@class, 'popular')]",
-                "//a[contains(text(), 'Popular')]",
-                "//a[contains(@class, 'popular')]",
-            ]
-
             button_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying selector {i+1}/{len(selectors)}: {selector}")
-                    button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Scroll to element with better positioning
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        button,
-                    )
-                    time.sleep(1)  # Wait for scroll to complete
-
-                    # Try regular click first
-                    try:
-                        button.click()
-                        print(
-                            f"[✓] Clicked Popular Plan button using selector: {selector}"
-                        )
-                        button_found = True
-                        break
-                    except Exception as click_error:
-                        print(
-                            f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}"
-                        )
-                        # Try JavaScript click as fallback
-                        self.driver.execute_script("arguments[0].click();", button)
-                        print(
-                            f"[✓] Clicked Popular Plan button using JavaScript: {selector}"
-                        )
-                        button_found = True
-                        break
-
-                except Exception as e:
-                    print(f"[⚠️] Selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                POPULAR_PLAN_FALLBACK_SELECTORS,
+                name=f"{self.__class__.__name__}.popular_plan",
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Popular Plan",
+                )
+                button_found = True
 
             if not button_found:
                 # Fallback: try to find any button that might be the popular plan
@@ -1007,7 +700,7 @@ class SolutionInnSecondaryPage:
                                     "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
                                     element,
                                 )
-                                time.sleep(1)
+                                scroll_settled(self.driver, element)
 
                                 try:
                                     element.click()
@@ -1088,12 +781,12 @@ class SolutionInnSecondaryPage:
                     "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                     button,
                 )
-                time.sleep(1)
+                scroll_settled(self.driver, button)
             else:
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", button
                 )
-                time.sleep(0.5)
+                scroll_settled(self.driver, button)
 
             try:
                 button.click()
@@ -1133,12 +826,12 @@ class SolutionInnSecondaryPage:
                     "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                     button,
                 )
-                time.sleep(1)
+                scroll_settled(self.driver, button)
             else:
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", button
                 )
-                time.sleep(0.5)
+                scroll_settled(self.driver, button)
 
             try:
                 button.click()
@@ -1161,67 +854,22 @@ class SolutionInnSecondaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking One Time Plan button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Use multiple specific selectors for One Time Plan button to ensure we get the right one
-            selectors = [
-                "//div[contains(@class,'one-time')]//button[normalize-space()='Buy solution']",
-                "//div[contains(@class,'one-time')]//button[normalize-space()='View Solution']",
-                "//div[contains(@class,'one-time')]//button[@type='button']",
-                "//div[contains(@class,'one-time')]//button[contains(@class,'btn')]",
-                "//button[contains(@class,'one-time') and normalize-space()='Buy solution']",
-                "//button[contains(@class,'one-time') and normalize-space()='View Solution']",
-                # Fallback to more specific selectors
-                "//div[@class='plans-card-header' and contains(.,'one-time')]//button",
-                "//div[@class='plans-card-header' and contains(.,'One Time')]//button",
-                "//div[@class='plans-card-header' and contains(.,'one time')]//button",
-            ]
-
-            button = None
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying One Time Plan selector {i+1}/{len(selectors)}: {selector}")
-                    button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    print(f"[✅] Found One Time Plan button with selector: {selector}")
-                    break
-                except Exception as e:
-                    print(f"[⚠️] Selector {i+1} failed: {type(e).__name__}")
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                ONE_TIME_PLAN_CARD_SELECTORS,
+                name=f"{self.__class__.__name__}.one_time_plan",
+                timeout=5,
+            )
+            if not match:
                 raise Exception("Could not find One Time Plan button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="One Time Plan",
             )
-            time.sleep(0.5)
-
-            # Re-find the element to avoid stale element issues
-            try:
-                button = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                button.click()
-                print(f"[✅] One Time Plan button clicked successfully")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                try:
-                    button = self.driver.find_element(By.XPATH, selector)
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print(f"[✅] One Time Plan button clicked with JavaScript")
-                except Exception as js_error:
-                    print(f"[⚠️] JavaScript click also failed: {type(js_error).__name__}")
-                    # Final fallback: direct XPath click
-                    self.driver.execute_script("""
-                        let element = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                        if (element) {
-                            element.click();
-                        }
-                    """, selector)
-                    print(f"[✅] One Time Plan button clicked using direct XPath: {selector}")
 
         except Exception as e:
             print(f"[❌] Failed to click One Time Plan button: {type(e).__name__} – {e}")
@@ -1240,62 +888,23 @@ class SolutionInnSecondaryPage:
                 f"[📱] Looking for Payment Toggle on {'Mobile' if is_mobile else 'Desktop'}"
             )
 
-            # Try multiple selectors for payment toggle
-            toggle_selectors = [
-                "//label[@for='radio7']",
-                "//input[@id='radio7']",
-                "//label[contains(text(), 'Credit Card')]",
-                "//label[contains(text(), 'Card')]",
-                "//input[@type='radio'][@name='payment_method']",
-                "//input[@type='radio']",
-                "//label[contains(@class, 'payment')]",
-                "//div[contains(@class, 'payment')]//input[@type='radio']",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(toggle_selectors):
-                try:
-                    print(
-                        f"[🔍] Trying payment toggle selector {i+1}/{len(toggle_selectors)}: {selector}"
-                    )
-                    toggle = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Enhanced scrolling for mobile
-                    if is_mobile:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
-                            toggle,
-                        )
-                        time.sleep(1)
-                    else:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center'});", toggle
-                        )
-                        time.sleep(0.5)
-
-                    try:
-                        toggle.click()
-                        print(f"[✅] Clicked Payment Toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(
-                            f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}"
-                        )
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(
-                            f"[✅] Clicked Payment Toggle with JavaScript: {selector}"
-                        )
-                        toggle_found = True
-                        break
-
-                except Exception as e:
-                    print(
-                        f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}"
-                    )
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_FALLBACK_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -1319,15 +928,15 @@ class SolutionInnSecondaryPage:
                     wait, "cc_num", CARD_NUMBER, delay_per_key=True
                 )
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
+                scroll_settled(self.driver)
 
                 self._fill_card_field_mobile(wait, "cc_card_holder", CARD_HOLDER_NAME)
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
+                scroll_settled(self.driver)
 
                 self._fill_card_field_mobile(wait, "cc-cvc", CVC)
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(0.5)
+                scroll_settled(self.driver)
 
                 self._fill_card_field_mobile(wait, "zipcode", POSTAL_CODE)
             else:
@@ -1352,22 +961,22 @@ class SolutionInnSecondaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear the field
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
             # Verify the value was entered correctly
-            time.sleep(0.3)
+            value_committed(self.driver, field, value)
             actual_value = field.get_attribute("value")
             if actual_value != value:
                 print(
@@ -1384,7 +993,7 @@ class SolutionInnSecondaryPage:
                     }}
                 """
                 )
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
 
                 # Final verification
                 final_value = field.get_attribute("value")
@@ -1426,12 +1035,12 @@ class SolutionInnSecondaryPage:
             "arguments[0].scrollIntoView({block: 'center'});", field
         )
         field.clear()
-        if delay_per_key:
-            for char in value:
-                field.send_keys(char)
-                time.sleep(0.03)
-        else:
-            field.send_keys(value)
+        type_text(
+            self.driver,
+            field,
+            value,
+            backend=typing_backend_for(element_id, per_key=delay_per_key),
+        )
 
     def _js_fallback_card_fields(self):
         try:
@@ -1479,7 +1088,7 @@ class SolutionInnSecondaryPage:
 
             # Verify the values were set correctly
             if is_mobile:
-                time.sleep(1)
+                dom_quiet(self.driver, quiet_ms=150, timeout=1)
                 fields_to_verify = [
                     ("cc_num", CARD_NUMBER),
                     ("cc_card_holder", CARD_HOLDER_NAME),
@@ -1537,6 +1146,7 @@ class SolutionInnSecondaryPage:
             print(f"[❌] Year selection failed: {type(e).__name__} – {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             btn = WebDriverWait(self.driver, 20).until(
                 EC.presence_of_element_located((By.ID, "submit_btn_checkout"))
@@ -4,6 +4,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from core.accounts import unique_test_email
+from core.click_engine import click_engine
 from core.constants import (
     ADDRESS,
     CARD_HOLDER_NAME,
@@ -13,14 +15,26 @@ from core.constants import (
     CVC,
     DEFAULT_PASSWORD,
     DEFAULT_UNIVERSITY,
-    EMAIL_DOMAIN,
     EXPIRY_MONTH,
     EXPIRY_YEAR,
+    JOIN_NOW_BUTTON_SELECTORS,
+    ONE_TIME_PLAN_CARD_SELECTORS,
+    PAYMENT_TOGGLE_SELECTORS,
     POSTAL_CODE,
     PRIMARY_URL,
     SECONDARY_URL,
     VIEW_SOLUTION_BTN_CSS,
 )
+from core.key_input import type_text, typing_backend_for
+from core.locator_resolver import locator_resolver, to_locator
+from core.session_checkpoint import spend_checkpoint
+from core.waits import (
+    animation_finished,
+    dom_quiet,
+    scroll_settled,
+    value_committed,
+    wait_until,
+)
 
 
 class SolutionInnPrimaryPage:
@@ -61,74 +75,20 @@ class SolutionInnPrimaryPage:
 
     def click_view_solution_button(self):
         try:
-            # Wait for button to be present
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, self.view_solution_btn_css)
-                )
+            click_engine.click(
+                self.driver,
+                (By.CSS_SELECTOR, self.view_solution_btn_css),
+                page=self.__class__.__name__,
+                label="View Solution",
+                timeout=15,
             )
-            
-            button = self.driver.find_element(By.CSS_SELECTOR, self.view_solution_btn_css)
-            
-            # Scroll to button with better positioning
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", button)
-            time.sleep(1)
-            
-            # Check if button is clickable
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, self.view_solution_btn_css))
-            )
-            
-            # Try to close any overlapping elements first
-            try:
-                # Close any open accordions that might be blocking the button
-                accordion_elements = self.driver.find_elements(By.CSS_SELECTOR, ".accordion.step-heading")
-                for accordion in accordion_elements:
-                    if "active" in accordion.get_attribute("class") or "open" in accordion.get_attribute("class"):
-                        self.driver.execute_script("arguments[0].click();", accordion)
-                        time.sleep(0.5)
-                        print("[🔧] Closed overlapping accordion element")
-            except Exception as accordion_error:
-                print(f"[⚠️] Could not close accordions: {accordion_error}")
-            
-            # Try regular click first
-            try:
-                button.click()
-                print("[✅] Clicked 'View Solution' button successfully")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed: {click_error}")
-                
-                # Try JavaScript click as fallback
-                try:
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print("[✅] Clicked 'View Solution' button using JavaScript")
-                except Exception as js_error:
-                    print(f"[⚠️] JavaScript click failed: {js_error}")
-                    
-                    # Try removing any overlays and clicking again
-                    try:
-                        # Remove any overlays or modals
-                        self.driver.execute_script("""
-                            var overlays = document.querySelectorAll('.modal, .overlay, .popup');
-                            overlays.forEach(function(overlay) {
-                                overlay.style.display = 'none';
-                            });
-                        """)
-                        time.sleep(0.5)
-                        
-                        # Try clicking again
-                        self.driver.execute_script("arguments[0].click();", button)
-                        print("[✅] Clicked 'View Solution' button after removing overlays")
-                    except Exception as final_error:
-                        print(f"[❌] All click attempts failed: {final_error}")
-                        raise final_error
-                        
+
         except Exception as e:
             print(f"[❌] Failed to click View Solution button: {type(e).__name__} – {e}")
             raise e
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -179,124 +139,24 @@ class SolutionInnPrimaryPage:
                 "//*[contains(text(),'popular plan')]",
             ]
             
-            working_selector = None
-            
-            # Find working selector first
-            for selector in selectors:
-                try:
-                    print(f"[SEARCH] Trying Popular Plan button selector: {selector}")
-                    
-                    if selector.startswith("//"):
-                        # XPath selector
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                        button = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        # CSS selector
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if button and button.is_displayed():
-                        working_selector = selector
-                        print(f"[SUCCESS] Found Popular Plan button with selector: {selector}")
-                        break
-                        
-                except Exception as e:
-                    print(f"[FAIL] Selector {selector} failed: {type(e).__name__}")
-                    continue
-            
-            if not working_selector:
+            match = locator_resolver.resolve(
+                self.driver, selectors, name=f"{self.__class__.__name__}.popular_plan"
+            )
+            if not match:
                 raise Exception("Could not find Popular Plan button with any selector")
+            working_selector = match.selector
             
             # Wait for page to stabilize after finding the button
-            time.sleep(2)
+            dom_quiet(self.driver)
             
-            # Try multiple click strategies with immediate execution
-            click_success = False
-            
-            # Strategy 1: Immediate click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element and click immediately
-                    if working_selector.startswith("//"):
-                        button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, working_selector))
-                        )
-                    else:
-                        button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, working_selector))
-                        )
-                    
-                    # Click immediately without scrolling first
-                    button.click()
-                    print(f"[SUCCESS] Popular Plan button clicked successfully: '{button.text.strip()}'")
-                    click_success = True
-                except Exception as click_error:
-                    print(f"[WARNING] Immediate click failed: {click_error}")
-            
-            # Strategy 2: JavaScript click with fresh element
-            if not click_success:
-                try:
-                    # Re-find the element
-                    if working_selector.startswith("//"):
-                        button = self.driver.find_element(By.XPATH, working_selector)
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, working_selector)
-                    
-                    # Click with JavaScript immediately
-                    self.driver.execute_script("arguments[0].click();", button)
-                    print(f"[SUCCESS] Popular Plan button clicked with JavaScript: '{button.text.strip()}'")
-                    click_success = True
-                except Exception as js_error:
-                    print(f"[WARNING] JavaScript click failed: {js_error}")
-            
-            # Strategy 3: Direct XPath click without finding element first
-            if not click_success:
-                try:
-                    # Click directly using XPath without finding the element first
-                    if working_selector.startswith("//"):
-                        self.driver.execute_script(f"""
-                            let element = document.evaluate('{working_selector}', document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                            if (element) {{
-                                element.click();
-                            }}
-                        """)
-                    else:
-                        self.driver.execute_script(f"""
-                            let element = document.querySelector('{working_selector}');
-                            if (element) {{
-                                element.click();
-                            }}
-                        """)
-                    print(f"[SUCCESS] Popular Plan button clicked using direct XPath/CSS: {working_selector}")
-                    click_success = True
-                except Exception as direct_error:
-                    print(f"[WARNING] Direct XPath/CSS click failed: {direct_error}")
-            
-            # Strategy 4: Try clicking by text content
-            if not click_success:
-                try:
-                    # Try to find and click any button with "Popular" text
-                    self.driver.execute_script("""
-                        let buttons = document.querySelectorAll('button, a, input[type="button"]');
-                        for (let button of buttons) {
-                            if (button.textContent && button.textContent.toLowerCase().includes('popular')) {
-                                button.click();
-                                return true;
-                            }
-                        }
-                        return false;
-                    """)
-                    print(f"[SUCCESS] Popular Plan button clicked using text search")
-                    click_success = True
-                except Exception as text_error:
-                    print(f"[WARNING] Text-based click failed: {text_error}")
-            
-            if not click_success:
-                raise Exception("All click strategies failed for Popular Plan button")
+            click_engine.click(
+                self.driver,
+                to_locator(working_selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Popular Plan",
+                timeout=5,
+            )
 
         except Exception as e:
             print(f"[❌] Failed to click Popular Plan button: {type(e).__name__} – {e}")
@@ -313,47 +173,23 @@ class SolutionInnPrimaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking payment toggle on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple selectors for the payment toggle
-            selectors = [
-                "//input[@id='radio7']",
-                "//label[@for='radio7']",
-                "//input[@name='payment_method' and @value='card']",
-                "//input[@type='radio' and contains(@class, 'payment')]",
-                "//input[@type='radio' and contains(@class, 'card')]",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying payment toggle selector {i+1}/{len(selectors)}: {selector}")
-                    toggle = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Scroll to element with better positioning
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        toggle,
-                    )
-                    time.sleep(0.2)
-
-                    # Try regular click first
-                    try:
-                        toggle.click()
-                        print(f"[✓] Clicked payment toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                        # Try JavaScript click as fallback
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(f"[✓] Clicked payment toggle using JavaScript: {selector}")
-                        toggle_found = True
-                        break
-
-                except Exception as e:
-                    print(f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -391,14 +227,14 @@ class SolutionInnPrimaryPage:
                 if is_mobile:
                     # Scroll to top first
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1)
+                    scroll_settled(self.driver)
 
                 self._js_fallback_card_fields()
                 print("[✅] Card details filled via enhanced JavaScript fallback.")
 
                 # Verify the values were set correctly
                 if is_mobile:
-                    time.sleep(1)
+                    dom_quiet(self.driver, quiet_ms=150, timeout=1)
                     fields_to_verify = [
                         ("cc_num", CARD_NUMBER),
                         ("cc_card_holder", CARD_HOLDER_NAME),
@@ -430,25 +266,23 @@ class SolutionInnPrimaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(1)  # Wait for scroll to complete
+            scroll_settled(self.driver, field)
 
             # Clear the field first
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(f"[⚠️] Card field {element_id} verification failed. Expected: {value}, Got: {actual_value}")
 
                 # Try JavaScript fallback
@@ -465,7 +299,7 @@ class SolutionInnPrimaryPage:
                 print(f"[✅] Card field {element_id} filled via JavaScript fallback.")
 
                 # Final verification
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
                 final_value = field.get_attribute("value")
                 if final_value != value:
                     print(f"[❌] Card field {element_id} still not correct after JavaScript fallback. Expected: {value}, Got: {final_value}")
@@ -487,20 +321,18 @@ class SolutionInnPrimaryPage:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", field
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.2)
+            value_committed(self.driver, field, "")
 
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.2)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
         except Exception as e:
             print(f"[❌] Error filling field {element_id}: {type(e).__name__} – {e}")
@@ -567,7 +399,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == month_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == month_value:
                         print(f"[🌐] JS: Set expiry month to '{month_value}' using ID '{element_id}'")
@@ -585,7 +425,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{month_value}']")
@@ -620,7 +460,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == year_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == year_value:
                         print(f"[🌐] JS: Set expiry year to '{year_value}' using ID '{element_id}'")
@@ -638,7 +486,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{year_value}']")
@@ -651,49 +499,26 @@ class SolutionInnPrimaryPage:
             print(f"[❌] Failed selecting year: {type(e).__name__} – {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking Join Now button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple possible selectors for the Join Now button
-            possible_selectors = [
-                (By.ID, "submit_btn_checkout"),  # Primary selector (like secondary page)
-                (By.XPATH, "//button[contains(text(), 'Join Now')]"),  # Fallback XPath
-                (By.XPATH, "//button[contains(text(), 'join now')]"),  # Case insensitive
-                (By.XPATH, "//input[@value='Join Now']"),  # Input button
-                (By.CSS_SELECTOR, "button[type='submit']"),  # Generic submit button
-            ]
-
-            button = None
-            for selector_type, selector_value in possible_selectors:
-                try:
-                    button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    print(f"[🔍] Found Join Now button using: {selector_type} = '{selector_value}'")
-                    break
-                except Exception:
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                JOIN_NOW_BUTTON_SELECTORS,
+                name=f"{self.__class__.__name__}.join_now",
+            )
+            if not match:
                 raise Exception("Could not find Join Now button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Join Now",
             )
-            time.sleep(0.5)  # Give time for scroll to complete
-
-            # Try regular click first
-            try:
-                button.click()
-                print("[✓] Clicked Join Now button")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print("[✓] Clicked Join Now button using JavaScript")
 
         except Exception as e:
             print(f"[❌] Failed to click Join Now button: {type(e).__name__} – {e}")
@@ -725,7 +550,7 @@ class SolutionInnSecondaryPage:
         ).click()
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -764,27 +589,13 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for Popular Plan button
             selector = "//button[contains(@class,'new-btn-blue-area activate_button')]"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Popular Plan",
             )
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Popular Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Popular Plan button clicked with JavaScript: '{button.text.strip()}'")
-
         except Exception as e:
             print(f"[❌] Failed to click Popular Plan button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -803,27 +614,13 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for Monthly Access button
             selector = "//div[@class='new-month-day-trail-1 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Monthly Access",
             )
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Monthly Access button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Monthly Access button clicked with JavaScript: '{button.text.strip()}'")
-
         except Exception as e:
             print(f"[❌] Failed to click Monthly Access button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -842,26 +639,12 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for Six Month Plan button
             selector = "//div[@class='new-month-day-trail-6 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Six Month Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Six Month Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Six Month Plan button clicked with JavaScript: '{button.text.strip()}'")
 
         except Exception as e:
             print(f"[❌] Failed to click Six Month Plan button: {type(e).__name__} – {e}")
@@ -878,52 +661,22 @@ class SolutionInnSecondaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking One Time Plan button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Use multiple specific selectors for One Time Plan button to ensure we get the right one
-            selectors = [
-                "//div[contains(@class,'one-time')]//button[normalize-space()='Buy solution']",
-                "//div[contains(@class,'one-time')]//button[normalize-space()='View Solution']",
-                "//div[contains(@class,'one-time')]//button[@type='button']",
-                "//div[contains(@class,'one-time')]//button[contains(@class,'btn')]",
-                "//button[contains(@class,'one-time') and normalize-space()='Buy solution']",
-                "//button[contains(@class,'one-time') and normalize-space()='View Solution']",
-                # Fallback to more specific selectors
-                "//div[@class='plans-card-header' and contains(.,'one-time')]//button",
-                "//div[@class='plans-card-header' and contains(.,'One Time')]//button",
-                "//div[@class='plans-card-header' and contains(.,'one time')]//button",
-            ]
-            
-            button = None
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying One Time Plan selector {i+1}/{len(selectors)}: {selector}")
-                    button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    print(f"[✅] Found One Time Plan button with selector: {selector}")
-                    break
-                except Exception as e:
-                    print(f"[⚠️] Selector {i+1} failed: {type(e).__name__}")
-                    continue
-            
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                ONE_TIME_PLAN_CARD_SELECTORS,
+                name=f"{self.__class__.__name__}.one_time_plan",
+                timeout=5,
+            )
+            if not match:
                 raise Exception("Could not find One Time Plan button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="One Time Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] One Time Plan button clicked successfully: '{button.text.strip()}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] One Time Plan button clicked with JavaScript: '{button.text.strip()}'")
 
         except Exception as e:
             print(f"[❌] Failed to click One Time Plan button: {type(e).__name__} – {e}")
@@ -940,46 +693,23 @@ class SolutionInnSecondaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking payment toggle on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple selectors for the payment toggle
-            selectors = [
-                "//input[@id='radio7']",
-                "//label[@for='radio7']",
-                "//input[@name='payment_method' and @value='card']",
-                "//input[@type='radio' and contains(@class, 'payment')]",
-                "//input[@type='radio' and contains(@class, 'card')]",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying payment toggle selector {i+1}/{len(selectors)}: {selector}")
-                    toggle = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Scroll to element with better positioning
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        toggle,
-                    )
-                    time.sleep(0.2)
-
-                    # Try regular click first
-                    try:
-                        toggle.click()
-                        print(f"[✓] Clicked payment toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                        # Try JavaScript click as fallback
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(f"[✓] Clicked payment toggle using JavaScript: {selector}")
-                        break
-
-                except Exception as e:
-                    print(f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -1017,14 +747,14 @@ class SolutionInnSecondaryPage:
                 if is_mobile:
                     # Scroll to top first
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1)
+                    scroll_settled(self.driver)
 
                 self._js_fallback_card_fields()
                 print("[✅] Card details filled via enhanced JavaScript fallback.")
 
                 # Verify the values were set correctly
                 if is_mobile:
-                    time.sleep(1)
+                    dom_quiet(self.driver, quiet_ms=150, timeout=1)
                     fields_to_verify = [
                         ("cc_num", CARD_NUMBER),
                         ("cc_card_holder", CARD_HOLDER_NAME),
@@ -1056,25 +786,23 @@ class SolutionInnSecondaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(1)  # Wait for scroll to complete
+            scroll_settled(self.driver, field)
 
             # Clear the field first
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(f"[⚠️] Card field {element_id} verification failed. Expected: {value}, Got: {actual_value}")
 
                 # Try JavaScript fallback
@@ -1091,7 +819,7 @@ class SolutionInnSecondaryPage:
                 print(f"[✅] Card field {element_id} filled via JavaScript fallback.")
 
                 # Final verification
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
                 final_value = field.get_attribute("value")
                 if final_value != value:
                     print(f"[❌] Card field {element_id} still not correct after JavaScript fallback. Expected: {value}, Got: {final_value}")
@@ -1113,20 +841,18 @@ class SolutionInnSecondaryPage:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", field
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.2)
-
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
+            value_committed(self.driver, field, "")
 
-            time.sleep(0.2)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
         except Exception as e:
             print(f"[❌] Error filling field {element_id}: {type(e).__name__} – {e}")
@@ -1193,7 +919,15 @@ class SolutionInnSecondaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == month_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == month_value:
                         print(f"[🌐] JS: Set expiry month to '{month_value}' using ID '{element_id}'")
@@ -1211,7 +945,7 @@ class SolutionInnSecondaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{month_value}']")
@@ -1246,7 +980,15 @@ class SolutionInnSecondaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == year_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == year_value:
                         print(f"[🌐] JS: Set expiry year to '{year_value}' using ID '{element_id}'")
@@ -1264,7 +1006,7 @@ class SolutionInnSecondaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{year_value}']")
@@ -1277,49 +1019,26 @@ class SolutionInnSecondaryPage:
             print(f"[❌] Failed selecting year: {type(e).__name__} – {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking Join Now button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple possible selectors for the Join Now button
-            possible_selectors = [
-                (By.ID, "submit_btn_checkout"),  # Primary selector (like secondary page)
-                (By.XPATH, "//button[contains(text(), 'Join Now')]"),  # Fallback XPath
-                (By.XPATH, "//button[contains(text(), 'join now')]"),  # Case insensitive
-                (By.XPATH, "//input[@value='Join Now']"),  # Input button
-                (By.CSS_SELECTOR, "button[type='submit']"),  # Generic submit button
-            ]
-
-            button = None
-            for selector_type, selector_value in possible_selectors:
-                try:
-                    button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    print(f"[🔍] Found Join Now button using: {selector_type} = '{selector_value}'")
-                    break
-                except Exception:
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                JOIN_NOW_BUTTON_SELECTORS,
+                name=f"{self.__class__.__name__}.join_now",
+            )
+            if not match:
                 raise Exception("Could not find Join Now button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Join Now",
             )
-            time.sleep(0.5)  # Give time for scroll to complete
-
-            # Try regular click first
-            try:
-                button.click()
-                print("[✓] Clicked Join Now button")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print("[✓] Clicked Join Now button using JavaScript")
 
         except Exception as e:
             print(f"[❌] Failed to click Join Now button: {type(e).__name__} – {e}")
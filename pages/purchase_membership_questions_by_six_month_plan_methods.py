@@ -4,6 +4,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from core.accounts import unique_test_email
+from core.click_engine import click_engine
 from core.constants import (
     ADDRESS,
     CARD_HOLDER_NAME,
@@ -13,14 +15,26 @@ from core.constants import (
     CVC,
     DEFAULT_PASSWORD,
     DEFAULT_UNIVERSITY,
-    EMAIL_DOMAIN,
     EXPIRY_MONTH,
     EXPIRY_YEAR,
+    JOIN_NOW_BUTTON_SELECTORS,
+    PAYMENT_TOGGLE_FALLBACK_SELECTORS,
+    PAYMENT_TOGGLE_SELECTORS,
     POSTAL_CODE,
     PRIMARY_URL,
     SECONDARY_URL,
     VIEW_SOLUTION_BTN_CSS,
 )
+from core.key_input import type_text, typing_backend_for
+from core.locator_resolver import locator_resolver, to_locator
+from core.session_checkpoint import spend_checkpoint
+from core.waits import (
+    animation_finished,
+    dom_quiet,
+    scroll_settled,
+    value_committed,
+    wait_until,
+)
 
 
 class SolutionInnPrimaryPage:
@@ -72,7 +86,7 @@ class SolutionInnPrimaryPage:
         ).click()
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -111,31 +125,13 @@ class SolutionInnPrimaryPage:
             # Use the specific selector for Six Month Plan button
             selector = "//div[@class='new-month-day-trail-6 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Six Month Plan",
             )
 
-            # Capture button text before clicking to avoid stale element issues
-            button_text = button.text.strip()
-            print(f"[🔍] Found Six Month Plan button: '{button_text}'")
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Six Month Plan button clicked successfully: '{button_text}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Six Month Plan button clicked with JavaScript: '{button_text}'")
-
         except Exception as e:
             print(f"[❌] Failed to click Six Month Plan button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -151,46 +147,23 @@ class SolutionInnPrimaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking payment toggle on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple selectors for the payment toggle (same as working secondary)
-            selectors = [
-                "//input[@id='radio7']",
-                "//label[@for='radio7']",
-                "//input[@name='payment_method' and @value='card']",
-                "//input[@type='radio' and contains(@class, 'payment')]",
-                "//input[@type='radio' and contains(@class, 'card')]",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying payment toggle selector {i+1}/{len(selectors)}: {selector}")
-                    toggle = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Scroll to element with better positioning
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        toggle,
-                    )
-                    time.sleep(0.2)
-
-                    # Try regular click first
-                    try:
-                        toggle.click()
-                        print(f"[✓] Clicked payment toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                        # Try JavaScript click as fallback
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(f"[✓] Clicked payment toggle using JavaScript: {selector}")
-                        break
-
-                except Exception as e:
-                    print(f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -228,14 +201,14 @@ class SolutionInnPrimaryPage:
                 if is_mobile:
                     # Scroll to top first
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1)
+                    scroll_settled(self.driver)
 
                 self._js_fallback_card_fields()
                 print("[✅] Card details filled via enhanced JavaScript fallback.")
 
                 # Verify the values were set correctly
                 if is_mobile:
-                    time.sleep(1)
+                    dom_quiet(self.driver, quiet_ms=150, timeout=1)
                     fields_to_verify = [
                         ("cc_num", CARD_NUMBER),
                         ("cc_card_holder", CARD_HOLDER_NAME),
@@ -267,25 +240,23 @@ class SolutionInnPrimaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(1)  # Wait for scroll to complete
+            scroll_settled(self.driver, field)
 
             # Clear the field first
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(f"[⚠️] Card field {element_id} verification failed. Expected: {value}, Got: {actual_value}")
 
                 # Try JavaScript fallback
@@ -302,7 +273,7 @@ class SolutionInnPrimaryPage:
                 print(f"[✅] Card field {element_id} filled via JavaScript fallback.")
 
                 # Final verification
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
                 final_value = field.get_attribute("value")
                 if final_value != value:
                     print(f"[❌] Card field {element_id} still not correct after JavaScript fallback. Expected: {value}, Got: {final_value}")
@@ -324,20 +295,18 @@ class SolutionInnPrimaryPage:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", field
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.2)
-
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
+            value_committed(self.driver, field, "")
 
-            time.sleep(0.2)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
         except Exception as e:
             print(f"[❌] Error filling field {element_id}: {type(e).__name__} – {e}")
@@ -404,7 +373,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == month_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == month_value:
                         print(f"[🌐] JS: Set expiry month to '{month_value}' using ID '{element_id}'")
@@ -422,7 +399,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{month_value}']")
@@ -457,7 +434,15 @@ class SolutionInnPrimaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == year_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == year_value:
                         print(f"[🌐] JS: Set expiry year to '{year_value}' using ID '{element_id}'")
@@ -475,7 +460,7 @@ class SolutionInnPrimaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{year_value}']")
@@ -488,49 +473,26 @@ class SolutionInnPrimaryPage:
             print(f"[❌] Failed selecting year: {type(e).__name__} – {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking Join Now button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple possible selectors for the Join Now button
-            possible_selectors = [
-                (By.ID, "submit_btn_checkout"),  # Primary selector (like secondary page)
-                (By.XPATH, "//button[contains(text(), 'Join Now')]"),  # Fallback XPath
-                (By.XPATH, "//button[contains(text(), 'join now')]"),  # Case insensitive
-                (By.XPATH, "//input[@value='Join Now']"),  # Input button
-                (By.CSS_SELECTOR, "button[type='submit']"),  # Generic submit button
-            ]
-
-            button = None
-            for selector_type, selector_value in possible_selectors:
-                try:
-                    button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    print(f"[🔍] Found Join Now button using: {selector_type} = '{selector_value}'")
-                    break
-                except Exception:
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                JOIN_NOW_BUTTON_SELECTORS,
+                name=f"{self.__class__.__name__}.join_now",
+            )
+            if not match:
                 raise Exception("Could not find Join Now button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Join Now",
             )
-            time.sleep(0.5)  # Give time for scroll to complete
-
-            # Try regular click first
-            try:
-                button.click()
-                print("[✓] Clicked Join Now button")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print("[✓] Clicked Join Now button using JavaScript")
 
         except Exception as e:
             print(f"[❌] Failed to click Join Now button: {type(e).__name__} – {e}")
@@ -562,7 +524,7 @@ class SolutionInnSecondaryPage:
         ).click()
 
     def generate_fake_email(self):
-        return f"testuser_{int(time.time())}@{EMAIL_DOMAIN}"
+        return unique_test_email()
 
     def enter_email(self, email=None):
         email = email or self.generate_fake_email()
@@ -601,30 +563,12 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for Popular Plan button
             selector = "//button[contains(@class,'new-btn-blue-area activate_button')]"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Capture button text before clicking to avoid stale element issues
-            button_text = button.text.strip()
-            print(f"[🔍] Found Popular Plan button: '{button_text}'")
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Popular Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Popular Plan button clicked successfully: '{button_text}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Popular Plan button clicked with JavaScript: '{button_text}'")
 
         except Exception as e:
             print(f"[❌] Failed to click Popular Plan button: {type(e).__name__} – {e}")
@@ -644,31 +588,13 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for Monthly Access button
             selector = "//div[@class='new-month-day-trail-1 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Monthly Access",
             )
 
-            # Capture button text before clicking to avoid stale element issues
-            button_text = button.text.strip()
-            print(f"[🔍] Found Monthly Access button: '{button_text}'")
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
-            )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Monthly Access button clicked successfully: '{button_text}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Monthly Access button clicked with JavaScript: '{button_text}'")
-
         except Exception as e:
             print(f"[❌] Failed to click Monthly Access button: {type(e).__name__} – {e}")
             # Take screenshot for debugging
@@ -687,30 +613,12 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for Six Month Plan button
             selector = "//div[@class='new-month-day-trail-6 plans-card-header']//button[@type='button'][normalize-space()='View Solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Capture button text before clicking to avoid stale element issues
-            button_text = button.text.strip()
-            print(f"[🔍] Found Six Month Plan button: '{button_text}'")
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="Six Month Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] Six Month Plan button clicked successfully: '{button_text}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] Six Month Plan button clicked with JavaScript: '{button_text}'")
 
         except Exception as e:
             print(f"[❌] Failed to click Six Month Plan button: {type(e).__name__} – {e}")
@@ -730,30 +638,12 @@ class SolutionInnSecondaryPage:
             # Use the specific selector for One Time Plan button
             selector = "//button[normalize-space()='Buy solution']"
             
-            button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
-            )
-
-            # Capture button text before clicking to avoid stale element issues
-            button_text = button.text.strip()
-            print(f"[🔍] Found One Time Plan button: '{button_text}'")
-
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                (By.XPATH, selector),
+                page=self.__class__.__name__,
+                label="One Time Plan",
             )
-            time.sleep(0.5)
-
-            # Try regular click first
-            try:
-                button.click()
-                print(f"[✅] One Time Plan button clicked successfully: '{button_text}'")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print(f"[✅] One Time Plan button clicked with JavaScript: '{button_text}'")
 
         except Exception as e:
             print(f"[❌] Failed to click One Time Plan button: {type(e).__name__} – {e}")
@@ -770,54 +660,23 @@ class SolutionInnSecondaryPage:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking payment toggle on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple selectors for the payment toggle (enhanced selectors)
-            selectors = [
-                "//label[@for='radio7']",
-                "//input[@id='radio7']",
-                "//label[contains(text(), 'Credit Card')]",
-                "//label[contains(text(), 'Card')]",
-                "//input[@type='radio'][@name='payment_method']",
-                "//input[@type='radio']",
-                "//label[contains(@class, 'payment')]",
-                "//div[contains(@class, 'payment')]//input[@type='radio']",
-            ]
-
             toggle_found = False
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"[🔍] Trying payment toggle selector {i+1}/{len(selectors)}: {selector}")
-                    toggle = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-
-                    # Enhanced scrolling for mobile
-                    if is_mobile:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
-                            toggle,
-                        )
-                        time.sleep(1)
-                    else:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center'});", toggle
-                        )
-                        time.sleep(0.5)
-
-                    try:
-                        toggle.click()
-                        print(f"[✅] Clicked Payment Toggle using selector: {selector}")
-                        toggle_found = True
-                        break
-                    except Exception as click_error:
-                        print(f"[⚠️] Regular click failed, trying JavaScript: {type(click_error).__name__}")
-                        self.driver.execute_script("arguments[0].click();", toggle)
-                        print(f"[✅] Clicked Payment Toggle with JavaScript: {selector}")
-                        toggle_found = True
-                        break
-
-                except Exception as e:
-                    print(f"[⚠️] Payment toggle selector {i+1} failed: {type(e).__name__}")
-                    continue
+            match = locator_resolver.resolve(
+                self.driver,
+                PAYMENT_TOGGLE_FALLBACK_SELECTORS,
+                name=f"{self.__class__.__name__}.payment_toggle",
+                timeout=3,
+            )
+            if match:
+                click_engine.click(
+                    self.driver,
+                    to_locator(match.selector),
+                    page=self.__class__.__name__,
+                    element=match.element,
+                    label="Payment Toggle",
+                    strategies=("native", "javascript"),
+                )
+                toggle_found = True
 
             if not toggle_found:
                 print("[⚠️] Could not find payment toggle, continuing without it...")
@@ -855,14 +714,14 @@ class SolutionInnSecondaryPage:
                 if is_mobile:
                     # Scroll to top first
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1)
+                    scroll_settled(self.driver)
 
                 self._js_fallback_card_fields()
                 print("[✅] Card details filled via enhanced JavaScript fallback.")
 
                 # Verify the values were set correctly
                 if is_mobile:
-                    time.sleep(1)
+                    dom_quiet(self.driver, quiet_ms=150, timeout=1)
                     fields_to_verify = [
                         ("cc_num", CARD_NUMBER),
                         ("cc_card_holder", CARD_HOLDER_NAME),
@@ -894,25 +753,23 @@ class SolutionInnSecondaryPage:
                 "arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});",
                 field,
             )
-            time.sleep(1)  # Wait for scroll to complete
+            scroll_settled(self.driver, field)
 
             # Clear the field first
             field.clear()
-            time.sleep(0.3)
+            value_committed(self.driver, field, "")
 
             # Fill the field
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
-
-            time.sleep(0.3)
+            committed = type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
-            # Verify the value was entered correctly
+            # type_text verifies the value, ignoring mask spacing
             actual_value = field.get_attribute("value")
-            if actual_value != value:
+            if not committed:
                 print(f"[⚠️] Card field {element_id} verification failed. Expected: {value}, Got: {actual_value}")
 
                 # Try JavaScript fallback
@@ -929,7 +786,7 @@ class SolutionInnSecondaryPage:
                 print(f"[✅] Card field {element_id} filled via JavaScript fallback.")
 
                 # Final verification
-                time.sleep(0.3)
+                value_committed(self.driver, field, value)
                 final_value = field.get_attribute("value")
                 if final_value != value:
                     print(f"[❌] Card field {element_id} still not correct after JavaScript fallback. Expected: {value}, Got: {final_value}")
@@ -951,20 +808,18 @@ class SolutionInnSecondaryPage:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", field
             )
-            time.sleep(0.5)
+            scroll_settled(self.driver, field)
 
             # Clear and fill the field
             field.clear()
-            time.sleep(0.2)
-
-            if delay_per_key:
-                for char in value:
-                    field.send_keys(char)
-                    time.sleep(0.03)
-            else:
-                field.send_keys(value)
+            value_committed(self.driver, field, "")
 
-            time.sleep(0.2)
+            type_text(
+                self.driver,
+                field,
+                value,
+                backend=typing_backend_for(element_id, per_key=delay_per_key),
+            )
 
         except Exception as e:
             print(f"[❌] Error filling field {element_id}: {type(e).__name__} – {e}")
@@ -1031,7 +886,15 @@ class SolutionInnSecondaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == month_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == month_value:
                         print(f"[🌐] JS: Set expiry month to '{month_value}' using ID '{element_id}'")
@@ -1049,7 +912,7 @@ class SolutionInnSecondaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{month_value}']")
@@ -1084,7 +947,15 @@ class SolutionInnSecondaryPage:
                     )
 
                     # Verify the selection was successful
-                    time.sleep(0.5)
+                    wait_until(
+                        self.driver,
+                        lambda d: d.find_element(By.ID, element_id).get_attribute(
+                            "value"
+                        )
+                        == year_value,
+                        timeout=1,
+                        name="value_committed",
+                    )
                     element = self.driver.find_element(By.ID, element_id)
                     if element.get_attribute("value") == year_value:
                         print(f"[🌐] JS: Set expiry year to '{year_value}' using ID '{element_id}'")
@@ -1102,7 +973,7 @@ class SolutionInnSecondaryPage:
                     "arguments[0].scrollIntoView({block: 'center'});", dropdown
                 )
                 dropdown.click()
-                time.sleep(1)
+                animation_finished(self.driver)
                 option = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable(
                         (By.XPATH, f"//span[normalize-space()='{year_value}']")
@@ -1115,49 +986,26 @@ class SolutionInnSecondaryPage:
             print(f"[❌] Failed selecting year: {type(e).__name__} – {e}")
 
     def click_join_now_button(self):
+        spend_checkpoint(self.driver)
         try:
             is_mobile = self.driver.execute_script("return window.innerWidth < 768;")
             print(f"[📱] Clicking Join Now button on {'Mobile' if is_mobile else 'Desktop'}")
 
-            # Try multiple possible selectors for the Join Now button
-            possible_selectors = [
-                (By.ID, "submit_btn_checkout"),  # Primary selector (like secondary page)
-                (By.XPATH, "//button[contains(text(), 'Join Now')]"),  # Fallback XPath
-                (By.XPATH, "//button[contains(text(), 'join now')]"),  # Case insensitive
-                (By.XPATH, "//input[@value='Join Now']"),  # Input button
-                (By.CSS_SELECTOR, "button[type='submit']"),  # Generic submit button
-            ]
-
-            button = None
-            for selector_type, selector_value in possible_selectors:
-                try:
-                    button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    print(f"[🔍] Found Join Now button using: {selector_type} = '{selector_value}'")
-                    break
-                except Exception:
-                    continue
-
-            if not button:
+            match = locator_resolver.resolve(
+                self.driver,
+                JOIN_NOW_BUTTON_SELECTORS,
+                name=f"{self.__class__.__name__}.join_now",
+            )
+            if not match:
                 raise Exception("Could not find Join Now button with any selector")
 
-            # Scroll to element with better positioning
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                button,
+            click_engine.click(
+                self.driver,
+                to_locator(match.selector),
+                page=self.__class__.__name__,
+                element=match.element,
+                label="Join Now",
             )
-            time.sleep(0.5)  # Give time for scroll to complete
-
-            # Try regular click first
-            try:
-                button.click()
-                print("[✓] Clicked Join Now button")
-            except Exception as click_error:
-                print(f"[⚠️] Regular click failed, trying JavaScript click: {type(click_error).__name__}")
-                # Try JavaScript click as fallback
-                self.driver.execute_script("arguments[0].click();", button)
-                print("[✓] Clicked Join Now button using JavaScript")
 
         except Exception as e:
             print(f"[❌] Failed to click Join Now button: {type(e).__name__} – {e}")
@@ -17,7 +17,7 @@ from github_actions_log_parser import GitHubActionsLogParser
 class ComprehensiveLogCapture:
     def __init__(self):
         self.db_helper = MySQLHelper()
-        self.parser = GitHubActionsLogParser()
+        self.parser = GitHubActionsLogParser(db_helper=self.db_helper)
         
     def capture_all_logs(self):
         """Capture all available test logs"""
@@ -9,6 +9,19 @@ from datetime import datetime
 
 from db.db_helper import MySQLHelper
 
+# Display names for the stored (test_category, plan_type) pairs
+CATEGORY_LABELS = {
+    ("book", None): "Book Tests",
+    ("subscription", "monthly"): "Monthly Plan Tests",
+    ("subscription", "six_month"): "Six Month Plan Tests",
+    ("subscription", "three_month"): "3 Month Plan Tests",
+    ("subscription", "popular"): "Popular Plan Tests",
+    ("subscription", "onetime"): "Onetime Plan Tests",
+    ("user", None): "User Tests",
+    ("general", None): "Other Tests",
+    (None, None): "Unclassified",
+}
+
 
 def print_header(title):
     """Print a formatted header"""
@@ -87,13 +100,9 @@ class ComprehensiveResultsViewer:
 
     def show_test_results_count(self):
         """Show test results count"""
-        try:
-            self.db_helper.cursor.execute("SELECT COUNT(*) as count FROM test_results")
-            result = self.db_helper.cursor.fetchone()
-            count = result["count"] if result else 0
-            print(f"📋 test_results: {count} records")
-        except Exception as e:
-            print(f"❌ Error getting test_results count: {e}")
+        stats = self.db_helper.get_test_statistics()
+        if stats:
+            print(f"📋 test_results: {stats['total_tests']} records")
 
     def show_users_summary(self):
         """Show users table summary"""
@@ -282,23 +291,19 @@ class ComprehensiveResultsViewer:
         print_header("TEST TYPE BREAKDOWN")
 
         try:
-            # Analyze test names to categorize them
+            # Read from the daily rollups; unclassified rows are stored there as ''
             self.db_helper.cursor.execute(
                 """
                 SELECT 
-                    CASE 
-                        WHEN test_case_name LIKE '%book%' OR module_name LIKE '%book%' THEN 'Book Tests'
-                        WHEN test_case_name LIKE '%monthly%' OR module_name LIKE '%monthly%' THEN 'Monthly Plan Tests'
-                        WHEN test_case_name LIKE '%six_month%' OR module_name LIKE '%six_month%' THEN 'Six Month Plan Tests'
-                        WHEN test_case_name LIKE '%onetime%' OR module_name LIKE '%onetime%' THEN 'Onetime Plan Tests'
-                        WHEN test_case_name LIKE '%user%' OR module_name LIKE '%user%' THEN 'User Tests'
-                        ELSE 'Other Tests'
-                    END as test_category,
-                    COUNT(*) as total_tests,
-                    SUM(CASE WHEN test_status = 'PASSED' THEN 1 ELSE 0 END) as passed_tests,
-                    SUM(CASE WHEN test_status = 'FAILED' THEN 1 ELSE 0 END) as failed_tests
-                FROM test_results
-                GROUP BY test_category
+                    NULLIF(test_category, '') as test_category,
+                    NULLIF(plan_type, '') as plan_type,
+                    SUM(result_count) as total_tests,
+                    SUM(CASE WHEN test_status = 'PASSED' THEN result_count ELSE 0 END)
+                        as passed_tests,
+                    SUM(CASE WHEN test_status = 'FAILED' THEN result_count ELSE 0 END)
+                        as failed_tests
+                FROM test_results_daily
+                GROUP BY test_category, plan_type
                 ORDER BY total_tests DESC
             """
             )
@@ -320,13 +325,47 @@ class ComprehensiveResultsViewer:
                 failed = category["failed_tests"]
                 success_rate = (passed / total * 100) if total > 0 else 0
 
+                label = CATEGORY_LABELS.get(
+                    (category["test_category"], category["plan_type"]), "Other Tests"
+                )
+                rate = f"{success_rate:.1f}%"
+                print(f"{label:<20} {total:<8} {passed:<8} {failed:<8} {rate}")
+
+            if any(category["test_category"] is None for category in categories):
                 print(
-                    f"{category['test_category']:<20} {total:<8} {passed:<8} {failed:<8} {success_rate:.1f}%"
+                    "\nℹ️ Unclassified rows predate test_category; "
+                    "run database_scripts/add_test_category_columns.py"
                 )
 
         except Exception as e:
             print(f"❌ Error showing test type breakdown: {e}")
 
+    def show_daily_statistics(self, days=14):
+        """Show per-day results and durations by module, device and status"""
+        print_header(f"DAILY TEST STATISTICS (Last {days} days)")
+
+        rows = self.db_helper.get_daily_statistics(days)
+        if not rows:
+            print("No test results found.")
+            return
+
+        def seconds(value):
+            return f"{value:.1f}s" if value is not None else "N/A"
+
+        print(
+            f"{'Date':<12} {'Module':<25} {'Device':<12} {'Status':<8} "
+            f"{'Count':<7} {'Avg':<8} {'p95':<8} {'Max':<8}"
+        )
+        print("-" * 95)
+        for row in rows:
+            device_name = row["device_name"] or "unknown"
+            print(
+                f"{str(row['stat_date']):<12} {row['module_name'][:24]:<25} "
+                f"{device_name[:11]:<12} {row['test_status']:<8} "
+                f"{row['total_tests']:<7} {seconds(row['avg_duration']):<8} "
+                f"{seconds(row['p95_duration']):<8} {seconds(row['max_duration']):<8}"
+            )
+
     def show_failed_tests_details(self):
         """Show detailed information about failed tests"""
         print_header("FAILED TESTS DETAILS")
@@ -335,11 +374,13 @@ class ComprehensiveResultsViewer:
             self.db_helper.cursor.execute(
                 """
                 SELECT tr.*, 
+                       COALESCE(tr.error_message, es.error_message) as error_message,
                        u.username as user_name,
                        o.order_number,
                        o.order_type,
                        s.subscription_type
                 FROM test_results tr
+                LEFT JOIN error_signatures es ON es.id = tr.error_signature_id
                 LEFT JOIN users u ON u.username LIKE 'test_user%'
                 LEFT JOIN orders o ON o.order_number LIKE 'TEST-%'
                 LEFT JOIN subscriptions s ON s.user_id = u.id
@@ -390,6 +431,7 @@ Commands:
   summary              - Show comprehensive test results summary
   recent [limit]       - Show recent test activity
   breakdown            - Show test type breakdown
+  daily [days]         - Show daily counts and durations (p95) per module/device
   failed               - Show failed tests details
   help                 - Show this help message
 
@@ -397,6 +439,7 @@ Examples:
   python view_comprehensive_results.py summary
   python view_comprehensive_results.py recent 20
   python view_comprehensive_results.py breakdown
+  python view_comprehensive_results.py daily 7
   python view_comprehensive_results.py failed
 """
     )
@@ -426,6 +469,10 @@ def main():
         elif command == "breakdown":
             viewer.show_test_type_breakdown()
 
+        elif command == "daily":
+            days = int(sys.argv[2]) if len(sys.argv) > 2 else 14
+            viewer.show_daily_statistics(days)
+
         elif command == "failed":
             viewer.show_failed_tests_details()
 
@@ -5,9 +5,10 @@ A utility script to view and analyze test results stored in the database.
 """
 
 import sys
+import time
 from datetime import datetime
 
-from db.db_helper import MySQLHelper
+from db.result_store import get_result_store, page_position, parse_page_position
 
 
 def print_header(title):
@@ -23,61 +24,72 @@ def print_test_results(results):
         print("No test results found.")
         return
 
+    print_results_header()
+    for result in results:
+        print_result_row(result)
+
+
+def print_results_header():
     print(
         f"{'ID':<4} {'Test Case Name':<18} {'Module':<10} {'Status':<8} {'Duration':<8} {'Device':<8} {'Resolution':<12} {'DateTime':<16} {'Error Summary':<20}"
     )
     print("-" * 130)
 
-    for result in results:
-        test_datetime = (
-            result["test_datetime"].strftime("%Y-%m-%d %H:%M")
-            if result["test_datetime"]
-            else "N/A"
-        )
-        status_emoji = {
-            "PASSED": "✅",
-            "FAILED": "❌",
-            "SKIPPED": "⏭️",
-            "ERROR": "⚠️",
-        }.get(result["test_status"], "❓")
-
-        # Format duration
-        duration = result.get("total_time_duration")
-        if duration:
-            if duration < 60:
-                duration_str = f"{duration:.1f}s"
-            else:
-                minutes = int(duration // 60)
-                seconds = duration % 60
-                duration_str = f"{minutes}m{seconds:.1f}s"
-        else:
-            duration_str = "N/A"
-
-        # Format device name
-        device_name = result.get("device_name", "unknown") or "unknown"
-        if device_name == "desktop":
-            device_emoji = "🖥️"
-        elif "iPhone" in device_name or "Pixel" in device_name:
-            device_emoji = "📱"
-        elif "iPad" in device_name:
-            device_emoji = "📱"
-        else:
-            device_emoji = "❓"
 
-        # Format screen resolution
-        screen_resolution = result.get("screen_resolution", "unknown") or "unknown"
-        if screen_resolution == "unknown":
-            resolution_str = "N/A"
+def print_result_row(result):
+    """Print one test result as a table row"""
+    test_datetime = (
+        result["test_datetime"].strftime("%Y-%m-%d %H:%M")
+        if result["test_datetime"]
+        else "N/A"
+    )
+    status_emoji = {
+        "PASSED": "✅",
+        "FAILED": "❌",
+        "SKIPPED": "⏭️",
+        "ERROR": "⚠️",
+    }.get(result["test_status"], "❓")
+
+    # Format duration
+    duration = result.get("total_time_duration")
+    if duration:
+        if duration < 60:
+            duration_str = f"{duration:.1f}s"
         else:
-            resolution_str = screen_resolution
-
-        error_summary = result.get("error_summary", "") or ""
-        if len(error_summary) > 18:
-            error_summary = error_summary[:15] + "..."
+            minutes = int(duration // 60)
+            seconds = duration % 60
+            duration_str = f"{minutes}m{seconds:.1f}s"
+    else:
+        duration_str = "N/A"
+
+    # Format device name
+    device_name = result.get("device_name", "unknown") or "unknown"
+    if device_name == "desktop":
+        device_emoji = "🖥️"
+    elif "iPhone" in device_name or "Pixel" in device_name:
+        device_emoji = "📱"
+    elif "iPad" in device_name:
+        device_emoji = "📱"
+    else:
+        device_emoji = "❓"
+
+    # Format screen resolution
+    screen_resolution = result.get("screen_resolution", "unknown") or "unknown"
+    if screen_resolution == "unknown":
+        resolution_str = "N/A"
+    else:
+        resolution_str = screen_resolution
+
+    error_summary = result.get("error_summary", "") or ""
+    if len(error_summary) > 18:
+        error_summary = error_summary[:15] + "..."
 
-        print(
-            f"{result['id']:<4} {result['test_case_name'][:17]:<18} {result['module_name'][:9]:<10} {status_emoji} {result['test_status']:<6} {duration_str:<8} {device_emoji} {device_name[:6]:<6} {resolution_str:<12} {test_datetime:<16} {error_summary:<20}"
-        )
+    print(
+        f"{result['id']:<4} {result['test_case_name'][:17]:<18} "
+        f"{result['module_name'][:9]:<10} {status_emoji} {result['test_status']:<6} "
+        f"{duration_str:<8} {device_emoji} {device_name[:6]:<6} "
+        f"{resolution_str:<12} {test_datetime:<16} {error_summary:<20}"
+    )
 
 
 def print_statistics(stats):
@@ -120,22 +132,23 @@ def show_failed_tests(db_helper):
     """Show only failed tests"""
     print_header("FAILED TESTS")
 
-    # Get failed tests
-    failed_query = """
-    SELECT * FROM test_results 
-    WHERE test_status IN ('FAILED', 'ERROR')
-    ORDER BY test_datetime DESC
-    """
+    # Streamed twice (table, then details) instead of holding every failure in memory
+    failed_statuses = ("FAILED", "ERROR")
 
     try:
-        db_helper.cursor.execute(failed_query)
-        failed_results = db_helper.cursor.fetchall()
-        print_test_results(failed_results)
+        found = False
+        for result in db_helper.iter_test_results(statuses=failed_statuses):
+            if not found:
+                print_results_header()
+                found = True
+            print_result_row(result)
+        if not found:
+            print("No test results found.")
 
         # Show error details for failed tests
-        if failed_results:
+        if found:
             print_header("FAILED TEST DETAILS")
-            for result in failed_results:
+            for result in db_helper.iter_test_results(statuses=failed_statuses):
                 print(f"\n🔍 Test: {result['test_case_name']}")
                 print(f"   Module: {result['module_name']}")
                 print(f"   Status: {result['test_status']}")
@@ -150,26 +163,146 @@ def show_failed_tests(db_helper):
         print(f"❌ Error fetching failed tests: {e}")
 
 
-def show_recent_tests(db_helper, limit=20):
-    """Show recent test results"""
+def result_filters():
+    """--module, --device and --since options of recent and history"""
+    return {
+        "module": option_value("--module"),
+        "device": option_value("--device"),
+        "since": option_value("--since"),
+    }
+
+
+def show_recent_tests(db_helper, limit=20, before=None, filters=None):
+    """Show recent test results, optionally older than a page position"""
+    filters = filters or {}
     print_header(f"RECENT TEST RESULTS (Last {limit})")
-    results = db_helper.get_test_results(limit)
+    results = db_helper.get_test_results(limit, before=before, **filters)
     print_test_results(results)
+    if len(results) == limit:
+        options = "".join(
+            f" --{name} {value}" for name, value in filters.items() if value
+        )
+        print(
+            f"\n⏪ Older results: python view_test_results.py recent {limit}{options} "
+            f"--before {page_position(results[-1])}"
+        )
+
+
+def show_history(db_helper, page_size=50, filters=None):
+    """Page back through all test results; Enter shows the next page"""
+    print_header("TEST RESULT HISTORY")
+    interactive = sys.stdin.isatty()
+    shown = 0
+    for result in db_helper.iter_test_results(page_size=page_size, **(filters or {})):
+        if shown % page_size == 0:
+            if shown and interactive:
+                answer = input("-- Enter for older results, q to quit -- ")
+                if answer.strip().lower() == "q":
+                    break
+            print_results_header()
+        print_result_row(result)
+        shown += 1
+    if not shown:
+        print("No test results found.")
+
+
+def follow_tests(db_helper):
+    """Print new test results as they are stored until Ctrl+C"""
+    print_header("FOLLOWING NEW TEST RESULTS (Ctrl+C to stop)")
+    print_results_header()
+    try:
+        for result in db_helper.follow_test_results():
+            print_result_row(result)
+    except KeyboardInterrupt:
+        print("\n⏹️ Stopped following")
+
+
+def search_errors(db_helper, text):
+    """Rank failures by how well their error text matches, with snippets"""
+    print_header(f"ERROR SEARCH: {text}")
+    limit = option_value("--limit")
+    start = time.time()
+    try:
+        results = db_helper.search_errors(
+            text,
+            module=option_value("--module"),
+            device=option_value("--device"),
+            since=option_value("--since"),
+            until=option_value("--until"),
+            limit=int(limit) if limit else 20,
+        )
+    except Exception as e:
+        print(f"❌ Error searching test results: {e}")
+        print(
+            "Make sure the search index exists: "
+            "python database_scripts/add_error_search_index.py"
+        )
+        return
+    elapsed_ms = (time.time() - start) * 1000
+
+    if not results:
+        print(f"No matching test results ({elapsed_ms:.0f} ms)")
+        return
+    for result in results:
+        print(
+            f"\n🔍 #{result['id']} {result['test_case_name']} ({result['module_name']}, "
+            f"{result['device_name'] or 'unknown'}) {result['test_status']} "
+            f"{result['test_datetime']}"
+            f"  score {float(result['score']):.2f}"
+        )
+        print(f"   {result['snippet']}")
+    print(f"\n📊 {len(results)} result(s) in {elapsed_ms:.0f} ms")
+
+
+def show_error_signatures(db_helper, limit=10):
+    """Show the most frequent failure signatures"""
+    since = option_value("--since")
+    print_header(
+        f"TOP {limit} FAILURE SIGNATURES" + (f" SINCE {since}" if since else "")
+    )
+    signatures = db_helper.get_top_error_signatures(limit, since)
+    if not signatures:
+        print("No failure signatures found.")
+        return
+
+    print(f"{'Count':<7} {'Last Seen':<17} {'Signature':<10} {'Error Summary':<60}")
+    print("-" * 100)
+    for signature in signatures:
+        last_seen = str(signature["last_seen"])[:16]
+        summary = (signature["error_summary"] or "")[:60]
+        print(
+            f"{signature['occurrences']:<7} {last_seen:<17} "
+            f"{signature['signature'][:8]:<10} {summary:<60}"
+        )
+
+
+def option_value(name):
+    """Value after a --name option on the command line, or None"""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return None
 
 
 def show_module_breakdown(db_helper):
     """Show test results breakdown by module"""
     print_header("TEST RESULTS BY MODULE")
 
+    # Read from the daily rollups instead of scanning test_results
     module_query = """
     SELECT 
         module_name,
-        COUNT(*) as total_tests,
-        SUM(CASE WHEN test_status = 'PASSED' THEN 1 ELSE 0 END) as passed_tests,
-        SUM(CASE WHEN test_status = 'FAILED' THEN 1 ELSE 0 END) as failed_tests,
-        SUM(CASE WHEN test_status = 'SKIPPED' THEN 1 ELSE 0 END) as skipped_tests,
-        SUM(CASE WHEN test_status = 'ERROR' THEN 1 ELSE 0 END) as error_tests
-    FROM test_results
+        SUM(result_count) as total_tests,
+        SUM(CASE WHEN test_status = 'PASSED' THEN result_count ELSE 0 END)
+            as passed_tests,
+        SUM(CASE WHEN test_status = 'FAILED' THEN result_count ELSE 0 END)
+            as failed_tests,
+        SUM(CASE WHEN test_status = 'SKIPPED' THEN result_count ELSE 0 END)
+            as skipped_tests,
+        SUM(CASE WHEN test_status = 'ERROR' THEN result_count ELSE 0 END)
+            as error_tests
+    FROM test_results_daily
     GROUP BY module_name
     ORDER BY total_tests DESC
     """
@@ -205,7 +338,7 @@ def show_module_breakdown(db_helper):
 def main():
     """Main function to run the test results viewer"""
     try:
-        db_helper = MySQLHelper()
+        db_helper = get_result_store()
 
         if len(sys.argv) > 1:
             command = sys.argv[1].lower()
@@ -218,11 +351,35 @@ def main():
             elif command == "modules":
                 show_module_breakdown(db_helper)
             elif command == "recent":
-                limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
-                show_recent_tests(db_helper, limit)
+                has_limit = len(sys.argv) > 2 and sys.argv[2].isdigit()
+                limit = int(sys.argv[2]) if has_limit else 20
+                before = option_value("--before")
+                before = parse_page_position(before) if before else None
+                show_recent_tests(db_helper, limit, before, result_filters())
+                if "--follow" in sys.argv:
+                    follow_tests(db_helper)
+            elif command == "history":
+                has_page_size = len(sys.argv) > 2 and sys.argv[2].isdigit()
+                page_size = int(sys.argv[2]) if has_page_size else 50
+                show_history(db_helper, page_size, result_filters())
+            elif command == "follow":
+                follow_tests(db_helper)
+            elif command == "search" and len(sys.argv) > 2:
+                search_errors(db_helper, sys.argv[2])
+            elif command == "signatures":
+                has_limit = len(sys.argv) > 2 and sys.argv[2].isdigit()
+                limit = int(sys.argv[2]) if has_limit else 10
+                show_error_signatures(db_helper, limit)
             else:
                 print(
-                    "❌ Unknown command. Available commands: failed, stats, modules, recent [limit]"
+                    "❌ Unknown command. Available commands: failed, stats, modules, "
+                    "recent [limit] [--module M] [--device D] [--since YYYY-MM-DD] "
+                    "[--before POSITION] [--follow], "
+                    "history [page_size] [--module M] [--device D] "
+                    "[--since YYYY-MM-DD], follow, "
+                    "search <text> [--module M] [--device D] [--since YYYY-MM-DD] "
+                    "[--until YYYY-MM-DD] [--limit N], "
+                    "signatures [limit] [--since YYYY-MM-DD]"
                 )
         else:
             # Default: show recent tests and statistics
@@ -2,16 +2,20 @@ import os
 import traceback
 
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 
-from db.db_helper import MySQLHelper
+from core.account_pool import account_pool
+from core.browser_pool import BrowserPool
+from core.click_engine import click_engine
+from core.device_emulation import get_default_resolution
+from core.locator_resolver import locator_resolver
+from core.waits import wait_tracker
+from db.connection_pool import pool_stats
+from db.result_store import get_result_store
+from db.result_writer import result_writer
 from testing.screenshot_utils import screenshot_manager
 
-# By default: headless = True for CI environments
-HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+# Seconds to keep the browser on screen after each test (0 in CI)
+KEEP_OPEN_SECONDS = float(os.getenv("BROWSER_KEEP_OPEN_SECONDS", "0"))
 
 # Initialize database helper lazily to avoid import-time connection issues
 db_helper = None
@@ -21,7 +25,7 @@ def get_db_helper():
     """Get database helper instance, creating it if needed"""
     global db_helper
     if db_helper is None:
-        db_helper = MySQLHelper()
+        db_helper = get_result_store()
     return db_helper
 
 
@@ -35,8 +39,15 @@ def device_info():
     return _device_info
 
 
-@pytest.fixture(scope="session", autouse=True)
+@pytest.fixture(scope="session")
 def setup_database():
+    """Replaces the root conftest's autouse fixture, which would connect to the
+    database for every test; browser tests get result_database via driver"""
+    yield
+
+
+@pytest.fixture(scope="session")
+def result_database():
     """Setup database table for test results"""
     try:
         helper = get_db_helper()
@@ -53,12 +64,18 @@ def capture_test_results(request, device_info):
     """Automatically capture test results and store in database"""
     import time
 
+    # Only browser tests are recorded; unit tests never reach the database
+    if "driver" not in request.fixturenames:
+        yield
+        return
+
     # Get test information
     test_name = request.node.name
     module_name = request.module.__name__ if request.module else "unknown"
 
     # Start timing
     start_time = time.time()
+    wait_tracker.start_test(request.node.nodeid)
 
     # Run the test
     yield
@@ -67,6 +84,14 @@ def capture_test_results(request, device_info):
     end_time = time.time()
     total_time_duration = round(end_time - start_time, 3)
 
+    wait_stats = wait_tracker.end_test()
+    if wait_stats:
+        print(
+            f"[⏱️] Waits: {wait_stats['idle_seconds']:.2f}s idle, "
+            f"{wait_stats['condition_seconds']:.2f}s on conditions "
+            f"({wait_stats['conditions_timed_out']} timed out)"
+        )
+
     # Get device information from the global variable
     device_name = device_info["name"]
     screen_resolution = device_info["resolution"]
@@ -239,19 +264,21 @@ def capture_test_results(request, device_info):
         print(
             f"[INFO] Storing test result: {cleaned_test_name} - {status} - Device: {device_name} - Resolution: {screen_resolution}"
         )
-        helper = get_db_helper()
-        helper.store_test_result_in_tables(
-            cleaned_test_name,
-            module_name,
-            status,
-            error_message,
-            None,  # test_data
-            total_time_duration,
-            device_name,
-            screen_resolution,
-            error_link,
+        result = dict(
+            test_case_name=cleaned_test_name,
+            module_name=module_name,
+            test_status=status,
+            error_message=error_message,
+            test_data=None,
+            total_time_duration=total_time_duration,
+            device_name=device_name,
+            screen_resolution=screen_resolution,
+            error_link=error_link,
         )
-        print("[SUCCESS] Test result inserted successfully")
+        # Spooled locally first, then written in the background (or inline with
+        # ASYNC_RESULT_WRITER=false); flushed at the latest in pytest_sessionfinish
+        result_writer.submit(**result)
+        print(f"[SUCCESS] Test result queued ({result_writer.queue_depth()} pending)")
     except Exception as e:
         print(f"WARNING: Database storage skipped: {type(e).__name__} - {e}")
         # Continue test execution without database logging
@@ -267,6 +294,29 @@ def pytest_runtest_makereport(item, call):
     item.rep_call = rep
 
 
+def pytest_sessionfinish(session, exitstatus):
+    """Stop the account pool, flush the result writer, save the click and selector
+    stats, print the pool and click stats and write the wait report"""
+    account_pool.stop_replenisher()
+    if result_writer.metrics["submitted"]:
+        result_writer.close()
+        print(f"\n[🗄️] Result writer summary: {result_writer.summary()}")
+    if pool_stats()["checkouts"]:
+        print(f"[🔌] Database pool: {pool_stats()}")
+    click_engine.save()
+    locator_resolver.save()
+    if click_engine.counters["clicks"]:
+        print(f"\n[🖱️] Click engine summary: {click_engine.summary()}")
+    if not wait_tracker.tests:
+        return
+    try:
+        report_path = wait_tracker.write_report()
+        print(f"\n[⏱️] Wait summary: {wait_tracker.summary()}")
+        print(f"[📄] Wait report saved: {report_path}")
+    except Exception as e:
+        print(f"[WARNING] Could not write wait report: {e}")
+
+
 # Function to get device list based on environment variable
 def get_device_list():
     """Get list of devices to test based on environment variable"""
@@ -301,157 +351,24 @@ def get_device_list():
     return devices
 
 
+@pytest.fixture(scope="session")
+def browser_pool():
+    """Session-wide pool of warm Chrome instances shared by all tests"""
+    pool = BrowserPool()
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(params=get_device_list())
-def driver(request):
+def driver(request, browser_pool, result_database):
     device = request.param
 
     # Store device information in global variable
     global _device_info  # noqa: F824
     _device_info["name"] = device
+    _device_info["resolution"] = get_default_resolution(device)
 
-    chrome_options = Options()
-
-    if HEADLESS:
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        print("[INFO] Running in headless mode")
-    else:
-        print("[INFO] Headless mode disabled")
-
-    if device == "desktop":
-        print("[INFO] Running on desktop")
-        chrome_options.add_argument("--start-maximized")
-        _device_info["resolution"] = "1920x1080"  # Default desktop resolution
-    else:
-        # Use valid Chrome device names that are known to work
-        device_mapping = {
-            "iPhone X": "iPhone X",
-            "iPad Pro": "iPad Pro",
-            "Pixel 4": "Pixel 4",
-        }
-
-        if device in device_mapping:
-            mobile_emulation = {"deviceName": device_mapping[device]}
-            chrome_options.add_experimental_option("mobileEmulation", mobile_emulation)
-            print(f"[INFO] Running on mobile: {device}")
-
-            # Set default resolutions for known devices
-            if device == "iPhone X":
-                _device_info["resolution"] = "375x812"
-            elif device == "iPad Pro":
-                _device_info["resolution"] = "1024x1366"
-            elif device == "Pixel 4":
-                _device_info["resolution"] = "411x823"
-        elif "Samsung Galaxy" in device:
-            # Use custom device metrics for Samsung devices with proper Android user agent
-            if "S21" in device:
-                mobile_emulation = {
-                    "deviceMetrics": {"width": 360, "height": 800, "pixelRatio": 3.0},
-                    "userAgent": "Mozilla/5.0 (Linux; Android 12; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
-                }
-                _device_info["resolution"] = "360x800"
-            elif "S20" in device:
-                mobile_emulation = {
-                    "deviceMetrics": {"width": 360, "height": 800, "pixelRatio": 3.0},
-                    "userAgent": "Mozilla/5.0 (Linux; Android 11; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
-                }
-                _device_info["resolution"] = "360x800"
-            elif "S10" in device:
-                mobile_emulation = {
-                    "deviceMetrics": {"width": 360, "height": 640, "pixelRatio": 3.0},
-                    "userAgent": "Mozilla/5.0 (Linux; Android 10; SM-G973F) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
-                }
-                _device_info["resolution"] = "360x640"
-            else:
-                # Generic Samsung device
-                mobile_emulation = {
-                    "deviceMetrics": {"width": 360, "height": 800, "pixelRatio": 3.0},
-                    "userAgent": "Mozilla/5.0 (Linux; Android 12; Samsung Galaxy) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
-                }
-                _device_info["resolution"] = "360x800"
-
-            chrome_options.add_experimental_option("mobileEmulation", mobile_emulation)
-            print(f"[INFO] Running on Samsung Android: {device}")
-        else:
-            # Fallback to custom dimensions for unknown devices
-            mobile_emulation = {
-                "deviceMetrics": {"width": 375, "height": 812, "pixelRatio": 3.0},
-                "userAgent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1",
-            }
-            chrome_options.add_experimental_option("mobileEmulation", mobile_emulation)
-            print(f"[INFO] Running on mobile with custom dimensions: {device}")
-            _device_info["resolution"] = "375x812"  # Default mobile resolution
-
-    # Add additional options for better stability and timeout handling
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-
-    # Improved timeout and stability settings
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-first-run")
-    chrome_options.add_argument("--no-default-browser-check")
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    chrome_options.add_argument("--disable-features=TranslateUI")
-    chrome_options.add_argument("--disable-ipc-flooding-protection")
-    
-    # Network and connectivity improvements
-    chrome_options.add_argument("--disable-background-networking")
-    chrome_options.add_argument("--disable-sync")
-    chrome_options.add_argument("--disable-translate")
-    chrome_options.add_argument("--disable-default-apps")
-    chrome_options.add_argument("--disable-component-update")
-    chrome_options.add_argument("--disable-client-side-phishing-detection")
-    chrome_options.add_argument("--disable-hang-monitor")
-    chrome_options.add_argument("--disable-prompt-on-repost")
-    chrome_options.add_argument("--disable-domain-reliability")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    
-    # Add timeout settings to prevent hanging
-    chrome_options.add_argument("--timeout=30000")
-    chrome_options.add_argument("--page-load-timeout=30000")
-    
-    # DNS and network settings
-    chrome_options.add_argument("--dns-prefetch-disable")
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    
-    # Fix for GitHub Actions: Use unique user data directory
-    import tempfile
-    import os
-    if os.getenv('GITHUB_ACTIONS') == 'true':
-        # Create unique temporary directory for each test
-        temp_dir = tempfile.mkdtemp(prefix='chrome_user_data_')
-        chrome_options.add_argument(f"--user-data-dir={temp_dir}")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--headless")  # Force headless in CI
-        print(f"[SETUP] Using unique user data directory: {temp_dir}")
-
-    # Create driver with improved timeout settings
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()), 
-        options=chrome_options
-    )
-    
-    # Set page load timeout and other timeouts
-    driver.set_page_load_timeout(30)
-    driver.implicitly_wait(10)
-    driver.set_script_timeout(30)
-
-    # Execute script to remove webdriver property
-    driver.execute_script(
-        "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-    )
+    driver = browser_pool.acquire(device)
 
     # Update resolution with actual values from driver
     try:
@@ -462,18 +379,20 @@ def driver(request):
             f"[INFO] Updated device info - Name: {_device_info['name']}, Resolution: {_device_info['resolution']}"
         )
     except Exception as e:
-                    print(f"[WARNING] Could not get actual resolution: {e}")
+        print(f"[WARNING] Could not get actual resolution: {e}")
 
     yield driver
-    
-    # Add delay before closing browser to see results
-    import time
-    print(f"[⏳] Test completed on {_device_info['name']}. Keeping browser open for 5 seconds...")
-    time.sleep(5)
-    
-    # Clean up driver
-    try:
-        driver.quit()
-        print(f"[✅] Browser closed successfully for {_device_info['name']}")
-    except Exception as e:
-        print(f"[⚠️] Error closing browser for {_device_info['name']}: {e}")
+
+    # Optional delay before handing the browser back, useful when watching locally
+    if KEEP_OPEN_SECONDS > 0:
+        import time
+
+        print(
+            f"[⏳] Test completed on {_device_info['name']}. "
+            f"Keeping browser open for {KEEP_OPEN_SECONDS} seconds..."
+        )
+        time.sleep(KEEP_OPEN_SECONDS)
+
+    rep_call = getattr(request.node, "rep_call", None)
+    browser_pool.release(driver, failed=bool(rep_call and rep_call.failed))
+    print(f"[✅] Browser released to pool for {_device_info['name']}")
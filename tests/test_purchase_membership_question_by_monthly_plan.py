@@ -5,6 +5,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from core.session_checkpoint import sign_up_or_restore
 from pages.purchase_membership_question_by_monthly_plan_methods import (
     SolutionInnPrimaryPage,
 )
@@ -27,15 +28,10 @@ def test_purchase_membership_question_by_monthly_plan_flow(driver, stage, device
         # Step 1: Open the page
         page.open()
 
-        # Step 2: Start registration
-        page.click_view_solution_button()
-        page.enter_email()
-        page.enter_password()
-        page.enter_university()
-        page.click_signup_button()
+        # Step 2: Start registration (or restore a signed-in session)
+        sign_up_or_restore(driver, page)
 
         # Step 3: Monthly Plan Purchase
-        page.click_view_solution_button()
         page.click_monthly_access_button()
         page.click_payment_toggle()
 
@@ -10,6 +10,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from core.session_checkpoint import sign_up_or_restore
 from pages.purchase_membership_question_by_three_month_popular_plan_methods import (
     SolutionInnPrimaryPage,
 )
@@ -36,18 +37,15 @@ def test_purchase_membership_question_by_three_month_popular_plan(driver, stage)
         page.open()
         print(f"[✅] Page opened successfully for {stage}")
 
-        # -------------------- Begin Registration --------------------
+        # -------------------- Registration (or restored session) --------------------
         print(f"[📝] Starting registration process for {stage}")
-        page.click_view_solution_button()
-        page.enter_email()
-        page.enter_password()
-        page.enter_university()
-        page.click_signup_button()
-        print(f"[✅] Registration completed for {stage}")
+        if sign_up_or_restore(driver, page):
+            print(f"[✅] Restored signed-in session for {stage}")
+        else:
+            print(f"[✅] Registration completed for {stage}")
 
         # -------------------- After Sign-Up --------------------
         print(f"[🔄] Starting post-registration flow for {stage}")
-        page.click_view_solution_button()
 
         # Add explicit wait and logging for popular plan button
         print(f"[🔍] Looking for popular plan button on {stage}")
@@ -0,0 +1,49 @@
+"""
+Fixtures for the unit tests under tests/unit.
+
+They run without a browser or a database server. Every cache, spool, stats
+file and report the code under test could write goes to the test's tmp_path,
+never to the checkout's .cache/ or test_reports/.
+"""
+
+import pytest
+
+from core import session_checkpoint
+from core.account_pool import account_pool
+from core.click_engine import click_engine
+from core.locator_resolver import locator_resolver
+from db import db_config, result_store
+from db.result_writer import result_writer
+from db.sqlite_helper import SQLiteHelper
+
+
+@pytest.fixture(autouse=True)
+def scratch_files(tmp_path, monkeypatch):
+    """Point the module-level paths and the shared singletons at tmp_path"""
+    cache = tmp_path / "cache"
+    # Relative defaults (.cache/..., test_reports/..., archive/...) land here too
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        result_store, "REFERENCE_ID_CACHE_PATH", str(cache / "reference_ids.json")
+    )
+    monkeypatch.setattr(result_store, "_reference_ids", {})
+    monkeypatch.setattr(
+        db_config, "ENDPOINT_CACHE_PATH", str(cache / "db_endpoint.json")
+    )
+    monkeypatch.setattr(
+        session_checkpoint, "CHECKPOINT_DIR", str(cache / "session_checkpoints")
+    )
+    monkeypatch.setattr(click_engine, "stats_path", cache / "click_stats.json")
+    monkeypatch.setattr(locator_resolver, "stats_path", cache / "selector_stats.json")
+    monkeypatch.setattr(account_pool, "path", cache / "account_pool.json")
+    monkeypatch.setattr(account_pool, "lock_path", cache / "account_pool.lock")
+    monkeypatch.setattr(result_writer.spool, "spool_dir", cache / "result_spool")
+    return cache
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty SQLite result store in a scratch file"""
+    helper = SQLiteHelper(str(tmp_path / "results.sqlite3"))
+    yield helper
+    helper.close()
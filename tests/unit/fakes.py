@@ -0,0 +1,100 @@
+"""Browser and database stand-ins shared by the unit tests"""
+
+from mysql.connector import errors as mysql_errors
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+class FakeElement:
+    def __init__(self, name, stale=False):
+        self.name = name
+        self.stale = stale
+        self.typed = []
+        self.cleared = 0
+
+    def send_keys(self, text):
+        self.typed.append(text)
+
+    def clear(self):
+        self.cleared += 1
+
+    def get_attribute(self, name):
+        return "".join(self.typed)
+
+
+class FakeDriver:
+    """Records the scripts, CDP commands and lookups a helper sends to the browser"""
+
+    device_name = "desktop"
+
+    def __init__(self, async_results=(), found=None):
+        self.scripts = []
+        self.async_scripts = []
+        self.cdp = []
+        self.lookups = []
+        self.async_results = list(async_results)
+        self.found = found or FakeElement("found")
+
+    def execute_script(self, script, *args):
+        if any(getattr(arg, "stale", False) for arg in args):
+            raise StaleElementReferenceException(
+                "element is not attached to the page document"
+            )
+        self.scripts.append((script, args))
+
+    def execute_async_script(self, script, *args):
+        self.async_scripts.append(args)
+        return self.async_results.pop(0) if self.async_results else True
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+    def find_element(self, by, value):
+        self.lookups.append((by, value))
+        return self.found
+
+
+def clicked(driver):
+    return [args[0].name for script, args in driver.scripts if "click()" in script]
+
+
+class ScriptedCursor:
+    """Cursor answering INFORMATION_SCHEMA and SHOW queries from a script"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.statements = []
+        self.rowcount = 0
+        self.fail_on = None
+        self._rows = []
+
+    def execute(self, query, args=()):
+        self.statements.append(" ".join(query.split()))
+        if self.fail_on and self.fail_on in query:
+            raise mysql_errors.Error("scripted failure")
+        self._rows = next(
+            (rows for marker, rows in self.answers if marker in query), []
+        )
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class ScriptedHelper:
+    """Just enough of MySQLHelper for the migration runner and partition upkeep"""
+
+    def __init__(self, answers):
+        self.cursor = ScriptedCursor(answers)
+        self.conn = self
+        self.ddl = []
+        self._partitioned = None
+
+    def commit(self):
+        pass
+
+    def run_ddl(self, statement):
+        self.ddl.append(statement)
+        if self.cursor.fail_on and self.cursor.fail_on in statement:
+            raise mysql_errors.Error("scripted failure")
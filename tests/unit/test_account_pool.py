@@ -0,0 +1,105 @@
+import json
+import sys
+import time
+import types
+
+from core import account_pool
+from core.account_pool import CONSUMED, FRESH, LEASED, AccountPool
+from core.accounts import unique_test_email
+from core.constants import EMAIL_DOMAIN
+
+
+def write_pool(path, accounts):
+    path.write_text(json.dumps(accounts))
+
+
+def test_expired_accounts_are_stamped_and_later_dropped(tmp_path):
+    now = time.time()
+    pool = AccountPool(tmp_path / "pool.json")
+    write_pool(
+        pool.path,
+        [
+            {
+                "email": "old@x",
+                "state": FRESH,
+                "created_at": now - 2 * account_pool.ACCOUNT_MAX_AGE_SECONDS,
+            },
+            {
+                "email": "stuck@x",
+                "state": LEASED,
+                "created_at": now,
+                "leased_at": now - 2 * account_pool.LEASE_TIMEOUT_SECONDS,
+            },
+            {"email": "legacy@x", "state": CONSUMED, "created_at": now},
+            {
+                "email": "gone@x",
+                "state": CONSUMED,
+                "created_at": now,
+                "consumed_at": now - 2 * 86400,
+            },
+            {"email": "new@x", "state": FRESH, "created_at": now},
+        ],
+    )
+
+    assert pool.counts() == {FRESH: 1, LEASED: 0, CONSUMED: 3}
+
+    accounts = {a["email"]: a for a in json.loads(pool.path.read_text())}
+    assert "gone@x" not in accounts
+    assert accounts["old@x"]["consumed_reason"] == "expired"
+    assert accounts["stuck@x"]["consumed_reason"] == "lease timed out"
+    assert all(
+        now <= accounts[email]["consumed_at"] <= time.time()
+        for email in ("old@x", "stuck@x", "legacy@x")
+    )
+
+
+def test_lease_hands_out_the_oldest_fresh_account_once(tmp_path):
+    now = time.time()
+    pool = AccountPool(tmp_path / "pool.json", low_watermark=1)
+    write_pool(
+        pool.path,
+        [
+            {
+                "email": "second@x",
+                "password": "pw",
+                "state": FRESH,
+                "created_at": now - 10,
+                "session": {},
+            },
+            {
+                "email": "first@x",
+                "password": "pw",
+                "state": FRESH,
+                "created_at": now - 20,
+                "session": {},
+            },
+        ],
+    )
+
+    leased = [pool.lease("w1"), pool.lease("w2"), pool.lease("w3")]
+
+    assert [a and a["email"] for a in leased] == ["first@x", "second@x", None]
+    assert pool.counts()[LEASED] == 2
+
+
+def test_pool_lock_falls_back_to_msvcrt(tmp_path, monkeypatch):
+    calls = []
+    msvcrt = types.SimpleNamespace(LK_LOCK=1, LK_UNLCK=0)
+    msvcrt.locking = lambda fd, mode, size: calls.append((mode, size))
+    monkeypatch.setitem(sys.modules, "fcntl", None)
+    monkeypatch.setitem(sys.modules, "msvcrt", msvcrt)
+
+    pool = AccountPool(tmp_path / "pool.json")
+    pool.add("a@x", "pw", {})
+
+    assert calls == [(1, 1), (0, 1)]
+    assert pool.path.exists()
+
+
+def test_unique_test_email():
+    emails = {unique_test_email() for _ in range(50)}
+    assert len(emails) == 50
+    assert all(
+        email.startswith("testuser_") and email.endswith(f"@{EMAIL_DOMAIN}")
+        for email in emails
+    )
@@ -0,0 +1,35 @@
+import threading
+
+from core import browser_pool
+
+
+class PoolDriver:
+    window_handles = ["main"]
+
+    def quit(self):
+        pass
+
+
+def test_browser_pool_stats_survive_parallel_workers(monkeypatch):
+    monkeypatch.setattr(browser_pool, "launch_browser", lambda device: PoolDriver())
+    monkeypatch.setattr(
+        browser_pool.BrowserPool, "_reset_state", lambda self, browser: True
+    )
+    pool = browser_pool.BrowserPool(
+        size_per_device=2, max_uses=10_000, emulation_mode="device"
+    )
+
+    def worker():
+        for _ in range(200):
+            pool.release(pool.acquire("desktop"))
+
+    workers = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    stats = pool.stats
+    assert stats["launched"] + stats["reused"] == 8 * 200
+    assert stats["crashed"] == stats["recycled"] == 0
+    pool.close()
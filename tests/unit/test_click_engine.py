@@ -0,0 +1,79 @@
+from selenium.webdriver.common.by import By
+
+from core.click_engine import ClickEngine
+from tests.unit.fakes import FakeDriver, FakeElement, clicked
+
+LOCATOR = (By.CSS_SELECTOR, "#checkout")
+
+
+def test_click_engine_tries_the_historical_winner_first(tmp_path):
+    engine = ClickEngine(stats_path=tmp_path / "clicks.json")
+    key = "Checkout|desktop|css selector=#checkout"
+    engine._record(key, "native", False)
+    engine._record(key, "javascript", True)
+
+    assert engine._order(key, ("native", "javascript", "force_dispatch")) == [
+        "javascript",
+        "native",
+        "force_dispatch",
+    ]
+    # Ties keep the default order
+    assert engine._order("Other|desktop|id=x", ("native", "javascript")) == [
+        "native",
+        "javascript",
+    ]
+
+
+def test_click_stats_are_merged_into_the_file_at_save(tmp_path):
+    stats_path = tmp_path / "clicks.json"
+    key = "Checkout|desktop|css selector=#checkout"
+    first, second = ClickEngine(stats_path), ClickEngine(stats_path)
+    first._record(key, "javascript", True)
+    second._record(key, "javascript", True)
+    second._record(key, "native", False)
+
+    # Nothing touches the disk on the click path
+    assert not stats_path.exists()
+    first.save()
+    second.save()
+
+    assert ClickEngine(stats_path).history == {
+        key: {
+            "javascript": {"success": 2, "failure": 0},
+            "native": {"success": 0, "failure": 1},
+        }
+    }
+    assert second.history == ClickEngine(stats_path).history
+
+
+def test_click_uses_the_resolved_element(tmp_path):
+    engine = ClickEngine(stats_path=tmp_path / "clicks.json")
+    driver = FakeDriver()
+
+    strategy = engine.click(
+        driver,
+        LOCATOR,
+        page="Checkout",
+        element=FakeElement("resolved"),
+        strategies=("javascript",),
+    )
+
+    assert strategy == "javascript"
+    assert clicked(driver) == ["resolved"]
+    assert driver.lookups == []
+
+
+def test_click_finds_the_locator_again_when_the_element_is_stale(tmp_path):
+    engine = ClickEngine(stats_path=tmp_path / "clicks.json")
+    driver = FakeDriver(found=FakeElement("fresh"))
+
+    engine.click(
+        driver,
+        LOCATOR,
+        page="Checkout",
+        element=FakeElement("resolved", stale=True),
+        strategies=("javascript",),
+    )
+
+    assert clicked(driver) == ["fresh"]
+    assert driver.lookups == [LOCATOR]
@@ -0,0 +1,48 @@
+from core import device_emulation
+
+
+class CdpDriver:
+    def __init__(self):
+        self.cdp = []
+        self.window_size = None
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+    def set_window_size(self, width, height):
+        self.window_size = (width, height)
+
+
+def test_device_profile_falls_back_to_generic_profiles():
+    assert device_emulation.get_device_profile("desktop") is None
+    assert (
+        device_emulation.get_device_profile("Samsung Galaxy S99")
+        is device_emulation.GENERIC_SAMSUNG_PROFILE
+    )
+    assert (
+        device_emulation.get_device_profile("Nokia 3310")
+        is device_emulation.GENERIC_MOBILE_PROFILE
+    )
+    assert device_emulation.get_default_resolution("iPhone X") == "375x812"
+    assert device_emulation.get_default_resolution("desktop") == "1920x1080"
+
+
+def test_switching_back_to_desktop_clears_the_mobile_overrides():
+    driver = CdpDriver()
+
+    device_emulation.apply_device_emulation(driver, "Pixel 4")
+    metrics = dict(driver.cdp)["Emulation.setDeviceMetricsOverride"]
+    assert (metrics["width"], metrics["deviceScaleFactor"]) == (411, 2.75)
+    assert metrics["mobile"] is True
+
+    driver.cdp = []
+    device_emulation.apply_device_emulation(
+        driver, "desktop", native_user_agent="Mozilla/5.0 (X11; Linux x86_64)"
+    )
+    commands = dict(driver.cdp)
+    assert "Emulation.clearDeviceMetricsOverride" in commands
+    assert commands["Emulation.setTouchEmulationEnabled"] == {"enabled": False}
+    assert commands["Emulation.setUserAgentOverride"] == {
+        "userAgent": "Mozilla/5.0 (X11; Linux x86_64)"
+    }
+    assert driver.window_size == device_emulation.DESKTOP_RESOLUTION
@@ -0,0 +1,19 @@
+from db.error_signatures import fingerprint_error
+
+
+def test_fingerprint_ignores_run_specific_noise():
+    first = (
+        "TimeoutException: Message: element 8F3A9C2B1D4E5F60_element_12 not "
+        "clickable at 2026-03-01 12:00:01\n"
+        "  File /home/runner/work/app/tests/test_checkout.py, line 42"
+    )
+    second = (
+        "TimeoutException: Message: element 0A1B2C3D4E5F6789_element_7 not "
+        "clickable at 2026-04-02 08:30:59\n"
+        "  File C:\\agent\\_work\\app\\tests\\test_checkout.py, line 57"
+    )
+
+    assert fingerprint_error(first) == fingerprint_error(second)
+    assert fingerprint_error(first) != fingerprint_error(
+        "AssertionError: expected order total 49.99"
+    )
@@ -0,0 +1,47 @@
+import pytest
+
+from core import key_input
+from tests.unit.fakes import FakeDriver, FakeElement
+
+
+def test_per_key_fields_default_to_one_insert_text(monkeypatch):
+    monkeypatch.setattr(key_input, "FIELD_BACKENDS", {})
+    driver = FakeDriver()
+    element = FakeElement("card")
+
+    backend = key_input.typing_backend_for("cc_num", per_key=True)
+    assert backend == "cdp_insert"
+    assert key_input.type_text(driver, element, "4242 4242 4242 4242", backend=backend)
+
+    assert driver.cdp == [("Input.insertText", {"text": "4242 4242 4242 4242"})]
+    assert element.typed == []
+
+
+def test_rejected_insert_is_retyped_per_key():
+    # value_committed fails after the insert and succeeds after retyping
+    driver = FakeDriver(async_results=[False, True])
+    element = FakeElement("zip")
+
+    assert key_input.type_text(driver, element, "123", backend="cdp_insert")
+
+    assert element.cleared == 1
+    assert element.typed == ["1", "2", "3"]
+
+
+def test_cdp_keys_sends_key_events_per_character():
+    driver = FakeDriver()
+
+    key_input.type_text(driver, FakeElement("cvc"), "12", backend="cdp_keys")
+
+    assert [params["type"] for _, params in driver.cdp] == [
+        "keyDown",
+        "keyUp",
+        "keyDown",
+        "keyUp",
+    ]
+    assert driver.cdp[0][1]["code"] == "Digit1"
+
+
+def test_unknown_typing_backend():
+    with pytest.raises(ValueError):
+        key_input.type_text(FakeDriver(), FakeElement("x"), "1", backend="xdotool")
@@ -0,0 +1,57 @@
+from core.locator_resolver import LocatorResolver
+from tests.unit.fakes import FakeDriver, FakeElement
+
+
+def test_resolver_returns_the_element_and_learns_the_winner(tmp_path):
+    resolver = LocatorResolver(stats_path=tmp_path / "selectors.json")
+    selectors = ["#pay-now", "//button[text()='Pay']", ".checkout .pay"]
+    element = FakeElement("pay")
+    driver = FakeDriver(
+        async_results=[
+            {"element": element, "index": 1, "matched": [1, 2], "invalid": [0]}
+        ]
+    )
+
+    match = resolver.resolve(driver, selectors, name="Checkout.pay")
+
+    assert match == (element, 1, "//button[text()='Pay']")
+    # The selector that won is sent first next time
+    driver.async_results = [
+        {"element": None, "index": -1, "matched": [], "invalid": []}
+    ]
+    assert resolver.resolve(driver, selectors, name="Checkout.pay", timeout=0) is None
+    assert driver.async_scripts[-1][0] == [
+        "//button[text()='Pay']",
+        ".checkout .pay",
+        "#pay-now",
+    ]
+
+
+def test_selector_stats_are_merged_into_the_file_at_save(tmp_path):
+    stats_path = tmp_path / "selectors.json"
+    selectors = ["#pay-now", ".pay"]
+    first, second = LocatorResolver(stats_path), LocatorResolver(stats_path)
+    for resolver in (first, second):
+        driver = FakeDriver(
+            async_results=[
+                {
+                    "element": FakeElement("pay"),
+                    "index": 1,
+                    "matched": [1],
+                    "invalid": [],
+                }
+            ]
+        )
+        resolver.resolve(driver, selectors, name="Checkout.pay")
+
+    # Nothing touches the disk on the resolve path
+    assert not stats_path.exists()
+    first.save()
+    second.save()
+
+    assert LocatorResolver(stats_path).history == {
+        "Checkout.pay|desktop": {
+            "#pay-now": {"evaluated": 2, "matched": 0, "chosen": 0},
+            ".pay": {"evaluated": 2, "matched": 2, "chosen": 2},
+        }
+    }
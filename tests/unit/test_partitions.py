@@ -0,0 +1,107 @@
+from datetime import date
+
+import pytest
+from mysql.connector import errors as mysql_errors
+
+from db.partitions import (
+    _exchange_partition,
+    add_months,
+    ensure_partitions,
+    month_partitions,
+    month_start,
+    partition_clause,
+)
+from tests.unit.fakes import ScriptedHelper
+
+
+@pytest.mark.parametrize(
+    "month, count, expected",
+    [
+        (date(2026, 10, 1), 3, date(2027, 1, 1)),
+        (date(2026, 12, 1), 1, date(2027, 1, 1)),
+        (date(2026, 1, 1), -1, date(2025, 12, 1)),
+        (date(2026, 3, 1), 24, date(2028, 3, 1)),
+    ],
+)
+def test_add_months(month, count, expected):
+    assert add_months(month, count) == expected
+
+
+def test_month_partitions_cover_each_month():
+    assert month_start(date(2026, 11, 30)) == date(2026, 11, 1)
+    assert month_partitions(date(2026, 11, 1), date(2027, 1, 1)) == [
+        "PARTITION p202611 VALUES LESS THAN ('2026-12-01')",
+        "PARTITION p202612 VALUES LESS THAN ('2027-01-01')",
+        "PARTITION p202701 VALUES LESS THAN ('2027-02-01')",
+    ]
+    clause = partition_clause(date(2026, 11, 1), date(2026, 11, 1))
+    assert clause.startswith("PARTITION BY RANGE COLUMNS(test_datetime)")
+    assert "PARTITION p_start VALUES LESS THAN ('2026-11-01')" in clause
+    assert clause.rstrip(")\n").endswith(
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE"
+    )
+
+
+def test_ensure_partitions_splits_p_future():
+    helper = ScriptedHelper(
+        [
+            (
+                "INFORMATION_SCHEMA.PARTITIONS",
+                [
+                    {
+                        "PARTITION_NAME": "p_start",
+                        "PARTITION_DESCRIPTION": "'2026-10-01'",
+                        "TABLE_ROWS": 0,
+                    },
+                    {
+                        "PARTITION_NAME": "p202610",
+                        "PARTITION_DESCRIPTION": "'2026-11-01'",
+                        "TABLE_ROWS": 10,
+                    },
+                    {
+                        "PARTITION_NAME": "p_future",
+                        "PARTITION_DESCRIPTION": "MAXVALUE",
+                        "TABLE_ROWS": 0,
+                    },
+                ],
+            )
+        ]
+    )
+
+    added = ensure_partitions(helper, months_ahead=2, today=date(2026, 10, 18))
+
+    assert added == ["p202611", "p202612"]
+    assert helper.ddl[0].startswith(
+        "ALTER TABLE test_results REORGANIZE PARTITION p_future INTO"
+    )
+    assert (
+        helper.ddl[0]
+        .rstrip()
+        .endswith("PARTITION p_future VALUES LESS THAN (MAXVALUE)\n)")
+    )
+
+
+def test_failed_exchange_drops_the_archive_table():
+    helper = ScriptedHelper([])
+    helper.cursor.fail_on = "EXCHANGE PARTITION"
+
+    with pytest.raises(mysql_errors.Error):
+        _exchange_partition(helper, "p202401")
+
+    assert (
+        helper.cursor.statements[-1]
+        == "DROP TABLE IF EXISTS test_results_archive_p202401"
+    )
+
+
+def test_exchanged_rows_are_kept_when_compression_fails():
+    helper = ScriptedHelper([("COUNT(*)", [{"count": 12}])])
+    helper.cursor.fail_on = "ROW_FORMAT=COMPRESSED"
+
+    assert _exchange_partition(helper, "p202401") == (
+        "test_results_archive_p202401",
+        12,
+    )
+    assert not any(
+        statement.startswith("DROP") for statement in helper.cursor.statements
+    )
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from db.query_advisor import index_for
+from db.result_store import QUERY_INDEXES, results_page_query
+
+START = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def test_index_for_viewer_queries():
+    indexes = dict(QUERY_INDEXES)
+    query, _ = results_page_query(
+        module="tests.test_module", device="desktop", before=(START, 7)
+    )
+    assert index_for(query) == list(indexes["idx_test_results_module_device_datetime"])
+
+    query, _ = results_page_query(statuses=["FAILED", "ERROR"])
+    assert index_for(query) == list(indexes["idx_test_results_status_datetime"])
@@ -0,0 +1,206 @@
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from db import result_store
+from db.result_store import (
+    ResultStore,
+    page_position,
+    parse_page_position,
+    results_page_query,
+)
+
+START = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def write_results(store, *results):
+    """Store results (dicts of build_result_rows keyword arguments) in one batch"""
+    rows = []
+    for number, result in enumerate(results):
+        result = dict(result)
+        result.setdefault("module_name", "tests.test_module")
+        result.setdefault("test_status", "PASSED")
+        result.setdefault("test_datetime", START + timedelta(minutes=number))
+        result.setdefault("result_key", f"{number:032x}")
+        rows.extend(store.build_result_rows(**result))
+    return store.write_rows(rows)
+
+
+@pytest.mark.parametrize(
+    "today, subscription_type, end",
+    [
+        (datetime(2025, 1, 31), "monthly", date(2025, 2, 28)),
+        (datetime(2024, 1, 31), "monthly", date(2024, 2, 29)),
+        (datetime(2025, 8, 31), "six_month", date(2026, 2, 28)),
+        (datetime(2025, 5, 31), "three_month", date(2025, 8, 31)),
+        (datetime(2024, 2, 29), "annual", date(2025, 2, 28)),
+    ],
+)
+def test_subscription_end_dates_clamp_to_month_end(today, subscription_type, end):
+    with mock.patch("db.result_store.datetime") as clock:
+        clock.now.return_value = today
+        assert ResultStore._subscription_terms(subscription_type)[0] == end
+
+
+def test_reference_ids_are_cached_across_processes(store, scratch_files, monkeypatch):
+    lookups = []
+
+    def resolve():
+        lookups.append("user")
+        return 7
+
+    assert store._reference_id("user", resolve) == 7
+    assert store._reference_id("user", resolve) == 7
+    assert lookups == ["user"]
+    assert (scratch_files / "reference_ids.json").exists()
+
+    # A new process reads the ids back from the cache file
+    monkeypatch.setattr(result_store, "_reference_ids", {})
+    assert store._reference_id("user", resolve) == 7
+    assert lookups == ["user"]
+
+    store.invalidate_reference_ids()
+    assert store._reference_id("user", resolve) == 7
+    assert lookups == ["user", "user"]
+
+
+def test_rollups_match_test_results(store):
+    write_results(
+        store,
+        {"test_case_name": "test_a", "total_time_duration": 2.0},
+        {"test_case_name": "test_b", "total_time_duration": 4.0},
+        {
+            "test_case_name": "test_c",
+            "test_status": "FAILED",
+            "error_message": "AssertionError",
+        },
+    )
+
+    def daily():
+        store.cursor.execute(
+            "SELECT test_status, result_count, timed_count, total_duration"
+            " FROM test_results_daily ORDER BY test_status"
+        )
+        return store.cursor.fetchall()
+
+    incremental = daily()
+    assert [(row["test_status"], row["result_count"]) for row in incremental] == [
+        ("FAILED", 1),
+        ("PASSED", 2),
+    ]
+    assert incremental[1]["total_duration"] == pytest.approx(6.0)
+
+    store.rebuild_rollups()
+    assert daily() == incremental
+
+
+def test_pages_follow_position_tokens(store):
+    """Keyset pages resumed from a printed position neither skip nor repeat rows"""
+    # Two results share each timestamp, so the id breaks the tie
+    write_results(
+        store,
+        *(
+            {
+                "test_case_name": f"test_{n:02d}",
+                "test_datetime": START + timedelta(minutes=n // 2),
+            }
+            for n in range(9)
+        ),
+    )
+
+    seen, before = [], None
+    while True:
+        page = list(store.iter_test_results(before=before, limit=4))
+        seen.extend(row["test_case_name"] for row in page)
+        if len(page) < 4:
+            break
+        before = parse_page_position(page_position(page[-1]))
+
+    assert seen == [f"test_{n:02d}" for n in reversed(range(9))]
+
+
+def test_page_position_round_trips():
+    position = page_position(
+        {"test_datetime": datetime(2026, 3, 1, 12, 30, 5), "id": 42}
+    )
+    assert position == "2026-03-01T12:30:05/42"
+    assert parse_page_position(position) == (datetime(2026, 3, 1, 12, 30, 5), 42)
+
+
+def test_results_page_query_filters():
+    query, args = results_page_query(
+        statuses=["FAILED"], module="tests.test_module", before=(START, 7), size=10
+    )
+    assert "tr.module_name = %s" in query
+    assert "tr.test_status IN (%s)" in query
+    assert query.rstrip().endswith(
+        "ORDER BY tr.test_datetime DESC, tr.id DESC LIMIT %s"
+    )
+    assert args == ("tests.test_module", "FAILED", START, START, 7, 10)
+
+
+def test_search_finds_rows_without_a_signature(store):
+    write_results(
+        store,
+        {
+            "test_case_name": "test_log",
+            "test_status": "SKIPPED",
+            "error_message": "Skipped: payment iframe missing",
+        },
+    )
+
+    results = store.search_errors("iframe")
+
+    assert [row["test_case_name"] for row in results] == ["test_log"]
+
+
+def test_search_returns_fingerprinted_failures_once(store):
+    """A failure matched by its own text and its signature is one hit"""
+    error = "TimeoutException: checkout button not clickable"
+    write_results(
+        store,
+        {
+            "test_case_name": "test_checkout",
+            "test_status": "FAILED",
+            "error_message": error,
+        },
+        {
+            "test_case_name": "test_checkout_again",
+            "test_status": "FAILED",
+            "error_message": error,
+        },
+        {"test_case_name": "test_passed"},
+    )
+
+    results = store.search_errors("checkout timeout")
+
+    assert sorted(row["test_case_name"] for row in results) == [
+        "test_checkout",
+        "test_checkout_again",
+    ]
+    assert all("**" in row["snippet"] for row in results)
+
+
+def test_normalise_test_names(store):
+    store.cursor.executemany(
+        "INSERT INTO test_results"
+        " (test_case_name, module_name, test_status, test_datetime)"
+        " VALUES (%s, %s, %s, %s)",
+        [
+            ("test_login[desktop]", "tests.test_login", "PASSED", START),
+            ("test_login", "login", "PASSED", START),
+        ],
+    )
+    store.conn.commit()
+
+    stats = store.normalise_test_names()
+
+    store.cursor.execute(
+        "SELECT test_case_name, module_name FROM test_results ORDER BY id"
+    )
+    assert store.cursor.fetchall() == [
+        {"test_case_name": "test_login", "module_name": "login"},
+        {"test_case_name": "test_login", "module_name": "login"},
+    ]
+    assert (stats["scanned"], stats["renamed"], stats["modules"]) == (1, 1, 1)
@@ -0,0 +1,137 @@
+import os
+import socket
+from datetime import datetime
+
+import pytest
+
+from db import result_spool
+from db.result_spool import ResultSpool, replay, spooled_files
+from db.result_writer import ResultWriter
+from db.sqlite_helper import SQLiteHelper
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "results.sqlite3")
+
+
+def stored_names(db_path):
+    helper = SQLiteHelper(db_path)
+    try:
+        helper.cursor.execute(
+            "SELECT test_case_name FROM test_results ORDER BY test_case_name"
+        )
+        return [row["test_case_name"] for row in helper.cursor.fetchall()]
+    finally:
+        helper.close()
+
+
+def result(name, **fields):
+    return dict(
+        test_case_name=name,
+        module_name="tests.test_module",
+        test_status="PASSED",
+        test_datetime=datetime(2026, 3, 1, 12, 0, 0),
+        **fields,
+    )
+
+
+def leave_for_replay(spool_dir):
+    """Make the spool files look like another host's, so this process may replay them"""
+    for path in spool_dir.glob("results-*.jsonl"):
+        path.rename(
+            path.with_name(path.name.replace(socket.gethostname(), "otherhost", 1))
+        )
+
+
+def test_bad_result_does_not_lose_its_batch(db_path, tmp_path):
+    helper = SQLiteHelper(db_path)
+    build_result_rows = helper.build_result_rows
+
+    def failing_build(**fields):
+        if fields["test_case_name"] == "test_bad":
+            raise ValueError("day is out of range for month")
+        return build_result_rows(**fields)
+
+    helper.build_result_rows = failing_build
+    writer = ResultWriter(
+        helper_factory=lambda: helper,
+        batch_size=10,
+        flush_seconds=60,
+        spool=ResultSpool(tmp_path / "spool"),
+    )
+    for name in ("test_first", "test_bad", "test_last"):
+        writer.submit(**result(name))
+    writer.close()
+
+    assert stored_names(db_path) == ["test_first", "test_last"]
+    assert (
+        writer.metrics["batches"],
+        writer.metrics["written"],
+        writer.metrics["failed"],
+    ) == (1, 2, 1)
+    # Only the bad result is left in the spool, and a replay stores it
+    leave_for_replay(tmp_path / "spool")
+    assert replay(SQLiteHelper(db_path), spool_dir=tmp_path / "spool") == (1, 0)
+    assert stored_names(db_path) == ["test_bad", "test_first", "test_last"]
+
+
+def test_unreachable_database_keeps_results_in_spool(tmp_path):
+    def no_database():
+        raise ConnectionError("database unreachable")
+
+    writer = ResultWriter(
+        helper_factory=no_database,
+        asynchronous=False,
+        spool=ResultSpool(tmp_path / "spool"),
+    )
+    writer.submit(**result("test_offline"))
+    writer.close()
+
+    assert writer.metrics["failed"] == 1
+    leave_for_replay(tmp_path / "spool")
+    assert len(spooled_files(tmp_path / "spool")) == 1
+
+
+def test_acknowledged_results_leave_no_spool_file(db_path, tmp_path):
+    writer = ResultWriter(
+        helper_factory=lambda: SQLiteHelper(db_path),
+        asynchronous=False,
+        spool=ResultSpool(tmp_path / "spool"),
+    )
+    writer.submit(**result("test_stored"))
+    writer.close()
+
+    assert stored_names(db_path) == ["test_stored"]
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_replay_skips_results_already_stored(db_path, tmp_path):
+    spool = ResultSpool(tmp_path / "spool")
+    spool.append("a" * 32, result("test_stored"))
+    spool.append("b" * 32, result("test_missing"))
+    spool.close()
+    helper = SQLiteHelper(db_path)
+    helper.write_rows(
+        helper.build_result_rows(**result("test_stored"), result_key="a" * 32)
+    )
+    leave_for_replay(tmp_path / "spool")
+
+    assert replay(helper, spool_dir=tmp_path / "spool") == (1, 1)
+    assert stored_names(db_path) == ["test_missing", "test_stored"]
+    assert spooled_files(tmp_path / "spool") == []
+
+
+def test_spool_of_a_running_process_is_not_replayed(tmp_path):
+    spool = ResultSpool(tmp_path / "spool")
+    spool.append("c" * 32, result("test_in_flight"))
+    spool._file.flush()
+
+    assert spooled_files(tmp_path / "spool") == []
+    spool.close()
+
+
+def test_pid_alive():
+    assert result_spool._pid_alive(os.getpid())
+    # Far above any pid_max
+    assert not result_spool._pid_alive(2**22 + 12345)
@@ -0,0 +1,138 @@
+import pytest
+from mysql.connector import errors as mysql_errors
+
+from db import schema_migrations
+from db.db_helper import MySQLHelper
+from tests.unit.fakes import ScriptedHelper
+
+
+class ServerConnection:
+    def __init__(self, version):
+        self.version = version
+
+    def get_server_version(self):
+        return self.version
+
+
+def online_helper(version, errors):
+    """MySQLHelper whose DDL fails with the given errnos, one per statement"""
+    helper = MySQLHelper.__new__(MySQLHelper)
+    helper.conn = ServerConnection(version)
+    helper.ddl = []
+
+    def run_ddl(statement):
+        helper.ddl.append(statement)
+        errno = errors.pop(0) if errors else None
+        if errno:
+            raise mysql_errors.Error("scripted failure", errno=errno)
+
+    helper.run_ddl = run_ddl
+    return helper
+
+
+def test_shadow_update_trigger_removes_the_old_row_first():
+    """An update changing test_datetime must not leave the old row behind"""
+    helper = ScriptedHelper(
+        [
+            ("KEY_COLUMN_USAGE", []),
+            (
+                "SHOW CREATE TABLE",
+                [{"Create Table": "CREATE TABLE `test_results` (`id` int)"}],
+            ),
+            ("SHOW COLUMNS", [{"Field": "id"}, {"Field": "test_datetime"}]),
+            ("MIN(id)", [{"min_id": None, "max_id": None}]),
+        ]
+    )
+
+    assert (
+        schema_migrations.shadow_copy(helper, "test_results", "ADD INDEX x (id)")
+        == "copy"
+    )
+
+    update_trigger = next(
+        statement for statement in helper.ddl if "AFTER UPDATE" in statement
+    )
+    delete_old = update_trigger.index(
+        "DELETE IGNORE FROM _test_results_new WHERE id = OLD.id;"
+    )
+    assert delete_old < update_trigger.index("REPLACE INTO _test_results_new")
+    assert "BEGIN" in update_trigger and update_trigger.rstrip().endswith("END")
+    assert helper.ddl[-1] == (
+        "RENAME TABLE test_results TO _test_results_old,"
+        " _test_results_new TO test_results"
+    )
+
+
+def test_failed_shadow_copy_removes_the_copy():
+    helper = ScriptedHelper(
+        [
+            ("KEY_COLUMN_USAGE", []),
+            (
+                "SHOW CREATE TABLE",
+                [{"Create Table": "CREATE TABLE `orders` (`id` int)"}],
+            ),
+        ]
+    )
+    helper.cursor.fail_on = "ALTER TABLE _orders_new"
+
+    with pytest.raises(mysql_errors.Error):
+        schema_migrations.shadow_copy(helper, "orders", "MODIFY COLUMN x INT")
+
+    assert helper.cursor.statements[-4:] == [
+        "DROP TRIGGER IF EXISTS _orders_ins",
+        "DROP TRIGGER IF EXISTS _orders_upd",
+        "DROP TRIGGER IF EXISTS _orders_del",
+        "DROP TABLE IF EXISTS _orders_new",
+    ]
+    assert helper.ddl == []
+
+
+def test_online_alter_falls_back_when_the_algorithm_is_not_supported():
+    helper = online_helper((8, 0, 36), [1846])
+
+    assert helper.alter_table_online("orders", "ADD INDEX x (id)") == "inplace"
+    assert "ALGORITHM=INSTANT" in helper.ddl[0]
+    assert (
+        online_helper((8, 0, 36), [1845, 1846]).alter_table_online("orders", "x")
+        is None
+    )
+
+
+def test_online_alter_raises_other_errors():
+    helper = online_helper((8, 0, 36), [1064])
+
+    with pytest.raises(mysql_errors.Error):
+        helper.alter_table_online("orders", "ADD INDEX x (id")
+    assert len(helper.ddl) == 1
+
+
+def test_online_alter_skips_instant_on_older_servers():
+    helper = online_helper((5, 7, 44), [])
+
+    assert helper.alter_table_online("orders", "ADD INDEX x (id)") == "inplace"
+    assert [statement.split(",")[0] for statement in helper.ddl] == [
+        "ALTER TABLE orders ALGORITHM=INPLACE"
+    ]
+
+
+def test_partitioning_migration_stays_pending_unless_enabled(monkeypatch):
+    monkeypatch.setattr(schema_migrations, "PARTITIONING", False)
+    applied = [
+        {"version": version}
+        for version, *_ in schema_migrations.MIGRATIONS
+        if version != "006"
+    ]
+    helper = ScriptedHelper(
+        [
+            ("GET_LOCK", [{"acquired": 1}]),
+            ("SELECT version", applied),
+            ("INFORMATION_SCHEMA.PARTITIONS", []),
+        ]
+    )
+
+    assert schema_migrations.apply_migrations(helper) == []
+    assert not any(
+        "INSERT INTO schema_migrations" in statement
+        for statement in helper.cursor.statements
+    )
+    assert helper.ddl == []
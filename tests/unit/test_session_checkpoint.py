@@ -0,0 +1,92 @@
+import json
+import time
+
+import pytest
+
+from core import session_checkpoint
+
+
+class SessionDriver:
+    """Browser stand-in holding cookies and storage for one origin"""
+
+    current_url = "https://example.test/solutions/42"
+
+    def __init__(self):
+        self.cookies = [{"name": "sid", "value": "abc", "path": "/"}]
+        self.refreshed = 0
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        return {"local": {"user": "signed-in"}, "session": {}}
+
+    def refresh(self):
+        self.refreshed += 1
+
+
+class SignupPage:
+    def __init__(self):
+        self.steps = []
+
+    def __getattr__(self, name):
+        if name.startswith(("click_", "enter_")):
+            return lambda: self.steps.append(name)
+        raise AttributeError(name)
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        session_checkpoint, "CHECKPOINT_DIR", str(tmp_path / "checkpoints")
+    )
+    monkeypatch.setattr(session_checkpoint, "USE_SESSION_CHECKPOINTS", True)
+    monkeypatch.setattr(session_checkpoint, "USE_ACCOUNT_POOL", False)
+    monkeypatch.setattr(
+        session_checkpoint, "page_ready", lambda driver, timeout=None: True
+    )
+    monkeypatch.setattr(session_checkpoint, "signup_form_shown", lambda driver: False)
+    return tmp_path / "checkpoints"
+
+
+def test_checkpoint_is_reused_until_spent(checkpoints):
+    first = SessionDriver()
+    assert session_checkpoint.sign_up_or_restore(first, SignupPage()) is False
+    assert first.session_checkpoint == "signup"
+    assert len(list(checkpoints.iterdir())) == 1
+
+    # A second test before any purchase skips the signup
+    second, page = SessionDriver(), SignupPage()
+    assert session_checkpoint.sign_up_or_restore(second, page) is True
+    assert page.steps == ["click_view_solution_button"]
+    assert second.refreshed == 1
+
+    # Buying a plan spends the checkpoint, so the next test registers again
+    session_checkpoint.spend_checkpoint(second)
+    assert second.session_checkpoint is None
+    assert list(checkpoints.iterdir()) == []
+    third, page = SessionDriver(), SignupPage()
+    assert session_checkpoint.sign_up_or_restore(third, page) is False
+    assert "click_signup_button" in page.steps
+
+
+def test_spend_checkpoint_without_one_is_a_no_op(checkpoints):
+    session_checkpoint.spend_checkpoint(SessionDriver())
+    assert not checkpoints.exists()
+
+
+def test_stale_checkpoint_is_discarded(checkpoints):
+    driver = SessionDriver()
+    path = session_checkpoint.save_checkpoint(driver, "signup")
+    snapshot = json.loads(path.read_text())
+    snapshot["created_at"] = time.time() - 2 * session_checkpoint.CHECKPOINT_TTL_SECONDS
+    path.write_text(json.dumps(snapshot))
+
+    assert session_checkpoint.restore_checkpoint(driver, "signup") is False
+    assert not path.exists()
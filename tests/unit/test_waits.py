@@ -0,0 +1,15 @@
+from core import waits
+from tests.unit.fakes import FakeDriver
+
+
+def test_page_ready_settles_the_dom_when_the_network_never_idles(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        waits, "network_idle", lambda driver, timeout: calls.append("network") or False
+    )
+    monkeypatch.setattr(
+        waits, "dom_quiet", lambda driver, timeout: calls.append("dom") or True
+    )
+
+    assert waits.page_ready(FakeDriver()) is False
+    assert calls == ["network", "dom"]
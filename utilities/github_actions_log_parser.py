@@ -15,8 +15,10 @@ from db.db_helper import MySQLHelper
 
 
 class GitHubActionsLogParser:
-    def __init__(self, github_token=None):
-        self.db_helper = MySQLHelper()
+    def __init__(self, github_token=None, db_helper=None):
+        # Reuse the caller's helper (and its pooled connection) when given one
+        self._owns_db_helper = db_helper is None
+        self.db_helper = db_helper or MySQLHelper()
         self.github_token = github_token or os.getenv('GITHUB_TOKEN')
         self.repo_owner = os.getenv('GITHUB_REPOSITORY_OWNER', 'Abdullah32101')
         self.repo_name = os.getenv('GITHUB_REPOSITORY', 'PyCharmMiscProject').split('/')[-1]
@@ -462,7 +464,8 @@ class GitHubActionsLogParser:
     
     def close(self):
         """Close database connection"""
-        self.db_helper.close()
+        if self._owns_db_helper:
+            self.db_helper.close()
 
 
 def main():